@@ -1,4 +1,4 @@
-from django.db.models import Prefetch
+from django.db.models import Prefetch, prefetch_related_objects
 from django.http import JsonResponse
 from django.views import View
 from django_filters import rest_framework as filters
@@ -105,6 +105,37 @@ class MatchPsychologistsAjaxView(View):
         data = []
         preferred_topic_type = client_profile.preferred_topic_type  # Для определения цены (individual / couple)
 
+        # Для того, чтоб избежать проблемы N+1 внутри цикла по психологам:
+        # 1) methods и topics уже подгружены через prefetch_related() в базовом QuerySet агрегатора;
+        # 2) Education и активное правило (для подписей длительности сессий) догружаем одним prefetch сразу для всех
+        #    психологов из результата через prefetch_related_objects();
+        # 3) запрошенные клиентом темы читаем один раз, а совпавшие темы считаем в памяти (пересечение множеств).
+        profiles = [item["profile"] for item in aggregated_results.values()]
+        prefetch_related_objects(
+            profiles,
+            Prefetch(
+                lookup="user__availability_rules",
+                queryset=AvailabilityRule.objects.filter(is_active=True).order_by("-created_at"),
+                to_attr="prefetched_active_availability_rules",
+            ),
+            Prefetch(
+                lookup="user__created_educations",
+                queryset=Education.objects.order_by("-year_start"),
+                to_attr="prefetched_educations",
+            ),
+        )
+
+        # ВАЖНЫЕ МОМЕНТ: используем явный mapping-слой (адаптер) между полем TYPE в таблице public.users_topic (где
+        # указано "Индивидуальная"/"Парная" на русском языке) и полем PREFERRED_TOPIC_TYPE в таблице
+        # public.users_clientprofile (где указано "Individual"/"Couple" на английском)
+        mapped_topic_type = CLIENT_TO_TOPIC_TYPE_MAP.get(preferred_topic_type)
+
+        requested_topic_ids = set(
+            client_profile.requested_topics.filter(
+                type=mapped_topic_type
+            ).values_list("id", flat=True)
+        )
+
         for item in aggregated_results.values():
             ps = item["profile"]
             attach_session_duration_labels(ps)
@@ -117,8 +148,8 @@ class MatchPsychologistsAjaxView(View):
                 else ps.price_individual
             )
 
-            # Образование
-            educations = Education.objects.filter(creator=ps.user).order_by("-year_start")
+            # Образование (уже отсортировано по -year_start в Prefetch)
+            educations = ps.user.prefetched_educations
 
             educations_data = [
                 {
@@ -140,23 +171,7 @@ class MatchPsychologistsAjaxView(View):
                 for method in ps.methods.all()
             ]
 
-            # Совпавшие темы
-            # ВАЖНЫЕ МОМЕНТ: используем явный mapping-слой (адаптер) между полем TYPE в таблице public.users_topic (где
-            # указано "Индивидуальная"/"Парная" на русском языке) и полем PREFERRED_TOPIC_TYPE в таблице
-            # public.users_clientprofile (где указано "Individual"/"Couple" на английском)
-            mapped_topic_type = CLIENT_TO_TOPIC_TYPE_MAP.get(preferred_topic_type)
-
-            requested_topic_ids = client_profile.requested_topics.filter(
-                type=mapped_topic_type
-            ).values_list("id", flat=True)
-
-            matched_topic_ids = set(
-                ps.topics.filter(
-                    id__in=requested_topic_ids,
-                    type=mapped_topic_type,
-                ).values_list("id", flat=True)
-            )
-
+            # Совпавшие темы (пересечение в памяти по уже подгруженным темам психолога)
             matched_topics_data = [
                 {
                     "id": topic.id,
@@ -164,7 +179,8 @@ class MatchPsychologistsAjaxView(View):
                     "group_name": topic.group_name,
                     "name": topic.name,
                 }
-                for topic in ps.topics.filter(id__in=matched_topic_ids)
+                for topic in ps.topics.all()
+                if topic.id in requested_topic_ids and topic.type == mapped_topic_type
             ]
 
             # Формируем итоговый контракт
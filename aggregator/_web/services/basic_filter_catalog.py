@@ -1,7 +1,6 @@
-from datetime import date, tzinfo
-from zoneinfo import ZoneInfo
+from datetime import date, timedelta
 
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils.dateparse import parse_datetime
 from django.utils.timezone import is_naive, make_aware, now
 
@@ -9,11 +8,16 @@ from aggregator._web.selectors.psychologist_selectors import \
     filter_by_topic_type
 from aggregator._web.services.topic_type_mapping import \
     CLIENT_TO_TOPIC_TYPE_MAP
-from calendar_engine.application.factories.generate_specialist_schedule_factory import \
-    build_generate_specialist_schedule_use_case
+from calendar_engine.application.factories.find_available_specialists_factory import \
+    build_find_available_specialists_use_case
 from calendar_engine.application.mappers.preferred_slots_mapper import \
     map_preferred_slots_to_domain
+from calendar_engine.availability_snapshot.services import (
+    filter_profiles_available_at, filter_profiles_available_before,
+    is_materialized_availability_enabled)
+from calendar_engine.constants import DAYS_AHEAD_FOR_CLIENT
 from users.constants import GENDER_CHOICES
+from users.models import PsychologistProfile
 
 # Используем уже существующий mapping-слой как единый источник истины для допустимых ключей фильтра "Вид консультации"
 CONSULTATION_TYPE_CHOICES = CLIENT_TO_TOPIC_TYPE_MAP
@@ -22,7 +26,10 @@ DEFAULT_CATALOG_AGE_MAX = 120
 DEFAULT_CATALOG_EXPERIENCE_MIN = 0
 DEFAULT_CATALOG_EXPERIENCE_MAX = max(date.today().year - 1900, 0)
 ALLOWED_GENDER_VALUES = {value for value, _label in GENDER_CHOICES}
-ALLOWED_SESSION_TIME_MODES = {"any", "specific"}
+ALLOWED_SESSION_TIME_MODES = {"any", "specific", "this_week"}
+# Точки разбиения шкалы стажа (в годах) на диапазоны для faceted counts фильтра "Опыт". Крайние точки диапазонов
+# берутся из границ стажа каталога (experience_bounds), см. _build_experience_facet_ranges()
+CATALOG_EXPERIENCE_FACET_BREAKPOINTS = (3, 5, 10)
 
 
 # 1. Фильтр "Вид консультации": фильтрация по ТИПУ тем (Индивидуальная/Парная)
@@ -412,22 +419,7 @@ def extract_experience_range(raw_experience_min, raw_experience_max, experience_
         - фильтр опыта не выбран;
         - каталог должен показывать специалистов с любым стажем.
     """
-    experience_bounds = experience_bounds or {}
-    bounds_min = experience_bounds.get("min", DEFAULT_CATALOG_EXPERIENCE_MIN)
-    bounds_max = experience_bounds.get("max", DEFAULT_CATALOG_EXPERIENCE_MAX)
-
-    try:
-        bounds_min = int(bounds_min)
-    except (TypeError, ValueError):
-        bounds_min = DEFAULT_CATALOG_EXPERIENCE_MIN
-
-    try:
-        bounds_max = int(bounds_max)
-    except (TypeError, ValueError):
-        bounds_max = DEFAULT_CATALOG_EXPERIENCE_MAX
-
-    if bounds_min > bounds_max:
-        bounds_min, bounds_max = bounds_max, bounds_min
+    bounds_min, bounds_max = _normalize_experience_bounds(experience_bounds)
 
     def parse_experience_value(raw_value):
         """Внутренняя вспомогательная функция для обработки одного значения опыта."""
@@ -462,6 +454,49 @@ def extract_experience_range(raw_experience_min, raw_experience_max, experience_
     return experience_min, experience_max
 
 
+def _normalize_experience_bounds(experience_bounds=None):
+    """Возвращает границы стажа каталога (bounds_min, bounds_max) в виде целых чисел.
+
+    Если границы не переданы или битые, берутся fallback-константы. Перепутанные местами границы меняются местами.
+    """
+    experience_bounds = experience_bounds or {}
+    bounds_min = experience_bounds.get("min", DEFAULT_CATALOG_EXPERIENCE_MIN)
+    bounds_max = experience_bounds.get("max", DEFAULT_CATALOG_EXPERIENCE_MAX)
+
+    try:
+        bounds_min = int(bounds_min)
+    except (TypeError, ValueError):
+        bounds_min = DEFAULT_CATALOG_EXPERIENCE_MIN
+
+    try:
+        bounds_max = int(bounds_max)
+    except (TypeError, ValueError):
+        bounds_max = DEFAULT_CATALOG_EXPERIENCE_MAX
+
+    if bounds_min > bounds_max:
+        bounds_min, bounds_max = bounds_max, bounds_min
+
+    return bounds_min, bounds_max
+
+
+def _build_experience_query(experience_min, experience_max):
+    """Переводит диапазон стажа (в годах, границы включительно) в условие по году начала практики.
+
+    Пустой Q() (оба значения None) - фильтр не активен. Используется и в filter_experience(), и в faceted counts,
+    чтобы количество по диапазону стажа всегда совпадало с выдачей при выборе этого диапазона.
+    """
+    current_year = date.today().year
+    experience_query = Q()
+
+    if experience_min is not None:
+        experience_query &= Q(practice_start_year__lte=current_year - experience_min)
+
+    if experience_max is not None:
+        experience_query &= Q(practice_start_year__gte=current_year - experience_max)
+
+    return experience_query
+
+
 def filter_experience(queryset, experience_min, experience_max):
     """Применяет к QuerySet фильтр "Опыт".
 
@@ -476,32 +511,35 @@ def filter_experience(queryset, experience_min, experience_max):
     if experience_min is None and experience_max is None:
         return queryset
 
-    current_year = date.today().year
+    return queryset.filter(_build_experience_query(experience_min, experience_max))
 
-    if experience_min is not None:
-        max_start_year = current_year - experience_min
-        queryset = queryset.filter(practice_start_year__lte=max_start_year)
 
-    if experience_max is not None:
-        min_start_year = current_year - experience_max
-        queryset = queryset.filter(practice_start_year__gte=min_start_year)
+# 8. Фильтр "Время сессии": фильтрация по выбранным доменным слотам
 
-    return queryset
+def is_nearest_days_session_time_mode_enabled():
+    """Доступен ли в каталоге режим "this_week" фильтра "Время сессии" (кнопка "Ближайшие N дней").
 
+    Режим предлагается только при материализованной доступности: там он сводится к одному индексированному
+    SQL-запросу. Без нее пришлось бы считать расписание каждого специалиста каталога на каждый запрос фильтра.
+    """
+    return is_materialized_availability_enabled()
 
-# 8. Фильтр "Время сессии": фильтрация по выбранным доменным слотам
 
 def extract_session_time_mode(raw_value):
     """Возвращает валидный режим фильтра "Время сессии" или значение по умолчанию.
 
     Простая логика:
-        - если пришел валидный режим "any" или "specific", возвращаем его;
-        - если значение пустое или битое, возвращаем "any".
+        - если пришел валидный режим "any", "specific" или "this_week", возвращаем его;
+        - если значение пустое или битое, возвращаем "any";
+        - режим "this_week" при выключенной материализованной доступности тоже превращается в "any"
+          (см. is_nearest_days_session_time_mode_enabled()).
 
     Почему по умолчанию именно "any":
         - это соответствует сценарию "Любое";
         - без этого фильтра каталог не должен дополнительно сужать выдачу.
     """
+    if raw_value == "this_week" and not is_nearest_days_session_time_mode_enabled():
+        return "any"
     if raw_value in ALLOWED_SESSION_TIME_MODES:
         return raw_value
     return "any"
@@ -550,11 +588,35 @@ def extract_selected_session_slots(raw_values):
     return normalized_slots
 
 
+def filter_available_this_week(queryset, consultation_type):
+    """Оставляет в QuerySet только специалистов, к которым можно записаться в ближайшие DAYS_AHEAD_FOR_CLIENT дней.
+
+    Это не календарная неделя, а скользящее окно от текущего момента: то же окно, на которое клиенту
+    показываются доменные слоты для записи.
+
+    Техническая логика:
+        - один индексированный SQL-запрос по заранее рассчитанному ближайшему свободному старту специалиста
+          (SpecialistNearestAvailableStart);
+        - без материализованной доступности фильтр не применяется (режим в каталоге не предлагается),
+          чтобы не считать расписание всех специалистов каталога на каждый запрос.
+    """
+    if not is_nearest_days_session_time_mode_enabled():
+        return queryset
+
+    return filter_profiles_available_before(
+        queryset,
+        consultation_type=consultation_type or "individual",
+        until=now() + timedelta(days=DAYS_AHEAD_FOR_CLIENT),
+    )
+
+
 def filter_session_time(queryset, consultation_type, session_time_mode, selected_session_slots):
     """Применяет к QuerySet фильтр "Время сессии".
 
     Бизнес-логика:
         - режим "any" ничего не фильтрует;
+        - режим "this_week" оставляет специалистов, к которым можно записаться в ближайшие DAYS_AHEAD_FOR_CLIENT дней
+          (доступен только при материализованной доступности);
         - режим "specific" без выбранных слотов тоже не фильтрует, потому что пользователь еще
           не указал конкретное время;
         - если слоты выбраны, оставляем только тех специалистов, у которых эти доменные слоты пересекаются
@@ -568,43 +630,31 @@ def filter_session_time(queryset, consultation_type, session_time_mode, selected
     normalized_mode = extract_session_time_mode(session_time_mode)
     normalized_slots = extract_selected_session_slots(selected_session_slots)
 
+    if normalized_mode == "this_week":
+        return filter_available_this_week(queryset, consultation_type)
+
     if normalized_mode != "specific" or not normalized_slots:
         return queryset
 
     selected_slot_datetimes = map_preferred_slots_to_domain(normalized_slots)
-    matched_profile_ids = []
 
-    for profile in queryset:
-        effective_consultation_type = consultation_type or "individual"
-        schedule_use_case = build_generate_specialist_schedule_use_case(
-            profile,
-            effective_consultation_type,
+    # Если включена материализованная доступность, то свободные старты уже рассчитаны заранее
+    # и фильтр сводится к одному индексированному SQL-запросу
+    if is_materialized_availability_enabled():
+        return filter_profiles_available_at(
+            queryset,
+            consultation_type=consultation_type or "individual",
+            start_datetimes=selected_slot_datetimes,
         )
-        if schedule_use_case is None:
-            continue
 
-        available_slots = schedule_use_case.execute()
-        specialist_tz_value = getattr(profile.user, "timezone", None)
-        if isinstance(specialist_tz_value, str):
-            specialist_tz = ZoneInfo(specialist_tz_value)
-        elif isinstance(specialist_tz_value, tzinfo):
-            specialist_tz = specialist_tz_value
-        else:
-            specialist_tz = None
-
-        normalized_selected_slot_keys = set()
-        for selected_dt in selected_slot_datetimes:
-            localized_dt = selected_dt.astimezone(specialist_tz) if specialist_tz else selected_dt
-            normalized_selected_slot_keys.add(
-                (localized_dt.date(), localized_dt.time().replace(second=0, microsecond=0))
-            )
-
-        has_match = any(
-            (slot.day, slot.start) in normalized_selected_slot_keys
-            for slot in available_slots
-        )
-        if has_match:
-            matched_profile_ids.append(profile.pk)
+    # Проверяем всех специалистов пакетно: правила, окна, исключения и занятые слоты читаются из БД
+    # фиксированным количеством запросов, а не несколькими запросами на каждого специалиста
+    find_available_specialists_use_case = build_find_available_specialists_use_case(
+        specialist_profiles=queryset.select_related("user"),
+        consultation_type=consultation_type or "individual",
+        selected_slots=selected_slot_datetimes,
+    )
+    matched_profile_ids = find_available_specialists_use_case.execute()
 
     if not matched_profile_ids:
         return queryset.none()
@@ -639,21 +689,28 @@ def apply_catalog_basic_filters(queryset, filters_state, age_bounds=None, experi
             "age_max": 40 | None,
             "experience_min": 3 | None,
             "experience_max": 15 | None,
-            "session_time_mode": "any" | "specific",
+            "session_time_mode": "any" | "specific" | "this_week",
             "selected_session_slots": ["2026-01-22T19:00:00+03:00"] | [],
         }
     """
+    normalized_filters = _normalize_catalog_filters_state(
+        filters_state,
+        age_bounds=age_bounds,
+        experience_bounds=experience_bounds,
+    )
+
+    return _apply_normalized_catalog_filters(queryset, normalized_filters)
+
+
+def _normalize_catalog_filters_state(filters_state, age_bounds=None, experience_bounds=None):
+    """Приводит filters_state к нормализованному виду (все значения уже прошли extract_*()).
+
+    Вынесено отдельно, чтобы и обычная фильтрация каталога, и подсчет faceted counts разбирали входные данные
+    одинаково и только один раз.
+    """
     if not isinstance(filters_state, dict):
         filters_state = {}
 
-    consultation_type = extract_consultation_type(
-        filters_state.get("consultation_type")
-    )
-    topic_ids = extract_topic_ids(filters_state.get("topic_ids"))
-    method_ids = extract_method_ids(filters_state.get("method_ids"))
-    gender = extract_gender(filters_state.get("gender"))
-    price_individual_values = extract_price_values(filters_state.get("price_individual_values"))
-    price_couple_values = extract_price_values(filters_state.get("price_couple_values"))
     age_min, age_max = extract_age_range(
         filters_state.get("age_min"),
         filters_state.get("age_max"),
@@ -664,30 +721,230 @@ def apply_catalog_basic_filters(queryset, filters_state, age_bounds=None, experi
         filters_state.get("experience_max"),
         experience_bounds=experience_bounds,
     )
-    session_time_mode = extract_session_time_mode(
-        filters_state.get("session_time_mode")
-    )
-    selected_session_slots = extract_selected_session_slots(
-        filters_state.get("selected_session_slots")
-    )
 
-    queryset = filter_topic_type(queryset, consultation_type)
-    queryset = filter_topics(queryset, topic_ids)
-    queryset = filter_methods(queryset, method_ids)
-    queryset = filter_gender(queryset, gender)
-    queryset = filter_price(
-        queryset,
-        consultation_type,
-        price_individual_values,
-        price_couple_values,
+    return {
+        "consultation_type": extract_consultation_type(filters_state.get("consultation_type")),
+        "topic_ids": extract_topic_ids(filters_state.get("topic_ids")),
+        "method_ids": extract_method_ids(filters_state.get("method_ids")),
+        "gender": extract_gender(filters_state.get("gender")),
+        "price_individual_values": extract_price_values(filters_state.get("price_individual_values")),
+        "price_couple_values": extract_price_values(filters_state.get("price_couple_values")),
+        "age_min": age_min,
+        "age_max": age_max,
+        "experience_min": experience_min,
+        "experience_max": experience_max,
+        "session_time_mode": extract_session_time_mode(filters_state.get("session_time_mode")),
+        "selected_session_slots": extract_selected_session_slots(filters_state.get("selected_session_slots")),
+    }
+
+
+def _apply_common_catalog_filters(queryset, normalized_filters):
+    """Применяет фильтры, которые не являются facet-ами ("Вид консультации" и "Возраст").
+
+    Эти фильтры одинаковы для выдачи каталога и для подсчета количества по каждому facet-у, поэтому в faceted
+    counts применяются один раз, до дорогого фильтра "Время сессии".
+    """
+    queryset = filter_topic_type(queryset, normalized_filters["consultation_type"])
+
+    return filter_age(queryset, normalized_filters["age_min"], normalized_filters["age_max"])
+
+
+def _apply_normalized_catalog_filters(queryset, normalized_filters, *, skip_facet=None, skip_common_filters=False):
+    """Применяет уже нормализованные фильтры каталога к QuerySet.
+
+    :param skip_facet: Имя фильтра ("topics" / "methods" / "gender" / "price" / "experience"), который нужно
+        пропустить. Используется для faceted counts: количество по значениям фильтра считается при всех
+        остальных активных фильтрах, но без самого этого фильтра (внутри одного фильтра значения объединяются
+        через OR).
+    :param skip_common_filters: Пропустить "Вид консультации", "Возраст" и "Время сессии" (если они уже
+        применены к queryset заранее).
+    """
+    consultation_type = normalized_filters["consultation_type"]
+
+    if not skip_common_filters:
+        queryset = _apply_common_catalog_filters(queryset, normalized_filters)
+    if skip_facet != "topics":
+        queryset = filter_topics(queryset, normalized_filters["topic_ids"])
+    if skip_facet != "methods":
+        queryset = filter_methods(queryset, normalized_filters["method_ids"])
+    if skip_facet != "gender":
+        queryset = filter_gender(queryset, normalized_filters["gender"])
+    if skip_facet != "price":
+        queryset = filter_price(
+            queryset,
+            consultation_type,
+            normalized_filters["price_individual_values"],
+            normalized_filters["price_couple_values"],
+        )
+    if skip_facet != "experience":
+        queryset = filter_experience(
+            queryset,
+            normalized_filters["experience_min"],
+            normalized_filters["experience_max"],
+        )
+    if not skip_common_filters:
+        queryset = filter_session_time(
+            queryset,
+            consultation_type,
+            normalized_filters["session_time_mode"],
+            normalized_filters["selected_session_slots"],
+        )
+
+    return queryset
+
+
+# FACETED COUNTS: количество специалистов по каждому значению фильтров
+
+def _build_experience_facet_ranges(experience_bounds=None):
+    """Разбивает шкалу стажа каталога на диапазоны для faceted counts фильтра "Опыт".
+
+    Крайние точки - те же границы каталога, что и у слайдера фильтра (experience_bounds), внутренние точки -
+    CATALOG_EXPERIENCE_FACET_BREAKPOINTS, попавшие внутрь границ. Пример для границ 1..25: (1, 3), (3, 5),
+    (5, 10), (10, 25).
+
+    Границы диапазонов включительные, как в filter_experience(): специалист ровно с 5 годами стажа попадает
+    и в "3-5", и в "5-10" - так же, как в выдачу при выборе любого из этих диапазонов на слайдере.
+    """
+    bounds_min, bounds_max = _normalize_experience_bounds(experience_bounds)
+    range_points = [
+        bounds_min,
+        *(point for point in CATALOG_EXPERIENCE_FACET_BREAKPOINTS if bounds_min < point < bounds_max),
+        bounds_max,
+    ]
+
+    return list(zip(range_points, range_points[1:]))
+
+
+def _count_by_experience_ranges(queryset, experience_bounds=None):
+    """Считает количество специалистов в каждом диапазоне стажа одним запросом (условная агрегация).
+
+    Каждый диапазон проходит через extract_experience_range() и _build_experience_query(), то есть через
+    тот же путь, что и значения слайдера в filter_experience(). Ключ ответа - "min-max", например: "3-5".
+    """
+    aggregates = {}
+
+    for range_min, range_max in _build_experience_facet_ranges(experience_bounds):
+        experience_min, experience_max = extract_experience_range(
+            range_min,
+            range_max,
+            experience_bounds=experience_bounds,
+        )
+        aggregates[f"{range_min}-{range_max}"] = Count(
+            "pk",
+            filter=_build_experience_query(experience_min, experience_max),
+        )
+
+    return queryset.aggregate(**aggregates)
+
+
+def build_catalog_facet_counts(queryset, filters_state, age_bounds=None, experience_bounds=None):
+    """Считает для модалок фильтров, сколько специалистов найдется по каждому значению фильтров каталога.
+
+    Бизнес-логика (классический faceted search):
+        - количество по значениям фильтра считается при всех ОСТАЛЬНЫХ активных фильтрах, но без самого этого
+          фильтра, т.к. внутри одного фильтра значения объединяются через OR;
+        - так пользователь видит, сколько специалистов получит, если добавит значение к текущему выбору;
+        - цены считаются только для выбранного вида консультации: при "Индивидуальная" filter_price() не смотрит
+          на price_couples, поэтому и счетчики по ним не показываются (и наоборот);
+        - режим "this_week" фильтра "Время сессии" без материализованной доступности не предлагается
+          и нормализуется в "any" (см. extract_session_time_mode()): счетчики считаются без него, а фронтенд
+          видит это по session_time_mode в active_filters ответа.
+
+    Техническая логика:
+        - вместо отдельного count() на каждое значение каждого фильтра используется по одному GROUP BY-запросу
+          на фильтр (темы и методы группируются по M2M-таблице, пол и цены - по полю профиля, стаж - условной
+          агрегацией по диапазонам);
+        - фильтры, общие для всех facet-ов ("Вид консультации", "Возраст" и самый дорогой - "Время сессии"),
+          применяются один раз, а не для каждого фильтра заново; "Время сессии" применяется последним из них,
+          чтобы расписания проверялись только у специалистов, уже прошедших дешевые фильтры.
+
+    Формат ответа:
+        {
+            "total_count": 14,  # количество специалистов при всех активных фильтрах (как в preview-режиме)
+            "topics": {"12": 5, ...},
+            "methods": {"3": 7, ...},
+            "gender": {"male": 4, "female": 9},
+            "price_individual": {"2500": 3, ...},
+            "price_couple": {"3500": 2, ...},
+            "experience": {"0-3": 1, "3-5": 4, "5-10": 6, "10-35": 2},  # см. _build_experience_facet_ranges()
+        }
+    """
+    normalized_filters = _normalize_catalog_filters_state(
+        filters_state,
+        age_bounds=age_bounds,
+        experience_bounds=experience_bounds,
     )
-    queryset = filter_age(queryset, age_min, age_max)
-    queryset = filter_experience(queryset, experience_min, experience_max)
+    consultation_type = normalized_filters["consultation_type"]
+
+    queryset = _apply_common_catalog_filters(queryset, normalized_filters)
     queryset = filter_session_time(
         queryset,
         consultation_type,
-        session_time_mode,
-        selected_session_slots,
+        normalized_filters["session_time_mode"],
+        normalized_filters["selected_session_slots"],
     )
 
-    return queryset
+    def matched_profile_ids(skip_facet):
+        """Подзапрос id специалистов, подходящих под все активные фильтры, кроме skip_facet."""
+        return _apply_normalized_catalog_filters(
+            queryset,
+            normalized_filters,
+            skip_facet=skip_facet,
+            skip_common_filters=True,
+        ).values("pk")
+
+    topic_counts = (
+        PsychologistProfile.topics.through.objects
+        .filter(psychologistprofile_id__in=matched_profile_ids("topics"))
+        .values("topic_id")
+        .annotate(count=Count("psychologistprofile_id"))
+        .order_by()
+    )
+    method_counts = (
+        PsychologistProfile.methods.through.objects
+        .filter(psychologistprofile_id__in=matched_profile_ids("methods"))
+        .values("method_id")
+        .annotate(count=Count("psychologistprofile_id"))
+        .order_by()
+    )
+    gender_counts = (
+        PsychologistProfile.objects
+        .filter(pk__in=matched_profile_ids("gender"))
+        .values("gender")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    price_profiles = PsychologistProfile.objects.filter(pk__in=matched_profile_ids("price"))
+    price_individual_counts = []
+    if consultation_type != "couple":
+        price_individual_counts = (
+            price_profiles
+            .filter(price_individual__gt=0)
+            .values("price_individual")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+    price_couple_counts = []
+    if consultation_type != "individual":
+        price_couple_counts = (
+            price_profiles
+            .filter(price_couples__gt=0)
+            .values("price_couples")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+    experience_counts = _count_by_experience_ranges(
+        PsychologistProfile.objects.filter(pk__in=matched_profile_ids("experience")),
+        experience_bounds=experience_bounds,
+    )
+
+    # Ключи приводим к строкам в том же формате, что и значения во frontend state (см. extract_*())
+    return {
+        "total_count": matched_profile_ids(None).count(),
+        "topics": {str(row["topic_id"]): row["count"] for row in topic_counts},
+        "methods": {str(row["method_id"]): row["count"] for row in method_counts},
+        "gender": {row["gender"]: row["count"] for row in gender_counts if row["gender"]},
+        "price_individual": {str(int(row["price_individual"])): row["count"] for row in price_individual_counts},
+        "price_couple": {str(int(row["price_couples"])): row["count"] for row in price_couple_counts},
+        "experience": experience_counts,
+    }
@@ -5,7 +5,7 @@ from django.utils.timezone import now
 from aggregator._web.services.basic_filter_service import match_psychologists
 from aggregator._web.services.scoring import apply_final_ordering
 from calendar_engine.application.factories.generate_and_match_factory import \
-    build_generate_and_match_use_case
+    build_generate_and_match_use_cases
 from calendar_engine.application.mappers.preferred_slots_mapper import \
     map_preferred_slots_to_domain
 from calendar_engine.constants import DAYS_AHEAD_FOR_SPECIALIST
@@ -86,18 +86,24 @@ class PsychologistAggregatorService:
             days_ahead=DAYS_AHEAD_FOR_SPECIALIST,
         )
 
-        # Шаг 4: Финальный агрегированный результат с учетом временными слотами
+        # Шаг 4: Финальный агрегированный результат с учетом временных слотов.
+        # Кандидатов сразу упорядочиваем финальным scoring (topic_score / method_score): тогда итоговый dict
+        # собирается уже в нужном порядке и не нужен второй запрос в БД по id совпавших психологов
+        ordered_psychologists = list(apply_final_ordering(psychologists_qs))
+
+        # Пакетно собираем use-case для всех кандидатов: правила, исключения и их окна читаются фиксированным
+        # количеством запросов, а не отдельными запросами на каждого психолога в цикле.
+        # В словарь попадают только психологи с активным AvailabilityRule и хотя бы одним выбранным слотом
+        # внутри периода действия правила
+        use_cases = build_generate_and_match_use_cases(
+            psychologists=[ps.user for ps in ordered_psychologists],
+            selected_slots=selected_slots,
+        )
+
         aggregated = {}  # Хранит итоговые данные (ТОЛЬКО психологи, которые: прошли проф фильтрацию + проверку слотов
-        availability_map = {}  # Временно хранит availability, чтобы потом снова второй раз не вызывать calendar_engine
-
-        # Идем по каждому психологу, который прошел первичную фильтрацию и создаем use-case:
-        # - проверяем: есть ли у психолога активный AvailabilityRule
-        # - если есть, то запускаем создание use-case для расчета доступных слотов
-        for ps in psychologists_qs:
-            use_case = build_generate_and_match_use_case(
-                psychologist=ps.user,
-                selected_slots=selected_slots,
-            )
+
+        for ps in ordered_psychologists:
+            use_case = use_cases.get(ps.user_id)
 
             if not use_case:
                 continue  # Выходим: у психолога нет активного AvailabilityRule (например, сейчас не работает)
@@ -114,39 +120,5 @@ class PsychologistAggregatorService:
                 "profile": ps,
                 "availability": match_result,
             }
-            availability_map[ps.id] = match_result
-
-        # Шаг 5: Итоговое ранжирование полученных результатов с помощью scoring
-        if not aggregated:  # Если вообще никто не подошел - это просто безопасный early-return
-            return {}
-
-        # ПОЯСНЕНИЕ РЕШЕНИЯ НИЖЕ: dict нельзя просто "отсортировать как queryset из БД", поэтому нужно:
-        # а) или переписать apply_final_ordering() в Python-версию. Из-за того что у нас изначально эта функция была
-        # написана под QUERYSET
-        # б) (КАК У НАС СЕЙЧАС) или оставить apply_final_ordering() как есть и просто применить такой
-        # технический прием, чтобы:
-        # - снова получить QuerySet
-        # - применить существующий SQL-based ранжирование
-        # - не писать Python-сортировку вручную
-        # где:
-        # --- aggregated.keys() - это просто список ID психологов из aggregated, например, dict_keys([12, 7, 31])
-        # --- а filter просто возвращает ТОЛЬКО психологов из БД с этими id: 12, 7, 31
-        # Очень важно:
-        # Django не теряет аннотации topic_score, method_score потому что они уже ранее вычислены в match_psychologists
-
-        ordered_psychologists = apply_final_ordering(
-            psychologists_qs.filter(id__in=aggregated.keys())
-        )
 
-        return {
-            ps.id: {
-                "profile": ps,
-                "availability": availability_map[ps.id],
-            }
-            for ps in ordered_psychologists
-        }
-        # availability_map[ps.id] это match_result (т.е., это MatchResultDTO) и это "дорогое" вычисление, которое
-        # мы уже ранее делали и, чтоб не запускать это вычисление второй раз, мы специально его записали/продублировали
-        # в availability_map. Потому что знали, что после применения apply_final_ordering() у нас вернется из БД
-        # список психологов без MatchResultDTO и чтоб его повторно не считать мы его из ранее записанного
-        # справочника availability_map просто подтягиваем по id снова, а не считаем заново!
+        return aggregated
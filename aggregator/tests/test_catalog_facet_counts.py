@@ -0,0 +1,171 @@
+from datetime import date
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from aggregator._web.services.basic_filter_catalog import (
+    _build_experience_facet_ranges, _normalize_catalog_filters_state,
+    apply_catalog_basic_filters, build_catalog_facet_counts)
+from calendar_engine.tests.helpers import create_test_specialist
+from users.models import AppUser, Method, PsychologistProfile, Topic
+
+EXPERIENCE_BOUNDS = {"min": 0, "max": 20}
+
+
+class BuildExperienceFacetRangesTests(SimpleTestCase):
+    """Диапазоны стажа для faceted counts строятся от тех же границ каталога, что и слайдер фильтра "Опыт"."""
+
+    def test_breakpoints_inside_bounds(self):
+        self.assertEqual(
+            _build_experience_facet_ranges(EXPERIENCE_BOUNDS),
+            [(0, 3), (3, 5), (5, 10), (10, 20)],
+        )
+
+    def test_breakpoints_outside_bounds_are_dropped(self):
+        self.assertEqual(_build_experience_facet_ranges({"min": 4, "max": 8}), [(4, 5), (5, 8)])
+        self.assertEqual(_build_experience_facet_ranges({"min": 10, "max": 10}), [(10, 10)])
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class BuildCatalogFacetCountsTests(TestCase):
+    """Количество по каждому значению фильтра равно размеру выдачи каталога при выборе этого значения."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.topics = [
+            Topic.objects.create(type="Индивидуальная", group_name="Моё состояние", name="Стресс"),
+            Topic.objects.create(type="Индивидуальная", group_name="Моё состояние", name="Выгорание"),
+            Topic.objects.create(type="Парная", group_name="Отношения", name="Конфликты"),
+        ]
+        cls.methods = [
+            Method.objects.create(name=name, description=f"Описание метода {name}")
+            for name in ("КПТ", "Гештальт")
+        ]
+
+        current_year = date.today().year
+        # (пол, стаж, возраст, цена индивидуальной, цена парной, индексы тем, индексы методов). Стаж 3, 5 и 10 лет -
+        # ровно на границах диапазонов фильтра "Опыт"
+        specialists = (
+            ("female", 0, 25, 2500, 0, (0,), (0,)),
+            ("male", 2, 30, 3500, 3500, (0, 2), (1,)),
+            ("female", 3, 35, 2500, 4500, (1, 2), (0, 1)),
+            ("male", 4, 40, 0, 3500, (2,), (0,)),
+            ("female", 5, 45, 3500, 0, (0, 1), ()),
+            ("female", 7, 50, 2500, 3500, (1,), (1,)),
+            ("male", 10, 55, 3500, 4500, (0, 2), (0,)),
+            ("female", 20, 60, 2500, 0, (), (0, 1)),
+        )
+        for index, specialist in enumerate(specialists):
+            gender, experience, age, price_individual, price_couples, topic_indexes, method_indexes = specialist
+            profile = create_test_specialist(email=f"specialist-{index}@example.com", gender=gender)
+            profile.practice_start_year = current_year - experience
+            profile.price_individual = price_individual
+            profile.price_couples = price_couples
+            profile.save()
+            profile.topics.set([cls.topics[topic_index] for topic_index in topic_indexes])
+            profile.methods.set([cls.methods[method_index] for method_index in method_indexes])
+            AppUser.objects.filter(pk=profile.user_id).update(age=age)
+
+    def _build_facet_counts(self, filters_state):
+        return build_catalog_facet_counts(
+            PsychologistProfile.objects.all(),
+            filters_state,
+            experience_bounds=EXPERIENCE_BOUNDS,
+        )
+
+    def _count_filtered(self, filters_state):
+        return apply_catalog_basic_filters(
+            PsychologistProfile.objects.all(),
+            filters_state,
+            experience_bounds=EXPERIENCE_BOUNDS,
+        ).count()
+
+    def _assert_facet_counts_match_filtered_results(self, filters_state):
+        """Для каждого значения каждого facet-а: количество == выдача, где этот facet заменен на одно значение.
+
+        Значения, которых нет в ответе, должны давать пустую выдачу. Цены индивидуальной и парной консультации -
+        один фильтр (OR), поэтому при проверке одной из них другая сбрасывается.
+        """
+        facet_counts = self._build_facet_counts(filters_state)
+
+        self.assertEqual(facet_counts["total_count"], self._count_filtered(filters_state))
+
+        facet_values = {
+            "topics": [(str(topic.pk), {"topic_ids": [str(topic.pk)]}) for topic in self.topics],
+            "methods": [(str(method.pk), {"method_ids": [str(method.pk)]}) for method in self.methods],
+            "gender": [(gender, {"gender": gender}) for gender in ("male", "female")],
+            "experience": [
+                (f"{range_min}-{range_max}", {"experience_min": range_min, "experience_max": range_max})
+                for range_min, range_max in _build_experience_facet_ranges(EXPERIENCE_BOUNDS)
+            ],
+        }
+        if filters_state.get("consultation_type") != "couple":
+            facet_values["price_individual"] = [
+                (price, {"price_individual_values": [price], "price_couple_values": []})
+                for price in ("2500", "3500")
+            ]
+        else:
+            self.assertEqual(facet_counts["price_individual"], {})
+        if filters_state.get("consultation_type") != "individual":
+            facet_values["price_couple"] = [
+                (price, {"price_individual_values": [], "price_couple_values": [price]})
+                for price in ("3500", "4500")
+            ]
+        else:
+            self.assertEqual(facet_counts["price_couple"], {})
+
+        for facet_name, values in facet_values.items():
+            for facet_value, facet_filters in values:
+                with self.subTest(facet=facet_name, value=facet_value):
+                    self.assertEqual(
+                        facet_counts[facet_name].get(facet_value, 0),
+                        self._count_filtered({**filters_state, **facet_filters}),
+                    )
+
+    def test_without_filters(self):
+        self._assert_facet_counts_match_filtered_results({})
+
+    def test_with_consultation_type_and_gender(self):
+        self._assert_facet_counts_match_filtered_results({"consultation_type": "individual", "gender": "female"})
+
+    def test_with_topic_and_experience_range(self):
+        self._assert_facet_counts_match_filtered_results({
+            "consultation_type": "couple",
+            "topic_ids": [str(self.topics[2].pk)],
+            "experience_min": 3,
+            "experience_max": 10,
+        })
+
+    def test_with_method_prices_and_age(self):
+        self._assert_facet_counts_match_filtered_results({
+            "method_ids": [str(self.methods[0].pk)],
+            "price_individual_values": ["2500"],
+            "price_couple_values": ["3500"],
+            "age_min": 30,
+            "age_max": 55,
+        })
+
+    def test_experience_boundary_is_counted_in_both_ranges(self):
+        """Специалист ровно с 5 годами стажа попадает в выдачу и "3-5", и "5-10" - и в счетчики обоих диапазонов."""
+        self.assertEqual(
+            self._build_facet_counts({})["experience"],
+            {"0-3": 3, "3-5": 3, "5-10": 3, "10-20": 2},
+        )
+
+    def test_query_count_does_not_depend_on_facet_values(self):
+        """Один запрос на facet (темы, методы, пол, две цены, стаж) и один на total_count."""
+        with self.assertNumQueries(7):
+            self._build_facet_counts({"gender": "female"})
+
+        # При выбранном виде консультации цены другого вида не считаются
+        with self.assertNumQueries(6):
+            self._build_facet_counts({"consultation_type": "individual"})
+
+    def test_this_week_without_materialized_availability_is_any(self):
+        """Без материализованной доступности режим "this_week" нормализуется в "any" и не сужает счетчики."""
+        filters_state = {"gender": "male", "session_time_mode": "this_week"}
+
+        self.assertEqual(_normalize_catalog_filters_state(filters_state)["session_time_mode"], "any")
+        self.assertEqual(
+            self._build_facet_counts(filters_state),
+            self._build_facet_counts({"gender": "male", "session_time_mode": "any"}),
+        )
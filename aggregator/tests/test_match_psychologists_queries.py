@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from calendar_engine.tests.helpers import (build_specialist_datetime,
+                                           create_test_availability_rule,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today)
+from users.models import Education, Method, Topic
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class MatchPsychologistsAjaxViewQueriesTests(TestCase):
+    """Количество SQL-запросов MatchPsychologistsAjaxView.get не должно зависеть от количества психологов в выдаче.
+
+    Карточка психолога в ответе собирается из образования, методов, совпавших тем и активного правила
+    (подписи длительности сессий) - все это должно читаться пакетно, а не запросом на каждого психолога.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.topics = [
+            Topic.objects.create(type="Индивидуальная", group_name="Моё состояние", name=name)
+            for name in ("Стресс", "Выгорание", "Прокрастинация")
+        ]
+        cls.methods = [
+            Method.objects.create(name=name, description=f"Описание метода {name}")
+            for name in ("КПТ", "Гештальт")
+        ]
+        cls.url = reverse("aggregator:api:ajax-match-psychologists")
+
+    def setUp(self):
+        self.client_user = create_test_client(email="client@example.com")
+        self.client_profile = self.client_user.client_profile
+        self.client_profile.preferred_topic_type = "individual"
+        self.client_profile.has_preferences = True
+        self.client_profile.save()
+        self.client_profile.requested_topics.set(self.topics[:2])
+        self.client_profile.preferred_methods.set(self.methods[:1])
+
+        self.client.force_login(self.client_user)
+        self.specialists_count = 0
+
+    def _create_matching_specialist(self):
+        """Психолог, который проходит все фильтры клиента: темы, методы, образование и рабочий график."""
+        self.specialists_count += 1
+        profile = create_test_specialist(email=f"specialist-{self.specialists_count}@example.com")
+        profile.topics.set(self.topics)
+        profile.methods.set(self.methods)
+
+        for year_start in (2005, 2012):
+            Education.objects.create(
+                creator=profile.user,
+                country="RU",
+                institution="МГУ",
+                degree="Магистр",
+                specialisation="Клиническая психология",
+                year_start=year_start,
+                year_end=year_start + 4,
+                is_verified=True,
+            )
+
+        create_test_availability_rule(specialist_user=profile.user)
+
+        return profile
+
+    def _assert_query_count_does_not_grow(self, *, more_specialists_count: int = 4):
+        """Сравнивает количество запросов для выдачи из 1 психолога и из 1 + more_specialists_count психологов."""
+        self._create_matching_specialist()
+        # Прогрев: первый запрос может заполнить служебные кэши процесса (например, ContentType)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as single_match_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        [single_item] = response.json()["items"]
+        self.assertEqual(len(single_item["educations"]), 2)
+        self.assertEqual(len(single_item["methods"]), 2)
+        self.assertEqual(len(single_item["matched_topics"]), 2)
+        self.assertIsNotNone(single_item["session_duration_individual"])
+
+        for _ in range(more_specialists_count):
+            self._create_matching_specialist()
+
+        with self.assertNumQueries(len(single_match_queries)):
+            response = self.client.get(self.url)
+
+        items = response.json()["items"]
+        self.assertEqual(len(items), 1 + more_specialists_count)
+        for item in items:
+            self.assertEqual(len(item["educations"]), 2)
+            self.assertEqual(len(item["methods"]), 2)
+            self.assertEqual(len(item["matched_topics"]), 2)
+
+        return items
+
+    def test_query_count_without_time_preferences(self):
+        """Без предпочтений по времени выдача - только первичная фильтрация и scoring."""
+        items = self._assert_query_count_does_not_grow()
+
+        self.assertTrue(all(item["schedule"] == {"status": "no_match"} for item in items))
+
+    def test_query_count_with_time_preferences(self):
+        """С предпочтениями по времени расписания всех кандидатов тоже собираются пакетно."""
+        self.client_profile.has_time_preferences = True
+        self.client_profile.preferred_slots = [
+            build_specialist_datetime(day=get_specialist_today() + timedelta(days=1), hour=10),
+        ]
+        self.client_profile.save()
+
+        items = self._assert_query_count_does_not_grow()
+
+        self.assertTrue(all(item["schedule"]["status"] == "matched" for item in items))
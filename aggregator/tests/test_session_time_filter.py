@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+
+from aggregator._web.services.basic_filter_catalog import (
+    extract_session_time_mode, filter_session_time)
+from calendar_engine.tests.helpers import (create_test_availability_exception,
+                                           create_test_availability_rule,
+                                           create_test_specialist,
+                                           get_specialist_today)
+from users.models import PsychologistProfile
+
+
+class NearestDaysSessionTimeFilterTests(TestCase):
+    """Режим "this_week" фильтра "Время сессии" ("Ближайшие 7 дней" в каталоге)."""
+
+    def setUp(self):
+        with override_settings(USE_MATERIALIZED_AVAILABILITY=True), self.captureOnCommitCallbacks(execute=True):
+            self.available_profile = create_test_specialist(email="available@example.com")
+            create_test_availability_rule(specialist_user=self.available_profile.user)
+
+            # Работает каждый день, но все ближайшие 7 дней (и сегодня) - выходные
+            self.busy_profile = create_test_specialist(email="busy@example.com")
+            busy_rule = create_test_availability_rule(specialist_user=self.busy_profile.user)
+            for day_offset in range(8):
+                create_test_availability_exception(
+                    rule=busy_rule,
+                    day=get_specialist_today() + timedelta(days=day_offset),
+                    exception_type="unavailable",
+                )
+
+    def _filter_profile_ids(self) -> set:
+        return set(
+            filter_session_time(
+                PsychologistProfile.objects.all(),
+                consultation_type="individual",
+                session_time_mode="this_week",
+                selected_session_slots=[],
+            ).values_list("pk", flat=True)
+        )
+
+    @override_settings(USE_MATERIALIZED_AVAILABILITY=True)
+    def test_filters_by_materialized_availability(self):
+        """Остаются только специалисты со свободным стартом в ближайшие DAYS_AHEAD_FOR_CLIENT дней."""
+        self.assertEqual(extract_session_time_mode("this_week"), "this_week")
+        self.assertEqual(self._filter_profile_ids(), {self.available_profile.pk})
+
+    @override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+    def test_mode_disabled_without_materialized_availability(self):
+        """Без материализованной доступности режим не предлагается и не считает расписания всего каталога."""
+        self.assertEqual(extract_session_time_mode("this_week"), "any")
+
+        with self.assertNumQueries(1):
+            profile_ids = self._filter_profile_ids()
+
+        self.assertEqual(profile_ids, {self.available_profile.pk, self.busy_profile.pk})
@@ -2,6 +2,10 @@ from rest_framework import serializers
 
 from calendar_engine.booking.use_cases.therapy_session_create import \
     CreateTherapySessionUseCase
+from calendar_engine.booking.use_cases.therapy_session_series_create import \
+    CreateTherapySessionSeriesUseCase
+from calendar_engine.constants import (FREQUENCY_RECURRENCE_CHOICES,
+                                       WEEKDAYS_CHOICES)
 from calendar_engine.models import (CalendarEvent, EventParticipant, TimeSlot,
                                     TimeSlotMessage)
 from users.constants import PREFERRED_TOPIC_TYPE_CHOICES
@@ -36,7 +40,44 @@ class CreateTherapySessionSerializer(serializers.Serializer):
         )
 
 
-# 2) Просмотр списка событий (используется вложенность сериализаторов)
+# 2) Создание серии встреч (повторяющиеся терапевтические сессии)
+
+class CreateTherapySessionSeriesSerializer(CreateTherapySessionSerializer):
+    """Класс-сериализатор для API-сценария создания серии встреч между клиентом и специалистом.
+
+    Тонкая HTTP-обертка над CreateTherapySessionSeriesUseCase: первый старт серии и формат консультации - как
+    у разовой встречи, плюс правило повторения. Бизнес-проверки правила (конечность серии, лимиты, дни недели)
+    выполняет сам use-case, чтобы они были одинаковыми для любого вызывающего слоя."""
+
+    frequency = serializers.ChoiceField(choices=FREQUENCY_RECURRENCE_CHOICES)
+    interval = serializers.IntegerField(min_value=1, default=1)
+    count_recurrences = serializers.IntegerField(min_value=1, allow_null=True, default=None)
+    rule_end = serializers.DateField(allow_null=True, default=None)
+    weekdays_recurrences = serializers.ListField(
+        child=serializers.ChoiceField(choices=WEEKDAYS_CHOICES),
+        allow_empty=True,
+        default=list,
+    )
+
+    def create(self, validated_data):
+        """Запускает CreateTherapySessionSeriesUseCase от имени текущего request.user."""
+        request = self.context["request"]
+        use_case = CreateTherapySessionSeriesUseCase()
+
+        return use_case.execute(
+            client_user=request.user,
+            specialist_profile_id=validated_data["specialist_profile_id"],
+            slot_start_iso=validated_data["slot_start_iso"],
+            consultation_type=validated_data["consultation_type"],
+            frequency=validated_data["frequency"],
+            interval=validated_data["interval"],
+            count_recurrences=validated_data["count_recurrences"],
+            rule_end=validated_data["rule_end"],
+            weekdays_recurrences=validated_data["weekdays_recurrences"] or None,
+        )
+
+
+# 3) Просмотр списка событий (используется вложенность сериализаторов)
 
 class EventSlotSerializer(serializers.ModelSerializer):
     """Получение СЛОТА(-ОВ) внутри события.
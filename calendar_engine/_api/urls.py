@@ -3,8 +3,10 @@ from django.urls import path
 from calendar_engine._api.views.availability import (
     AvailabilityExceptionDeactivateView, AvailabilityExceptionListCreateView,
     AvailabilityRuleDeactivateView, AvailabilityRuleListCreateView,
-    GetDomainSlotsAjaxView, GetSpecialistScheduleAjaxView)
-from calendar_engine._api.views.events import CalendarEventListCreateView
+    GetDomainSlotsAjaxView, GetSpecialistScheduleAjaxView,
+    GetSpecialistsSchedulesBatchAjaxView)
+from calendar_engine._api.views.events import (CalendarEventListCreateView,
+                                               CalendarEventSeriesCreateView)
 from calendar_engine.apps import AppCalendarConfig
 
 app_name = AppCalendarConfig.name
@@ -31,9 +33,15 @@ urlpatterns = [
 
     # Работа с событиями / слотами
     path("events/", CalendarEventListCreateView.as_view(), name="events-list-create"),
+    path("events/series/", CalendarEventSeriesCreateView.as_view(), name="events-series-create"),
 
     # AJAX-запрос (fetch) на создание и отображение временных слотов и расписания на html-страницах
     path("get-domain-slots/", GetDomainSlotsAjaxView.as_view(), name="get-domain-slots"),
+    path(
+        "psychologists/schedules/",
+        GetSpecialistsSchedulesBatchAjaxView.as_view(),
+        name="get-psychologists-schedules"
+    ),
     path(
         "psychologists/<int:profile_id>/schedule/",
         GetSpecialistScheduleAjaxView.as_view(),
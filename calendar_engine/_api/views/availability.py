@@ -15,11 +15,13 @@ from rest_framework.views import APIView
 
 from calendar_engine._api.serializers.availability import (
     AvailabilityExceptionSerializer, AvailabilityRuleSerializer)
-from calendar_engine.application.factories.generate_specialist_schedule_factory import \
-    build_generate_specialist_schedule_use_case
 from calendar_engine.application.use_cases.get_domain_slots_use_case import \
     GetDomainSlotsUseCase
+from calendar_engine.availability_snapshot.schedule_cache import (
+    get_specialist_schedule_slots, get_specialists_schedule_slots)
+from calendar_engine.constants import SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES
 from calendar_engine.models import AvailabilityException, AvailabilityRule
+from calendar_engine.services import get_local_date_for_user
 from core.services.anonymous_client_flow_for_search_and_booking import \
     build_guest_profile
 from users.models import PsychologistProfile
@@ -50,10 +52,6 @@ class AvailabilityRuleListCreateView(generics.ListCreateAPIView):
         """Возвращает правила доступности текущего пользователя. По умолчанию - только активное правило."""
         user = self.request.user
 
-        # Сначала архивируем правила и исключения пользователя, срок действия которых уже истек
-        AvailabilityRule.close_expired_for_user(user)
-        AvailabilityException.close_expired_for_user(user)
-
         include_archived = self.request.query_params.get("include_archived")
 
         queryset = (
@@ -63,7 +61,9 @@ class AvailabilityRuleListCreateView(generics.ListCreateAPIView):
         )
 
         if include_archived not in ("true", "1", "yes"):
-            queryset = queryset.filter(is_active=True)
+            # Правила с прошедшей датой окончания отсекаются прямо в запросе (без UPDATE на read-пути),
+            # а в архив их переводит команда close_expired_availability
+            queryset = queryset.filter(is_active=True).exclude(rule_end__lt=get_local_date_for_user(user))
 
         return queryset.order_by("-created_at")
 
@@ -102,14 +102,8 @@ class AvailabilityRuleDeactivateView(APIView):
         """Soft-delete для явного "закрытия" рабочего расписания специалиста: помечаем is_active=False."""
         user = request.user
 
-        # Сначала архивируем правила и исключения пользователя, срок действия которых уже истек
-        AvailabilityRule.close_expired_for_user(user)
-        AvailabilityException.close_expired_for_user(user)
-
-        rule = AvailabilityRule.objects.filter(
-            creator=user,
-            is_active=True,
-        ).first()
+        # Правило с прошедшей датой окончания уже считается неактивным, поэтому закрывать его вручную не нужно
+        rule = AvailabilityRule.active_for_user(user).first()
 
         if not rule:
             return Response(
@@ -142,10 +136,6 @@ class AvailabilityExceptionListCreateView(generics.ListCreateAPIView):
         """Возвращает исключения из рабочего расписания. По умолчанию - только активные исключения."""
         user = self.request.user
 
-        # Сначала архивируем правила и исключения пользователя, срок действия которых уже истек
-        AvailabilityRule.close_expired_for_user(user)
-        AvailabilityException.close_expired_for_user(user)
-
         include_archived = self.request.query_params.get("include_archived")
 
         queryset = (
@@ -156,7 +146,15 @@ class AvailabilityExceptionListCreateView(generics.ListCreateAPIView):
         )
 
         if include_archived not in ("true", "1", "yes"):
-            queryset = queryset.filter(rule__is_active=True, is_active=True)
+            # Исключения с прошедшей датой окончания и исключения просроченного правила отсекаются прямо в запросе
+            # (без UPDATE на read-пути), а в архив их переводит команда close_expired_availability
+            today = get_local_date_for_user(user)
+            queryset = (
+                queryset
+                .filter(rule__is_active=True, is_active=True)
+                .exclude(rule__rule_end__lt=today)
+                .exclude(exception_end__lt=today)
+            )
 
         return queryset.order_by("-created_at")
 
@@ -169,15 +167,8 @@ class AvailabilityExceptionListCreateView(generics.ListCreateAPIView):
             3) автоматически проставляет creator"""
         user = self.request.user
 
-        # Сначала архивируем правила и исключения пользователя, срок действия которых уже истек
-        AvailabilityRule.close_expired_for_user(user)
-        AvailabilityException.close_expired_for_user(user)
-
-        # Ищем существующее активное правило
-        rule = AvailabilityRule.objects.filter(
-            creator=user,
-            is_active=True,
-        ).first()
+        # Ищем существующее активное правило (правило с прошедшей датой окончания уже считается неактивным)
+        rule = AvailabilityRule.active_for_user(user).first()
 
         if not rule:
             raise NotFound(
@@ -208,10 +199,6 @@ class AvailabilityExceptionDeactivateView(APIView):
         """Soft-delete для явного "закрытия" исключения из рабочего расписания специалиста: is_active=False."""
         user = request.user
 
-        # Сначала архивируем правила и исключения пользователя, срок действия которых уже истек
-        AvailabilityRule.close_expired_for_user(user)
-        AvailabilityException.close_expired_for_user(user)
-
         exception = get_object_or_404(
             AvailabilityException,
             creator=user,
@@ -257,6 +244,74 @@ def _resolve_schedule_viewer_context(request) -> tuple[object, str | None]:
     return guest_profile.user, guest_profile.preferred_topic_type
 
 
+def _normalize_tz(tz_value):
+    """Безопасный fallback на 'timezone=None'.
+    Просто 'ZoneInfo(str(specialist_profile.user.timezone))' превратит None в 'None' и выбросит исключение.
+    Поэтому нужна безопасная ветка: если timezone None - fallback на now() без astimezone."""
+    if tz_value is None:
+        return None
+    if isinstance(tz_value, tzinfo):
+        return tz_value
+    return ZoneInfo(str(tz_value))
+
+
+def _build_viewer_schedule(schedule_slots, *, specialist_tz, viewer_tz, now_specialist) -> list[dict]:
+    """Переводит свободные слоты специалиста (из кэша, в TZ специалиста) в JSON-расписание в TZ viewer'а.
+
+    Общая часть одиночного и пакетного эндпоинтов расписания специалистов.
+    """
+    # Use-case генерирует слоты в TZ специалиста, но ответ должен быть в TZ текущего viewer'а.
+    # Изначально отправляется raw SlotDTO, так что клиент увидит время специалиста.
+    # Нужна конвертация: локализовать (day+start_time) в TZ специалиста и перевести в TZ viewer'а,
+    # затем отдать ISO/строку.
+    schedule = []
+    current_datetime = now()
+
+    for slot, bookable_until in schedule_slots:
+        # Слот мог быть рассчитан раньше (кэш), а с тех пор уже попасть в minimum notice специалиста
+        if bookable_until < current_datetime:
+            continue
+
+        if specialist_tz:
+            slot_start_spec = datetime.combine(slot.day, slot.start, tzinfo=specialist_tz)
+            slot_end_spec = datetime.combine(slot.day, slot.end, tzinfo=specialist_tz)
+        else:
+            slot_start_spec = datetime.combine(slot.day, slot.start)
+            slot_end_spec = datetime.combine(slot.day, slot.end)
+
+        # Если слот пересекает полночь (например, 23:00–00:00), конец нужно сдвигать на следующий день,
+        # так как 00:00 это уже +1
+        if slot.end <= slot.start:
+            slot_end_spec += timedelta(days=1)
+
+        if slot_start_spec < now_specialist:
+            continue
+
+        slot_start_client = (
+            slot_start_spec.astimezone(viewer_tz)
+            if viewer_tz
+            else slot_start_spec
+        )
+        slot_end_client = (
+            slot_end_spec.astimezone(viewer_tz)
+            if viewer_tz
+            else slot_end_spec
+        )
+
+        # schedule возвращает как SlotDTO, который не JSON‑serializable поэтому нужен перевод в ISO datetime
+        schedule.append(
+            {
+                "day": slot_start_client.date().isoformat(),
+                "start_time": slot_start_client.strftime("%H:%M"),
+                "end_time": slot_end_client.strftime("%H:%M"),
+                "start_iso": slot_start_client.isoformat(),
+                "end_iso": slot_end_client.isoformat(),
+            }
+        )
+
+    return schedule
+
+
 class GetDomainSlotsAjaxView(View):
     """Возвращает клиенту на UI все возможные доменные временные слоты (общее правило домена).
     Read-only эндпоинт только для показа возможных слотов на странице пользователя, без сохранения в БД.
@@ -338,29 +393,21 @@ class GetSpecialistScheduleAjaxView(View):
         # использовать get_object_or_404() и передавать именно объект дальше
         specialist_profile = get_object_or_404(PsychologistProfile, pk=profile_id)
 
-        def normalize_tz(tz_value):
-            """Безопасный fallback на 'timezone=None'.
-            Просто 'ZoneInfo(str(specialist_profile.user.timezone))' превратит None в 'None' и выбросит исключение.
-            Поэтому нужна безопасная ветка: если timezone None - fallback на now() без astimezone."""
-            if tz_value is None:
-                return None
-            if isinstance(tz_value, tzinfo):
-                return tz_value
-            return ZoneInfo(str(tz_value))
-
-        viewer_tz = normalize_tz(getattr(viewer_user, "timezone", None))
-        specialist_tz = normalize_tz(getattr(specialist_profile.user, "timezone", None)) or viewer_tz
+        viewer_tz = _normalize_tz(getattr(viewer_user, "timezone", None))
+        specialist_tz = _normalize_tz(getattr(specialist_profile.user, "timezone", None)) or viewer_tz
 
         if consultation_type not in ("individual", "couple"):
             consultation_type = preferred_consultation_type or "individual"
 
-        use_case = build_generate_specialist_schedule_use_case(
+        # Свободные слоты специалиста берутся из кэша (одинаковы для всех viewer'ов), а перевод в TZ viewer'а
+        # и отсечение "сгоревших" по времени слотов выполняются уже ниже, после кэша
+        schedule_slots = get_specialist_schedule_slots(
             specialist_profile=specialist_profile,
             consultation_type=consultation_type,
             exclude_event_ids=[exclude_event_id] if exclude_event_id else None,
         )
 
-        if use_case is None:
+        if schedule_slots is None:
             return JsonResponse(
                 {
                     "status": "ok",
@@ -370,8 +417,6 @@ class GetSpecialistScheduleAjaxView(View):
                 status=200,
             )
 
-        slots = use_case.execute()
-
         # ВАЖНО: кроме сгенерированного расписания нам необходимо передать на фронт еще текущее время
         # viewer'а (now_iso_client) и текущее время специалиста (now_iso_specialist), потому что определять
         # его по времени сервера неправильно. Так как viewer/специалист в настройках своего профиля
@@ -380,59 +425,111 @@ class GetSpecialistScheduleAjaxView(View):
         now_client = now().astimezone(viewer_tz) if viewer_tz else now()
         now_specialist = now().astimezone(specialist_tz) if specialist_tz else now()
 
-        # Use-case генерирует слоты в TZ специалиста, но ответ должен быть в TZ текущего viewer'а.
-        # Изначально отправляется raw SlotDTO, так что клиент увидит время специалиста.
-        # Нужна конвертация: локализовать (day+start_time) в TZ специалиста и перевести в TZ viewer'а,
-        # затем отдать ISO/строку.
-        schedule = []
-
-        for slot in slots:
-            if specialist_tz:
-                slot_start_spec = datetime.combine(slot.day, slot.start, tzinfo=specialist_tz)
-                slot_end_spec = datetime.combine(slot.day, slot.end, tzinfo=specialist_tz)
-            else:
-                slot_start_spec = datetime.combine(slot.day, slot.start)
-                slot_end_spec = datetime.combine(slot.day, slot.end)
-
-            # Если слот пересекает полночь (например, 23:00–00:00), конец нужно сдвигать на следующий день,
-            # так как 00:00 это уже +1
-            if slot.end <= slot.start:
-                slot_end_spec += timedelta(days=1)
-
-            if slot_start_spec < now_specialist:
-                continue
-
-            slot_start_client = (
-                slot_start_spec.astimezone(viewer_tz)
-                if viewer_tz
-                else slot_start_spec
+        schedule = _build_viewer_schedule(
+            schedule_slots,
+            specialist_tz=specialist_tz,
+            viewer_tz=viewer_tz,
+            now_specialist=now_specialist,
+        )
+        nearest_slot = schedule[0] if schedule else None
+
+        return JsonResponse(
+            {
+                "status": "ok",
+                "nearest_slot": nearest_slot,
+                "schedule": schedule,
+                "now_iso_client": now_client.isoformat(),
+                "now_iso_specialist": now_specialist.isoformat(),
+            },
+            status=200,
+        )
+
+
+class GetSpecialistsSchedulesBatchAjaxView(View):
+    """Возвращает viewer'у на UI расписания сразу нескольких специалистов одним запросом.
+
+    Зачем нужен:
+        - страница "Выбор психолога" и карточки каталога запрашивали расписание каждого специалиста отдельным
+          запросом к GetSpecialistScheduleAjaxView, т.е. N HTTP-запросов и N полных расчетов расписания;
+        - здесь расписания берутся из общего кэша пакетно, а для промахов правила, исключения и занятые слоты
+          всех специалистов читаются из БД фиксированным количеством запросов (get_specialists_schedule_slots()).
+
+    Query-параметры:
+        - profile_ids: id профилей специалистов через запятую (не больше SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES);
+        - consultation_type: individual / couple (как и в GetSpecialistScheduleAjaxView);
+        - nearest_only: "1" - вернуть только ближайший слот каждого специалиста (без полного расписания).
+
+    Все слоты ОТОБРАЖЕНЫ в TZ текущего viewer'а. Несуществующие профили в ответ не попадают.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Получить расписания (или только ближайшие слоты) нескольких специалистов в TZ текущего viewer'а."""
+        viewer_user, preferred_consultation_type = _resolve_schedule_viewer_context(request)
+
+        try:
+            profile_ids = list(
+                dict.fromkeys(
+                    int(value)
+                    for value in request.GET.get("profile_ids", "").split(",")
+                    if value.strip()
+                )
             )
-            slot_end_client = (
-                slot_end_spec.astimezone(viewer_tz)
-                if viewer_tz
-                else slot_end_spec
+        except ValueError:
+            return JsonResponse(
+                data={"status": "error", "error": "invalid_value"}, status=400
             )
 
-            # schedule возвращает как SlotDTO, который не JSON‑serializable поэтому нужен перевод в ISO datetime
-            schedule.append(
-                {
-                    "day": slot_start_client.date().isoformat(),
-                    "start_time": slot_start_client.strftime("%H:%M"),
-                    "end_time": slot_end_client.strftime("%H:%M"),
-                    "start_iso": slot_start_client.isoformat(),
-                    "end_iso": slot_end_client.isoformat(),
-                }
+        if not profile_ids or len(profile_ids) > SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES:
+            return JsonResponse(
+                data={"status": "error", "error": "invalid_value"}, status=400
             )
 
-        nearest_slot = schedule[0] if schedule else None
+        consultation_type = request.GET.get("consultation_type")
+        if consultation_type not in ("individual", "couple"):
+            consultation_type = preferred_consultation_type or "individual"
+
+        nearest_only = request.GET.get("nearest_only") in ("1", "true")
+
+        specialist_profiles = list(
+            PsychologistProfile.objects
+            .filter(pk__in=profile_ids)
+            .select_related("user")
+        )
+        schedule_slots_by_profile_id = get_specialists_schedule_slots(
+            specialist_profiles=specialist_profiles,
+            consultation_type=consultation_type,
+        )
+
+        viewer_tz = _normalize_tz(getattr(viewer_user, "timezone", None))
+        now_client = now().astimezone(viewer_tz) if viewer_tz else now()
+        schedules = {}
+
+        for specialist_profile in specialist_profiles:
+            schedule_slots = schedule_slots_by_profile_id.get(specialist_profile.pk)
+            specialist_tz = _normalize_tz(getattr(specialist_profile.user, "timezone", None)) or viewer_tz
+            now_specialist = now().astimezone(specialist_tz) if specialist_tz else now()
+
+            schedule = (
+                []
+                if schedule_slots is None
+                else _build_viewer_schedule(
+                    schedule_slots,
+                    specialist_tz=specialist_tz,
+                    viewer_tz=viewer_tz,
+                    now_specialist=now_specialist,
+                )
+            )
+
+            schedules[str(specialist_profile.pk)] = {
+                "nearest_slot": schedule[0] if schedule else None,
+                "schedule": [] if nearest_only else schedule,
+            }
 
         return JsonResponse(
             {
                 "status": "ok",
-                "nearest_slot": nearest_slot,
-                "schedule": schedule,
+                "schedules": schedules,
                 "now_iso_client": now_client.isoformat(),
-                "now_iso_specialist": now_specialist.isoformat(),
             },
             status=200,
         )
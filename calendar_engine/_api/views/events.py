@@ -4,7 +4,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from calendar_engine._api.serializers.events import (
-    CreateTherapySessionSerializer, EventListSerializer)
+    CreateTherapySessionSerializer, CreateTherapySessionSeriesSerializer,
+    EventListSerializer)
 from calendar_engine.booking.exceptions import CreateBookingValidationError
 from calendar_engine.booking.throttles import CreateTherapySessionThrottle
 from calendar_engine.lifecycle.use_cases.apply_time_based_status_transitions import \
@@ -120,3 +121,42 @@ class CalendarEventListCreateView(generics.ListCreateAPIView):
             },
             status=status.HTTP_201_CREATED,
         )
+
+
+class CalendarEventSeriesCreateView(generics.CreateAPIView):
+    """Класс-контроллер на основе Generic для создания клиентом серии встреч (повторяющиеся сессии).
+
+    POST (201_CREATED):
+        - создает одно событие серии (is_recurring=True), TimeSlot на каждое повторение и RecurrenceRule
+          через CreateTherapySessionSeriesUseCase;
+        - серия создается целиком или не создается вовсе: если хотя бы одна дата недоступна, возвращается
+          400 со списком недоступных дат.
+    Throttle тот же, что и у создания разовой встречи: серия тоже создает реальные встречи.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [CreateTherapySessionThrottle]
+    serializer_class = CreateTherapySessionSeriesSerializer
+
+    def create(self, request, *args, **kwargs):
+        """Создает серию встреч через CreateTherapySessionSeriesUseCase и возвращает ответ."""
+        serializer = self.get_serializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            booking_result = serializer.save()
+        except CreateBookingValidationError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "event_id": str(booking_result["event"].id),
+                "slot_ids": [str(slot.id) for slot in booking_result["slots"]],
+                "recurrence_rule_id": booking_result["recurrence_rule"].id,
+                "status": booking_result["event"].status,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -5,7 +5,9 @@ from calendar_engine.models import (AvailabilityException,
                                     AvailabilityRule,
                                     AvailabilityRuleTimeWindow, CalendarEvent,
                                     EventParticipant, RecurrenceRule,
-                                    SlotParticipant, TimeSlot, TimeSlotMessage)
+                                    SlotParticipant, SpecialistAvailableSlot,
+                                    SpecialistNearestAvailableStart, TimeSlot,
+                                    TimeSlotMessage)
 
 # =====
 # СОБЫТИЕ / СЛОТЫ
@@ -302,3 +304,34 @@ class AvailabilityExceptionAdmin(CreatorAndReadonlyFields):
     search_fields = ("rule__creator__email", "creator__email", "creator__last_name")
     ordering = ("creator__email", "-created_at")
     inlines = (ExceptionTimeWindowInline,)
+
+
+# =====
+# МАТЕРИАЛИЗОВАННАЯ ДОСТУПНОСТЬ
+# =====
+
+
+@admin.register(SpecialistAvailableSlot)
+class SpecialistAvailableSlotAdmin(admin.ModelAdmin):
+    """Настройка отображения модели SpecialistAvailableSlot в админке (только просмотр, данные пересобираются
+    автоматически)."""
+
+    list_display = ("id", "specialist", "consultation_type", "start_datetime", "end_datetime", "bookable_until")
+    list_filter = ("consultation_type",)
+    search_fields = ("specialist__email", "specialist__last_name")
+    ordering = ("specialist__email", "start_datetime")
+    readonly_fields = ("specialist", "consultation_type", "start_datetime", "end_datetime", "bookable_until",
+                       "created_at", "updated_at")
+
+
+@admin.register(SpecialistNearestAvailableStart)
+class SpecialistNearestAvailableStartAdmin(admin.ModelAdmin):
+    """Настройка отображения модели SpecialistNearestAvailableStart в админке (только просмотр, данные
+    пересобираются автоматически)."""
+
+    list_display = ("id", "specialist", "consultation_type", "nearest_available_start", "bookable_until")
+    list_filter = ("consultation_type",)
+    search_fields = ("specialist__email", "specialist__last_name")
+    ordering = ("consultation_type", "nearest_available_start")
+    readonly_fields = ("specialist", "consultation_type", "nearest_available_start", "bookable_until",
+                       "created_at", "updated_at")
@@ -0,0 +1,76 @@
+from datetime import datetime, tzinfo
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+from calendar_engine.application.factories.generate_specialist_schedule_factory import \
+    build_specialist_schedule_runtime_contexts
+from calendar_engine.application.use_cases.find_available_specialists import \
+    FindAvailableSpecialistsUseCase
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+
+
+def _get_specialist_tz(profile) -> tzinfo | None:
+    """Возвращает timezone специалиста как tzinfo (или None, если timezone не указан)."""
+    specialist_tz_value = getattr(profile.user, "timezone", None)
+
+    if isinstance(specialist_tz_value, str):
+        return ZoneInfo(specialist_tz_value)
+    if isinstance(specialist_tz_value, tzinfo):
+        return specialist_tz_value
+
+    return None
+
+
+def build_find_available_specialists_use_case(
+    *,
+    specialist_profiles,
+    consultation_type: str = "individual",
+    selected_slots: Iterable[datetime],
+) -> FindAvailableSpecialistsUseCase:
+    """Собирает use-case пакетного поиска специалистов, свободных в выбранные клиентом старты.
+
+    Что делает factory:
+        1) пакетно (фиксированным количеством запросов) собирает runtime-context расписаний всех специалистов;
+        2) для каждого специалиста собирает GenerateSpecialistScheduleUseCase;
+        3) переводит выбранные клиентом слоты в TZ каждого специалиста и превращает их в ключи (day, start_time);
+        4) возвращает готовый FindAvailableSpecialistsUseCase.
+
+    :param specialist_profiles: Итерируемый набор PsychologistProfile.
+    :param consultation_type: Тип консультации ("individual" / "couple").
+    :param selected_slots: Выбранные клиентом слоты (aware datetime).
+    """
+    specialist_profiles = list(specialist_profiles)
+    selected_slots = list(selected_slots)
+
+    runtime_contexts = build_specialist_schedule_runtime_contexts(
+        specialist_profiles=specialist_profiles,
+        consultation_type=consultation_type,
+    )
+
+    schedule_use_cases = {}
+    slot_keys_by_profile_id = {}
+
+    for profile in specialist_profiles:
+        runtime_context = runtime_contexts.get(profile.pk)
+        if runtime_context is None:
+            continue
+
+        schedule_use_cases[profile.pk] = GenerateSpecialistScheduleUseCase(**runtime_context)
+
+        # Переводим выбранные клиентом слоты в TZ специалиста, потому что расписание специалиста
+        # строится именно в его локальном времени
+        specialist_tz = _get_specialist_tz(profile)
+        normalized_selected_slot_keys = set()
+        for selected_dt in selected_slots:
+            localized_dt = selected_dt.astimezone(specialist_tz) if specialist_tz else selected_dt
+            normalized_selected_slot_keys.add(
+                (localized_dt.date(), localized_dt.time().replace(second=0, microsecond=0))
+            )
+
+        slot_keys_by_profile_id[profile.pk] = normalized_selected_slot_keys
+
+    return FindAvailableSpecialistsUseCase(
+        schedule_use_cases=schedule_use_cases,
+        slot_keys_by_profile_id=slot_keys_by_profile_id,
+    )
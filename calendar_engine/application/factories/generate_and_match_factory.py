@@ -1,5 +1,5 @@
 from datetime import date, time, tzinfo
-from typing import Iterable, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from calendar_engine.application.mappers.exception_mapper import \
@@ -11,6 +11,7 @@ from calendar_engine.domain.availability.get_user_slots import \
     AvailabilitySlotFilter
 from calendar_engine.domain.matching.matcher import SelectedSlotsMatcher
 from calendar_engine.models import AvailabilityException, AvailabilityRule
+from calendar_engine.services import get_local_date_for_user
 
 # Тип ключа выбранного пользователем доменного слота: (day, start_time)
 # matcher работает ТОЛЬКО с этим типом
@@ -47,30 +48,42 @@ def build_generate_and_match_use_case(
         - FilterAndMatchSlotsUseCase - если у специалиста есть активное правило доступности;
         - None - если правило отсутствует (специалист недоступен)."""
 
-    # Перед проверкой выбранных слотов закрываем устаревшие правила и исключения
-    AvailabilityRule.close_expired_for_user(psychologist)
-    AvailabilityException.close_expired_for_user(psychologist)
-
-    # 1) Получаем активное правило доступности специалиста
-    rule = (
-        AvailabilityRule.objects
-        .filter(
-            creator=psychologist,
-            is_active=True,
-        )
-        .first()
-    )
+    # 1) Получаем активное правило доступности специалиста.
+    # Устаревшие правила и исключения отсекаются прямо в запросе (без UPDATE на read-пути),
+    # а в архив их переводит команда close_expired_availability
+    today = get_local_date_for_user(psychologist)
+    rule = AvailabilityRule.active_for_user(psychologist).first()
 
     if rule is None:
         # Без активного правила специалист считается недоступным
         return None
 
-    # 2) Получаем все активные исключения для этого правила
-    exceptions = AvailabilityException.objects.filter(
+    # 2) Получаем все активные исключения для этого правила (окна исключений сразу одним запросом)
+    exceptions = AvailabilityException.active_for_rule(rule, today=today).prefetch_related("time_windows")
+
+    return _assemble_generate_and_match_use_case(
         rule=rule,
-        is_active=True,
+        exceptions=exceptions,
+        selected_slots=selected_slots,
     )
 
+
+def _assemble_generate_and_match_use_case(
+    *,
+    rule: AvailabilityRule,
+    exceptions: Iterable[AvailabilityException],
+    selected_slots: Iterable,
+) -> Optional[FilterAndMatchSlotsUseCase]:
+    """Собирает FilterAndMatchSlotsUseCase из уже загруженных правила и исключений специалиста.
+
+    Общая часть для одиночного (build_generate_and_match_use_case) и пакетного
+    (build_generate_and_match_use_cases) сценариев, чтобы трактовка рабочих окон, timezone и периода
+    действия правила не расходилась между ними.
+
+    :return:
+        - FilterAndMatchSlotsUseCase - если хотя бы один выбранный слот попадает в период действия правила;
+        - None - если проверять уже нечего.
+    """
     # 3) Адаптация Django-моделей → доменные объекты
     domain_rule = map_rule_to_domain(rule)
     domain_exceptions = map_exceptions_to_domain(exceptions)
@@ -132,3 +145,93 @@ def build_generate_and_match_use_case(
         slot_filter=slot_filter,
         matcher=matcher,
     )
+
+
+def build_generate_and_match_use_cases(
+    *,
+    psychologists: Iterable,
+    selected_slots: Iterable,  # iterable[datetime] (aware)
+) -> Dict[int, FilterAndMatchSlotsUseCase]:
+    """Пакетная версия build_generate_and_match_use_case() для сразу многих специалистов (агрегатор/matching).
+
+    Зачем нужна:
+        - одиночная factory на каждого специалиста делает отдельные запросы за правилом, окнами правила,
+          исключениями и окнами исключений, т.е. в цикле по кандидатам это 4 * N запросов на каждое изменение
+          предпочтений клиента в wizard-е подбора;
+        - здесь все правила (с окнами) и все исключения (с окнами) кандидатов читаются фиксированным количеством
+          запросов, а use-case каждого специалиста собирается в памяти той же функцией, что и в одиночном сценарии.
+
+    Важно:
+        - просроченные правила и исключения (rule_end / exception_end < "сегодня" в TZ специалиста) трактуются
+          как неактивные прямо при чтении - так же, как AvailabilityRule.active_for_user() и
+          AvailabilityException.active_for_rule() в одиночном сценарии;
+        - из нескольких действующих правил специалиста выбирается правило с наименьшим pk (как .first()).
+
+    :param psychologists: Итерируемый набор пользователей-специалистов (AppUser).
+    :param selected_slots: Доменные временные слоты, выбранные клиентом.
+    :return: Словарь вида {user_id: FilterAndMatchSlotsUseCase}. Специалисты без use-case в него не попадают.
+    """
+    psychologists_by_id = {psychologist.pk: psychologist for psychologist in psychologists}
+    if not psychologists_by_id:
+        return {}
+
+    # selected_slots проходим для каждого специалиста, поэтому материализуем их один раз
+    selected_slots = list(selected_slots)
+
+    # 1) Все активные правила кандидатов с окнами (2 запроса), по порядку pk - как в .first() одиночного сценария
+    rules_by_user_id: Dict[int, list] = {}
+    for rule in (
+        AvailabilityRule.objects
+        .filter(creator_id__in=psychologists_by_id.keys(), is_active=True)
+        .prefetch_related("time_windows")
+        .order_by("pk")
+    ):
+        rules_by_user_id.setdefault(rule.creator_id, []).append(rule)
+
+    # 2) Для каждого специалиста выбираем первое не просроченное правило
+    chosen_rules = {}
+    today_by_user_id = {}
+    for user_id, rules in rules_by_user_id.items():
+        today = get_local_date_for_user(psychologists_by_id[user_id])
+        rule = next(
+            (
+                candidate_rule
+                for candidate_rule in rules
+                if not (candidate_rule.rule_end and candidate_rule.rule_end < today)
+            ),
+            None,
+        )
+        if rule is not None:
+            chosen_rules[user_id] = rule
+            today_by_user_id[user_id] = today
+
+    if not chosen_rules:
+        return {}
+
+    # 3) Все активные исключения выбранных правил с окнами (2 запроса)
+    exceptions_by_rule_id: Dict[int, list] = {}
+    for exception in (
+        AvailabilityException.objects
+        .filter(rule_id__in=[rule.pk for rule in chosen_rules.values()], is_active=True)
+        .prefetch_related("time_windows")
+        .order_by("pk")
+    ):
+        exceptions_by_rule_id.setdefault(exception.rule_id, []).append(exception)
+
+    # 4) Сборка use-case каждого специалиста в памяти
+    use_cases = {}
+    for user_id, rule in chosen_rules.items():
+        exceptions = [
+            exception
+            for exception in exceptions_by_rule_id.get(rule.pk, [])
+            if exception.exception_end >= today_by_user_id[user_id]
+        ]
+        use_case = _assemble_generate_and_match_use_case(
+            rule=rule,
+            exceptions=exceptions,
+            selected_slots=selected_slots,
+        )
+        if use_case is not None:
+            use_cases[user_id] = use_case
+
+    return use_cases
@@ -14,7 +14,9 @@ from calendar_engine.domain.availability.domain_slot_generator import \
 from calendar_engine.domain.availability.get_user_slots import \
     AvailabilitySlotFilter
 from calendar_engine.models import (AvailabilityException, AvailabilityRule,
-                                    TimeSlot)
+                                    SlotParticipant, TimeSlot)
+from calendar_engine.services import get_local_date_for_user
+from core.profiling.metrics import phase_timer
 from users.models import PsychologistProfile
 
 
@@ -121,77 +123,62 @@ def _build_all_override_maps(*, rule, exceptions, consultation_type: str) -> dic
     }
 
 
-def _build_specialist_busy_intervals(
-    *,
-    specialist_profile: PsychologistProfile,
-    specialist_tz,
-    rule,
-    exceptions,
-    exclude_event_ids=None,
-) -> list[tuple[datetime, datetime]]:
-    """Строит список уже занятых интервалов специалиста. Т.е., функция нужна для одной конкретной задачи:
-    “Определить какие уже существующие встречи специалиста должны сделать часть доменных стартов (слотов)
-    недоступными в его расписании”
+def _get_current_specialist_time(specialist_profile: PsychologistProfile) -> datetime:
+    """Возвращает текущее время в timezone СПЕЦИАЛИСТА, где astimezone(self.timezone) - это метод, который
+    говорит: "И пересчитай это время для данного часового пояса".
 
-    Важно:
-        - TimeSlot хранит только чистое время сессии;
-        - TimeSlot.end_datetime хранит только чистое окончание сессии;
-        - но для доступности нам нужен не только конец сессии, а конец занятого интервала.
-          Занятый интервал = end_datetime + break_between_sessions;
-        - для блокировки следующих доменных стартов, нам нужно дополнительно прибавить break_between_sessions к
-          продолжительности сессии, чтоб определить сколько доменных слотов необходимо выделить под это
-          (например, если сессия у специалиста =50 мин и перерыв между =30 мин, то это занимает 2 слота, а не один).
+    Если timezone у специалиста не указан, то используем текущее время сервера (aware datetime).
+    """
+    specialist_timezone = getattr(specialist_profile.user, "timezone", None)
+    if specialist_timezone:
+        specialist_tz = ZoneInfo(str(specialist_timezone))
+        return now().astimezone(specialist_tz)
 
-    Т.е., функция НЕ считает новые слоты, а считает уже существующую занятость специалиста в виде списка интервалов:
-        [
-            (busy_start_1, busy_end_1),
-            (busy_start_2, busy_end_2),
-            ...
-        ]
-    А потом GenerateSpecialistScheduleUseCase проверяет:
-        если новый доменный старт (слот) пересекается с любым таким busy interval, значит этот старт (слот)
-        нельзя показывать как доступный.
+    return now()
+
+
+def _get_busy_intervals_horizon(specialist_tz) -> tuple[datetime, datetime]:
+    """Возвращает границы периода (start, end), за который нужно читать из БД уже существующие встречи специалиста.
+
+    Ограничиваем горизонт чтения БД только тем периодом, который реально влияет на UI отображаемое расписание,
+    т.е., в карточке специалиста в блоке "Расписание" мы устанавливаем настройку DAYS_AHEAD_FOR_SHOW_SCHEDULE = 9,
+    значит не нужно тянуть из БД всю историю сессий специалиста без пользы, а достаточно только для этих 9 дней.
     """
-    # 1) Ограничиваем горизонт чтения БД только тем периодом, который реально влияет на UI отображаемое расписание,
-    # т.е., в карточке специалиста в блоке "Расписание" мы устанавливаем настройку DAYS_AHEAD_FOR_SHOW_SCHEDULE = 9,
-    # значит не нужно тянуть из БД всю историю сессий специалиста без пользы, а достаточно только для этих 9 дней
-    schedule_horizon_end = datetime.combine(
-        now().astimezone(specialist_tz).date() + timedelta(days=DAYS_AHEAD_FOR_SHOW_SCHEDULE + 1),
+    today_for_specialist = now().astimezone(specialist_tz).date()
+    schedule_horizon_start = datetime.combine(
+        today_for_specialist - timedelta(days=1),
         time(0, 0),
         tzinfo=specialist_tz,
     )
-    schedule_horizon_start = datetime.combine(
-        now().astimezone(specialist_tz).date() - timedelta(days=1),
+    schedule_horizon_end = datetime.combine(
+        today_for_specialist + timedelta(days=DAYS_AHEAD_FOR_SHOW_SCHEDULE + 1),
         time(0, 0),
         tzinfo=specialist_tz,
     )
-    # 2) Получаем готовый словарь override_break_between_sessions по дням
+
+    return schedule_horizon_start, schedule_horizon_end
+
+
+def _build_busy_intervals_from_slot_ranges(
+    *,
+    slot_ranges,
+    specialist_tz,
+    rule,
+    exceptions,
+) -> list[tuple[datetime, datetime]]:
+    """Превращает уже загруженные из БД интервалы встреч специалиста (start_datetime, end_datetime)
+    в busy intervals с учетом break_between_sessions.
+
+    Вынесено отдельно от чтения БД, чтобы одну и ту же трактовку busy intervals использовали:
+        - расчет расписания одного специалиста (_build_specialist_busy_intervals);
+        - пакетный расчет расписаний сразу для множества специалистов (build_specialist_schedule_runtime_contexts).
+    """
+    # 1) Получаем готовый словарь override_break_between_sessions по дням
     override_break_between_sessions_minutes_by_day = _build_override_break_between_sessions_by_day(
         exceptions=exceptions,
     )
 
-    # 3) Берем только реальные активные слоты специалиста, которые уже занимают его календарь. Поэтому
-    # события "completed"/"cancelled" здесь не нужны, потому что они не должны блокировать доменные слоты
-    specialist_slots = (
-        TimeSlot.objects.filter(
-            status__in=["planned", "started"],
-            slot_participants__user=specialist_profile.user,
-            start_datetime__gte=schedule_horizon_start,
-            start_datetime__lt=schedule_horizon_end,
-        )
-        .distinct()
-        .order_by("start_datetime")
-    )
-
-    # Когда клиент открывает модалку “Перенести встречу”, фронт запрашивает у backend доступные слоты специалиста.
-    # Но есть нюанс:
-    # - старая встреча еще существует в БД и она уже занимает время у специалиста;
-    # - если просто построить расписание "как есть", backend посчитает, что это время занято и старая встреча
-    # начнет блокировать перенос сама на себя
-    if exclude_event_ids:
-        specialist_slots = specialist_slots.exclude(event_id__in=exclude_event_ids)
-
-    # 4) Собираем итоговые busy intervals специалиста.
+    # 2) Собираем итоговые busy intervals специалиста.
     # Это не "новые слоты", а именно интервалы занятого времени, которые потом нужны только для того,
     # чтобы скрыть конфликтующие доменные старты в UI-расписании.
     # busy_interval для специалиста считается как интервал:
@@ -199,12 +186,12 @@ def _build_specialist_busy_intervals(
     # - до slot.end_datetime + break_between_sessions_minutes
     busy_intervals = []
 
-    for slot in specialist_slots:
+    for start_datetime, end_datetime in slot_ranges:
         # Переводим slot в timezone специалиста, потому что:
         # 1) override_break_between_sessions определяется по локальному дню специалиста;
         # 2) все дальнейшие сравнения в расписании потом тоже идут в TZ специалиста.
-        slot_start_datetime = slot.start_datetime.astimezone(specialist_tz)
-        slot_end_datetime = slot.end_datetime.astimezone(specialist_tz)
+        slot_start_datetime = start_datetime.astimezone(specialist_tz)
+        slot_end_datetime = end_datetime.astimezone(specialist_tz)
         slot_day = slot_start_datetime.date()
 
         # Если на этот день есть override_break_between_sessions - берем его.
@@ -227,67 +214,75 @@ def _build_specialist_busy_intervals(
     return busy_intervals
 
 
-def build_specialist_schedule_runtime_context(
+def _build_specialist_busy_intervals(
     *,
     specialist_profile: PsychologistProfile,
-    consultation_type: str = "individual",
+    specialist_tz,
+    rule,
+    exceptions,
     exclude_event_ids=None,
-) -> dict | None:
-    """Собирает единый runtime-context для availability и booking логики специалиста.
+) -> list[tuple[datetime, datetime]]:
+    """Строит список уже занятых интервалов специалиста. Т.е., функция нужна для одной конкретной задачи:
+    “Определить какие уже существующие встречи специалиста должны сделать часть доменных стартов (слотов)
+    недоступными в его расписании”
 
-    Почему это отдельная функция, а не сразу в build_generate_specialist_schedule_use_case()?
-        - и read-only расписание (просто отображение доступных слотов в детальной карточке специалиста в "Расписание")
-          и booking (функционал бронирования и создания событий) должны опираться на одну и ту же трактовку
-          duration / break / overrides / уже существующих броней;
-        - если собирать эти данные в двух местах, которые по сути идентичны, то в availability и booking
-          возникнет риск расхождения.
-    """
-    if consultation_type not in ("individual", "couple"):
-        raise ValueError("consultation_type должен быть либо 'individual', либо 'couple'")
+    Важно:
+        - TimeSlot хранит только чистое время сессии;
+        - TimeSlot.end_datetime хранит только чистое окончание сессии;
+        - но для доступности нам нужен не только конец сессии, а конец занятого интервала.
+          Занятый интервал = end_datetime + break_between_sessions;
+        - для блокировки следующих доменных стартов, нам нужно дополнительно прибавить break_between_sessions к
+          продолжительности сессии, чтоб определить сколько доменных слотов необходимо выделить под это
+          (например, если сессия у специалиста =50 мин и перерыв между =30 мин, то это занимает 2 слота, а не один).
 
-    # Перед генерацией убираем из активных записей все правила/исключения, срок которых уже прошел
-    AvailabilityRule.close_expired_for_user(specialist_profile.user)
-    AvailabilityException.close_expired_for_user(specialist_profile.user)
+    Т.е., функция НЕ считает новые слоты, а считает уже существующую занятость специалиста в виде списка интервалов:
+        [
+            (busy_start_1, busy_end_1),
+            (busy_start_2, busy_end_2),
+            ...
+        ]
+    А потом GenerateSpecialistScheduleUseCase проверяет:
+        если новый доменный старт (слот) пересекается с любым таким busy interval, значит этот старт (слот)
+        нельзя показывать как доступный.
+    """
+    # 1) Ограничиваем горизонт чтения БД только тем периодом, который реально влияет на UI отображаемое расписание
+    schedule_horizon_start, schedule_horizon_end = _get_busy_intervals_horizon(specialist_tz)
 
-    # 1) Получаем активное правило доступности специалиста
-    rule = (
-        AvailabilityRule.objects
-        .filter(
-            creator=specialist_profile.user,
-            is_active=True,
+    # 2) Берем только реальные активные слоты специалиста, которые уже занимают его календарь. Поэтому
+    # события "completed"/"cancelled" здесь не нужны, потому что они не должны блокировать доменные слоты
+    specialist_slots = (
+        TimeSlot.objects.filter(
+            status__in=["planned", "started"],
+            slot_participants__user=specialist_profile.user,
+            start_datetime__gte=schedule_horizon_start,
+            start_datetime__lt=schedule_horizon_end,
         )
-        .first()
+        .distinct()
+        .order_by("start_datetime")
     )
 
-    # Без активного правила специалист считается недоступным
-    if rule is None:
-        return None
+    # Когда клиент открывает модалку “Перенести встречу”, фронт запрашивает у backend доступные слоты специалиста.
+    # Но есть нюанс:
+    # - старая встреча еще существует в БД и она уже занимает время у специалиста;
+    # - если просто построить расписание "как есть", backend посчитает, что это время занято и старая встреча
+    # начнет блокировать перенос сама на себя
+    if exclude_event_ids:
+        specialist_slots = specialist_slots.exclude(event_id__in=exclude_event_ids)
 
-    # 2) Получаем все активные исключения для этого правила
-    exceptions = AvailabilityException.objects.filter(
+    # 3) Собираем итоговые busy intervals специалиста
+    return _build_busy_intervals_from_slot_ranges(
+        slot_ranges=specialist_slots.values_list("start_datetime", "end_datetime"),
+        specialist_tz=specialist_tz,
         rule=rule,
-        is_active=True,
+        exceptions=exceptions,
     )
 
-    # 3) Адаптируем Django-модели → доменные объекты
-    domain_rule = map_rule_to_domain(rule)
-    domain_exceptions = map_exceptions_to_domain(exceptions)
 
-    # 4) Фильтруем все возможные доменные слоты по индивидуальным правилам доступности специалиста
-    slot_filter = AvailabilitySlotFilter(
-        rule=domain_rule,
-        exceptions=domain_exceptions,
-    )
-
-    # 5) Определяем дату старта генерации В timezone СПЕЦИАЛИСТА, где astimezone(self.timezone) - это метод, который
-    # говорит: "И пересчитай это время для данного часового пояса".
-    specialist_timezone = getattr(specialist_profile.user, "timezone", None)
-    if specialist_timezone:
-        specialist_tz = ZoneInfo(str(specialist_timezone))
-        current_specialist_time = now().astimezone(specialist_tz)
-    else:
-        current_specialist_time = now()
+def _resolve_schedule_period(*, rule, current_specialist_time: datetime) -> tuple[date, int] | None:
+    """Определяет период показа расписания специалиста: (date_from, days_ahead).
 
+    Возвращает None, если рабочих дней впереди уже не осталось и специалист сейчас недоступен.
+    """
     # Старт показа расписания зависит сразу от двух факторов:
     # 1) "сегодня" в timezone специалиста;
     # 2) дата начала самого рабочего правила.
@@ -314,7 +309,35 @@ def build_specialist_schedule_runtime_context(
         if days_ahead <= 0:
             return None
 
-    # 6) Собираем словари override-параметров из AvailabilityException по конкретным дням
+    return date_from, days_ahead
+
+
+def _assemble_runtime_context(
+    *,
+    rule,
+    exceptions,
+    consultation_type: str,
+    date_from: date,
+    days_ahead: int,
+    current_specialist_time: datetime,
+    busy_intervals: list[tuple[datetime, datetime]],
+) -> dict:
+    """Собирает итоговый runtime-context из уже загруженных правила, исключений и busy intervals специалиста.
+
+    Общая точка сборки для одиночного (build_specialist_schedule_runtime_context) и пакетного
+    (build_specialist_schedule_runtime_contexts) сценариев, чтобы они не могли разойтись в трактовке данных.
+    """
+    # 1) Адаптируем Django-модели → доменные объекты
+    domain_rule = map_rule_to_domain(rule)
+    domain_exceptions = map_exceptions_to_domain(exceptions)
+
+    # 2) Фильтруем все возможные доменные слоты по индивидуальным правилам доступности специалиста
+    slot_filter = AvailabilitySlotFilter(
+        rule=domain_rule,
+        exceptions=domain_exceptions,
+    )
+
+    # 3) Собираем словари override-параметров из AvailabilityException по конкретным дням
     # и base-параметры из AvailabilityRule.
     # Это нужно для сценария, когда специалист на общий период работает по одному правилу, но на отдельные
     # даты хочет показывать ближайшие слоты только за другое количество часов до старта.
@@ -323,15 +346,8 @@ def build_specialist_schedule_runtime_context(
         exceptions=exceptions,
         consultation_type=consultation_type,
     )
-    busy_intervals = _build_specialist_busy_intervals(
-        specialist_profile=specialist_profile,
-        specialist_tz=current_specialist_time.tzinfo,
-        rule=rule,
-        exceptions=exceptions,
-        exclude_event_ids=exclude_event_ids,
-    )
 
-    # 7) Генератор доменных слотов
+    # 4) Генератор доменных слотов
     slot_generator = DomainSlotGenerator()
 
     return {
@@ -345,6 +361,442 @@ def build_specialist_schedule_runtime_context(
     }
 
 
+@phase_timer("calendar.runtime_context")
+def build_specialist_schedule_runtime_context(
+    *,
+    specialist_profile: PsychologistProfile,
+    consultation_type: str = "individual",
+    exclude_event_ids=None,
+) -> dict | None:
+    """Собирает единый runtime-context для availability и booking логики специалиста.
+
+    Почему это отдельная функция, а не сразу в build_generate_specialist_schedule_use_case()?
+        - и read-only расписание (просто отображение доступных слотов в детальной карточке специалиста в "Расписание")
+          и booking (функционал бронирования и создания событий) должны опираться на одну и ту же трактовку
+          duration / break / overrides / уже существующих броней;
+        - если собирать эти данные в двух местах, которые по сути идентичны, то в availability и booking
+          возникнет риск расхождения.
+    """
+    if consultation_type not in ("individual", "couple"):
+        raise ValueError("consultation_type должен быть либо 'individual', либо 'couple'")
+
+    # 1) Получаем активное правило доступности специалиста.
+    # Правила/исключения с прошедшей датой окончания отсекаются прямо в запросе (без UPDATE на read-пути),
+    # а в архив их переводит команда close_expired_availability
+    today = get_local_date_for_user(specialist_profile.user)
+    rule = AvailabilityRule.active_for_user(specialist_profile.user).first()
+
+    # Без активного правила специалист считается недоступным
+    if rule is None:
+        return None
+
+    # 2) Определяем период показа расписания в timezone СПЕЦИАЛИСТА
+    current_specialist_time = _get_current_specialist_time(specialist_profile)
+    schedule_period = _resolve_schedule_period(
+        rule=rule,
+        current_specialist_time=current_specialist_time,
+    )
+    if schedule_period is None:
+        return None
+
+    date_from, days_ahead = schedule_period
+
+    # 3) Получаем все активные исключения для этого правила (окна исключений сразу одним запросом)
+    exceptions = AvailabilityException.active_for_rule(rule, today=today).prefetch_related("time_windows")
+
+    # 4) Получаем уже существующую занятость специалиста
+    busy_intervals = _build_specialist_busy_intervals(
+        specialist_profile=specialist_profile,
+        specialist_tz=current_specialist_time.tzinfo,
+        rule=rule,
+        exceptions=exceptions,
+        exclude_event_ids=exclude_event_ids,
+    )
+
+    return _assemble_runtime_context(
+        rule=rule,
+        exceptions=exceptions,
+        consultation_type=consultation_type,
+        date_from=date_from,
+        days_ahead=days_ahead,
+        current_specialist_time=current_specialist_time,
+        busy_intervals=busy_intervals,
+    )
+
+
+def _build_candidate_busy_intervals(
+    *,
+    specialist_profile: PsychologistProfile,
+    specialist_tz,
+    rule,
+    exceptions,
+    consultation_type: str,
+    candidate_start: datetime,
+    last_candidate_start: datetime | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """Строит busy intervals специалиста, которые могут пересечься с кандидатами на бронирование
+    от candidate_start до last_candidate_start (для одного кандидата - только с ним самим).
+
+    В отличие от _build_specialist_busy_intervals() здесь из БД читается не вся занятость на горизонт расписания,
+    а только встречи, попадающие в узкий диапазон вокруг кандидатов (range-запрос по start/end_datetime):
+        - встреча должна начаться раньше, чем закончится последний кандидат вместе с перерывом специалиста;
+        - и закончиться позже, чем за "максимальный перерыв" до старта первого кандидата (перерыв после уже
+          существующей встречи тоже блокирует следующие старты);
+        - нижняя граница по start_datetime (сутки до кандидата) нужна только, чтобы запрос шел по индексу,
+          т.к. сессия не может длиться дольше суток.
+    Итоговая проверка пересечения выполняется use-case так же, как в полном расписании.
+    """
+    last_candidate_start = last_candidate_start or candidate_start
+    candidate_day = last_candidate_start.date()
+    override_maps = _build_all_override_maps(
+        rule=rule,
+        exceptions=exceptions,
+        consultation_type=consultation_type,
+    )
+    candidate_busy_end = last_candidate_start + timedelta(
+        minutes=(
+            override_maps["override_session_duration_minutes_by_day"].get(
+                candidate_day,
+                override_maps["session_duration_minutes"],
+            )
+            + override_maps["override_break_between_sessions_minutes_by_day"].get(
+                candidate_day,
+                override_maps["break_between_sessions_minutes"],
+            )
+        )
+    )
+    max_break_between_sessions_minutes = max(
+        [
+            override_maps["break_between_sessions_minutes"],
+            *override_maps["override_break_between_sessions_minutes_by_day"].values(),
+        ]
+    )
+
+    specialist_slots = (
+        TimeSlot.objects.filter(
+            status__in=["planned", "started"],
+            slot_participants__user=specialist_profile.user,
+            start_datetime__gte=candidate_start - timedelta(days=1),
+            start_datetime__lt=candidate_busy_end,
+            end_datetime__gt=candidate_start - timedelta(minutes=max_break_between_sessions_minutes),
+        )
+        .distinct()
+    )
+
+    return _build_busy_intervals_from_slot_ranges(
+        slot_ranges=specialist_slots.values_list("start_datetime", "end_datetime"),
+        specialist_tz=specialist_tz,
+        rule=rule,
+        exceptions=exceptions,
+    )
+
+
+@phase_timer("calendar.runtime_context")
+def build_specialist_booking_runtime_context(
+    *,
+    specialist_profile: PsychologistProfile,
+    consultation_type: str,
+    requested_start_datetime: datetime,
+) -> dict | None:
+    """Собирает runtime-context специалиста для проверки ОДНОГО запрошенного старта при бронировании.
+
+    Зачем нужна:
+        - booking-flow раньше собирал полный runtime-context (все исключения и вся занятость на горизонт
+          DAYS_AHEAD_FOR_SHOW_SCHEDULE) и пересчитывал все расписание, удерживая select_for_update блокировки
+          клиента и специалиста;
+        - для проверки одного старта достаточно исключений, действующих в день старта (и накануне - их перерыв
+          влияет на встречи предыдущего вечера), и встреч, пересекающихся с самим кандидатом.
+
+    Контекст имеет тот же формат, что и build_specialist_schedule_runtime_context(), и те же правило, период
+    расписания и override-параметры на день старта, поэтому GenerateSpecialistScheduleUseCase.execute_for_slot_keys()
+    дает для запрошенного старта тот же результат, что и полный пересчет расписания.
+    ВАЖНО: busy intervals и исключения в этом контексте неполные, поэтому для построения расписания
+    на горизонт (execute()) он не подходит.
+    """
+    if consultation_type not in ("individual", "couple"):
+        raise ValueError("consultation_type должен быть либо 'individual', либо 'couple'")
+
+    # 1) Активное правило и период расписания - так же, как в build_specialist_schedule_runtime_context()
+    today = get_local_date_for_user(specialist_profile.user)
+    rule = AvailabilityRule.active_for_user(specialist_profile.user).first()
+
+    if rule is None:
+        return None
+
+    current_specialist_time = _get_current_specialist_time(specialist_profile)
+    schedule_period = _resolve_schedule_period(
+        rule=rule,
+        current_specialist_time=current_specialist_time,
+    )
+    if schedule_period is None:
+        return None
+
+    date_from, days_ahead = schedule_period
+    specialist_tz = current_specialist_time.tzinfo
+    candidate_start = requested_start_datetime.astimezone(specialist_tz)
+    candidate_day = candidate_start.date()
+
+    # 2) Только исключения, действующие в день кандидата или накануне
+    exceptions = list(
+        AvailabilityException.active_for_rule(rule, today=today)
+        .filter(
+            exception_start__lte=candidate_day,
+            exception_end__gte=candidate_day - timedelta(days=1),
+        )
+        .prefetch_related("time_windows")
+    )
+
+    # 3) Только встречи специалиста, которые могут пересечься с кандидатом
+    busy_intervals = _build_candidate_busy_intervals(
+        specialist_profile=specialist_profile,
+        specialist_tz=specialist_tz,
+        rule=rule,
+        exceptions=exceptions,
+        consultation_type=consultation_type,
+        candidate_start=candidate_start,
+    )
+
+    return _assemble_runtime_context(
+        rule=rule,
+        exceptions=exceptions,
+        consultation_type=consultation_type,
+        date_from=date_from,
+        days_ahead=days_ahead,
+        current_specialist_time=current_specialist_time,
+        busy_intervals=busy_intervals,
+    )
+
+
+@phase_timer("calendar.runtime_context")
+def build_specialist_series_booking_runtime_context(
+    *,
+    specialist_profile: PsychologistProfile,
+    consultation_type: str,
+    first_start_datetime: datetime,
+    last_start_datetime: datetime,
+) -> dict | None:
+    """Собирает runtime-context специалиста для проверки СЕРИИ стартов (повторяющиеся встречи) при бронировании.
+
+    Отличия от build_specialist_booking_runtime_context():
+        - период расписания тянется от "сегодня" до последнего старта серии (в пределах rule_end правила),
+          а не ограничен горизонтом DAYS_AHEAD_FOR_SHOW_SCHEDULE: серия бронируется на месяцы вперед;
+        - исключения и встречи специалиста читаются одним range-запросом на весь период серии,
+          поэтому все старты серии проверяются за один проход
+          GenerateSpecialistScheduleUseCase.execute_for_slot_keys().
+    ВАЖНО: как и у одиночного бронирования, busy intervals и исключения здесь только на период серии.
+    """
+    if consultation_type not in ("individual", "couple"):
+        raise ValueError("consultation_type должен быть либо 'individual', либо 'couple'")
+
+    # 1) Активное правило специалиста - так же, как в build_specialist_schedule_runtime_context()
+    today = get_local_date_for_user(specialist_profile.user)
+    rule = AvailabilityRule.active_for_user(specialist_profile.user).first()
+
+    if rule is None:
+        return None
+
+    current_specialist_time = _get_current_specialist_time(specialist_profile)
+    specialist_tz = current_specialist_time.tzinfo
+    first_candidate_start = first_start_datetime.astimezone(specialist_tz)
+    last_candidate_start = last_start_datetime.astimezone(specialist_tz)
+
+    # 2) Период расписания: от более поздней из дат "сегодня" / rule_start до последнего старта серии,
+    # но не дальше rule_end. Старты вне периода execute_for_slot_keys() просто не вернет
+    date_from = max(current_specialist_time.date(), rule.rule_start)
+    schedule_last_day = last_candidate_start.date()
+    if rule.rule_end:
+        schedule_last_day = min(schedule_last_day, rule.rule_end)
+
+    days_ahead = (schedule_last_day - date_from).days + 1
+    if days_ahead <= 0:
+        return None
+
+    # 3) Только исключения, которые пересекаются с периодом серии (включая день до первого старта)
+    exceptions = list(
+        AvailabilityException.active_for_rule(rule, today=today)
+        .filter(
+            exception_start__lte=last_candidate_start.date(),
+            exception_end__gte=first_candidate_start.date() - timedelta(days=1),
+        )
+        .prefetch_related("time_windows")
+    )
+
+    # 4) Встречи специалиста на весь период серии - одним запросом
+    busy_intervals = _build_candidate_busy_intervals(
+        specialist_profile=specialist_profile,
+        specialist_tz=specialist_tz,
+        rule=rule,
+        exceptions=exceptions,
+        consultation_type=consultation_type,
+        candidate_start=first_candidate_start,
+        last_candidate_start=last_candidate_start,
+    )
+
+    return _assemble_runtime_context(
+        rule=rule,
+        exceptions=exceptions,
+        consultation_type=consultation_type,
+        date_from=date_from,
+        days_ahead=days_ahead,
+        current_specialist_time=current_specialist_time,
+        busy_intervals=busy_intervals,
+    )
+
+
+@phase_timer("calendar.runtime_context")
+def build_specialist_schedule_runtime_contexts(
+    *,
+    specialist_profiles,
+    consultation_type: str = "individual",
+    exclude_event_ids=None,
+) -> dict[int, dict]:
+    """Пакетная версия build_specialist_schedule_runtime_context() сразу для множества специалистов.
+
+    Зачем нужна:
+        - каталог и другие массовые сценарии раньше вызывали build_specialist_schedule_runtime_context()
+          в цикле по каждому специалисту, а это несколько запросов в БД на каждого;
+        - здесь все данные (правила + окна, исключения + окна, занятые слоты) читаются фиксированным
+          количеством запросов, независимо от количества специалистов, а дальше runtime-context каждого
+          специалиста собирается в памяти теми же helper-функциями, что и в одиночном сценарии.
+
+    Важно:
+        - функция НЕ выполняет UPDATE-запросы, а трактует просроченные правила и исключения
+          (rule_end / exception_end < "сегодня" в TZ специалиста) как неактивные прямо при чтении - так же, как
+          AvailabilityRule.active_for_user() / AvailabilityException.active_for_rule() в одиночном сценарии.
+
+    :param specialist_profiles: Итерируемый набор PsychologistProfile (желательно с select_related("user")).
+    :return: Словарь вида {profile_id: runtime_context}. Специалисты без доступного расписания в него не попадают.
+    """
+    if consultation_type not in ("individual", "couple"):
+        raise ValueError("consultation_type должен быть либо 'individual', либо 'couple'")
+
+    specialist_profiles = list(specialist_profiles)
+    if not specialist_profiles:
+        return {}
+
+    user_ids = [profile.user_id for profile in specialist_profiles]
+
+    # 1) Все активные правила всех специалистов вместе с рабочими окнами (2 запроса).
+    # По умолчанию Meta.ordering у AvailabilityRule начинается с pk, поэтому первое встреченное правило
+    # пользователя совпадает с .first() из одиночного сценария
+    rules_by_user_id = {}
+    for rule in (
+        AvailabilityRule.objects
+        .filter(creator_id__in=user_ids, is_active=True)
+        .prefetch_related("time_windows")
+        .order_by("pk")
+    ):
+        rules_by_user_id.setdefault(rule.creator_id, []).append(rule)
+
+    # 2) Для каждого специалиста выбираем первое не просроченное правило и период показа расписания
+    prepared_by_profile_id = {}
+    for profile in specialist_profiles:
+        today_for_specialist = get_local_date_for_user(profile.user)
+        rule = next(
+            (
+                candidate_rule
+                for candidate_rule in rules_by_user_id.get(profile.user_id, [])
+                if not (candidate_rule.rule_end and candidate_rule.rule_end < today_for_specialist)
+            ),
+            None,
+        )
+        if rule is None:
+            continue
+
+        current_specialist_time = _get_current_specialist_time(profile)
+        schedule_period = _resolve_schedule_period(
+            rule=rule,
+            current_specialist_time=current_specialist_time,
+        )
+        if schedule_period is None:
+            continue
+
+        prepared_by_profile_id[profile.pk] = {
+            "profile": profile,
+            "rule": rule,
+            "today": today_for_specialist,
+            "current_specialist_time": current_specialist_time,
+            "schedule_period": schedule_period,
+        }
+
+    if not prepared_by_profile_id:
+        return {}
+
+    # 3) Все активные исключения выбранных правил вместе с их окнами (2 запроса)
+    exceptions_by_rule_id = {}
+    for exception in (
+        AvailabilityException.objects
+        .filter(
+            rule_id__in=[item["rule"].pk for item in prepared_by_profile_id.values()],
+            is_active=True,
+        )
+        .prefetch_related("time_windows")
+    ):
+        exceptions_by_rule_id.setdefault(exception.rule_id, []).append(exception)
+
+    # 4) Все активные встречи выбранных специалистов (1 запрос).
+    # Горизонт берем с запасом в сутки с каждой стороны, чтобы покрыть все часовые пояса специалистов,
+    # а точную границу горизонта каждого специалиста применяем ниже уже в памяти
+    server_now = now()
+    busy_slots_queryset = (
+        SlotParticipant.objects
+        .filter(
+            user_id__in=[item["profile"].user_id for item in prepared_by_profile_id.values()],
+            slot__status__in=["planned", "started"],
+            slot__start_datetime__gte=server_now - timedelta(days=2),
+            slot__start_datetime__lt=server_now + timedelta(days=DAYS_AHEAD_FOR_SHOW_SCHEDULE + 2),
+        )
+        .order_by("slot__start_datetime")
+    )
+    if exclude_event_ids:
+        busy_slots_queryset = busy_slots_queryset.exclude(slot__event_id__in=exclude_event_ids)
+
+    slot_ranges_by_user_id = {}
+    for user_id, start_datetime, end_datetime in busy_slots_queryset.values_list(
+        "user_id", "slot__start_datetime", "slot__end_datetime",
+    ):
+        slot_ranges_by_user_id.setdefault(user_id, []).append((start_datetime, end_datetime))
+
+    # 5) Собираем runtime-context каждого специалиста в памяти
+    runtime_contexts = {}
+    for profile_id, item in prepared_by_profile_id.items():
+        profile = item["profile"]
+        rule = item["rule"]
+        specialist_tz = item["current_specialist_time"].tzinfo
+
+        # Исключения с прошедшей датой окончания считаются неактивными (как в AvailabilityException.active_for_rule())
+        exceptions = [
+            exception
+            for exception in exceptions_by_rule_id.get(rule.pk, [])
+            if exception.exception_end >= item["today"]
+        ]
+
+        schedule_horizon_start, schedule_horizon_end = _get_busy_intervals_horizon(specialist_tz)
+        busy_intervals = _build_busy_intervals_from_slot_ranges(
+            slot_ranges=[
+                (start_datetime, end_datetime)
+                for start_datetime, end_datetime in slot_ranges_by_user_id.get(profile.user_id, [])
+                if schedule_horizon_start <= start_datetime < schedule_horizon_end
+            ],
+            specialist_tz=specialist_tz,
+            rule=rule,
+            exceptions=exceptions,
+        )
+
+        date_from, days_ahead = item["schedule_period"]
+        runtime_contexts[profile_id] = _assemble_runtime_context(
+            rule=rule,
+            exceptions=exceptions,
+            consultation_type=consultation_type,
+            date_from=date_from,
+            days_ahead=days_ahead,
+            current_specialist_time=item["current_specialist_time"],
+            busy_intervals=busy_intervals,
+        )
+
+    return runtime_contexts
+
+
 def build_generate_specialist_schedule_use_case(
     specialist_profile: PsychologistProfile,
     consultation_type: str = "individual",
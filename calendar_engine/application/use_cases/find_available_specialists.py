@@ -0,0 +1,53 @@
+from datetime import date, time
+from typing import Dict, List, Set, Tuple
+
+from calendar_engine.application.use_cases.base import AbsUseCase
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+
+# Тип ключа доменного слота в TZ специалиста: (day, start_time)
+SlotKey = Tuple[date, time]
+
+
+class FindAvailableSpecialistsUseCase(AbsUseCase):
+    """Use-case пакетного поиска специалистов, у которых свободен хотя бы один из выбранных клиентом стартов.
+
+    Прикладной сценарий:
+        1) принять уже собранные use-case расписаний специалистов (по одному на специалиста);
+        2) для каждого специалиста проверить только выбранные старты (в его TZ), а не все расписание целиком;
+        3) вернуть id профилей специалистов, у которых есть хотя бы одно совпадение.
+
+    ВАЖНО:
+        - use-case НЕ знает про БД: все данные уже загружены пакетно в factory;
+        - проверка каждого старта полностью совпадает с GenerateSpecialistScheduleUseCase.execute()."""
+
+    def __init__(
+        self,
+        *,
+        schedule_use_cases: Dict[int, GenerateSpecialistScheduleUseCase],
+        slot_keys_by_profile_id: Dict[int, Set[SlotKey]],
+    ) -> None:
+        """
+        :param schedule_use_cases: Словарь вида {profile_id: GenerateSpecialistScheduleUseCase}.
+        :param slot_keys_by_profile_id: Словарь вида {profile_id: {(day, start_time), ...}} с выбранными клиентом
+            стартами, уже переведенными в TZ конкретного специалиста.
+        """
+        self._schedule_use_cases = schedule_use_cases
+        self._slot_keys_by_profile_id = slot_keys_by_profile_id
+
+    def execute(self) -> List[int]:
+        """Запускает пакетную проверку доступности выбранных стартов.
+
+        :return: Список id профилей специалистов, у которых свободен хотя бы один из выбранных стартов.
+        """
+        matched_profile_ids: List[int] = []
+
+        for profile_id, schedule_use_case in self._schedule_use_cases.items():
+            slot_keys = self._slot_keys_by_profile_id.get(profile_id)
+            if not slot_keys:
+                continue
+
+            if schedule_use_case.execute_for_slot_keys(slot_keys=slot_keys):
+                matched_profile_ids.append(profile_id)
+
+        return matched_profile_ids
@@ -1,10 +1,16 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from django.utils.timezone import make_aware, now
 
 from calendar_engine.application.use_cases.base import AbsUseCase
 from calendar_engine.constants import DAYS_AHEAD_FOR_CLIENT, DOMAIN_TIME_POLICY
+from calendar_engine.domain.availability.domain_slot_grid_cache import \
+    DomainSlotGridCache
+
+# Кэш уже сериализованной сетки (isoformat-строки) по (дата "сегодня" клиента, горизонт, timezone клиента).
+# Сетка от текущего момента не зависит, поэтому на каждый запрос пересчитывается только now_iso
+SERIALIZED_DOMAIN_SLOTS_CACHE = DomainSlotGridCache()
 
 
 class GetDomainSlotsUseCase(AbsUseCase):
@@ -35,9 +41,31 @@ class GetDomainSlotsUseCase(AbsUseCase):
         current_time = now().astimezone(self.timezone)
         today = current_time.date()
 
-        slots_by_day: Dict[str, List[str]] = {}
+        # ШАГ 2: Берем сериализованную сетку из кэша (генерируется один раз в день на каждый timezone).
+        # В кэше слоты дня лежат кортежами, а наружу отдаются новые dict и списки: вызывающий код может их
+        # модифицировать, не портя общий на процесс кэш
+        cached_slots_by_day = SERIALIZED_DOMAIN_SLOTS_CACHE.get_or_build(
+            day=today,
+            key=(DAYS_AHEAD_FOR_CLIENT, str(self.timezone)),
+            build=lambda: self._build_slots_by_day(today=today),
+        )
+        slots_by_day = {day: list(day_slots) for day, day_slots in cached_slots_by_day.items()}
+
+        # ВАЖНО: кроме сгенерированных слотов (slots_by_day) нам необходимо передать на фронт еще текущее время
+        # пользователя (now_iso), потому что определять его по времени сервера неправильно. Так как клиент в
+        # настройках своего профиля указывает свой timezone и он может отличаться от сервера (путешествует например).
+        # ОБОСНОВАНИЕ: текущее время пользователя нам необходимо для того, чтоб потом на странице деактивировать
+        # слоты, которые уже в прошлом (делать их недоступными к выбору).
+        return {
+            "now_iso": current_time.isoformat(),
+            "slots": slots_by_day,
+        }
 
-        # ШАГ 2: Генерируем доменные слоты для КАЛЕНДАРНОГО ДНЯ клиента.
+    def _build_slots_by_day(self, *, today) -> Dict[str, Tuple[str, ...]]:
+        """Генерирует доменные слоты на DAYS_AHEAD_FOR_CLIENT дней в timezone клиента (без кэша)."""
+        slots_by_day: Dict[str, Tuple[str, ...]] = {}
+
+        # Генерируем доменные слоты для КАЛЕНДАРНОГО ДНЯ клиента.
         # Запускаем цикл по последовательности чисел (DAYS_AHEAD: 7 дней): 0, 1, 2, 3, 4, 5, 6
         for day_offset in range(DAYS_AHEAD_FOR_CLIENT):
             day = today + timedelta(days=day_offset)
@@ -54,14 +82,6 @@ class GetDomainSlotsUseCase(AbsUseCase):
                 day_slots.append(start_dt.isoformat())  # isoformat() превращает datetime объект-Python в СТРОКУ
 
             if day_slots:
-                slots_by_day[str(day)] = day_slots
+                slots_by_day[str(day)] = tuple(day_slots)
 
-        # ВАЖНО: кроме сгенерированных слотов (slots_by_day) нам необходимо передать на фронт еще текущее время
-        # пользователя (now_iso), потому что определять его по времени сервера неправильно. Так как клиент в
-        # настройках своего профиля указывает свой timezone и он может отличаться от сервера (путешествует например).
-        # ОБОСНОВАНИЕ: текущее время пользователя нам необходимо для того, чтоб потом на странице деактивировать
-        # слоты, которые уже в прошлом (делать их недоступными к выбору).
-        return {
-            "now_iso": current_time.isoformat(),
-            "slots": slots_by_day,
-        }
+        return slots_by_day
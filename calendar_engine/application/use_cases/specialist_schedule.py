@@ -1,13 +1,18 @@
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
 
 from calendar_engine.application.use_cases.base import AbsUseCase
+from calendar_engine.domain.availability.busy_interval_index import \
+    BusyIntervalIndex
 from calendar_engine.domain.availability.domain_slot_generator import \
     DomainSlotGenerator
 from calendar_engine.domain.availability.dto import SlotDTO
 from calendar_engine.domain.availability.get_user_slots import \
     AvailabilitySlotFilter
-from calendar_engine.services import normalize_range
+from calendar_engine.domain.availability.minute_grid import (
+    datetime_to_minutes, day_to_minutes, minutes_to_time,
+    normalize_minute_range, shift_minute_end, time_to_minutes)
+from core.profiling.metrics import phase_timer
 
 
 class GenerateSpecialistScheduleUseCase(AbsUseCase):
@@ -65,254 +70,235 @@ class GenerateSpecialistScheduleUseCase(AbsUseCase):
         self._override_minimum_booking_notice_hours_by_day = override_minimum_booking_notice_hours_by_day
         self._busy_intervals = busy_intervals
 
-    def _build_slot_datetimes(self, *, slot: SlotDTO, session_duration_minutes: int) -> tuple[datetime, datetime]:
-        """Строит реальные aware datetime для кандидата на запись из доменного SlotDTO.
+    def _get_day_slot_filter_params(self, day: date) -> Tuple[Tuple[Tuple[int, int], ...], int, int, int]:
+        """Определяет "эффективные" параметры специалиста для конкретного дня (один раз на день, а не на слот).
 
-        Важно:
-            - SlotDTO приходит из доменной политики и всегда отражает только старт доменного слота;
-            - фактическое окончание потенциальной сессии определяется уже рабочими правилами специалиста
-              (session_duration_*), а не самой доменной сеткой.
+        Это значит:
+            - если на день есть override в AvailabilityException, берем его;
+            - если нет, берем базовые настройки из AvailabilityRule.
+
+        :return: (рабочие окна дня в минутах, длительность сессии, перерыв, самый ранний допустимый старт
+            в абсолютных минутах по minimum notice).
         """
-        slot_start_datetime = datetime.combine(
-            slot.day,
-            slot.start,
-            tzinfo=self._current_datetime.tzinfo,
+        effective_session_duration_minutes = self._override_session_duration_minutes_by_day.get(
+            day,
+            self._session_duration_minutes,
+        )
+        effective_break_between_sessions_minutes = self._override_break_between_sessions_minutes_by_day.get(
+            day,
+            self._break_between_sessions_minutes,
         )
-        slot_end_datetime = slot_start_datetime + timedelta(minutes=session_duration_minutes)
-
-        # ВЫПОЛНЯЕМ НОРМАЛИЗАЦИЮ:
-        # т.е., нужно сравнивать datetime, а не time, чтобы корректно учитывать интервалы, пересекающие границу суток.
-        # Для этого используем сервисную вспомогательную функцию normalize_range().
-        # Здесь нормализуется сам интервал будущей сессии:
-        # - старт доменного слота
-        # - чистый конец сессии по session_duration
-        normalized_start_datetime, normalized_end_datetime = normalize_range(
-            slot.day,
-            slot_start_datetime.timetz().replace(tzinfo=None),
-            slot_end_datetime.timetz().replace(tzinfo=None),
+        effective_minimum_booking_notice_hours = self._override_minimum_booking_notice_hours_by_day.get(
+            day,
+            self._minimum_booking_notice_hours,
         )
 
+        # Бизнес-смысл minimum notice:
+        #   - если сейчас 10:57, а minimum_booking_notice_hours = 1 час,
+        #   - то слот на 11:00 не должен показываться клиенту как доступный для записи.
+        # Порог округляется вверх до минуты: "старт < 11:57:30" для целых минут то же самое, что "старт < 11:58"
+        earliest_allowed_start = self._current_datetime + timedelta(hours=effective_minimum_booking_notice_hours)
+
+        with phase_timer("calendar.rule_windows"):
+            time_windows = self._slot_filter.get_user_minute_time_windows(day)
+
         return (
-            normalized_start_datetime.replace(tzinfo=self._current_datetime.tzinfo),
-            normalized_end_datetime.replace(tzinfo=self._current_datetime.tzinfo),
+            time_windows,
+            effective_session_duration_minutes,
+            effective_break_between_sessions_minutes,
+            datetime_to_minutes(earliest_allowed_start, round_up=True),
         )
 
-    def _slot_fits_working_windows(
+    def _filter_day_slot_offsets(
         self,
         *,
-        slot: SlotDTO,
-        session_duration_minutes: int,
-    ) -> bool:
-        """Проверяет, помещается ли реальная длительность сессии в рабочие окна специалиста.
-
-        Ключевая логика:
-            - доменная сетка стартов остается общей для всех специалистов;
-            - но сам факт доступности старта (слота) зависит от того, помещается ли реальная сессия специалиста
-              в его рабочее окно.
-
-        Например:
-            - если доменный слот стартует в 11:00;
-            - а рабочее окно специалиста заканчивается в 12:00;
-            - и для парной сессии duration = 120 минут;
-            - значит такой старт (слот) показывать нельзя, даже если сама доменная сетка его содержит.
+        day: date,
+        slot_offsets: Iterable[Tuple[int, int]],
+        busy_interval_index: BusyIntervalIndex,
+    ) -> List[Tuple[int, int]]:
+        """Оставляет из доменных слотов одного дня только доступные для записи (целочисленная минутная сетка).
+
+        Все проверки выполняются над минутами от полуночи дня (окна, сессия) и абсолютными минутами
+        (notice, занятость), т.е. без datetime.combine() / normalize_range() для каждого слота.
+        Результат полностью совпадает с прежней проверкой через datetime в TZ специалиста: все datetime расчета
+        имеют один tzinfo специалиста, а их сравнение - это сравнение настенного времени.
+
+        :param day: Календарный день в TZ специалиста.
+        :param slot_offsets: Доменные слоты дня в виде пар (start_minutes, end_minutes).
+        :param busy_interval_index: Индекс занятых интервалов специалиста на весь расчет.
+        :return: Доступные слоты дня в виде пар (start_minutes, end_minutes).
         """
-        # 1) Превращаем абстрактный доменный старт в реальный интервал будущей сессии специалиста.
-        # Например:
-        #   - доменный слот = "23:00";
-        #   - реальная длительность сессии = 120 минут;
-        #   - значит фактически это уже интервал "23:00 -> 01:00 следующего дня"
-        slot_start_datetime, slot_end_datetime = self._build_slot_datetimes(
-            slot=slot,
-            session_duration_minutes=session_duration_minutes,
-        )
-
-        # 2) Берем рабочие окна специалиста именно для этого календарного дня.
-        # На этом этапе доменная сетка уже отфильтрована под AvailabilityRule / AvailabilityException,
-        # но теперь нужно понять более точную вещь:
-        #   - помещается ли полная длительность конкретной сессии в одно из разрешенных окон дня
-        for window_start, window_end in self._slot_filter.get_user_time_windows(slot.day):
-            # ВЫПОЛНЯЕМ НОРМАЛИЗАЦИЮ:
-            # т.е., чтобы корректно учитывать интервалы, пересекающие границу суток - normalize_range().
-            # Здесь повторно нормализуется рабочие окна специалиста (рабочее окно тоже может пересекать полночь)
-            normalized_window_start_datetime, normalized_window_end_datetime = normalize_range(
-                slot.day,
-                window_start,
-                window_end,
-            )
-            window_start_datetime = normalized_window_start_datetime.replace(
-                tzinfo=self._current_datetime.tzinfo,
-            )
-            window_end_datetime = normalized_window_end_datetime.replace(
-                tzinfo=self._current_datetime.tzinfo,
-            )
-
-            # 3) Слот считаем допустимым только если будущая сессия целиком помещается в рабочее окно.
-            # Пример:
-            #   - окно специалиста = "09:00-12:00";
-            #   - слот стартует в "11:00";
-            #   - длительность = 50 минут;
-            #   - значит слот еще допустим.
-            # Но если длительность = 120 минут, то показывать такой старт уже нельзя
-            if (
-                slot_start_datetime >= window_start_datetime
-                and slot_end_datetime <= window_end_datetime
+        (
+            time_windows,
+            session_duration_minutes,
+            break_between_sessions_minutes,
+            earliest_allowed_start_minutes,
+        ) = self._get_day_slot_filter_params(day)
+
+        if not time_windows:
+            return []  # день полностью закрыт
+
+        day_minutes = day_to_minutes(day)
+        available_offsets: List[Tuple[int, int]] = []
+
+        for slot_start, slot_end in slot_offsets:
+            # 1) Из общей доменной сетки убираем все старты (слоты), которые вообще не попадают в рабочие окна
+            # специалиста по AvailabilityRule / AvailabilityException
+            if not any(
+                window_start <= slot_start and slot_end <= window_end
+                for window_start, window_end in time_windows
             ):
-                return True
+                continue
 
-        return False
+            # 2) Если специалист указал minimum notice, то слишком близкие слоты клиенту не показываем.
+            # Пример:
+            #   - сейчас 10:57;
+            #   - minimum notice = 2 часа;
+            #   - значит старт на 11:00 или 12:00 уже нельзя показывать.
+            slot_start_minutes = day_minutes + slot_start
+            if slot_start_minutes < earliest_allowed_start_minutes:
+                continue
 
-    def _slot_conflicts_with_busy_intervals(
-        self,
-        *,
-        slot: SlotDTO,
-        session_duration_minutes: int,
-        break_between_sessions_minutes: int,
-    ) -> bool:
-        """Проверяет, конфликтует ли потенциальная запись с уже занятыми интервалами специалиста.
+            # 3) Даже если доменный старт попадает в рабочее окно дня, нужно дополнительно проверить,
+            # что полная сессия выбранного типа действительно помещается в рабочий интервал специалиста.
+            # Например:
+            #   - доменный слот стартует в 11:00, а рабочее окно специалиста заканчивается в 12:00;
+            #   - для парной сессии duration = 120 минут;
+            #   - значит такой старт (слот) показывать нельзя, даже если сама доменная сетка его содержит.
+            session_end = shift_minute_end(slot_start, session_duration_minutes)
+            if not any(
+                window_start <= slot_start and session_end <= window_end
+                for window_start, window_end in time_windows
+            ):
+                continue
 
-        Здесь учитываем именно busy-интервал кандидата:
-            - старт доменного слота;
-            - чистую продолжительность сессии;
-            - и обязательный перерыв после нее.
+            # 4) И в конце проверяем пересечение с уже существующими встречами специалиста. Поверх чистой
+            # длительности сессии добавляем обязательный перерыв: именно этот "расширенный" интервал
+            # и должен блокировать последующие доменные старты
+            busy_end = shift_minute_end(slot_start, session_duration_minutes + break_between_sessions_minutes)
+            if busy_interval_index.overlaps(start=slot_start_minutes, end=day_minutes + busy_end):
+                continue
 
-        Это позволяет:
-            - не менять доменную сетку стартов (слотов);
-            - но корректно скрывать следующие доменные старты, если предыдущая встреча + break их перекрывают.
-        """
-        # 1) Строим интервал самой потенциальной сессии без перерыва
-        candidate_start_datetime, candidate_end_datetime = self._build_slot_datetimes(
-            slot=slot,
-            session_duration_minutes=session_duration_minutes,
-        )
+            available_offsets.append((slot_start, slot_end))
 
-        # 2) Поверх чистой длительности сессии добавляем обязательный перерыв специалиста.
-        # Именно этот "расширенный" интервал и должен блокировать последующие доменные старты.
-        candidate_busy_end_datetime = candidate_end_datetime + timedelta(
-            minutes=break_between_sessions_minutes
-        )
-        # ВЫПОЛНЯЕМ НОРМАЛИЗАЦИЮ:
-        # т.е., чтобы корректно учитывать интервалы, пересекающие границу суток - normalize_range().
-        # После добавления break это уже новый интервал, и его нужно нормализовать отдельно
-        normalized_candidate_start_datetime, normalized_candidate_busy_end_datetime = normalize_range(
-            candidate_start_datetime.date(),
-            candidate_start_datetime.timetz().replace(tzinfo=None),
-            candidate_busy_end_datetime.timetz().replace(tzinfo=None),
-        )
+        return available_offsets
 
-        candidate_start_datetime = normalized_candidate_start_datetime.replace(
-            tzinfo=self._current_datetime.tzinfo,
-        )
-        candidate_busy_end_datetime = normalized_candidate_busy_end_datetime.replace(
-            tzinfo=self._current_datetime.tzinfo,
-        )
+    def _build_busy_interval_index(self) -> BusyIntervalIndex:
+        """Индекс занятых интервалов строим один раз на весь расчет, а не для каждого кандидата."""
+        with phase_timer("calendar.busy_index"):
+            return BusyIntervalIndex(busy_intervals=self._busy_intervals)
 
-        # 3) Сравниваем кандидата со всеми уже существующими busy intervals специалиста.
-        # Если новый старт пересекается хотя бы с одним из них, такой слот уже нельзя показывать как доступный
-        for busy_start_datetime, busy_end_datetime in self._busy_intervals:
-            # ВЫПОЛНЯЕМ НОРМАЛИЗАЦИЮ:
-            # т.е., чтобы корректно учитывать интервалы, пересекающие границу суток - normalize_range().
-            # Отдельно нормализуются и уже существующие busy_intervals из БД, так как тоже могут пересекать полночь
-            normalized_busy_start_datetime, normalized_busy_end_datetime = normalize_range(
-                busy_start_datetime.date(),
-                busy_start_datetime.timetz().replace(tzinfo=None),
-                busy_end_datetime.timetz().replace(tzinfo=None),
+    def _generate_domain_slot_offsets(self) -> List[Tuple[date, Tuple[Tuple[int, int], ...]]]:
+        """Полная доменная сетка стартов на горизонт расписания (минутные смещения по дням)."""
+        with phase_timer("calendar.domain_grid"):
+            return self._slot_generator.generate_domain_slot_offsets(
+                date_from=self._date_from,
+                days_ahead=self._days_ahead,
             )
-            busy_start_datetime = normalized_busy_start_datetime.replace(
-                tzinfo=self._current_datetime.tzinfo,
-            )
-            busy_end_datetime = normalized_busy_end_datetime.replace(
-                tzinfo=self._current_datetime.tzinfo,
-            )
-
-            if (
-                candidate_start_datetime < busy_end_datetime
-                and candidate_busy_end_datetime > busy_start_datetime
-            ):
-                return True
-
-        return False
 
     def execute(self) -> List[SlotDTO]:
         """Генерируем все возможные доменные временные слоты и выполняем бизнес-операцию
         получения расписания специалиста с учетом рабочего расписания и действующих исключений в нем.
 
+        Доменная сетка обрабатывается в компактном виде (минутные смещения по дням), а SlotDTO создаются
+        только для итоговых доступных слотов.
+
+        Фазы расчета замеряются phase_timer() (видны в метриках профилирования запросов):
+            - calendar.domain_grid - доменная сетка;
+            - calendar.busy_index - индекс занятых интервалов;
+            - calendar.slot_checks - проверки кандидатов (окна правила/исключений, minimum notice, занятость),
+              внутри нее отдельно calendar.rule_windows - расчет рабочих окон дня.
+
         :return: Список доступных слотов специалиста (расписание специалиста).
         """
-        # 1) Генерируем полную доменную сетку стартов на ближайшие дни.
+        busy_interval_index = self._build_busy_interval_index()
+        # Полная доменная сетка стартов на ближайшие дни.
         # Это именно общие слоты домена по DomainTimePolicy, а не персональное расписание специалиста
-        domain_slots = self._slot_generator.generate_domain_slots(
-            date_from=self._date_from,
-            days_ahead=self._days_ahead,
-        )
+        domain_slot_offsets = self._generate_domain_slot_offsets()
+        available_slots: List[SlotDTO] = []
+
+        with phase_timer("calendar.slot_checks"):
+            for day, slot_offsets in domain_slot_offsets:
+                available_slots.extend(
+                    SlotDTO(day=day, start=minutes_to_time(slot_start), end=minutes_to_time(slot_end))
+                    for slot_start, slot_end in self._filter_day_slot_offsets(
+                        day=day,
+                        slot_offsets=slot_offsets,
+                        busy_interval_index=busy_interval_index,
+                    )
+                )
+
+        return available_slots
+
+    def execute_for_slot_keys(self, *, slot_keys: Set[Tuple[date, time]]) -> List[SlotDTO]:
+        """Проверяет доступность только конкретных доменных стартов (day, start_time) в TZ специалиста.
+
+        Бизнес-смысл:
+            - фильтру каталога "Время сессии" не нужно полное расписание специалиста на весь горизонт,
+              ему достаточно понять, свободен ли специалист в выбранные клиентом старты;
+            - поэтому из доменной сетки берутся только дни из slot_keys (в пределах горизонта расписания)
+              и только запрошенные старты, а дальше кандидаты проходят ровно те же проверки, что и в execute().
+
+        :param slot_keys: Набор ключей (day, start_time) в TZ специалиста.
+        :return: Список доступных SlotDTO из числа запрошенных (результат совпадает с пересечением execute()
+            и slot_keys).
+        """
+        horizon_end = self._date_from + timedelta(days=self._days_ahead)
+        requested_starts_by_day: Dict[date, Set[int]] = {}
 
-        # 2) Из общей доменной сетки убираем все старты (слоты), которые вообще не попадают в рабочие окна специалиста
-        # по AvailabilityRule / AvailabilityException
-        allowed_slots = self._slot_filter.filter_user_slots(
-            domain_slots=domain_slots
-        )
+        for day, start in slot_keys:
+            # Дни вне горизонта расписания execute() тоже никогда не вернет, а старты с секундами
+            # не совпадают ни с одним доменным стартом
+            if not self._date_from <= day < horizon_end or start.second or start.microsecond:
+                continue
 
-        # После того как получили все допустимые слоты специалиста по рабочему расписанию и исключениям,
-        # дополнительно отсекаем слишком "близкие" к текущему моменту слоты.
-        # Бизнес-смысл:
-        #   - если сейчас 10:57, а minimum_booking_notice_hours = 1 час,
-        #   - то слот на 11:00 не должен показываться клиенту как доступный для записи.
-        filtered_by_notice: List[SlotDTO] = []
-
-        for slot in allowed_slots:
-            # 3) Для каждого конкретного дня определяем "эффективные" параметры специалиста.
-            # Это значит:
-            #   - если на день есть override в AvailabilityException, берем его;
-            #   - если нет, берем базовые настройки из AvailabilityRule.
-            effective_session_duration_minutes = self._override_session_duration_minutes_by_day.get(
-                slot.day,
-                self._session_duration_minutes,
-            )
-            effective_break_between_sessions_minutes = self._override_break_between_sessions_minutes_by_day.get(
-                slot.day,
-                self._break_between_sessions_minutes,
-            )
-            effective_minimum_booking_notice_hours = self._override_minimum_booking_notice_hours_by_day.get(
-                slot.day,
-                self._minimum_booking_notice_hours,
-            )
+            requested_starts_by_day.setdefault(day, set()).add(time_to_minutes(start))
 
-            earliest_allowed_start = self._current_datetime + timedelta(
-                hours=effective_minimum_booking_notice_hours
-            )
+        if not requested_starts_by_day:
+            return []
 
-            # 4) Переводим доменный старт в реальный datetime специалиста,
-            # чтобы понять не слишком ли "близко" этот слот к текущему моменту.
-            slot_start_datetime = datetime.combine(
-                slot.day,
-                slot.start,
-                tzinfo=self._current_datetime.tzinfo,
-            )
+        busy_interval_index = self._build_busy_interval_index()
+        domain_slot_offsets = self._generate_domain_slot_offsets()
+        available_slots: List[SlotDTO] = []
 
-            # 5) Если специалист указал minimum notice, то слишком близкие слоты клиенту не показываем.
-            # Пример:
-            #   - сейчас 10:57;
-            #   - minimum notice = 2 часа;
-            #   - значит старт на 11:00 или 12:00 уже нельзя показывать.
-            if slot_start_datetime < earliest_allowed_start:
-                continue
+        with phase_timer("calendar.slot_checks"):
+            for day, day_slot_offsets in domain_slot_offsets:
+                requested_starts = requested_starts_by_day.get(day)
+                if not requested_starts:
+                    continue
 
-            # 6) Даже если доменный старт попадает в рабочее окно дня, нужно дополнительно проверить,
-            # что полная сессия выбранного типа действительно помещается в рабочий интервал специалиста.
-            if not self._slot_fits_working_windows(
-                slot=slot,
-                session_duration_minutes=effective_session_duration_minutes,
-            ):
-                continue
+                available_slots.extend(
+                    SlotDTO(day=day, start=minutes_to_time(slot_start), end=minutes_to_time(slot_end))
+                    for slot_start, slot_end in self._filter_day_slot_offsets(
+                        day=day,
+                        slot_offsets=[offsets for offsets in day_slot_offsets if offsets[0] in requested_starts],
+                        busy_interval_index=busy_interval_index,
+                    )
+                )
 
-            # 7) И в конце проверяем пересечение с уже существующими встречами специалиста,
-            # включая обязательный перерыв после них. Если есть пересечение - такой старт скрываем.
-            if self._slot_conflicts_with_busy_intervals(
-                slot=slot,
-                session_duration_minutes=effective_session_duration_minutes,
-                break_between_sessions_minutes=effective_break_between_sessions_minutes,
-            ):
-                continue
+        return available_slots
+
+    def filter_available_slots(self, *, domain_slots: Iterable[SlotDTO]) -> List[SlotDTO]:
+        """Оставляет из переданных доменных слотов только доступные для записи к специалисту.
+
+        Совместимый вход для готовых SlotDTO: слоты переводятся в минутную сетку и проходят те же проверки,
+        что и в execute(), а возвращаются исходные объекты SlotDTO в исходном порядке.
+
+        :param domain_slots: Доменные слоты (вся сетка горизонта или только нужные кандидаты).
+        :return: Список доступных слотов специалиста.
+        """
+        busy_interval_index = self._build_busy_interval_index()
+        available_slots: List[SlotDTO] = []
+
+        with phase_timer("calendar.slot_checks"):
+            for slot in domain_slots:
+                slot_offsets = normalize_minute_range(time_to_minutes(slot.start), time_to_minutes(slot.end))
 
-            filtered_by_notice.append(slot)
+                if self._filter_day_slot_offsets(
+                    day=slot.day,
+                    slot_offsets=(slot_offsets,),
+                    busy_interval_index=busy_interval_index,
+                ):
+                    available_slots.append(slot)
 
-        return filtered_by_notice
+        return available_slots
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AppCalendarConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'calendar_engine'
+
+    def ready(self):
+        """Подключает signals приложения (пересборка материализованной доступности специалистов)."""
+        import calendar_engine.signals  # noqa: F401
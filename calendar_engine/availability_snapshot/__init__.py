@@ -0,0 +1,5 @@
+"""Пакет материализованной доступности специалистов приложения calendar_engine.
+
+Здесь живет логика пересборки таблицы SpecialistAvailableSlot (заранее рассчитанных свободных стартов)
+и чтения из нее для массовых сценариев: каталог, matching, виджеты расписания.
+"""
@@ -0,0 +1,252 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from calendar_engine.application.factories.generate_specialist_schedule_factory import (
+    build_specialist_schedule_runtime_context,
+    build_specialist_schedule_runtime_contexts)
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.constants import SPECIALIST_SCHEDULE_CACHE_TIMEOUT
+from calendar_engine.domain.availability.dto import SlotDTO
+from calendar_engine.services import get_local_date_for_user
+from core.services.cache_backend import is_process_local_cache
+
+SPECIALIST_SCHEDULE_CACHE_KEY_PREFIX = "calendar:specialist_schedule"
+SPECIALIST_SCHEDULE_VERSION_CACHE_KEY_PREFIX = "calendar:specialist_schedule_version"
+
+# Свободный слот специалиста в кэше: (SlotDTO в TZ специалиста, момент до которого на него еще можно записаться)
+CachedScheduleSlot = Tuple[SlotDTO, datetime]
+
+
+def _build_version_cache_key(specialist_user_id: int) -> str:
+    """Возвращает ключ текущей версии кэша расписания специалиста."""
+    return f"{SPECIALIST_SCHEDULE_VERSION_CACHE_KEY_PREFIX}:{specialist_user_id}"
+
+
+def _build_schedule_slots_from_runtime_context(runtime_context: dict) -> List[CachedScheduleSlot]:
+    """Выполняет use-case расписания и дополняет каждый свободный слот моментом bookable_until."""
+    specialist_tz = runtime_context["current_datetime"].tzinfo
+    schedule_slots: List[CachedScheduleSlot] = []
+
+    for slot in GenerateSpecialistScheduleUseCase(**runtime_context).execute():
+        minimum_booking_notice_hours = runtime_context["override_minimum_booking_notice_hours_by_day"].get(
+            slot.day,
+            runtime_context["minimum_booking_notice_hours"],
+        )
+        # Как и в SpecialistAvailableSlot: после этого момента старт уже нарушает minimum notice
+        bookable_until = datetime.combine(slot.day, slot.start, tzinfo=specialist_tz) - timedelta(
+            hours=minimum_booking_notice_hours
+        )
+        schedule_slots.append((slot, bookable_until))
+
+    return schedule_slots
+
+
+def _build_schedule_slots(*, specialist_profile, consultation_type: str, exclude_event_ids=None):
+    """Считает свободные слоты специалиста без кэша.
+
+    :return: None - у специалиста нет активного расписания, иначе список (SlotDTO, bookable_until).
+    """
+    runtime_context = build_specialist_schedule_runtime_context(
+        specialist_profile=specialist_profile,
+        consultation_type=consultation_type,
+        exclude_event_ids=exclude_event_ids,
+    )
+    if runtime_context is None:
+        return None
+
+    return _build_schedule_slots_from_runtime_context(runtime_context)
+
+
+def _build_schedules_for_profiles(
+    *,
+    specialist_profiles,
+    consultation_type: str,
+) -> Dict[int, Optional[List[CachedScheduleSlot]]]:
+    """Считает свободные слоты сразу для множества специалистов без кэша.
+
+    Runtime-context всех специалистов собирается через build_specialist_schedule_runtime_contexts(), т.е. правила,
+    исключения и занятые слоты читаются из БД фиксированным количеством запросов.
+
+    :return: Словарь вида {profile_id: None | [(SlotDTO, bookable_until), ...]}.
+    """
+    runtime_contexts = build_specialist_schedule_runtime_contexts(
+        specialist_profiles=specialist_profiles,
+        consultation_type=consultation_type,
+    )
+    schedules = {}
+
+    for profile in specialist_profiles:
+        runtime_context = runtime_contexts.get(profile.pk)
+        schedules[profile.pk] = (
+            None
+            if runtime_context is None
+            else _build_schedule_slots_from_runtime_context(runtime_context)
+        )
+
+    return schedules
+
+
+def _is_schedule_cache_enabled() -> bool:
+    """Кэш расписания используется только с общим для всех процессов кэшем (Redis, см. REDIS_URL в settings.py).
+
+    Почему не LocMemCache:
+        - у каждого процесса (gunicorn worker) свой LocMemCache, а сброс версии кэша после booking выполняется
+          только в процессе, который создал встречу;
+        - остальные процессы до истечения TTL показывали бы уже занятый старт как свободный, поэтому
+          с локальным кэшем расписание всегда считается заново.
+    """
+    return not is_process_local_cache()
+
+
+def _build_schedule_cache_key(*, specialist_profile, version: int, consultation_type: str) -> str:
+    """Возвращает ключ кэша свободных слотов специалиста для текущей версии и "сегодня" в TZ специалиста."""
+    return (
+        f"{SPECIALIST_SCHEDULE_CACHE_KEY_PREFIX}:{specialist_profile.user_id}:{version}:{consultation_type}:"
+        f"{get_local_date_for_user(specialist_profile.user).isoformat()}"
+    )
+
+
+def get_specialist_schedule_slots(
+    *,
+    specialist_profile,
+    consultation_type: str,
+    exclude_event_ids=None,
+) -> Optional[List[CachedScheduleSlot]]:
+    """Возвращает свободные слоты специалиста (в TZ специалиста) через Django cache.
+
+    Зачем нужно:
+        - расписание специалиста одинаково для всех viewer'ов (с точностью до перевода в их timezone),
+          а его расчет - это ~6 запросов в БД и весь pipeline генерации слотов на каждое открытие карточки;
+        - поэтому результат кэшируется по (специалист, consultation_type, "сегодня" в TZ специалиста),
+          а перевод в timezone viewer'а выполняется уже после кэша.
+
+    Актуальность:
+        - при изменении AvailabilityRule / AvailabilityException / их окон / TimeSlot специалиста signals
+          сдвигают версию кэша специалиста (invalidate_specialist_schedule_cache), и старые ключи перестают читаться;
+        - со временем слоты только "сгорают" по minimum notice, поэтому вместе со слотом хранится bookable_until,
+          и вызывающий код отсекает слоты с bookable_until < now (новых слотов внутри дня не появляется);
+        - расписание для переноса встречи (exclude_event_ids) зависит от конкретной встречи и не кэшируется;
+        - с локальным для процесса кэшем (LocMemCache) кэш не используется вовсе (см. _is_schedule_cache_enabled).
+
+    :return: None - у специалиста нет активного расписания, иначе список (SlotDTO, bookable_until).
+    """
+    if exclude_event_ids or not _is_schedule_cache_enabled():
+        return _build_schedule_slots(
+            specialist_profile=specialist_profile,
+            consultation_type=consultation_type,
+            exclude_event_ids=exclude_event_ids,
+        )
+
+    cache_key = _build_schedule_cache_key(
+        specialist_profile=specialist_profile,
+        version=cache.get(_build_version_cache_key(specialist_profile.user_id), 0),
+        consultation_type=consultation_type,
+    )
+
+    # В кэше хранится словарь, чтобы отличать "нет в кэше" от закэшированного "нет активного расписания" (None)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached["slots"]
+
+    schedule_slots = _build_schedule_slots(
+        specialist_profile=specialist_profile,
+        consultation_type=consultation_type,
+    )
+    cache.set(cache_key, {"slots": schedule_slots}, SPECIALIST_SCHEDULE_CACHE_TIMEOUT)
+
+    return schedule_slots
+
+
+def get_specialists_schedule_slots(
+    *,
+    specialist_profiles,
+    consultation_type: str,
+) -> Dict[int, Optional[List[CachedScheduleSlot]]]:
+    """Пакетная версия get_specialist_schedule_slots() сразу для множества специалистов.
+
+    Что делает:
+        1) читает версии и закэшированные расписания всех специалистов двумя запросами в cache (get_many);
+        2) для промахов собирает runtime-context через build_specialist_schedule_runtime_contexts(), т.е. правила,
+           исключения и занятые слоты всех специалистов читаются из БД фиксированным количеством запросов;
+        3) сохраняет посчитанное одним set_many.
+    С локальным для процесса кэшем (LocMemCache) расписания всех специалистов считаются без кэша.
+
+    :param specialist_profiles: Набор PsychologistProfile (желательно с select_related("user")).
+    :return: Словарь вида {profile_id: None | [(SlotDTO, bookable_until), ...]}.
+    """
+    specialist_profiles = list(specialist_profiles)
+    if not specialist_profiles:
+        return {}
+
+    if not _is_schedule_cache_enabled():
+        return _build_schedules_for_profiles(
+            specialist_profiles=specialist_profiles,
+            consultation_type=consultation_type,
+        )
+
+    versions = cache.get_many(
+        [_build_version_cache_key(profile.user_id) for profile in specialist_profiles]
+    )
+    cache_keys = {
+        profile.pk: _build_schedule_cache_key(
+            specialist_profile=profile,
+            version=versions.get(_build_version_cache_key(profile.user_id), 0),
+            consultation_type=consultation_type,
+        )
+        for profile in specialist_profiles
+    }
+    cached_by_key = cache.get_many(list(cache_keys.values()))
+
+    schedules = {
+        profile_id: cached_by_key[cache_key]["slots"]
+        for profile_id, cache_key in cache_keys.items()
+        if cache_key in cached_by_key
+    }
+    missing_profiles = [profile for profile in specialist_profiles if profile.pk not in schedules]
+
+    if missing_profiles:
+        missing_schedules = _build_schedules_for_profiles(
+            specialist_profiles=missing_profiles,
+            consultation_type=consultation_type,
+        )
+        schedules.update(missing_schedules)
+        cache.set_many(
+            {
+                cache_keys[profile_id]: {"slots": schedule_slots}
+                for profile_id, schedule_slots in missing_schedules.items()
+            },
+            SPECIALIST_SCHEDULE_CACHE_TIMEOUT,
+        )
+
+    return schedules
+
+
+def _bump_specialist_schedule_versions(specialist_user_ids: Iterable[int]) -> None:
+    """Сдвигает версию кэша расписания специалистов: все их ранее закэшированные ключи перестают читаться."""
+    for specialist_user_id in specialist_user_ids:
+        version_key = _build_version_cache_key(specialist_user_id)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Версии еще нет (кэш специалиста ни разу не сбрасывался) - читалась версия 0
+            cache.add(version_key, 1, None)
+
+
+def invalidate_specialist_schedule_cache(*, specialist_user_ids: Iterable[int]) -> None:
+    """Сбрасывает кэш расписания специалистов после успешного commit текущей транзакции.
+
+    Важно:
+        - сброс выполняется через transaction.on_commit(), иначе параллельный запрос успел бы заново
+          закэшировать еще старое (не закоммиченное) состояние;
+        - версия хранится в том же кэше, поэтому сброс виден всем процессам только с общим кэшем (Redis).
+          С LocMemCache кэш расписания не читается вовсе (см. _is_schedule_cache_enabled).
+    """
+    specialist_user_ids = {user_id for user_id in specialist_user_ids if user_id}
+    if not specialist_user_ids:
+        return
+
+    transaction.on_commit(lambda: _bump_specialist_schedule_versions(specialist_user_ids))
@@ -0,0 +1,265 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Subquery
+from django.utils.timezone import now
+
+from calendar_engine.application.factories.generate_specialist_schedule_factory import \
+    build_specialist_schedule_runtime_contexts
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.constants import AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES
+from calendar_engine.models import (SpecialistAvailableSlot,
+                                    SpecialistNearestAvailableStart)
+from users.models import PsychologistProfile
+
+# Набор специалистов, которым нужна пересборка после commit текущей транзакции (отдельно для каждого потока).
+# Нужен, чтобы одна бизнес-операция (например, booking: TimeSlot + 2 SlotParticipant) пересобирала
+# доступность специалиста один раз, а не на каждый сигнал
+_pending_rebuild = threading.local()
+
+
+def is_materialized_availability_enabled() -> bool:
+    """Возвращает True, если проект работает с материализованной таблицей доступности (settings.py)."""
+    return getattr(settings, "USE_MATERIALIZED_AVAILABILITY", False)
+
+
+def _build_available_slot_rows(*, profile, consultation_type: str, runtime_context: dict) -> list:
+    """Превращает результат GenerateSpecialistScheduleUseCase в строки SpecialistAvailableSlot.
+
+    Эталоном корректности является сам use-case: таблица хранит ровно то, что он вернул бы в момент пересборки.
+    """
+    available_slots = GenerateSpecialistScheduleUseCase(**runtime_context).execute()
+    specialist_tz = runtime_context["current_datetime"].tzinfo
+    rows = []
+
+    for slot in available_slots:
+        session_duration_minutes = runtime_context["override_session_duration_minutes_by_day"].get(
+            slot.day,
+            runtime_context["session_duration_minutes"],
+        )
+        minimum_booking_notice_hours = runtime_context["override_minimum_booking_notice_hours_by_day"].get(
+            slot.day,
+            runtime_context["minimum_booking_notice_hours"],
+        )
+        start_datetime = datetime.combine(slot.day, slot.start, tzinfo=specialist_tz)
+
+        rows.append(
+            SpecialistAvailableSlot(
+                specialist_id=profile.user_id,
+                consultation_type=consultation_type,
+                start_datetime=start_datetime,
+                end_datetime=start_datetime + timedelta(minutes=session_duration_minutes),
+                bookable_until=start_datetime - timedelta(hours=minimum_booking_notice_hours),
+            )
+        )
+
+    return rows
+
+
+def _build_nearest_available_start_rows(available_slot_rows: list) -> list:
+    """Выбирает из строк SpecialistAvailableSlot ближайший свободный старт для каждой пары
+    (специалист, consultation_type) и превращает его в строки SpecialistNearestAvailableStart."""
+    current_time = now()
+    nearest_by_key = {}
+
+    for row in available_slot_rows:
+        if row.bookable_until < current_time:
+            continue
+
+        key = (row.specialist_id, row.consultation_type)
+        nearest = nearest_by_key.get(key)
+        if nearest is None or row.start_datetime < nearest.start_datetime:
+            nearest_by_key[key] = row
+
+    return [
+        SpecialistNearestAvailableStart(
+            specialist_id=row.specialist_id,
+            consultation_type=row.consultation_type,
+            nearest_available_start=row.start_datetime,
+            bookable_until=row.bookable_until,
+        )
+        for row in nearest_by_key.values()
+    ]
+
+
+def rebuild_specialist_available_slots(*, specialist_user_ids: Iterable[int]) -> int:
+    """Пересобирает материализованную доступность для указанных специалистов.
+
+    Что делает:
+        1) пакетно собирает runtime-context расписаний (фиксированное количество запросов на весь набор);
+        2) для каждого типа консультации выполняет GenerateSpecialistScheduleUseCase;
+        3) в одной транзакции удаляет старые строки специалистов и вставляет новые через bulk_create;
+        4) в той же транзакции пересобирает ближайший свободный старт специалистов (SpecialistNearestAvailableStart).
+
+    Пользователи без PsychologistProfile (например, клиенты из SlotParticipant) просто получают пустой набор строк.
+
+    :return: Количество вставленных строк.
+    """
+    specialist_user_ids = set(specialist_user_ids)
+    if not specialist_user_ids:
+        return 0
+
+    profiles = list(
+        PsychologistProfile.objects
+        .filter(user_id__in=specialist_user_ids)
+        .select_related("user")
+    )
+    rows = []
+
+    for consultation_type, _label in AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES:
+        runtime_contexts = build_specialist_schedule_runtime_contexts(
+            specialist_profiles=profiles,
+            consultation_type=consultation_type,
+        )
+
+        for profile in profiles:
+            runtime_context = runtime_contexts.get(profile.pk)
+            if runtime_context is None:
+                continue
+
+            rows.extend(
+                _build_available_slot_rows(
+                    profile=profile,
+                    consultation_type=consultation_type,
+                    runtime_context=runtime_context,
+                )
+            )
+
+    nearest_rows = _build_nearest_available_start_rows(rows)
+
+    with transaction.atomic():
+        SpecialistAvailableSlot.objects.filter(specialist_id__in=specialist_user_ids).delete()
+        SpecialistAvailableSlot.objects.bulk_create(rows, batch_size=1000)
+        SpecialistNearestAvailableStart.objects.filter(specialist_id__in=specialist_user_ids).delete()
+        SpecialistNearestAvailableStart.objects.bulk_create(nearest_rows, batch_size=1000)
+
+    return len(rows)
+
+
+def roll_forward_nearest_available_starts() -> tuple[int, int]:
+    """Сдвигает "сгоревшие" ближайшие старты специалистов на следующий свободный старт.
+
+    Зачем нужно:
+        - ближайший старт перестает быть доступным не только из-за booking (это ловят signals),
+          но и просто со временем: как только bookable_until < now, записаться на него уже нельзя;
+        - следующий свободный старт уже рассчитан в SpecialistAvailableSlot, поэтому сдвиг - это один UPDATE
+          с подзапросом, без пересчета расписаний.
+
+    Если у специалиста больше нет свободных стартов в горизонте таблицы, строка удаляется
+    (ее заново создаст ежедневная пересборка rebuild_available_slots, когда горизонт сдвинется вперед).
+
+    :return: (количество сдвинутых строк, количество удаленных строк).
+    """
+    current_time = now()
+    next_available_slots = (
+        SpecialistAvailableSlot.objects
+        .filter(
+            specialist_id=OuterRef("specialist_id"),
+            consultation_type=OuterRef("consultation_type"),
+            bookable_until__gte=current_time,
+        )
+        .order_by("start_datetime")
+    )
+    expired_rows = SpecialistNearestAvailableStart.objects.filter(bookable_until__lt=current_time)
+
+    with transaction.atomic():
+        rolled_count = (
+            expired_rows
+            .filter(Exists(next_available_slots))
+            .update(
+                nearest_available_start=Subquery(next_available_slots.values("start_datetime")[:1]),
+                bookable_until=Subquery(next_available_slots.values("bookable_until")[:1]),
+                # QuerySet.update() не обновляет auto_now поля
+                updated_at=current_time,
+            )
+        )
+        # Все, что после сдвига осталось "сгоревшим", - специалисты без свободных стартов в горизонте
+        deleted_count, _deleted_by_model = expired_rows.delete()
+
+    return rolled_count, deleted_count
+
+
+def _flush_pending_rebuild() -> None:
+    """Пересобирает доступность всех специалистов, накопленных за текущую транзакцию."""
+    specialist_user_ids = getattr(_pending_rebuild, "user_ids", set())
+    _pending_rebuild.user_ids = set()
+
+    if specialist_user_ids:
+        rebuild_specialist_available_slots(specialist_user_ids=specialist_user_ids)
+
+
+def schedule_specialist_available_slots_rebuild(*, specialist_user_ids: Iterable[int]) -> None:
+    """Планирует пересборку доступности специалистов после успешного commit текущей транзакции.
+
+    Важно:
+        - пересборка идет через transaction.on_commit(), чтобы читать уже сохраненное состояние
+          (и не пересобирать ничего, если транзакция откатилась);
+        - несколько сигналов в одной транзакции объединяются в одну пересборку.
+    """
+    if not is_materialized_availability_enabled():
+        return
+
+    specialist_user_ids = {user_id for user_id in specialist_user_ids if user_id}
+    if not specialist_user_ids:
+        return
+
+    if not hasattr(_pending_rebuild, "user_ids"):
+        _pending_rebuild.user_ids = set()
+
+    _pending_rebuild.user_ids.update(specialist_user_ids)
+    transaction.on_commit(_flush_pending_rebuild)
+
+
+def filter_profiles_available_at(queryset, *, consultation_type: str, start_datetimes: Iterable[datetime]):
+    """Оставляет в QuerySet PsychologistProfile только специалистов со свободным стартом в любой из start_datetimes.
+
+    Один индексированный SQL-запрос (semi-join по consultation_type + start_datetime) вместо расчета
+    расписания каждого специалиста в Python.
+    """
+    available_specialist_ids = (
+        SpecialistAvailableSlot.objects
+        .filter(
+            consultation_type=consultation_type,
+            # Старты доменной сетки всегда кратны минуте, поэтому секунды/микросекунды отбрасываем (как и в matching)
+            start_datetime__in=[
+                start_datetime.replace(second=0, microsecond=0)
+                for start_datetime in start_datetimes
+            ],
+            bookable_until__gte=now(),
+        )
+        .values("specialist_id")
+    )
+
+    return queryset.filter(user_id__in=available_specialist_ids)
+
+
+def filter_profiles_available_before(queryset, *, consultation_type: str, until: datetime):
+    """Оставляет в QuerySet PsychologistProfile только специалистов, у которых есть свободный старт раньше until.
+
+    Работает по одной строке SpecialistNearestAvailableStart на специалиста (индекс consultation_type +
+    nearest_available_start). Если ближайший старт уже "сгорел", а roll forward еще не успел его сдвинуть,
+    наличие следующего свободного старта проверяется по SpecialistAvailableSlot, поэтому результат не зависит
+    от того, как давно выполнялась roll_forward_nearest_available_starts.
+    """
+    current_time = now()
+    next_available_slots = SpecialistAvailableSlot.objects.filter(
+        specialist_id=OuterRef("specialist_id"),
+        consultation_type=OuterRef("consultation_type"),
+        start_datetime__lt=until,
+        bookable_until__gte=current_time,
+    )
+    available_specialist_ids = (
+        SpecialistNearestAvailableStart.objects
+        .filter(
+            Q(bookable_until__gte=current_time) | Exists(next_available_slots),
+            consultation_type=consultation_type,
+            nearest_available_start__lt=until,
+        )
+        .values("specialist_id")
+    )
+
+    return queryset.filter(user_id__in=available_specialist_ids)
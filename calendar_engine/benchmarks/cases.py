@@ -0,0 +1,314 @@
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from aggregator._web.services.basic_filter_catalog import (
+    apply_catalog_basic_filters, is_nearest_days_session_time_mode_enabled)
+from aggregator._web.services.final_aggregator import \
+    PsychologistAggregatorService
+from calendar_engine.application.factories.generate_specialist_schedule_factory import \
+    build_specialist_schedule_runtime_contexts
+from calendar_engine.application.use_cases.filter_and_match_availability import \
+    FilterAndMatchSlotsUseCase
+from calendar_engine.application.use_cases.find_available_specialists import \
+    FindAvailableSpecialistsUseCase
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.availability_snapshot.schedule_cache import \
+    invalidate_specialist_schedule_cache
+from calendar_engine.benchmarks.runner import BenchmarkResult, run_benchmark
+from calendar_engine.benchmarks.synthetic import (
+    build_synthetic_schedule_use_cases, build_synthetic_selected_slot_keys,
+    build_synthetic_slot_filter)
+from calendar_engine.domain.availability.domain_slot_generator import (
+    DOMAIN_SLOTS_CACHE, DomainSlotGenerator)
+from calendar_engine.domain.matching.matcher import SelectedSlotsMatcher
+from core.services.mixins_ps_catalog import CatalogPsychologistQuerysetMixin
+from users.models import ClientProfile
+
+
+@dataclass(frozen=True)
+class BenchmarkParameters:
+    """Параметры прогона benchmark-сценариев (сохраняются вместе с baseline)."""
+
+    specialists: int
+    days_ahead: int
+    exceptions_per_specialist: int
+    busy_slots_per_specialist: int
+    selected_slots: int
+    clients: int
+    repeat: int
+    seed: int
+
+    def to_dict(self) -> dict:
+        """Представление параметров для сохранения в baseline."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """Описание benchmark-сценария.
+
+    - requires_db: сценарию нужна локальная БД с данными (каталог, matching), а не только синтетика в памяти;
+    - run: запускает сценарий и возвращает результат или None, если для сценария нет данных.
+    """
+
+    name: str
+    description: str
+    requires_db: bool
+    run: Callable[[BenchmarkParameters], Optional[BenchmarkResult]]
+
+
+def _get_benchmark_start() -> datetime:
+    """Текущий момент в локальной timezone проекта (синтетические специалисты живут в ней)."""
+    return now().astimezone()
+
+
+# СЦЕНАРИИ БЕЗ БД (чистый Python calendar engine на синтетических данных)
+
+def _run_domain_grid(parameters: BenchmarkParameters) -> BenchmarkResult:
+    """Генерация доменной сетки без кэша (холодный старт процесса / новый день)."""
+    date_from = _get_benchmark_start().date()
+
+    def scenario(_state: Any) -> Dict[str, int]:
+        DOMAIN_SLOTS_CACHE.clear()
+        domain_slots = DomainSlotGenerator().generate_domain_slots(
+            date_from=date_from,
+            days_ahead=parameters.days_ahead,
+        )
+        return {"domain_slots": len(domain_slots)}
+
+    return run_benchmark(name="domain_grid", func=scenario, repeat=parameters.repeat)
+
+
+def _build_schedule_use_cases(parameters: BenchmarkParameters) -> List[GenerateSpecialistScheduleUseCase]:
+    """Свежие use-case синтетических специалистов (у фильтров доступности внутри еще пустые кэши окон)."""
+    current_datetime = _get_benchmark_start()
+
+    return build_synthetic_schedule_use_cases(
+        specialists_count=parameters.specialists,
+        date_from=current_datetime.date(),
+        days_ahead=parameters.days_ahead,
+        current_datetime=current_datetime,
+        exceptions_per_specialist=parameters.exceptions_per_specialist,
+        busy_slots_per_specialist=parameters.busy_slots_per_specialist,
+        seed=parameters.seed,
+    )
+
+
+def _run_specialist_schedule(parameters: BenchmarkParameters) -> BenchmarkResult:
+    """Полное расписание каждого специалиста: GenerateSpecialistScheduleUseCase.execute()."""
+
+    def scenario(use_cases: List[GenerateSpecialistScheduleUseCase]) -> Dict[str, int]:
+        return {"available_slots": sum(len(use_case.execute()) for use_case in use_cases)}
+
+    return run_benchmark(
+        name="specialist_schedule",
+        func=scenario,
+        setup=lambda: _build_schedule_use_cases(parameters),
+        repeat=parameters.repeat,
+    )
+
+
+def _run_find_available_specialists(parameters: BenchmarkParameters) -> BenchmarkResult:
+    """Фильтр каталога "Время сессии" без материализации: проверка только выбранных клиентом стартов."""
+    slot_keys = build_synthetic_selected_slot_keys(
+        date_from=_get_benchmark_start().date(),
+        days_ahead=parameters.days_ahead,
+        selected_slots_count=parameters.selected_slots,
+        seed=parameters.seed,
+    )
+
+    def setup() -> FindAvailableSpecialistsUseCase:
+        use_cases = dict(enumerate(_build_schedule_use_cases(parameters)))
+        return FindAvailableSpecialistsUseCase(
+            schedule_use_cases=use_cases,
+            slot_keys_by_profile_id={profile_id: slot_keys for profile_id in use_cases},
+        )
+
+    def scenario(use_case: FindAvailableSpecialistsUseCase) -> Dict[str, int]:
+        return {"matched_specialists": len(use_case.execute())}
+
+    return run_benchmark(
+        name="find_available_specialists",
+        func=scenario,
+        setup=setup,
+        repeat=parameters.repeat,
+    )
+
+
+def _run_selected_slots_matcher(parameters: BenchmarkParameters) -> BenchmarkResult:
+    """Matching подбора: доменная сетка -> AvailabilitySlotFilter -> SelectedSlotsMatcher по каждому специалисту."""
+    date_from = _get_benchmark_start().date()
+    domain_slots = DomainSlotGenerator().generate_domain_slots(date_from=date_from, days_ahead=parameters.days_ahead)
+    matcher = SelectedSlotsMatcher(
+        selected_slots=build_synthetic_selected_slot_keys(
+            date_from=date_from,
+            days_ahead=parameters.days_ahead,
+            selected_slots_count=parameters.selected_slots,
+            seed=parameters.seed,
+        )
+    )
+
+    def setup() -> List[FilterAndMatchSlotsUseCase]:
+        rnd = random.Random(parameters.seed)
+        return [
+            FilterAndMatchSlotsUseCase(
+                slot_filter=build_synthetic_slot_filter(
+                    rnd=rnd,
+                    date_from=date_from,
+                    days_ahead=parameters.days_ahead,
+                    exceptions_count=parameters.exceptions_per_specialist,
+                ),
+                matcher=matcher,
+            )
+            for _ in range(parameters.specialists)
+        ]
+
+    def scenario(use_cases: List[FilterAndMatchSlotsUseCase]) -> Dict[str, int]:
+        return {
+            "matched_specialists": sum(
+                1 for use_case in use_cases if use_case.execute(domain_slots=domain_slots).has_match
+            )
+        }
+
+    return run_benchmark(
+        name="selected_slots_matcher",
+        func=scenario,
+        setup=setup,
+        repeat=parameters.repeat,
+    )
+
+
+# СЦЕНАРИИ С ЛОКАЛЬНОЙ БД (работают на данных, которые уже загружены в локальную БД: fixtures или набор
+# команды generate_synthetic_data для реалистичных объемов)
+
+def _build_selected_session_slots(parameters: BenchmarkParameters) -> List[str]:
+    """ISO-строки выбранных клиентом стартов для фильтра каталога (завтра и дальше, с шагом в несколько часов)."""
+    first_start = now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    return [
+        (first_start + timedelta(hours=slot_index * 5)).isoformat()
+        for slot_index in range(parameters.selected_slots)
+    ]
+
+
+def _run_catalog_filter(parameters: BenchmarkParameters, *, filters_state: dict, name: str) -> BenchmarkResult:
+    """Фильтрация каталога через apply_catalog_basic_filters() по базовому QuerySet страницы каталога.
+
+    Перед каждым прогоном (и перед warmup) кэш расписаний специалистов каталога сбрасывается: иначе warmup
+    заполнил бы его, и замеры показывали бы чтение из кэша, а не фильтрацию.
+    """
+    specialist_user_ids = list(CatalogPsychologistQuerysetMixin().get_queryset().values_list("user_id", flat=True))
+
+    def setup() -> None:
+        invalidate_specialist_schedule_cache(specialist_user_ids=specialist_user_ids)
+
+    def scenario(_state: Any) -> Dict[str, int]:
+        queryset = CatalogPsychologistQuerysetMixin().get_queryset()
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            matched_profile_ids = list(
+                apply_catalog_basic_filters(queryset, filters_state).values_list("pk", flat=True)
+            )
+
+        return {"matched_specialists": len(matched_profile_ids), "queries": len(captured_queries)}
+
+    return run_benchmark(name=name, func=scenario, setup=setup, repeat=parameters.repeat)
+
+
+def _run_catalog_filter_specific(parameters: BenchmarkParameters) -> BenchmarkResult:
+    return _run_catalog_filter(
+        parameters,
+        filters_state={
+            "consultation_type": "individual",
+            "session_time_mode": "specific",
+            "selected_session_slots": _build_selected_session_slots(parameters),
+        },
+        name="catalog_filter_specific",
+    )
+
+
+def _run_catalog_filter_this_week(parameters: BenchmarkParameters) -> Optional[BenchmarkResult]:
+    """Фильтр "Ближайшие 7 дней": без материализованной доступности режим не применяется, сценарий пропускается."""
+    if not is_nearest_days_session_time_mode_enabled():
+        return None
+
+    return _run_catalog_filter(
+        parameters,
+        filters_state={"consultation_type": "individual", "session_time_mode": "this_week"},
+        name="catalog_filter_this_week",
+    )
+
+
+def _run_schedule_runtime_contexts(parameters: BenchmarkParameters) -> Optional[BenchmarkResult]:
+    """Расписания специалистов каталога без кэшей: пакетное чтение БД + GenerateSpecialistScheduleUseCase."""
+    profiles = list(CatalogPsychologistQuerysetMixin().get_queryset()[:parameters.specialists])
+    if not profiles:
+        return None
+
+    def scenario(_state: Any) -> Dict[str, int]:
+        with CaptureQueriesContext(connection) as captured_queries:
+            runtime_contexts = build_specialist_schedule_runtime_contexts(
+                specialist_profiles=profiles,
+                consultation_type="individual",
+            )
+
+        available_slots = sum(
+            len(GenerateSpecialistScheduleUseCase(**runtime_context).execute())
+            for runtime_context in runtime_contexts.values()
+            if runtime_context is not None
+        )
+        return {"specialists": len(profiles), "available_slots": available_slots, "queries": len(captured_queries)}
+
+    return run_benchmark(name="schedule_runtime_contexts", func=scenario, repeat=parameters.repeat)
+
+
+def _run_aggregator_matching(parameters: BenchmarkParameters) -> Optional[BenchmarkResult]:
+    """Подбор психологов для клиентов с предпочтениями по времени (PsychologistAggregatorService)."""
+    client_profiles = list(
+        ClientProfile.objects
+        .filter(has_time_preferences=True)
+        .select_related("user")
+        .order_by("pk")[:parameters.clients]
+    )
+    if not client_profiles:
+        return None
+
+    def scenario(_state: Any) -> Dict[str, int]:
+        with CaptureQueriesContext(connection) as captured_queries:
+            matched_count = sum(
+                len(PsychologistAggregatorService(client_profile).get_aggregated_results())
+                for client_profile in client_profiles
+            )
+
+        return {"clients": len(client_profiles), "matched": matched_count, "queries": len(captured_queries)}
+
+    return run_benchmark(name="aggregator_matching", func=scenario, repeat=parameters.repeat)
+
+
+BENCHMARK_CASES: Dict[str, BenchmarkCase] = {
+    case.name: case
+    for case in (
+        BenchmarkCase("domain_grid", "Генерация доменной сетки без кэша", False, _run_domain_grid),
+        BenchmarkCase("specialist_schedule", "Полное расписание синтетических специалистов", False,
+                      _run_specialist_schedule),
+        BenchmarkCase("find_available_specialists", "Проверка выбранных стартов у синтетических специалистов",
+                      False, _run_find_available_specialists),
+        BenchmarkCase("selected_slots_matcher", "Matching выбранных слотов у синтетических специалистов", False,
+                      _run_selected_slots_matcher),
+        BenchmarkCase("catalog_filter_specific", "Фильтр каталога по выбранным стартам (локальная БД)", True,
+                      _run_catalog_filter_specific),
+        BenchmarkCase("catalog_filter_this_week", "Фильтр каталога \"Ближайшие 7 дней\" (локальная БД)", True,
+                      _run_catalog_filter_this_week),
+        BenchmarkCase("schedule_runtime_contexts", "Расписания специалистов каталога без кэша (локальная БД)",
+                      True, _run_schedule_runtime_contexts),
+        BenchmarkCase("aggregator_matching", "Подбор психологов для клиентов (локальная БД)", True,
+                      _run_aggregator_matching),
+    )
+}
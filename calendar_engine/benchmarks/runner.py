@@ -0,0 +1,149 @@
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Результат одного benchmark-сценария.
+
+    - best_seconds: лучший прогон (меньше всего подвержен шуму машины, по нему сравниваем с baseline);
+    - median_seconds: медиана прогонов;
+    - details: дополнительные показатели сценария (количество SQL-запросов, найденных специалистов и т.п.).
+    """
+
+    name: str
+    repeat: int
+    best_seconds: float
+    median_seconds: float
+    details: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BaselineComparison:
+    """Сравнение результата сценария с сохраненным baseline."""
+
+    name: str
+    current_seconds: float
+    baseline_seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """Во сколько раз текущий прогон медленнее (>1) или быстрее (<1) baseline."""
+        if self.baseline_seconds <= 0:
+            return 1.0
+        return self.current_seconds / self.baseline_seconds
+
+
+def run_benchmark(
+    *,
+    name: str,
+    func: Callable[[Any], Optional[Dict[str, int]]],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """Выполняет сценарий warmup + repeat раз и возвращает лучшее и медианное время.
+
+    :param func: Сценарий, принимает результат setup() (или None). Может вернуть словарь с дополнительными
+        показателями (берется из последнего прогона).
+    :param setup: Подготовка данных перед КАЖДЫМ прогоном, не входит в замер. Нужна, когда сценарий
+        прогревает внутренние кэши объектов (например, AvailabilitySlotFilter кэширует окна по дням),
+        и повторный прогон на тех же объектах был бы нечестно быстрым.
+    :param warmup: Сколько прогонов выполнить до замеров (прогрев импортов, кэшей процесса, соединения с БД).
+    """
+    for _ in range(warmup):
+        func(setup() if setup else None)
+
+    timings: List[float] = []
+    details: Dict[str, int] = {}
+
+    for _ in range(max(repeat, 1)):
+        state = setup() if setup else None
+        started_at = perf_counter()
+        details = func(state) or {}
+        timings.append(perf_counter() - started_at)
+
+    return BenchmarkResult(
+        name=name,
+        repeat=len(timings),
+        best_seconds=min(timings),
+        median_seconds=median(timings),
+        details=details,
+    )
+
+
+def load_baseline(path: Path) -> dict:
+    """Читает сохраненный baseline: {"parameters": {...}, "results": {имя сценария: {"best_seconds": ..., ...}}}.
+
+    Нет файла - пустой baseline.
+    """
+    if not path.exists():
+        return {"parameters": {}, "results": {}}
+
+    with path.open(encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    return {"parameters": baseline.get("parameters", {}), "results": baseline.get("results", {})}
+
+
+def find_baseline_parameter_differences(baseline: dict, *, parameters: dict) -> Dict[str, tuple]:
+    """Параметры прогона, которые отличаются от сохраненных вместе с baseline: {параметр: (baseline, текущий)}.
+
+    Пустой словарь - прогоны сопоставимы (или baseline еще нет).
+    """
+    baseline_parameters = baseline.get("parameters", {})
+    if not baseline.get("results"):
+        return {}
+
+    return {
+        name: (baseline_parameters.get(name), value)
+        for name, value in parameters.items()
+        if baseline_parameters.get(name) != value
+    }
+
+
+def save_baseline(path: Path, *, results: Iterable[BenchmarkResult], parameters: dict) -> None:
+    """Сохраняет результаты как новый baseline вместе с параметрами прогона (чтобы сравнивать сопоставимое)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open("w", encoding="utf-8") as baseline_file:
+        json.dump(
+            {
+                "parameters": parameters,
+                "results": {result.name: asdict(result) for result in results},
+            },
+            baseline_file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def compare_with_baseline(
+    results: Iterable[BenchmarkResult],
+    baseline: dict,
+    *,
+    parameters: dict,
+) -> List[BaselineComparison]:
+    """Сопоставляет результаты с baseline по имени сценария (сценарии без baseline пропускаются).
+
+    Если baseline сохранен с другими параметрами (количество специалистов, горизонт, seed и т.п.), время
+    несопоставимо, и сравнение не выполняется вовсе (см. find_baseline_parameter_differences()).
+    """
+    if find_baseline_parameter_differences(baseline, parameters=parameters):
+        return []
+
+    baseline_results = baseline.get("results", {})
+
+    return [
+        BaselineComparison(
+            name=result.name,
+            current_seconds=result.best_seconds,
+            baseline_seconds=baseline_results[result.name]["best_seconds"],
+        )
+        for result in results
+        if result.name in baseline_results
+    ]
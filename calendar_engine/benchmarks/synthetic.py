@@ -0,0 +1,169 @@
+import random
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import List, Set, Tuple
+
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.domain.availability.domain_slot_generator import \
+    DomainSlotGenerator
+from calendar_engine.domain.availability.get_user_slots import \
+    AvailabilitySlotFilter
+from calendar_engine.domain.availability.user_exceptions import \
+    DateIndexedAvailabilityExceptions
+from calendar_engine.domain.availability.user_rules import \
+    WeeklyAvailabilityRule
+
+# Ключ доменного старта: (day, start_time)
+SlotKey = Tuple[date, time]
+
+
+def build_synthetic_rule_time_windows(rnd: random.Random) -> List[Tuple[time, time]]:
+    """Рабочие окна дня: либо один длинный интервал, либо два интервала с перерывом на обед."""
+    day_start_hour = rnd.randint(7, 11)
+    day_end_hour = rnd.randint(17, 22)
+
+    if rnd.random() < 0.5:
+        return [(time(day_start_hour), time(day_end_hour))]
+
+    lunch_start_hour = rnd.randint(day_start_hour + 2, 15)
+    return [
+        (time(day_start_hour), time(lunch_start_hour)),
+        (time(lunch_start_hour + 1), time(day_end_hour)),
+    ]
+
+
+def build_synthetic_slot_filter(
+    *,
+    rnd: random.Random,
+    date_from: date,
+    days_ahead: int,
+    exceptions_count: int,
+) -> AvailabilitySlotFilter:
+    """Собирает фильтр доступности одного синтетического специалиста: правило по дням недели
+    и "плотные" исключения (закрытые дни и дни с переопределенными окнами) внутри горизонта расписания."""
+    rule = WeeklyAvailabilityRule(
+        weekdays=set(rnd.sample(range(7), rnd.randint(3, 6))),
+        time_windows=build_synthetic_rule_time_windows(rnd),
+    )
+    exceptions = DateIndexedAvailabilityExceptions()
+
+    for _ in range(exceptions_count):
+        exception_day = date_from + timedelta(days=rnd.randrange(days_ahead))
+
+        if rnd.random() < 0.3:
+            exceptions.add_unavailable_range(date_from=exception_day, date_to=exception_day)
+        else:
+            override_start_hour = rnd.randint(8, 14)
+            exceptions.add_override_range(
+                date_from=exception_day,
+                date_to=exception_day,
+                time_windows=[(time(override_start_hour), time(override_start_hour + rnd.randint(2, 8)))],
+            )
+
+    return AvailabilitySlotFilter(rule=rule, exceptions=(exceptions,) if exceptions else ())
+
+
+def build_synthetic_busy_intervals(
+    *,
+    rnd: random.Random,
+    date_from: date,
+    days_ahead: int,
+    busy_slots_count: int,
+    specialist_tz: tzinfo,
+    session_duration_minutes: int,
+    break_between_sessions_minutes: int,
+) -> List[Tuple[datetime, datetime]]:
+    """Занятые интервалы специалиста (уже созданные встречи) в его timezone, как их собирает factory:
+    busy_end = конец сессии + перерыв между сессиями."""
+    busy_intervals = []
+
+    for _ in range(busy_slots_count):
+        busy_start = datetime.combine(
+            date_from + timedelta(days=rnd.randrange(days_ahead)),
+            time(rnd.randint(8, 21)),
+            tzinfo=specialist_tz,
+        )
+        busy_intervals.append(
+            (
+                busy_start,
+                busy_start + timedelta(minutes=session_duration_minutes + break_between_sessions_minutes),
+            )
+        )
+
+    return busy_intervals
+
+
+def build_synthetic_schedule_use_cases(
+    *,
+    specialists_count: int,
+    date_from: date,
+    days_ahead: int,
+    current_datetime: datetime,
+    exceptions_per_specialist: int,
+    busy_slots_per_specialist: int,
+    seed: int,
+) -> List[GenerateSpecialistScheduleUseCase]:
+    """Собирает GenerateSpecialistScheduleUseCase для множества синтетических специалистов без БД.
+
+    Все специалисты находятся в timezone current_datetime, а их параметры (правило, исключения, встречи,
+    длительность сессий, minimum notice, override по дням) генерируются детерминированно по seed,
+    поэтому повторные прогоны с тем же seed сравнимы между собой.
+    """
+    rnd = random.Random(seed)
+    specialist_tz = current_datetime.tzinfo
+    slot_generator = DomainSlotGenerator()
+    use_cases = []
+
+    for _ in range(specialists_count):
+        session_duration_minutes = rnd.choice((50, 60, 90))
+        break_between_sessions_minutes = rnd.choice((0, 10, 15, 30))
+        override_day = date_from + timedelta(days=rnd.randrange(days_ahead))
+
+        use_cases.append(
+            GenerateSpecialistScheduleUseCase(
+                slot_generator=slot_generator,
+                slot_filter=build_synthetic_slot_filter(
+                    rnd=rnd,
+                    date_from=date_from,
+                    days_ahead=days_ahead,
+                    exceptions_count=exceptions_per_specialist,
+                ),
+                date_from=date_from,
+                days_ahead=days_ahead,
+                current_datetime=current_datetime,
+                session_duration_minutes=session_duration_minutes,
+                break_between_sessions_minutes=break_between_sessions_minutes,
+                override_session_duration_minutes_by_day={override_day: rnd.choice((60, 90, 120))},
+                override_break_between_sessions_minutes_by_day={override_day: rnd.choice((0, 15))},
+                minimum_booking_notice_hours=rnd.choice((0, 1, 2, 12, 24)),
+                override_minimum_booking_notice_hours_by_day={},
+                busy_intervals=build_synthetic_busy_intervals(
+                    rnd=rnd,
+                    date_from=date_from,
+                    days_ahead=days_ahead,
+                    busy_slots_count=busy_slots_per_specialist,
+                    specialist_tz=specialist_tz,
+                    session_duration_minutes=session_duration_minutes,
+                    break_between_sessions_minutes=break_between_sessions_minutes,
+                ),
+            )
+        )
+
+    return use_cases
+
+
+def build_synthetic_selected_slot_keys(
+    *,
+    date_from: date,
+    days_ahead: int,
+    selected_slots_count: int,
+    seed: int,
+) -> Set[SlotKey]:
+    """Выбранные клиентом доменные старты (day, start_time) внутри горизонта расписания."""
+    rnd = random.Random(seed)
+    domain_slots = DomainSlotGenerator().generate_domain_slots(date_from=date_from, days_ahead=days_ahead)
+
+    return {
+        (slot.day, slot.start)
+        for slot in rnd.sample(domain_slots, min(selected_slots_count, len(domain_slots)))
+    }
@@ -0,0 +1,575 @@
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from slugify import slugify
+
+from aggregator._web.services.topic_type_mapping import \
+    CLIENT_TO_TOPIC_TYPE_MAP
+from calendar_engine.benchmarks.synthetic import \
+    build_synthetic_rule_time_windows
+from calendar_engine.models import (AvailabilityException,
+                                    AvailabilityExceptionTimeWindow,
+                                    AvailabilityRule,
+                                    AvailabilityRuleTimeWindow, CalendarEvent,
+                                    EventParticipant, SlotParticipant,
+                                    TimeSlot)
+from users.constants import AGE_BUCKET_CHOICES, GENDER_CHOICES
+from users.models import (AppUser, ClientProfile, Education, Method,
+                          PsychologistProfile, Specialisation, Topic,
+                          UserRole)
+
+# Все синтетические пользователи получают email в этом домене, чтобы их было легко найти и отличить от fixtures
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.loadtest"
+
+# Часовые поясы как в fixtures. Все со смещением на целое число часов: синтетические сессии начинаются ровно
+# в начале часа, поэтому в UTC они тоже остаются на "часовой сетке" и не пересекаются у одного клиента
+SYNTHETIC_TIMEZONES = (
+    "Europe/Minsk",
+    "Europe/Moscow",
+    "Europe/Kaliningrad",
+    "Asia/Yekaterinburg",
+    "Asia/Almaty",
+    "Asia/Vladivostok",
+)
+
+SYNTHETIC_FIRST_NAMES = {
+    "male": ("Алексей", "Дмитрий", "Иван", "Сергей", "Андрей", "Максим", "Павел", "Егор", "Никита", "Роман"),
+    "female": ("Ирина", "Ольга", "Анна", "Мария", "Елена", "Дарья", "Наталья", "Юлия", "Светлана", "Ксения"),
+}
+SYNTHETIC_LAST_NAMES = (
+    "Иванов", "Петров", "Смирнов", "Кузнецов", "Соколов", "Попов", "Лебедев", "Козлов", "Новиков", "Морозов",
+)
+
+SYNTHETIC_EDUCATIONS = (
+    ("Московский государственный университет", "Магистр", "Клиническая психология"),
+    ("Санкт-Петербургский государственный университет", "Специалист", "Психология"),
+    ("Белорусский государственный университет", "Бакалавр", "Психология"),
+    ("Институт практической психологии", "Сертификат", "Психологическое консультирование"),
+    ("Институт гештальт-терапии", "Сертификат", "Гештальт-терапия"),
+)
+
+SYNTHETIC_SESSION_TITLE = "Терапевтическая сессия с психологом"
+
+
+@dataclass(frozen=True)
+class SyntheticDatasetParameters:
+    """Параметры генерации синтетического набора данных.
+
+    - sessions_per_psychologist: сколько будущих забронированных сессий (TimeSlot) создать каждому психологу;
+    - days_ahead: горизонт (в днях от завтрашнего дня), внутри которого создаются исключения, сессии
+      и предпочитаемые клиентами слоты;
+    - chunk_size: сколько психологов собирать в памяти за один проход (ограничивает расход памяти);
+    - batch_size: batch_size для bulk_create().
+    """
+
+    psychologists: int
+    clients: int
+    sessions_per_psychologist: int
+    exceptions_per_psychologist: int
+    days_ahead: int
+    seed: int
+    chunk_size: int
+    batch_size: int
+    password: str
+
+
+class SyntheticDatasetError(Exception):
+    """В БД нет справочников, без которых нельзя собрать реалистичные профили (темы, методы, специализации)."""
+
+
+@dataclass
+class _SyntheticSpecialistCalendar:
+    """Рабочий график одного синтетического психолога, по которому подбираются времена забронированных сессий."""
+
+    user: AppUser
+    timezone_name: str
+    weekdays: Set[int]
+    time_windows: List[Tuple[time, time]]
+    session_duration_minutes: int
+    break_between_sessions_minutes: int
+    excluded_days: Set[date]
+
+
+class SyntheticDatasetGenerator:
+    """Генерирует масштабный набор данных для нагрузочного тестирования каталога, подбора и бронирования.
+
+    Что создается:
+        - клиенты (AppUser + ClientProfile) с предпочтениями по психологу, темам, методам и времени сессии;
+        - психологи (AppUser + PsychologistProfile) с темами, методами, специализациями и образованием;
+        - у каждого психолога: AvailabilityRule + окна, исключения (выходные дни и дни с другими окнами)
+          и забронированные клиентами сессии (CalendarEvent + TimeSlot + участники на обоих уровнях).
+
+    ВАЖНО:
+        - все записи создаются через bulk_create(), поэтому save(), full_clean() и signals НЕ выполняются.
+          Slug психолога формируется здесь же, а материализованную доступность после генерации нужно пересобрать
+          (команда generate_synthetic_data делает это с флагом --rebuild-availability);
+        - справочники (темы, методы, специализации) не генерируются, а берутся из БД (fixtures);
+        - генерация детерминирована по seed (кроме created_at и "сегодня").
+    """
+
+    def __init__(self, parameters: SyntheticDatasetParameters) -> None:
+        self.parameters = parameters
+        self.rnd = random.Random(parameters.seed)
+        self.today = timezone.localdate()
+        self.created_rows: Dict[str, int] = {}
+        self.specialist_user_ids: List[uuid.UUID] = []
+
+        # Один хэш пароля на всех пользователей: хэширование (PBKDF2) на каждого заняло бы больше, чем сама вставка
+        self._password_hash = make_password(parameters.password)
+        # Занятые часы клиентов в UTC: у одного клиента не может быть двух сессий одновременно
+        # (в БД это защищено ExclusionConstraint prevent_slot_overlap_per_creator)
+        self._client_busy_starts: Set[Tuple[int, datetime]] = set()
+
+    def generate(self) -> Dict[str, int]:
+        """Создает весь набор данных в одной транзакции и возвращает количество созданных строк по таблицам."""
+        self._load_reference_data()
+
+        with transaction.atomic():
+            clients = self._create_clients()
+
+            for chunk_start in range(0, self.parameters.psychologists, self.parameters.chunk_size):
+                chunk_count = min(self.parameters.chunk_size, self.parameters.psychologists - chunk_start)
+                self._create_psychologists_chunk(first_index=chunk_start, count=chunk_count, clients=clients)
+
+        return dict(self.created_rows)
+
+    # СПРАВОЧНИКИ
+
+    def _load_reference_data(self) -> None:
+        """Загружает id справочников и роли, к которым привязываются синтетические профили."""
+        self.topic_ids_by_type: Dict[str, List[int]] = {}
+        for topic_id, topic_type in Topic.objects.values_list("id", "type"):
+            self.topic_ids_by_type.setdefault(topic_type, []).append(topic_id)
+
+        self.method_ids = list(Method.objects.values_list("id", flat=True))
+        self.specialisation_ids = list(Specialisation.objects.values_list("id", flat=True))
+
+        if not self.topic_ids_by_type or not self.method_ids or not self.specialisation_ids:
+            raise SyntheticDatasetError(
+                "В БД нет справочников тем, методов или специализаций. Сначала загрузите fixtures: "
+                "python manage.py loaddata fixtures/topics.json fixtures/methods.json fixtures/specialisations.json"
+            )
+
+        self.all_topic_ids = [topic_id for topic_ids in self.topic_ids_by_type.values() for topic_id in topic_ids]
+        self.psychologist_role, _ = UserRole.objects.get_or_create(role="psychologist")
+        self.client_role, _ = UserRole.objects.get_or_create(role="client")
+
+    # ОБЩИЕ ХЕЛПЕРЫ
+
+    def _bulk_create(self, model, objects: list) -> list:
+        """bulk_create() с batch_size и учетом количества созданных строк по таблице."""
+        created = model.objects.bulk_create(objects, batch_size=self.parameters.batch_size)
+        table_name = model._meta.db_table
+        self.created_rows[table_name] = self.created_rows.get(table_name, 0) + len(created)
+        return created
+
+    def _build_user(self, *, kind: str, index: int, role: UserRole, gender: str, age: int) -> AppUser:
+        """Синтетический пользователь. uuid берется из self.rnd, чтобы прогоны с одним seed совпадали."""
+        return AppUser(
+            uuid=uuid.UUID(int=self.rnd.getrandbits(128), version=4),
+            first_name=self.rnd.choice(SYNTHETIC_FIRST_NAMES[gender]),
+            last_name=self.rnd.choice(SYNTHETIC_LAST_NAMES) + ("а" if gender == "female" else ""),
+            age=age,
+            email=f"synthetic-{self.parameters.seed}-{kind}-{index}@{SYNTHETIC_EMAIL_DOMAIN}",
+            role=role,
+            timezone=self.rnd.choice(SYNTHETIC_TIMEZONES),
+            is_active=True,
+            password=self._password_hash,
+        )
+
+    def _sample_ids(self, ids: List[int], *, min_count: int, max_count: int) -> List[int]:
+        """Случайное подмножество id справочника размером от min_count до max_count."""
+        return self.rnd.sample(ids, min(len(ids), self.rnd.randint(min_count, max_count)))
+
+    def _horizon_day(self) -> date:
+        """Случайный день внутри горизонта генерации (начиная с завтрашнего дня)."""
+        return self.today + timedelta(days=self.rnd.randint(1, self.parameters.days_ahead))
+
+    # КЛИЕНТЫ
+
+    def _create_clients(self) -> List[AppUser]:
+        """Создает клиентов с предпочтениями. Возвращает пользователей-клиентов для бронирования сессий."""
+        users = []
+        profiles = []
+        preferred_methods = []
+        requested_topics = []
+
+        for index in range(self.parameters.clients):
+            user = self._build_user(
+                kind="client",
+                index=index,
+                role=self.client_role,
+                gender=self.rnd.choice(GENDER_CHOICES)[0],
+                age=self.rnd.randint(18, 65),
+            )
+            users.append(user)
+
+            topic_type = "couple" if self.rnd.random() < 0.2 else "individual"
+            has_preferences = self.rnd.random() < 0.6
+            has_time_preferences = self.rnd.random() < 0.7
+            profiles.append(
+                ClientProfile(
+                    user=user,
+                    therapy_experience=self.rnd.random() < 0.4,
+                    has_preferences=has_preferences,
+                    preferred_ps_gender=(
+                        [self.rnd.choice(GENDER_CHOICES)[0]] if has_preferences and self.rnd.random() < 0.5 else []
+                    ),
+                    preferred_ps_age=(
+                        [bucket for bucket, _label in self.rnd.sample(AGE_BUCKET_CHOICES, 2)]
+                        if has_preferences and self.rnd.random() < 0.5
+                        else []
+                    ),
+                    preferred_topic_type=topic_type,
+                    has_time_preferences=has_time_preferences,
+                    preferred_slots=(
+                        self._build_client_preferred_slots(timezone_name=str(user.timezone))
+                        if has_time_preferences
+                        else []
+                    ),
+                )
+            )
+
+            topic_ids = self.topic_ids_by_type.get(CLIENT_TO_TOPIC_TYPE_MAP[topic_type]) or self.all_topic_ids
+            requested_topics.append((index, self._sample_ids(topic_ids, min_count=1, max_count=4)))
+            if has_preferences:
+                preferred_methods.append((index, self._sample_ids(self.method_ids, min_count=1, max_count=3)))
+
+        self._bulk_create(AppUser, users)
+        profiles = self._bulk_create(ClientProfile, profiles)
+
+        self._bulk_create(
+            ClientProfile.requested_topics.through,
+            [
+                ClientProfile.requested_topics.through(clientprofile_id=profiles[index].pk, topic_id=topic_id)
+                for index, topic_ids in requested_topics
+                for topic_id in topic_ids
+            ],
+        )
+        self._bulk_create(
+            ClientProfile.preferred_methods.through,
+            [
+                ClientProfile.preferred_methods.through(clientprofile_id=profiles[index].pk, method_id=method_id)
+                for index, method_ids in preferred_methods
+                for method_id in method_ids
+            ],
+        )
+
+        return users
+
+    def _build_client_preferred_slots(self, *, timezone_name: str) -> List[datetime]:
+        """Предпочитаемые клиентом старты сессии: несколько "ровных" часов внутри горизонта, в UTC."""
+        client_tz = ZoneInfo(timezone_name)
+        preferred_slots = {
+            datetime.combine(self._horizon_day(), time(self.rnd.randint(8, 21)), tzinfo=client_tz)
+            .astimezone(dt_timezone.utc)
+            for _ in range(self.rnd.randint(2, 10))
+        }
+        return sorted(preferred_slots)
+
+    # ПСИХОЛОГИ
+
+    def _create_psychologists_chunk(self, *, first_index: int, count: int, clients: List[AppUser]) -> None:
+        """Создает пачку психологов со всеми связанными данными (профиль, справочники, образование, график, сессии)."""
+        users = []
+        profiles = []
+        profile_relations = []
+
+        for index in range(first_index, first_index + count):
+            gender = self.rnd.choice(GENDER_CHOICES)[0]
+            user = self._build_user(
+                kind="ps",
+                index=index,
+                role=self.psychologist_role,
+                gender=gender,
+                age=self.rnd.randint(25, 70),
+            )
+            users.append(user)
+            profiles.append(self._build_psychologist_profile(user=user, gender=gender))
+            profile_relations.append(
+                (
+                    self._sample_ids(self.all_topic_ids, min_count=3, max_count=10),
+                    self._sample_ids(self.method_ids, min_count=1, max_count=3),
+                    self._sample_ids(self.specialisation_ids, min_count=1, max_count=2),
+                )
+            )
+
+        self._bulk_create(AppUser, users)
+        profiles = self._bulk_create(PsychologistProfile, profiles)
+        self.specialist_user_ids.extend(user.pk for user in users)
+        self._create_psychologist_relations(profiles=profiles, profile_relations=profile_relations)
+        self._create_educations(users=users)
+
+        calendars = self._create_availability(users=users)
+        if clients:
+            self._create_booked_sessions(calendars=calendars, clients=clients)
+
+    def _build_psychologist_profile(self, *, user: AppUser, gender: str) -> PsychologistProfile:
+        """Профиль психолога. Slug задается сразу: bulk_create() не вызывает PsychologistProfile.save()."""
+        price_individual = Decimal(self.rnd.randrange(2000, 9000, 500))
+
+        return PsychologistProfile(
+            user=user,
+            slug=f"{slugify(f'{user.first_name} {user.last_name}')}-{user.pk.hex[:8]}",
+            is_verified=self.rnd.random() < 0.9,
+            gender=gender,
+            is_all_education_verified=True,
+            practice_start_year=self.rnd.randint(1995, self.today.year - 1),
+            languages=["russian", "english"] if self.rnd.random() < 0.2 else ["russian"],
+            therapy_format=self.rnd.choice(("online", "online", "offline", "any")),
+            price_individual=price_individual,
+            price_couples=price_individual + Decimal(self.rnd.randrange(1000, 4000, 500)),
+            work_status="working" if self.rnd.random() < 0.95 else "not_working",
+            rating=Decimal(self.rnd.randint(0, 50)) / 10,
+        )
+
+    def _create_psychologist_relations(
+        self,
+        *,
+        profiles: List[PsychologistProfile],
+        profile_relations: List[Tuple[List[int], List[int], List[int]]],
+    ) -> None:
+        """Создает связи психологов с темами, методами и специализациями напрямую в M2M-таблицах."""
+        topics_through = PsychologistProfile.topics.through
+        methods_through = PsychologistProfile.methods.through
+        specialisations_through = PsychologistProfile.specialisations.through
+        topics_rows = []
+        methods_rows = []
+        specialisations_rows = []
+
+        for profile, (topic_ids, method_ids, specialisation_ids) in zip(profiles, profile_relations):
+            topics_rows.extend(
+                topics_through(psychologistprofile_id=profile.pk, topic_id=topic_id) for topic_id in topic_ids
+            )
+            methods_rows.extend(
+                methods_through(psychologistprofile_id=profile.pk, method_id=method_id) for method_id in method_ids
+            )
+            specialisations_rows.extend(
+                specialisations_through(psychologistprofile_id=profile.pk, specialisation_id=specialisation_id)
+                for specialisation_id in specialisation_ids
+            )
+
+        self._bulk_create(topics_through, topics_rows)
+        self._bulk_create(methods_through, methods_rows)
+        self._bulk_create(specialisations_through, specialisations_rows)
+
+    def _create_educations(self, *, users: List[AppUser]) -> None:
+        """Создает каждому психологу от 1 до 3 записей об образовании (уже верифицированных)."""
+        educations = []
+
+        for user in users:
+            for institution, degree, specialisation in self.rnd.sample(SYNTHETIC_EDUCATIONS, self.rnd.randint(1, 3)):
+                year_start = self.rnd.randint(1990, self.today.year - 2)
+                educations.append(
+                    Education(
+                        creator=user,
+                        country=self.rnd.choice(("RU", "BY", "KZ")),
+                        institution=institution,
+                        degree=degree,
+                        specialisation=specialisation,
+                        year_start=year_start,
+                        year_end=min(year_start + self.rnd.randint(1, 6), self.today.year),
+                        is_verified=True,
+                    )
+                )
+
+        self._bulk_create(Education, educations)
+
+    # РАБОЧИЙ ГРАФИК И СЕССИИ
+
+    def _create_availability(self, *, users: List[AppUser]) -> List[_SyntheticSpecialistCalendar]:
+        """Создает правило доступности с окнами и исключения каждому психологу.
+
+        :return: Рабочий график каждого психолога для подбора времени забронированных сессий.
+        """
+        calendars = []
+        rules = []
+        rule_windows = []
+        exceptions = []
+        exception_windows = []
+
+        for user in users:
+            timezone_name = str(user.timezone)
+            # Сессия вместе с перерывом укладывается в час: сессии специалиста стоят на "часовой сетке",
+            # и их busy intervals не пересекаются (ExclusionConstraint prevent_slot_overlap_per_specialist)
+            session_duration_minutes = self.rnd.choice((50, 60))
+            rule = AvailabilityRule(
+                creator=user,
+                timezone=timezone_name,
+                rule_start=self.today - timedelta(days=self.rnd.randint(0, 90)),
+                rule_end=None,
+                weekdays=sorted(self.rnd.sample(range(7), self.rnd.randint(3, 6))),
+                session_duration_individual=session_duration_minutes,
+                session_duration_couple=90,
+                break_between_sessions=self.rnd.choice((0, 10)) if session_duration_minutes == 50 else 0,
+                minimum_booking_notice_hours=self.rnd.choice((0, 1, 2, 12, 24)),
+                is_active=True,
+            )
+            rules.append(rule)
+
+            time_windows = build_synthetic_rule_time_windows(self.rnd)
+            rule_windows.extend(
+                AvailabilityRuleTimeWindow(rule=rule, start_time=start_time, end_time=end_time)
+                for start_time, end_time in time_windows
+            )
+
+            excluded_days = set()
+            for _ in range(self.parameters.exceptions_per_psychologist):
+                exception_day = self._horizon_day()
+                excluded_days.add(exception_day)
+
+                if self.rnd.random() < 0.3:
+                    exceptions.append(
+                        AvailabilityException(
+                            creator=user,
+                            rule=rule,
+                            exception_start=exception_day,
+                            exception_end=exception_day,
+                            reason="day_off",
+                            exception_type="unavailable",
+                        )
+                    )
+                    continue
+
+                override_start_hour = self.rnd.randint(8, 14)
+                exception = AvailabilityException(
+                    creator=user,
+                    rule=rule,
+                    exception_start=exception_day,
+                    exception_end=exception_day,
+                    reason="short_day",
+                    exception_type="override",
+                )
+                exceptions.append(exception)
+                exception_windows.append(
+                    AvailabilityExceptionTimeWindow(
+                        exception=exception,
+                        override_start_time=time(override_start_hour),
+                        override_end_time=time(override_start_hour + self.rnd.randint(2, 8)),
+                    )
+                )
+
+            calendars.append(
+                _SyntheticSpecialistCalendar(
+                    user=user,
+                    timezone_name=timezone_name,
+                    weekdays=set(rule.weekdays),
+                    time_windows=time_windows,
+                    session_duration_minutes=rule.session_duration_individual,
+                    break_between_sessions_minutes=rule.break_between_sessions,
+                    excluded_days=excluded_days,
+                )
+            )
+
+        self._bulk_create(AvailabilityRule, rules)
+        self._bulk_create(AvailabilityRuleTimeWindow, rule_windows)
+        self._bulk_create(AvailabilityException, exceptions)
+        self._bulk_create(AvailabilityExceptionTimeWindow, exception_windows)
+
+        return calendars
+
+    def _build_session_start_candidates(self, calendar: _SyntheticSpecialistCalendar) -> List[datetime]:
+        """Возможные старты сессий психолога внутри горизонта: рабочие дни без исключений, начало каждого часа
+        рабочего окна, в которое сессия помещается целиком."""
+        specialist_tz = ZoneInfo(calendar.timezone_name)
+        candidates = []
+
+        for day_offset in range(1, self.parameters.days_ahead + 1):
+            day = self.today + timedelta(days=day_offset)
+            if day.weekday() not in calendar.weekdays or day in calendar.excluded_days:
+                continue
+
+            for start_time, end_time in calendar.time_windows:
+                last_start_minutes = end_time.hour * 60 - calendar.session_duration_minutes
+                candidates.extend(
+                    datetime.combine(day, time(hour), tzinfo=specialist_tz)
+                    for hour in range(start_time.hour, end_time.hour)
+                    if hour * 60 <= last_start_minutes
+                )
+
+        return candidates
+
+    def _pick_client_index(self, *, clients_count: int, slot_start_utc: datetime) -> Optional[int]:
+        """Выбирает клиента, у которого этот час еще свободен (несколько попыток, затем сессия пропускается)."""
+        for _ in range(5):
+            client_index = self.rnd.randrange(clients_count)
+            if (client_index, slot_start_utc) not in self._client_busy_starts:
+                self._client_busy_starts.add((client_index, slot_start_utc))
+                return client_index
+
+        return None
+
+    def _create_booked_sessions(
+        self,
+        *,
+        calendars: List[_SyntheticSpecialistCalendar],
+        clients: List[AppUser],
+    ) -> None:
+        """Создает забронированные клиентами будущие сессии так же, как CreateTherapySessionUseCase:
+        CalendarEvent + TimeSlot + участники события и слота (клиент - organizer, психолог - participant)."""
+        events = []
+        slots = []
+        event_participants = []
+        slot_participants = []
+
+        for calendar in calendars:
+            candidates = self._build_session_start_candidates(calendar)
+            sessions_count = min(self.parameters.sessions_per_psychologist, len(candidates))
+
+            for slot_start in sorted(self.rnd.sample(candidates, sessions_count)):
+                slot_start_utc = slot_start.astimezone(dt_timezone.utc)
+                client_index = self._pick_client_index(clients_count=len(clients), slot_start_utc=slot_start_utc)
+                if client_index is None:
+                    continue
+
+                client_user = clients[client_index]
+                event = CalendarEvent(
+                    creator=client_user,
+                    title=SYNTHETIC_SESSION_TITLE,
+                    description="",
+                    event_type="session_individual",
+                    status="planned",
+                    visibility="private",
+                    source="internal",
+                    is_recurring=False,
+                )
+                slot_end_utc = slot_start_utc + timedelta(minutes=calendar.session_duration_minutes)
+                slot = TimeSlot(
+                    creator=client_user,
+                    specialist=calendar.user,
+                    event=event,
+                    start_datetime=slot_start_utc,
+                    end_datetime=slot_end_utc,
+                    specialist_busy_until=slot_end_utc + timedelta(minutes=calendar.break_between_sessions_minutes),
+                    status="planned",
+                    timezone=calendar.timezone_name,
+                    slot_index=1,
+                )
+                events.append(event)
+                slots.append(slot)
+                event_participants.extend(
+                    [
+                        EventParticipant(event=event, user=client_user, role="organizer", status="accepted"),
+                        EventParticipant(event=event, user=calendar.user, role="participant", status="invited"),
+                    ]
+                )
+                slot_participants.extend(
+                    [
+                        SlotParticipant(slot=slot, user=client_user, role="organizer", status="planned"),
+                        SlotParticipant(slot=slot, user=calendar.user, role="participant", status="planned"),
+                    ]
+                )
+
+        self._bulk_create(CalendarEvent, events)
+        self._bulk_create(TimeSlot, slots)
+        self._bulk_create(EventParticipant, event_participants)
+        self._bulk_create(SlotParticipant, slot_participants)
@@ -0,0 +1,233 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Sequence
+
+from django.db import IntegrityError, transaction
+
+from calendar_engine.availability_snapshot.schedule_cache import \
+    invalidate_specialist_schedule_cache
+from calendar_engine.availability_snapshot.services import \
+    schedule_specialist_available_slots_rebuild
+from calendar_engine.booking.exceptions import CreateBookingValidationError
+from calendar_engine.booking.services import map_booking_integrity_error
+from calendar_engine.models import (CalendarEvent, EventParticipant,
+                                    SlotParticipant, TimeSlot)
+
+# =====
+# BULK-ЗАПИСЬ ТЕРАПЕВТИЧЕСКИХ СЕССИЙ (CalendarEvent + TimeSlot + EventParticipant + SlotParticipant)
+# =====
+# Раньше каждое бронирование сохранялось по одному объекту: full_clean() + save() для события, слота
+# и четырех участников = 6 INSERT плюс SELECT-запросы валидации (существование FK, unique_together).
+# Writer собирает все объекты в памяти, валидирует их без обращений к БД и записывает одним bulk_create()
+# на каждую таблицу: 4 INSERT независимо от количества сессий (одна встреча, серия, импорт из админки).
+# ВАЖНО: bulk_create() не отправляет post_save, поэтому пересборку доступности и сброс кэша расписания
+# специалистов writer планирует сам (как это сделали бы signals).
+
+
+@dataclass(frozen=True, slots=True)
+class TherapySessionSlotDraft:
+    """Один временной интервал будущей встречи (будущий TimeSlot).
+
+    Пояснение:
+        - end_datetime - чистое окончание сессии без перерыва специалиста;
+        - specialist_busy_until - окончание сессии плюс перерыв специалиста на день слота
+          (по нему ExclusionConstraint prevent_slot_overlap_per_specialist защищает специалиста).
+    """
+
+    start_datetime: datetime
+    end_datetime: datetime
+    specialist_busy_until: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class TherapySessionDraft:
+    """Все, что нужно для записи одной терапевтической сессии: событие, его слоты и участники.
+
+    Проверка доступности стартов в расписании специалиста - забота вызывающего use-case, writer только
+    валидирует сами объекты и записывает их. У одного события может быть несколько слотов (серия встреч),
+    slot_index им проставляется по порядку начиная с 1.
+    """
+
+    client_user: object
+    specialist_user: object
+    consultation_type: str
+    timezone: object
+    slots: Sequence[TherapySessionSlotDraft]
+    previous_event: CalendarEvent | None = None
+    is_recurring: bool = False
+
+
+@dataclass(slots=True)
+class WrittenTherapySession:
+    """Результат записи одной сессии: сохраненное событие и его слоты в порядке slot_index."""
+
+    event: CalendarEvent
+    slots: List[TimeSlot] = field(default_factory=list)
+
+
+def full_clean_in_memory(*, instance) -> None:
+    """Модельная валидация объекта без SQL-запросов.
+
+    Что пропускаем и почему:
+        - ForeignKey.validate() делает SELECT на каждый FK, а связанные объекты вызывающий код уже получил
+          из БД (или только что создал сам);
+        - unique_together (event + user, event + slot_index) в writer гарантирует сама сборка объектов;
+        - ExclusionConstraint окончательно проверяет PostgreSQL при записи (см. _bulk_create_slots).
+    clean() модели (бизнес-инварианты статусов и причин отмены) и проверки полей выполняются как обычно.
+    """
+    relation_field_names = [
+        model_field.name for model_field in instance._meta.concrete_fields if model_field.is_relation
+    ]
+    instance.full_clean(exclude=relation_field_names, validate_unique=False, validate_constraints=False)
+
+
+def _validate_drafts_do_not_overlap(*, drafts: Sequence[TherapySessionDraft]) -> None:
+    """Проверяет, что новые сессии не пересекаются друг с другом внутри одной пачки.
+
+    Пересечения с уже существующими встречами отклоняет PostgreSQL, но внутри одной пачки понятнее сразу
+    сказать, какие именно новые сессии конфликтуют. Проверка - один проход по отсортированным интервалам:
+        - у специалиста интервал занятости включает перерыв (до specialist_busy_until);
+        - у клиента - только чистое время сессии (до end_datetime).
+    """
+    busy_intervals_by_specialist = defaultdict(list)
+    busy_intervals_by_client = defaultdict(list)
+
+    for draft in drafts:
+        if draft.client_user.pk == draft.specialist_user.pk:
+            raise CreateBookingValidationError("Нельзя забронировать сессию у самого себя.")
+
+        if not draft.slots:
+            raise CreateBookingValidationError("У сессии должен быть хотя бы один временной слот.")
+
+        for slot_draft in draft.slots:
+            busy_intervals_by_specialist[draft.specialist_user.pk].append(
+                (slot_draft.start_datetime, slot_draft.specialist_busy_until)
+            )
+            busy_intervals_by_client[draft.client_user.pk].append(
+                (slot_draft.start_datetime, slot_draft.end_datetime)
+            )
+
+    conflict_messages = (
+        (busy_intervals_by_specialist, "Новые сессии пересекаются друг с другом по времени специалиста."),
+        (busy_intervals_by_client, "Новые сессии пересекаются друг с другом по времени клиента."),
+    )
+    for busy_intervals_by_user, conflict_message in conflict_messages:
+        for busy_intervals in busy_intervals_by_user.values():
+            busy_intervals.sort()
+            for (_, previous_end), (next_start, _) in zip(busy_intervals, busy_intervals[1:]):
+                if next_start < previous_end:
+                    raise CreateBookingValidationError(conflict_message)
+
+
+def _bulk_create_slots(*, slots: List[TimeSlot]) -> None:
+    """Вставляет слоты одним INSERT в savepoint и превращает нарушение ExclusionConstraint
+    (пересечение с другой встречей специалиста или клиента) в CreateBookingValidationError."""
+    try:
+        with transaction.atomic():
+            TimeSlot.objects.bulk_create(slots)
+    except IntegrityError as exc:
+        booking_error = map_booking_integrity_error(exc)
+        if booking_error is None:
+            raise
+
+        raise booking_error from exc
+
+
+def _schedule_specialist_schedule_refresh(*, specialist_user_ids: Iterable) -> None:
+    """Заменяет post_save signals, которые bulk_create() не отправляет: после commit пересобирает
+    материализованную доступность специалистов и сбрасывает кэш их расписания."""
+    specialist_user_ids = list(specialist_user_ids)
+    invalidate_specialist_schedule_cache(specialist_user_ids=specialist_user_ids)
+    schedule_specialist_available_slots_rebuild(specialist_user_ids=specialist_user_ids)
+
+
+@transaction.atomic
+def write_therapy_sessions(*, drafts: Sequence[TherapySessionDraft]) -> List[WrittenTherapySession]:
+    """Записывает пачку терапевтических сессий за 4 INSERT и возвращает их в порядке drafts.
+
+    Подходит и для одной встречи (CreateTherapySessionUseCase), и для серии встреч, и для импорта из админки.
+    Бизнес-правила участников те же, что были при пошаговом сохранении:
+        - клиент - organizer (accepted в событии), специалист - participant (invited в событии);
+        - на уровне каждого слота оба участника в статусе planned.
+    """
+    drafts = list(drafts)
+    if not drafts:
+        return []
+
+    _validate_drafts_do_not_overlap(drafts=drafts)
+
+    # 1) Собираем и валидируем в памяти все объекты. UUID primary key генерируется еще в Python (default=uuid4),
+    # поэтому слоты и участники могут ссылаться на событие до его вставки
+    written_sessions = []
+    events = []
+    slots = []
+    event_participants = []
+    slot_participants = []
+
+    for draft in drafts:
+        event = CalendarEvent(
+            creator=draft.client_user,
+            title="Терапевтическая сессия с психологом",
+            description="",
+            event_type="session_couple" if draft.consultation_type == "couple" else "session_individual",
+            status="planned",
+            visibility="private",
+            source="internal",
+            is_recurring=draft.is_recurring,
+            previous_event=draft.previous_event,
+        )
+        full_clean_in_memory(instance=event)
+        events.append(event)
+        written_session = WrittenTherapySession(event=event)
+
+        for participant in (
+            EventParticipant(event=event, user=draft.client_user, role="organizer", status="accepted"),
+            EventParticipant(event=event, user=draft.specialist_user, role="participant", status="invited"),
+        ):
+            full_clean_in_memory(instance=participant)
+            event_participants.append(participant)
+
+        # Здесь сохраняем только чистое время сессии без break_between_sessions, а занятость специалиста
+        # вместе с перерывом - в specialist_busy_until
+        for slot_index, slot_draft in enumerate(draft.slots, start=1):
+            slot = TimeSlot(
+                creator=draft.client_user,
+                specialist=draft.specialist_user,
+                event=event,
+                start_datetime=slot_draft.start_datetime,
+                end_datetime=slot_draft.end_datetime,
+                specialist_busy_until=slot_draft.specialist_busy_until,
+                status="planned",
+                timezone=draft.timezone,
+                meeting_url=None,
+                meeting_resume=None,
+                cancel_reason_type=None,
+                cancel_reason=None,
+                slot_index=slot_index,
+            )
+            full_clean_in_memory(instance=slot)
+            slots.append(slot)
+            written_session.slots.append(slot)
+
+            for participant in (
+                SlotParticipant(slot=slot, user=draft.client_user, role="organizer", status="planned"),
+                SlotParticipant(slot=slot, user=draft.specialist_user, role="participant", status="planned"),
+            ):
+                full_clean_in_memory(instance=participant)
+                slot_participants.append(participant)
+
+        written_sessions.append(written_session)
+
+    # 2) Записываем по одному INSERT на таблицу. Порядок важен из-за FK: событие -> слоты -> участники
+    CalendarEvent.objects.bulk_create(events)
+    _bulk_create_slots(slots=slots)
+    EventParticipant.objects.bulk_create(event_participants)
+    SlotParticipant.objects.bulk_create(slot_participants)
+
+    # 3) bulk_create() не отправляет signals - планируем пересборку доступности и сброс кэша сами
+    _schedule_specialist_schedule_refresh(
+        specialist_user_ids={draft.specialist_user.pk for draft in drafts},
+    )
+
+    return written_sessions
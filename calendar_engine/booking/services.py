@@ -39,6 +39,51 @@ def normalize_user_timezone(*, timezone_value):
     return ZoneInfo(str(timezone_value))
 
 
+# Имена ExclusionConstraint у TimeSlot и сообщения для клиента, если PostgreSQL отклонил вставку слота
+BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT = {
+    "prevent_slot_overlap_per_specialist": "Выбранный слот уже занят. Пожалуйста, выберите другое время",
+    "prevent_slot_overlap_per_creator": (
+        "Невозможно создать встречу: у клиента уже есть другая сессия в выбранное время"
+    ),
+}
+
+# SQLSTATE ошибок PostgreSQL, после которых бронирование можно безопасно повторить:
+# deadlock_detected и serialization_failure
+TRANSIENT_BOOKING_ERROR_SQLSTATES = {"40P01", "40001"}
+
+
+def _get_database_error_cause(exc):
+    """Исходная ошибка драйвера БД (psycopg), которую Django оборачивает в свои IntegrityError/OperationalError."""
+    return exc.__cause__ or exc
+
+
+def map_booking_integrity_error(exc) -> CreateBookingValidationError | None:
+    """Превращает нарушение ExclusionConstraint у TimeSlot в предметную ошибку бронирования.
+
+    Нужна для optimistic booking: пересечение с параллельным бронированием обнаруживает сам PostgreSQL при вставке,
+    а клиент должен получить такую же понятную ошибку, как и при обычной проверке слота.
+
+    :return: CreateBookingValidationError для известных constraint, иначе None
+        (это уже не конфликт бронирования, а системная ошибка, и ее нужно пробросить как есть).
+    """
+    cause = _get_database_error_cause(exc)
+    diag = getattr(cause, "diag", None)
+    constraint_name = getattr(diag, "constraint_name", None) or ""
+
+    for name, message in BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT.items():
+        if constraint_name == name or (not constraint_name and name in str(exc)):
+            return CreateBookingValidationError(message)
+
+    return None
+
+
+def is_transient_booking_error(exc) -> bool:
+    """Проверяет, что ошибка БД временная (deadlock / serialization failure) и бронирование можно повторить."""
+    cause = _get_database_error_cause(exc)
+    sqlstate = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    return sqlstate in TRANSIENT_BOOKING_ERROR_SQLSTATES
+
+
 def _get_effective_time_windows_for_day(*, rule: AvailabilityRule, exceptions, day) -> list[tuple]:
     """Возвращает итоговые рабочие окна специалиста на конкретный календарный день.
 
@@ -120,17 +165,11 @@ def build_specialist_live_indicator(*, specialist_profile: PsychologistProfile |
 
     current_datetime = timezone.now()
 
-    # Перед live-проверкой закрываем устаревшие правила и исключения,
-    # чтобы индикатор не опирался на расписание с прошедшей датой окончания
-    AvailabilityRule.close_expired_for_user(specialist_profile.user)
-    AvailabilityException.close_expired_for_user(specialist_profile.user)
-
-    # 2) Берем активное рабочее расписание специалиста
+    # 2) Берем активное рабочее расписание специалиста.
+    # Правила с прошедшей датой окончания отсекаются прямо в запросе (без UPDATE на read-пути),
+    # поэтому индикатор не опирается на устаревшее расписание, даже если оно еще не переведено в архив
     active_rule = (
-        AvailabilityRule.objects.filter(
-            creator=specialist_profile.user,
-            is_active=True,
-        )
+        AvailabilityRule.active_for_user(specialist_profile.user)
         .prefetch_related("time_windows")
         .first()
     )
@@ -1,23 +1,29 @@
+import random
 from datetime import datetime, timedelta
+from time import sleep
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import OperationalError, transaction
 from django.utils import timezone
 
 from calendar_engine.application.factories.generate_specialist_schedule_factory import \
-    build_specialist_schedule_runtime_context
+    build_specialist_booking_runtime_context
 from calendar_engine.application.use_cases.specialist_schedule import \
     GenerateSpecialistScheduleUseCase
+from calendar_engine.booking.bulk_writer import (TherapySessionDraft,
+                                                 TherapySessionSlotDraft,
+                                                 write_therapy_sessions)
 from calendar_engine.booking.exceptions import CreateBookingValidationError
 from calendar_engine.booking.services import (
     get_specialist_profile_for_booking_therapy_session,
-    normalize_user_timezone)
+    is_transient_booking_error, normalize_user_timezone)
 from calendar_engine.booking.validators import (
     parse_requested_slot_start, validate_client_can_create_booking,
     validate_client_has_no_overlapping_bookings,
     validate_consultation_type_in_therapy_session)
-from calendar_engine.models import (CalendarEvent, EventParticipant,
-                                    SlotParticipant, TimeSlot)
+from calendar_engine.constants import (
+    OPTIMISTIC_BOOKING_MAX_ATTEMPTS, OPTIMISTIC_BOOKING_RETRY_BACKOFF_SECONDS)
 
 
 class CreateTherapySessionUseCase:
@@ -34,7 +40,9 @@ class CreateTherapySessionUseCase:
         - индивидуальные значения в рабочем расписании специалиста (session_duration_* и break_between_sessions)
           НЕ меняют доменную сетку, а накладываются на нее;
         - индивидуальные значения в рабочем расписании специалиста используются только для проверки
-          доступности старта (слота/слотов) и для расчета чистого TimeSlot.end_datetime.
+          доступности старта (слота/слотов) и для расчета чистого TimeSlot.end_datetime;
+        - защита от параллельных бронирований работает в двух режимах (settings.USE_OPTIMISTIC_BOOKING):
+          блокировка строк участников (pessimistic) или ExclusionConstraint у TimeSlot без блокировок (optimistic).
     """
 
     @staticmethod
@@ -67,7 +75,14 @@ class CreateTherapySessionUseCase:
             runtime_context["session_duration_minutes"],
         )
 
-    @transaction.atomic
+    @staticmethod
+    def _get_effective_break_between_sessions_minutes(*, runtime_context, slot_day):
+        """Возвращает фактический перерыв специалиста после сессии на день выбранного старта."""
+        return runtime_context["override_break_between_sessions_minutes_by_day"].get(
+            slot_day,
+            runtime_context["break_between_sessions_minutes"],
+        )
+
     def execute(
         self,
         *,
@@ -78,7 +93,11 @@ class CreateTherapySessionUseCase:
         previous_event=None,
         previous_event_id=None,
     ) -> dict:
-        """Запускает процесс booking-flow и создает встречу."""
+        """Запускает процесс booking-flow и создает встречу.
+
+        Транзакцию открывает не execute(), а _run_booking(): в optimistic режиме каждая попытка создания
+        должна выполняться в своей транзакции (см. _create_booking_optimistically).
+        """
         # 1) Запускаем кастомные первоначальные валидации
         validate_client_can_create_booking(client_user=client_user)
         validate_consultation_type_in_therapy_session(consultation_type=consultation_type)
@@ -90,11 +109,45 @@ class CreateTherapySessionUseCase:
         specialist_profile = get_specialist_profile_for_booking_therapy_session(
             specialist_profile_id=specialist_profile_id,
         )
-        specialist_user = specialist_profile.user
 
-        # 3) Сразу блокируем записи двух участников в БД в стабильном порядке.
-        # Это нужно для сценария, когда клиент или специалист почти одновременно пытаются создать
-        # пересекающиеся встречи: такая блокировка уменьшает риск гонок при бронировании.
+        # 3) Создаем встречу в одном из двух режимов конкурентного доступа (settings.USE_OPTIMISTIC_BOOKING):
+        #   - pessimistic (по умолчанию): сначала блокируем строки обоих участников, затем проверяем и создаем;
+        #   - optimistic: без блокировок проверяем и сразу создаем, а пересечения отклоняет PostgreSQL.
+        booking_kwargs = {
+            "client_user": client_user,
+            "specialist_profile": specialist_profile,
+            "requested_slot_start_datetime": requested_slot_start_datetime,
+            "consultation_type": consultation_type,
+            "previous_event": previous_event,
+            "previous_event_id": previous_event_id,
+        }
+
+        return self._run_booking(**booking_kwargs)
+
+    def _run_booking(self, **booking_kwargs) -> dict:
+        """Создает встречу в режиме конкурентного доступа из settings.USE_OPTIMISTIC_BOOKING.
+
+        В pessimistic режиме блокировки участников и создание встречи выполняются в одной транзакции:
+        блокировки держатся до ее завершения.
+        """
+        if getattr(settings, "USE_OPTIMISTIC_BOOKING", False):
+            return self._create_booking_optimistically(**booking_kwargs)
+
+        with transaction.atomic():
+            self._lock_booking_participants(
+                client_user=booking_kwargs["client_user"],
+                specialist_user=booking_kwargs["specialist_profile"].user,
+            )
+            return self._create_booking(**booking_kwargs)
+
+    @staticmethod
+    def _lock_booking_participants(*, client_user, specialist_user) -> None:
+        """Блокирует записи двух участников в БД в стабильном порядке (pessimistic режим).
+
+        Это нужно для сценария, когда клиент или специалист почти одновременно пытаются создать
+        пересекающиеся встречи: такая блокировка уменьшает риск гонок при бронировании.
+        Обратная сторона: все бронирования к одному специалисту выполняются строго по очереди.
+        """
         user_model = get_user_model()
         user_ids_to_lock = sorted([client_user.pk, specialist_user.pk], key=str)
         locked_users = list(
@@ -106,6 +159,49 @@ class CreateTherapySessionUseCase:
                 "Не удалось получить блокировку участников для безопасного создания бронирования."
             )
 
+    def _create_booking_optimistically(self, **booking_kwargs) -> dict:
+        """Создает встречу без блокировок участников (optimistic режим).
+
+        Как работает:
+            - проверки доступности слота и занятости клиента выполняются как обычно, но без select_for_update;
+            - гонку двух параллельных бронирований окончательно разрешает PostgreSQL: ExclusionConstraint
+              prevent_slot_overlap_per_specialist (занятость специалиста с учетом перерыва) и
+              prevent_slot_overlap_per_creator (занятость клиента) отклоняют пересекающуюся вставку;
+            - нарушение constraint превращается в обычную CreateBookingValidationError (см. write_therapy_sessions);
+            - каждая попытка выполняется в СВОЕЙ транзакции, а пауза перед повтором - уже после ее отката:
+              транзакция, прерванная взаимоблокировкой (deadlock) параллельных вставок, не держит блокировки
+              на время паузы, и попытка повторяется целиком (с новыми проверками) с экспоненциальной паузой;
+            - если вызывающий код уже открыл свою транзакцию (например, перенос встречи), повтора нет:
+              после deadlock PostgreSQL прерывает всю внешнюю транзакцию, и повтор внутри нее не может пройти,
+              поэтому ошибка сразу возвращается вызывающему коду.
+
+        Бронирования разных слотов одного специалиста при этом не ждут друг друга.
+        """
+        max_attempts = 1 if transaction.get_connection().in_atomic_block else OPTIMISTIC_BOOKING_MAX_ATTEMPTS
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                with transaction.atomic():
+                    return self._create_booking(**booking_kwargs)
+            except OperationalError as exc:
+                if not is_transient_booking_error(exc) or attempt == max_attempts:
+                    raise
+
+            sleep(OPTIMISTIC_BOOKING_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    def _create_booking(
+        self,
+        *,
+        client_user,
+        specialist_profile,
+        requested_slot_start_datetime,
+        consultation_type: str,
+        previous_event=None,
+        previous_event_id=None,
+    ) -> dict:
+        """Проверяет выбранный старт и создает CalendarEvent / TimeSlot / EventParticipant / SlotParticipant."""
+        specialist_user = specialist_profile.user
+
         # 4) Приводим timezone специалиста к единому tzinfo-формату.
         # Это важно, потому что расписание специалиста считается именно в его локальном времени,
         # а клиент мог выбрать слот, находясь вообще в другом часовом поясе.
@@ -113,16 +209,19 @@ class CreateTherapySessionUseCase:
             timezone_value=getattr(specialist_user, "timezone", None)
         )
 
-        # build_specialist_schedule_runtime_context() - собирает единый runtime-context для booking логики специалиста
-        # 5) Собираем единый runtime-context специалиста:
+        # build_specialist_booking_runtime_context() - собирает runtime-context специалиста для проверки одного старта
+        # 5) Собираем runtime-context специалиста для проверки ИМЕННО выбранного старта:
         #   - рабочее правило;
-        #   - активные исключения;
+        #   - активные исключения на день старта (и накануне);
         #   - override-параметры на конкретные дни;
-        #   - уже существующие занятые интервалы.
-        # Это важно, чтобы и отображение расписания, и само бронирование опирались на одну и ту же логику.
-        runtime_context = build_specialist_schedule_runtime_context(
+        #   - уже существующие встречи, которые могут пересечься с выбранным стартом (range-запрос).
+        # Полное расписание на весь горизонт здесь не нужно: в pessimistic режиме мы держим блокировки обоих
+        # участников, и каждая лишняя выборка из БД увеличивает время ожидания для параллельных бронирований.
+        # При этом трактовка duration / break / notice / окон та же, что и в отображаемом расписании.
+        runtime_context = build_specialist_booking_runtime_context(
             specialist_profile=specialist_profile,
             consultation_type=consultation_type,
+            requested_start_datetime=requested_slot_start_datetime,
         )
 
         if runtime_context is None:
@@ -130,19 +229,19 @@ class CreateTherapySessionUseCase:
                 "У специалиста нет активного рабочего расписания для бронирования."
             )
 
-        # Use-case получения актуального расписания специалиста (в TZ СПЕЦИАЛИСТА).
-        #     Ответственность:
-        #         - сгенерировать доменные слоты;
-        #         - отфильтровать их по AvailabilityRule / AvailabilityException / Booking;
-        #         - вернуть список доступных SlotDTO.
-        # 6) Повторно пересчитываем расписание специалиста на backend.
+        # 6) Повторно проверяем выбранный старт на backend (в TZ СПЕЦИАЛИСТА).
         # Это ключевая защита от ситуации, когда клиент увидел слот на странице несколько секунд назад,
         # но пока нажимал кнопку "Записаться", слот уже успел заняться или перестал подходить по правилам.
+        # execute_for_slot_keys() проверяет только этот старт теми же проверками, что и полное расписание:
+        # горизонт расписания, рабочие окна дня, minimum notice и пересечение с занятостью.
+        requested_start_in_specialist_tz = requested_slot_start_datetime.astimezone(specialist_timezone)
         specialist_schedule_use_case = GenerateSpecialistScheduleUseCase(**runtime_context)
-        available_slots = specialist_schedule_use_case.execute()
+        available_slots = specialist_schedule_use_case.execute_for_slot_keys(
+            slot_keys={(requested_start_in_specialist_tz.date(), requested_start_in_specialist_tz.time())},
+        )
 
-        # 7) Ищем среди актуально доступных стартов именно тот слот, который выбрал клиент.
-        # Если такого старта уже нет - значит бронирование нужно прервать и попросить выбрать новое время.
+        # 7) Убеждаемся, что найденный старт - именно тот, который выбрал клиент.
+        # Если такого старта нет - значит бронирование нужно прервать и попросить выбрать новое время.
         selected_slot = self._find_matching_available_slot(
             requested_slot_start_datetime=requested_slot_start_datetime,
             specialist_timezone=specialist_timezone,
@@ -164,6 +263,12 @@ class CreateTherapySessionUseCase:
             slot_day=selected_slot.day,
         )
         slot_end_datetime = slot_start_datetime + timedelta(minutes=effective_session_duration_minutes)
+        specialist_busy_until = slot_end_datetime + timedelta(
+            minutes=self._get_effective_break_between_sessions_minutes(
+                runtime_context=runtime_context,
+                slot_day=selected_slot.day,
+            )
+        )
 
         # 9) Дополнительно защищаем клиента от двойной записи на одно и то же время.
         # Даже если слот свободен у специалиста, backend не должен создавать новую сессию,
@@ -186,89 +291,40 @@ class CreateTherapySessionUseCase:
         #     consultation_type=consultation_type,
         # )
 
-        # 11) Создаем корневую сущность встречи - CalendarEvent.
-        # Это "карточка" самой терапевтической сессии, внутри которой потом уже живут слот и участники.
-        event = CalendarEvent(
-            creator=client_user,
-            title="Терапевтическая сессия с психологом",  # title=event_title
-            description="",
-            event_type="session_couple" if consultation_type == "couple" else "session_individual",
-            status="planned",
-            visibility="private",
-            source="internal",
-            is_recurring=False,
-            previous_event=previous_event,
-        )
-        event.full_clean()
-        event.save()
-
-        # 12) Создаем TimeSlot как конкретный временной интервал этой встречи.
-        # Здесь сохраняем только чистое время сессии без break_between_sessions.
-        slot = TimeSlot(
-            creator=client_user,
-            event=event,
-            start_datetime=slot_start_datetime,
-            end_datetime=slot_end_datetime,
-            status="planned",
-            timezone=specialist_timezone,
-            meeting_url=None,
-            meeting_resume=None,
-            cancel_reason_type=None,
-            cancel_reason=None,
-            slot_index=1,
-        )
-        slot.full_clean()
-        slot.save()
-
-        # 13) Фиксируем состав участников на уровне всей встречи.
+        # 11) Создаем CalendarEvent / TimeSlot / EventParticipant / SlotParticipant одной пачкой.
+        # write_therapy_sessions() валидирует объекты в памяти (без SELECT-запросов на FK и unique_together)
+        # и пишет каждую таблицу одним bulk_create(): 4 INSERT вместо 6 отдельных save().
         # По согласованной бизнес-логике:
         #   - клиент выступает организатором и уже считается accepted;
-        #   - специалист получает статус invited.
-        event_participants = [
-            EventParticipant(
-                event=event,
-                user=client_user,
-                role="organizer",
-                status="accepted",
-            ),
-            EventParticipant(
-                event=event,
-                user=specialist_user,
-                role="participant",
-                status="invited",
-            ),
-        ]
-
-        for participant in event_participants:
-            participant.full_clean()
-            participant.save()
-
-        # 14) Фиксируем участников и на уровне конкретного временного слота.
-        # Это отдельный слой модели, который понадобится для дальнейшей логики проведения встречи,
-        # подключения участников, отметок joined_at/left_at и т.д.
-        slot_participants = [
-            SlotParticipant(
-                slot=slot,
-                user=client_user,
-                role="organizer",
-                status="planned",
-            ),
-            SlotParticipant(
-                slot=slot,
-                user=specialist_user,
-                role="participant",
-                status="planned",
-            ),
-        ]
-
-        for participant in slot_participants:
-            participant.full_clean()
-            participant.save()
+        #   - специалист получает статус invited;
+        #   - в TimeSlot хранится только чистое время сессии без break_between_sessions, а занятость специалиста
+        #     вместе с перерывом - в specialist_busy_until (по нему ExclusionConstraint защищает специалиста).
+        # ExclusionConstraint не проверяем заранее: это лишние SELECT-запросы, которые к тому же не защищают
+        # от гонки. Пересечения окончательно отклоняет сама БД при вставке, а ошибка превращается
+        # в понятную CreateBookingValidationError
+        [written_session] = write_therapy_sessions(
+            drafts=[
+                TherapySessionDraft(
+                    client_user=client_user,
+                    specialist_user=specialist_user,
+                    consultation_type=consultation_type,
+                    timezone=specialist_timezone,
+                    slots=[
+                        TherapySessionSlotDraft(
+                            start_datetime=slot_start_datetime,
+                            end_datetime=slot_end_datetime,
+                            specialist_busy_until=specialist_busy_until,
+                        ),
+                    ],
+                    previous_event=previous_event,
+                ),
+            ],
+        )
 
-        # 15) Возвращаем результат use-case вызывающему слою.
+        # 12) Возвращаем результат use-case вызывающему слою.
         # API или web-flow дальше сами решат, как показать пользователю успешное бронирование.
         return {
-            "event": event,
-            "slot": slot,
+            "event": written_session.event,
+            "slot": written_session.slots[0],
             "created_at": timezone.now(),
         }
@@ -0,0 +1,247 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.utils import timezone
+
+from calendar_engine.application.factories.generate_specialist_schedule_factory import \
+    build_specialist_series_booking_runtime_context
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.booking.bulk_writer import (TherapySessionDraft,
+                                                 TherapySessionSlotDraft,
+                                                 full_clean_in_memory,
+                                                 write_therapy_sessions)
+from calendar_engine.booking.exceptions import CreateBookingValidationError
+from calendar_engine.booking.services import (
+    get_specialist_profile_for_booking_therapy_session,
+    normalize_user_timezone)
+from calendar_engine.booking.use_cases.therapy_session_create import \
+    CreateTherapySessionUseCase
+from calendar_engine.booking.validators import (
+    parse_requested_slot_start, validate_client_can_create_booking,
+    validate_client_has_no_overlapping_series_bookings,
+    validate_consultation_type_in_therapy_session,
+    validate_therapy_session_series_recurrence)
+from calendar_engine.constants import (SERIES_BOOKING_MAX_DAYS_AHEAD,
+                                       SERIES_BOOKING_MAX_OCCURRENCES)
+from calendar_engine.domain.recurrence.expander import iter_recurrence_days
+from calendar_engine.models import RecurrenceRule
+
+
+class CreateTherapySessionSeriesUseCase(CreateTherapySessionUseCase):
+    """Прикладной сценарий для клиента по созданию СЕРИИ встреч (терапевтических сессий) со специалистом.
+
+    Текущий use-case:
+        - клиент в долгосрочной терапии выбирает первый старт и правило повторения (daily / weekly / monthly,
+          interval, count_recurrences или rule_end, дни недели для weekly);
+        - backend лениво разворачивает правило в старты серии в TZ специалиста (то же настенное время каждый раз);
+        - все старты проверяются ОДНИМ проходом: один runtime-context на период серии (один range-запрос встреч
+          специалиста) и один вызов GenerateSpecialistScheduleUseCase.execute_for_slot_keys();
+        - создаются один CalendarEvent (is_recurring=True), TimeSlot на каждое повторение (slot_index по порядку),
+          участники и RecurrenceRule - через bulk-запись, а не N запусков CreateTherapySessionUseCase.
+
+    Важно:
+        - серия бронируется целиком или не бронируется вовсе: если хотя бы один старт недоступен,
+          клиент получает ошибку со списком недоступных дат;
+        - режимы конкурентного доступа (pessimistic / optimistic) и повтор при deadlock - те же, что и у
+          одиночного бронирования (наследуются от CreateTherapySessionUseCase).
+    """
+
+    def execute(
+        self,
+        *,
+        client_user,
+        specialist_profile_id: int,
+        slot_start_iso: str,
+        consultation_type: str,
+        frequency: str,
+        interval: int = 1,
+        count_recurrences: int | None = None,
+        rule_end=None,
+        weekdays_recurrences=None,
+    ) -> dict:
+        """Запускает процесс booking-flow для серии и создает все встречи серии."""
+        # 1) Запускаем кастомные первоначальные валидации (как у одиночного бронирования + параметры повторения)
+        validate_client_can_create_booking(client_user=client_user)
+        validate_consultation_type_in_therapy_session(consultation_type=consultation_type)
+        requested_slot_start_datetime = parse_requested_slot_start(slot_start_iso=slot_start_iso)
+
+        # 2) Получаем специалиста, к которому клиент пытается записаться
+        specialist_profile = get_specialist_profile_for_booking_therapy_session(
+            specialist_profile_id=specialist_profile_id,
+        )
+
+        # 3) Создаем серию в одном из двух режимов конкурентного доступа (settings.USE_OPTIMISTIC_BOOKING)
+        booking_kwargs = {
+            "client_user": client_user,
+            "specialist_profile": specialist_profile,
+            "requested_slot_start_datetime": requested_slot_start_datetime,
+            "consultation_type": consultation_type,
+            "recurrence": {
+                "frequency": frequency,
+                "interval": interval,
+                "count_recurrences": count_recurrences,
+                "rule_end": rule_end,
+                "weekdays_recurrences": sorted(set(weekdays_recurrences)) if weekdays_recurrences else None,
+            },
+        }
+
+        return self._run_booking(**booking_kwargs)
+
+    @staticmethod
+    def _build_series_start_datetimes(*, first_start_datetime: datetime, recurrence: dict) -> list[datetime]:
+        """Разворачивает правило повторения в aware datetime стартов серии (в TZ специалиста).
+
+        Дни повторений генерируются лениво (iter_recurrence_days), поэтому даже для серии "до rule_end" без
+        count_recurrences читается не больше SERIES_BOOKING_MAX_OCCURRENCES + 1 дней.
+        Время старта - настенное время первого старта: при переходе на летнее/зимнее время встреча остается
+        в то же локальное время специалиста.
+        """
+        validate_therapy_session_series_recurrence(first_start_day=first_start_datetime.date(), **recurrence)
+
+        recurrence_days = list(
+            islice(
+                iter_recurrence_days(rule_start=first_start_datetime.date(), **recurrence),
+                SERIES_BOOKING_MAX_OCCURRENCES + 1,
+            )
+        )
+        if len(recurrence_days) > SERIES_BOOKING_MAX_OCCURRENCES:
+            raise CreateBookingValidationError(
+                f"В серии не может быть больше {SERIES_BOOKING_MAX_OCCURRENCES} встреч."
+            )
+
+        today_for_specialist = timezone.now().astimezone(first_start_datetime.tzinfo).date()
+        if recurrence_days[-1] > today_for_specialist + timedelta(days=SERIES_BOOKING_MAX_DAYS_AHEAD):
+            raise CreateBookingValidationError(
+                f"Серию встреч можно бронировать не дальше, чем на {SERIES_BOOKING_MAX_DAYS_AHEAD} дней вперед."
+            )
+
+        return [
+            datetime.combine(day, first_start_datetime.time(), tzinfo=first_start_datetime.tzinfo)
+            for day in recurrence_days
+        ]
+
+    def _create_booking(
+        self,
+        *,
+        client_user,
+        specialist_profile,
+        requested_slot_start_datetime,
+        consultation_type: str,
+        recurrence: dict,
+    ) -> dict:
+        """Проверяет все старты серии одним проходом и создает событие серии со всеми слотами."""
+        specialist_user = specialist_profile.user
+
+        # 4) Разворачиваем серию в TZ специалиста: именно в нем считаются рабочие окна и доменная сетка
+        specialist_timezone = normalize_user_timezone(
+            timezone_value=getattr(specialist_user, "timezone", None)
+        )
+        series_start_datetimes = self._build_series_start_datetimes(
+            first_start_datetime=requested_slot_start_datetime.astimezone(specialist_timezone),
+            recurrence=recurrence,
+        )
+
+        # 5) Собираем ОДИН runtime-context на весь период серии: правило, исключения и встречи специалиста
+        # читаются range-запросами от первого до последнего старта серии
+        runtime_context = build_specialist_series_booking_runtime_context(
+            specialist_profile=specialist_profile,
+            consultation_type=consultation_type,
+            first_start_datetime=series_start_datetimes[0],
+            last_start_datetime=series_start_datetimes[-1],
+        )
+
+        if runtime_context is None:
+            raise CreateBookingValidationError(
+                "У специалиста нет активного рабочего расписания на период серии встреч."
+            )
+
+        # 6) Проверяем ВСЕ старты серии за один проход: индекс занятости специалиста строится один раз,
+        # а каждый старт проходит те же проверки, что и в отображаемом расписании (горизонт, рабочие окна дня,
+        # minimum notice, пересечение с занятостью)
+        specialist_schedule_use_case = GenerateSpecialistScheduleUseCase(**runtime_context)
+        available_slots = specialist_schedule_use_case.execute_for_slot_keys(
+            slot_keys={(start.date(), start.time()) for start in series_start_datetimes},
+        )
+        available_start_datetimes = {
+            self._build_specialist_slot_start_datetime(slot=slot, specialist_timezone=specialist_timezone)
+            for slot in available_slots
+        }
+        unavailable_start_datetimes = [
+            start for start in series_start_datetimes if start not in available_start_datetimes
+        ]
+
+        if unavailable_start_datetimes:
+            unavailable_days = ", ".join(f"{start:%d.%m.%Y}" for start in unavailable_start_datetimes)
+            raise CreateBookingValidationError(
+                f"Серию нельзя забронировать: выбранное время занято или недоступно в даты {unavailable_days}."
+            )
+
+        # 7) Строим реальные интервалы каждой встречи серии: длительность и перерыв специалиста берутся
+        # на день конкретного повторения (override из AvailabilityException может отличаться по дням)
+        slot_drafts = []
+        for slot_start_datetime in series_start_datetimes:
+            slot_day = slot_start_datetime.date()
+            slot_end_datetime = slot_start_datetime + timedelta(
+                minutes=self._get_effective_session_duration_minutes(
+                    runtime_context=runtime_context,
+                    slot_day=slot_day,
+                )
+            )
+            slot_drafts.append(
+                TherapySessionSlotDraft(
+                    start_datetime=slot_start_datetime,
+                    end_datetime=slot_end_datetime,
+                    specialist_busy_until=slot_end_datetime + timedelta(
+                        minutes=self._get_effective_break_between_sessions_minutes(
+                            runtime_context=runtime_context,
+                            slot_day=slot_day,
+                        )
+                    ),
+                )
+            )
+
+        # 8) Защищаем клиента от двойной записи - один запрос на весь период серии
+        validate_client_has_no_overlapping_series_bookings(
+            client_user=client_user,
+            slot_ranges=[(slot_draft.start_datetime, slot_draft.end_datetime) for slot_draft in slot_drafts],
+        )
+
+        # 9) Создаем событие серии, все его TimeSlot (slot_index 1..N) и участников bulk-записью.
+        # Пересечения, появившиеся после проверки (параллельное бронирование), отклоняет ExclusionConstraint
+        [written_session] = write_therapy_sessions(
+            drafts=[
+                TherapySessionDraft(
+                    client_user=client_user,
+                    specialist_user=specialist_user,
+                    consultation_type=consultation_type,
+                    timezone=specialist_timezone,
+                    slots=slot_drafts,
+                    is_recurring=True,
+                ),
+            ],
+        )
+
+        # 10) Сохраняем само правило повторения, чтобы серия оставалась серией и в календаре, и в API
+        recurrence_rule = RecurrenceRule(
+            creator=client_user,
+            event=written_session.event,
+            timezone=specialist_timezone,
+            rule_start=series_start_datetimes[0].date(),
+            rule_end=recurrence["rule_end"],
+            count_recurrences=recurrence["count_recurrences"],
+            frequency=recurrence["frequency"],
+            interval=recurrence["interval"],
+            weekdays_recurrences=recurrence["weekdays_recurrences"],
+            is_active=True,
+        )
+        full_clean_in_memory(instance=recurrence_rule)
+        recurrence_rule.save()
+
+        # 11) Возвращаем результат use-case вызывающему слою
+        return {
+            "event": written_session.event,
+            "slots": written_session.slots,
+            "recurrence_rule": recurrence_rule,
+            "created_at": timezone.now(),
+        }
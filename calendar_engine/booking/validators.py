@@ -1,9 +1,14 @@
+from bisect import bisect_left
+
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.dateparse import parse_datetime
 from django.utils.timezone import is_naive, make_aware
 
 from calendar_engine.booking.exceptions import (CreateBookingValidationError,
                                                 ParseSlotValidationError)
+from calendar_engine.constants import (FREQUENCY_RECURRENCE_CHOICES,
+                                       SERIES_BOOKING_MAX_OCCURRENCES,
+                                       WEEKDAYS_CHOICES)
 from calendar_engine.models import TimeSlot
 
 
@@ -99,3 +104,92 @@ def validate_client_has_no_overlapping_bookings(
         raise CreateBookingValidationError(
             "Невозможно создать встречу: у клиента уже есть другая сессия в выбранное время"
         )
+
+
+def validate_therapy_session_series_recurrence(
+    *,
+    first_start_day,
+    frequency: str,
+    interval: int,
+    count_recurrences=None,
+    rule_end=None,
+    weekdays_recurrences=None,
+) -> None:
+    """Проверяет параметры повторения серии встреч до того, как backend начнет разворачивать серию.
+
+    Бизнес-смысл:
+        - серия обязательно должна быть конечной: либо count_recurrences, либо rule_end;
+        - первая встреча серии - это выбранный клиентом старт, поэтому для weekly с днями недели
+          он должен приходиться на один из этих дней.
+    """
+    if frequency not in dict(FREQUENCY_RECURRENCE_CHOICES):
+        raise CreateBookingValidationError("Периодичность серии должна быть одной из: daily, weekly, monthly.")
+
+    if not isinstance(interval, int) or interval < 1:
+        raise CreateBookingValidationError("Интервал повторения серии должен быть положительным числом.")
+
+    if count_recurrences is None and rule_end is None:
+        raise CreateBookingValidationError(
+            "Для серии встреч нужно указать количество повторений или дату окончания."
+        )
+
+    if count_recurrences is not None and not 1 <= count_recurrences <= SERIES_BOOKING_MAX_OCCURRENCES:
+        raise CreateBookingValidationError(
+            f"Количество встреч в серии должно быть от 1 до {SERIES_BOOKING_MAX_OCCURRENCES}."
+        )
+
+    if rule_end is not None and rule_end < first_start_day:
+        raise CreateBookingValidationError("Дата окончания серии не может быть раньше первой встречи.")
+
+    if weekdays_recurrences:
+        if frequency != "weekly":
+            raise CreateBookingValidationError("Дни недели можно указывать только для еженедельной серии.")
+
+        if not set(weekdays_recurrences) <= set(dict(WEEKDAYS_CHOICES)):
+            raise CreateBookingValidationError("Дни недели серии указаны некорректно.")
+
+        if first_start_day.weekday() not in weekdays_recurrences:
+            raise CreateBookingValidationError(
+                "Первая встреча серии должна приходиться на один из выбранных дней недели."
+            )
+
+
+def validate_client_has_no_overlapping_series_bookings(*, client_user, slot_ranges) -> None:
+    """Проверяет, что ни одна встреча серии не пересекается с другими активными встречами клиента.
+
+    В отличие от validate_client_has_no_overlapping_bookings() вызывается один раз на всю серию:
+        - активные встречи клиента за период серии читаются одним запросом;
+        - каждая встреча серии проверяется бинарным поиском по отсортированным встречам (prefix max окончаний),
+          т.е. без отдельного запроса на каждое повторение.
+
+    :param client_user: Кого проверяем.
+    :param slot_ranges: Список (start_datetime, end_datetime) встреч серии.
+    """
+    slot_ranges = list(slot_ranges)
+    if not slot_ranges:
+        return
+
+    existing_ranges = sorted(
+        TimeSlot.objects.filter(
+            status__in=["planned", "started"],
+            start_datetime__lt=max(slot_end for _, slot_end in slot_ranges),
+            end_datetime__gt=min(slot_start for slot_start, _ in slot_ranges),
+            slot_participants__user=client_user,
+        )
+        .values_list("start_datetime", "end_datetime")
+        .distinct()
+    )
+
+    existing_starts = [existing_start for existing_start, _ in existing_ranges]
+    prefix_max_ends = []
+    for _, existing_end in existing_ranges:
+        prefix_max_ends.append(max(prefix_max_ends[-1], existing_end) if prefix_max_ends else existing_end)
+
+    for slot_start, slot_end in slot_ranges:
+        # Количество встреч клиента, которые начинаются раньше окончания встречи серии
+        position = bisect_left(existing_starts, slot_end)
+        if position and prefix_max_ends[position - 1] > slot_start:
+            raise CreateBookingValidationError(
+                "Невозможно создать серию встреч: у клиента уже есть другая сессия "
+                f"в это время ({slot_start:%d.%m.%Y %H:%M})"
+            )
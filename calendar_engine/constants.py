@@ -117,6 +117,13 @@ EXCEPTION_TYPE_CHOICES = [
     ("override", "Частичное переопределение"),
 ]
 
+# Тип консультации, для которого рассчитана материализованная доступность специалиста
+# (от него зависит продолжительность сессии, а значит и набор доступных стартов)
+AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES = [
+    ("individual", "Индивидуальная"),
+    ("couple", "Парная"),
+]
+
 # ====== ДЛЯ ДОМЕННОЙ ПОЛИТИКИ ======
 
 DOMAIN_TIME_POLICY = DomainTimePolicy(
@@ -128,3 +135,37 @@ DOMAIN_TIME_POLICY = DomainTimePolicy(
 DAYS_AHEAD_FOR_CLIENT = 7
 DAYS_AHEAD_FOR_SPECIALIST = 8
 DAYS_AHEAD_FOR_SHOW_SCHEDULE = 9
+
+# ====== ДЛЯ ФОНОВОГО ОБНОВЛЕНИЯ СТАТУСОВ СОБЫТИЙ/СЛОТОВ ======
+
+# Если фоновая команда apply_status_transitions отработала не раньше, чем столько секунд назад,
+# то request-time пересчет статусов на страницах пропускается (статусы уже актуальны с этой точностью).
+# Это же TTL отметки о проходе команды в cache
+STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS = 120
+# Сколько событий обрабатывается за одну транзакцию фоновой команды apply_status_transitions
+STATUS_TRANSITIONS_WORKER_BATCH_SIZE = 500
+
+# ====== ДЛЯ КЭША РАСПИСАНИЯ СПЕЦИАЛИСТА ======
+
+# Страховочный TTL кэша свободных слотов специалиста (в секундах). Основная инвалидация идет через signals,
+# а TTL ограничивает устаревание для изменений через QuerySet.update() (они сигналы не отправляют).
+# Кэш используется только с общим кэшем (Redis): с LocMemCache расписание всегда считается заново
+SPECIALIST_SCHEDULE_CACHE_TIMEOUT = 10 * 60
+# Максимальное количество специалистов в одном запросе пакетного эндпоинта расписаний
+SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES = 50
+
+# ====== ДЛЯ OPTIMISTIC BOOKING (USE_OPTIMISTIC_BOOKING) ======
+
+# Сколько раз пытаться создать бронирование, если PostgreSQL прервал вставку из-за взаимоблокировки
+# (deadlock) с параллельным бронированием, прежде чем вернуть ошибку
+OPTIMISTIC_BOOKING_MAX_ATTEMPTS = 3
+# Базовая пауза перед повтором (в секундах). Каждый следующий повтор ждет в 2 раза дольше, плюс случайный разброс,
+# чтобы параллельные бронирования не повторялись синхронно
+OPTIMISTIC_BOOKING_RETRY_BACKOFF_SECONDS = 0.05
+
+# ====== ДЛЯ БРОНИРОВАНИЯ СЕРИИ ВСТРЕЧ (RecurrenceRule) ======
+
+# Максимальное количество встреч в одной серии (например, еженедельно на год вперед)
+SERIES_BOOKING_MAX_OCCURRENCES = 52
+# Насколько далеко от сегодня (в днях) может стоять последняя встреча серии
+SERIES_BOOKING_MAX_DAYS_AHEAD = 366
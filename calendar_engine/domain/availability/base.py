@@ -38,3 +38,10 @@ class AbsAvailabilityException(ABC):
             - []: день полностью закрыт (day-off);
             - Iterable[(start, end)]: правило полностью переопределено (заданы новые временные окна дня)."""
         raise NotImplementedError
+
+    def covered_days(self) -> Optional[Iterable[date]]:
+        """Возвращает календарные дни, к которым применяется исключение:
+            - Iterable[date]: исключение применяется только к этим дням (позволяет индексировать исключения по дате);
+            - None: набор дней заранее неизвестен, и исключение нужно проверять для каждого дня.
+        По умолчанию None, поэтому любые реализации контракта остаются корректными без индексации."""
+        return None
@@ -0,0 +1,80 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from calendar_engine.domain.availability.minute_grid import (MINUTES_PER_DAY,
+                                                             day_to_minutes,
+                                                             time_to_minutes)
+
+
+class BusyIntervalIndex:
+    """Индекс уже занятых интервалов специалиста для быстрой проверки пересечения с кандидатом на запись.
+
+    Зачем нужен:
+        - раньше каждый кандидат (доменный старт) сравнивался со ВСЕМИ busy intervals специалиста,
+          а каждый busy interval заново нормализовался через normalize_range() для каждого кандидата,
+          т.е. сложность была O(слоты × встречи);
+        - теперь busy intervals нормализуются ОДИН раз при построении индекса, сортируются по старту,
+          и для каждого кандидата выполняется бинарный поиск (bisect) - O(log n).
+
+    Как устроена проверка:
+        - интервалы хранятся как целые абсолютные минуты (см. minute_grid.day_to_minutes), т.е. на одной оси
+          с минутной сеткой use-case расписания специалиста, без datetime;
+        - интервалы отсортированы по busy_start;
+        - для каждой позиции хранится максимальный busy_end среди всех интервалов до нее включительно (prefix max);
+        - кандидат [start, end) пересекается хотя бы с одним интервалом тогда и только тогда, когда среди интервалов
+          с busy_start < end есть интервал с busy_end > start, т.е. prefix max в найденной позиции больше start.
+
+    ВАЖНО:
+        - класс НЕ знает про БД, пользователей, UI;
+        - нормализация busy intervals полностью совпадает с прежней построчной проверкой в use-case;
+        - округление до минут выполняется "наружу" (старт вниз, конец вверх): для целочисленного кандидата это дает
+          тот же ответ, что и сравнение с исходными datetime, даже если встреча хранится с секундами.
+    """
+
+    def __init__(self, *, busy_intervals: Iterable[tuple[datetime, datetime]]) -> None:
+        """
+        :param busy_intervals: Список занятых интервалов (busy_start, busy_end) в timezone специалиста.
+        """
+        normalized_intervals: List[Tuple[int, int]] = []
+
+        for busy_start_datetime, busy_end_datetime in busy_intervals:
+            busy_start_time = busy_start_datetime.time()
+            busy_end_time = busy_end_datetime.time()
+            day_minutes = day_to_minutes(busy_start_datetime.date())
+
+            busy_end_minutes = day_minutes + time_to_minutes(busy_end_time, round_up=True)
+
+            # ВЫПОЛНЯЕМ НОРМАЛИЗАЦИЮ (как normalize_range()):
+            # т.е., чтобы корректно учитывать интервалы, пересекающие границу суток.
+            # Busy intervals из БД тоже могут пересекать полночь, но нормализуем их один раз на весь расчет
+            if busy_end_time <= busy_start_time:
+                busy_end_minutes += MINUTES_PER_DAY
+
+            normalized_intervals.append((day_minutes + time_to_minutes(busy_start_time), busy_end_minutes))
+
+        normalized_intervals.sort()
+
+        self._starts: List[int] = [busy_start for busy_start, _busy_end in normalized_intervals]
+        self._prefix_max_ends: List[int] = []
+
+        for _busy_start, busy_end in normalized_intervals:
+            if self._prefix_max_ends and self._prefix_max_ends[-1] > busy_end:
+                self._prefix_max_ends.append(self._prefix_max_ends[-1])
+            else:
+                self._prefix_max_ends.append(busy_end)
+
+    def overlaps(self, *, start: int, end: int) -> bool:
+        """Проверяет, пересекается ли интервал [start, end) хотя бы с одним занятым интервалом.
+
+        :param start: Начало интервала кандидата в абсолютных минутах.
+        :param end: Конец интервала кандидата с учетом перерыва в абсолютных минутах.
+        :return: True - есть пересечение, False - интервал свободен.
+        """
+        # Количество интервалов, у которых busy_start < end (только они могут пересекаться с кандидатом)
+        position = bisect_left(self._starts, end)
+
+        if position == 0:
+            return False
+
+        return self._prefix_max_ends[position - 1] > start
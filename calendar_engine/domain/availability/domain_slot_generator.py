@@ -1,9 +1,14 @@
 from datetime import date, timedelta
-from typing import List
+from typing import List, Tuple
 
 from calendar_engine.constants import DOMAIN_TIME_POLICY
+from calendar_engine.domain.availability.domain_slot_grid_cache import \
+    DomainSlotGridCache
 from calendar_engine.domain.availability.dto import SlotDTO
 
+# Общий на процесс кэш доменной сетки: для одной и той же (date_from, days_ahead) сетка всегда одинаковая
+DOMAIN_SLOTS_CACHE = DomainSlotGridCache()
+
 
 class DomainSlotGenerator:
     """Генерирует все возможные доменные временные слоты по правилам домена."""
@@ -14,8 +19,22 @@ class DomainSlotGenerator:
         :param date_from: Дата с которой начинается генерация доменных временных слотов.
         :param days_ahead: На какое количество дней вперед выполняется генерация слотов.
         :return: Список SlotDTO.
+
+        Сетка генерируется один раз на (date_from, days_ahead) и дальше берется из DOMAIN_SLOTS_CACHE
+        (SlotDTO неизменяемые, поэтому их можно безопасно переиспользовать между запросами), наружу
+        отдается новый список, чтобы вызывающий код мог его свободно модифицировать.
         """
+        domain_slots = DOMAIN_SLOTS_CACHE.get_or_build(
+            day=date_from,
+            key=days_ahead,
+            build=lambda: tuple(self._build_domain_slots(date_from=date_from, days_ahead=days_ahead)),
+        )
+
+        return list(domain_slots)
 
+    @staticmethod
+    def _build_domain_slots(*, date_from: date, days_ahead: int) -> List[SlotDTO]:
+        """Генерирует доменные слоты без кэша."""
         domain_slots: List[SlotDTO] = []
 
         # Генерируем доменные слоты для КАЛЕНДАРНОГО ДНЯ клиента.
@@ -33,3 +52,26 @@ class DomainSlotGenerator:
                 )
 
         return domain_slots
+
+    def generate_domain_slot_offsets(
+        self,
+        *,
+        date_from: date,
+        days_ahead: int,
+    ) -> List[Tuple[date, Tuple[Tuple[int, int], ...]]]:
+        """Компактный вариант generate_domain_slots(): сетка по дням в виде минутных смещений от полуночи.
+
+        Вместо одного SlotDTO на каждый слот возвращается по одной паре (day, offsets) на день, где offsets -
+        ОДИН И ТОТ ЖЕ кортеж ((start_minutes, end_minutes), ...) для всех дней (сетка домена от дня не зависит).
+        SlotDTO создаются уже только для итоговых доступных слотов (см. GenerateSpecialistScheduleUseCase).
+
+        :param date_from: Дата с которой начинается генерация доменных временных слотов.
+        :param days_ahead: На какое количество дней вперед выполняется генерация слотов.
+        :return: Список пар (day, offsets).
+        """
+        day_slot_offsets = DOMAIN_TIME_POLICY.get_domain_day_slot_offsets()
+
+        return [
+            (date_from + timedelta(days=day_offset), day_slot_offsets)
+            for day_offset in range(days_ahead)
+        ]
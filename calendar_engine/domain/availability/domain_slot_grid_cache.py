@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Сколько календарных дней назад от самой "поздней" запрошенной даты еще держим в кэше.
+# В один и тот же момент у пользователей из разных часовых поясов (UTC-12 ... UTC+14) может быть до трех разных
+# календарных дат "сегодня", поэтому вытесняем только то, что старше этого окна
+DOMAIN_SLOT_GRID_CACHE_KEEP_DAYS = 2
+
+
+class DomainSlotGridCache:
+    """Кэш доменной сетки слотов в памяти процесса с вытеснением при смене дня (day-rollover eviction).
+
+    Зачем нужен:
+        - доменная сетка (и ее сериализованное представление для UI) зависит только от даты "сегодня",
+          горизонта в днях, DOMAIN_TIME_POLICY и timezone пользователя;
+        - DOMAIN_TIME_POLICY - константа процесса, поэтому при одинаковых (дата, горизонт, timezone) результат
+          всегда одинаковый и его не нужно генерировать заново на каждый запрос.
+
+    Как работает вытеснение:
+        - ключ всегда начинается с даты, от которой построена сетка;
+        - как только появляется более поздняя дата (наступил новый день), все записи старше
+          DOMAIN_SLOT_GRID_CACHE_KEEP_DAYS дней от нее удаляются, т.е. кэш не растет бесконечно.
+
+    ВАЖНО:
+        - кэшируемые значения должны считаться неизменяемыми (вызывающий код их не модифицирует);
+        - класс НЕ знает про БД, пользователей, UI.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[Tuple[date, Hashable], Any] = {}
+        self._latest_day: Optional[date] = None
+        self._lock = Lock()
+
+    def get_or_build(self, *, day: date, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Возвращает значение из кэша, а при промахе строит его через build() и сохраняет.
+
+        :param day: Дата "сегодня", от которой строится сетка (по ней выполняется вытеснение).
+        :param key: Остальная часть ключа (горизонт в днях, timezone и т.п.).
+        :param build: Функция без аргументов, которая строит значение (вызывается только при промахе).
+        """
+        cache_key = (day, key)
+        value = self._values.get(cache_key)
+
+        if value is None:
+            value = build()
+
+            with self._lock:
+                self._values[cache_key] = value
+                self._evict_outdated(day)
+
+        return value
+
+    def _evict_outdated(self, day: date) -> None:
+        """Удаляет записи, построенные от дат, которые уже ни у кого не могут быть "сегодня"."""
+        if self._latest_day is not None and day <= self._latest_day:
+            return
+
+        self._latest_day = day
+        oldest_kept_day = day - timedelta(days=DOMAIN_SLOT_GRID_CACHE_KEEP_DAYS)
+
+        for cached_day, cached_key in list(self._values):
+            if cached_day < oldest_kept_day:
+                del self._values[(cached_day, cached_key)]
+
+    def clear(self) -> None:
+        """Полностью очищает кэш (например, при изменении DOMAIN_TIME_POLICY в тестах)."""
+        with self._lock:
+            self._values.clear()
+            self._latest_day = None
@@ -1,9 +1,11 @@
-from datetime import date, time
-from typing import Iterable, List
+from datetime import date, datetime, time, tzinfo
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from calendar_engine.domain.availability.base import (AbsAvailabilityException,
                                                       AbsAvailabilityRule)
 from calendar_engine.domain.availability.dto import SlotDTO
+from calendar_engine.domain.availability.minute_grid import \
+    normalize_time_range_to_minutes
 from calendar_engine.services import normalize_range
 
 
@@ -32,6 +34,62 @@ class AvailabilitySlotFilter:
         self._rule = rule
         self._exceptions = tuple(exceptions)
 
+        # Индекс исключений по календарным дням, чтобы не сканировать весь кортеж исключений для каждого слота.
+        # Храним позицию исключения в исходном порядке, т.к. при нескольких исключениях на один день
+        # побеждает первое применимое (как и при линейном переборе)
+        self._exceptions_by_day: Dict[date, List[Tuple[int, AbsAvailabilityException]]] = {}
+        # Исключения, которые не сообщают свои дни (covered_days() = None), проверяем для каждого дня как раньше
+        self._unindexed_exceptions: List[Tuple[int, AbsAvailabilityException]] = []
+
+        for position, exception in enumerate(self._exceptions):
+            covered_days = exception.covered_days()
+            if covered_days is None:
+                self._unindexed_exceptions.append((position, exception))
+                continue
+
+            for day in covered_days:
+                self._exceptions_by_day.setdefault(day, []).append((position, exception))
+
+        # Кэш итоговых окон по дням. Правило и исключения внутри фильтра не меняются, поэтому окна конкретного
+        # дня достаточно вычислить один раз, а не для каждого слота этого дня
+        self._time_windows_by_day: Dict[date, Tuple[Tuple[time, time], ...]] = {}
+        self._normalized_time_windows_by_day: Dict[
+            Tuple[date, Optional[tzinfo]], Tuple[Tuple[datetime, datetime], ...]
+        ] = {}
+        self._minute_time_windows_by_day: Dict[date, Tuple[Tuple[int, int], ...]] = {}
+
+    def _iter_day_exceptions(self, day: date) -> Iterable[AbsAvailabilityException]:
+        """Возвращает исключения, которые могут относиться к дню, в исходном порядке их передачи в фильтр."""
+        day_exceptions = self._exceptions_by_day.get(day, [])
+
+        if not self._unindexed_exceptions:
+            return [exception for _position, exception in day_exceptions]
+
+        return [
+            exception
+            for _position, exception in sorted(day_exceptions + self._unindexed_exceptions, key=lambda item: item[0])
+        ]
+
+    def _get_cached_time_windows(self, day: date) -> Tuple[Tuple[time, time], ...]:
+        """Вычисляет итоговые окна дня один раз и дальше берет их из кэша."""
+        if day not in self._time_windows_by_day:
+            self._time_windows_by_day[day] = self._resolve_time_windows(day)
+
+        return self._time_windows_by_day[day]
+
+    def _resolve_time_windows(self, day: date) -> Tuple[Tuple[time, time], ...]:
+        """Определяет итоговые окна дня с учетом приоритета исключений (без кэша)."""
+        # 1) Проверяем наличие действующих исключений в правиле (имеют приоритет) и если есть действующее
+        # исключение - используем правило из AbsAvailabilityException для переопределения временных окон внутри дня
+        for exception in self._iter_day_exceptions(day):
+            overridden = exception.override_time_windows(day)
+            if overridden is not None:
+                return tuple(overridden)
+
+        # 2) Если исключений нет - используем базовое правило из AbsAvailabilityRule для формирования разрешенных
+        # временных периодов специалиста внутри дня, в которые он работает (например, "09:00–19:00")
+        return tuple(self._rule.iter_time_windows(day))
+
     def get_user_time_windows(self, day: date) -> List[tuple[time, time]]:
         """Возвращает итоговые разрешенные временные окна для конкретного дня с учетом приоритета исключений.
         Логика:
@@ -41,18 +99,58 @@ class AvailabilitySlotFilter:
         Результат:
             None - ни одно исключение не применилось;
             [] - день полностью закрыт;
-            tuple[time, time] - переопределенные рабочие окна."""
+            tuple[time, time] - переопределенные рабочие окна.
+
+        Окна каждого дня вычисляются один раз и кэшируются внутри фильтра."""
+        return list(self._get_cached_time_windows(day))
+
+    def get_user_normalized_time_windows(
+        self,
+        day: date,
+        *,
+        tz: Optional[tzinfo] = None,
+    ) -> List[tuple[datetime, datetime]]:
+        """Возвращает итоговые окна дня, уже нормализованные в datetime через normalize_range().
+
+        Зачем:
+            - раньше каждое окно дня заново нормализовалось для каждого слота этого дня;
+            - теперь нормализация выполняется один раз на день (и на timezone, если он передан).
+
+        :param day: Календарный день.
+        :param tz: Timezone, который нужно проставить нормализованным datetime (None - naive datetime).
+        :return: Список окон (window_start_datetime, window_end_datetime).
+        """
+        cache_key = (day, tz)
 
-        # 1) Проверяем наличие действующих исключений в правиле (имеют приоритет) и если есть действующее
-        # исключение - используем правило из AbsAvailabilityException для переопределения временных окон внутри дня
-        for exception in self._exceptions:
-            overridden = exception.override_time_windows(day)
-            if overridden is not None:
-                return list(overridden)
+        if cache_key not in self._normalized_time_windows_by_day:
+            normalized_windows = []
 
-        # 2) Если исключений нет - используем базовое правило из AbsAvailabilityRule для формирования разрешенных
-        # временных периодов специалиста внутри дня, в которые он работает (например, "09:00–19:00")
-        return list(self._rule.iter_time_windows(day))
+            for window_start, window_end in self._get_cached_time_windows(day):
+                window_start_dt, window_end_dt = normalize_range(day, window_start, window_end)
+                normalized_windows.append(
+                    (window_start_dt.replace(tzinfo=tz), window_end_dt.replace(tzinfo=tz))
+                )
+
+            self._normalized_time_windows_by_day[cache_key] = tuple(normalized_windows)
+
+        return list(self._normalized_time_windows_by_day[cache_key])
+
+    def get_user_minute_time_windows(self, day: date) -> Tuple[Tuple[int, int], ...]:
+        """Возвращает итоговые окна дня в виде целочисленных интервалов в минутах от полуночи этого дня.
+
+        Это тот же результат, что и get_user_normalized_time_windows(day), но без datetime: окно "22:00-02:00"
+        превращается в (1320, 1560). Используется минутной сеткой use-case расписания специалиста.
+
+        :param day: Календарный день.
+        :return: Кортеж окон (window_start_minutes, window_end_minutes).
+        """
+        if day not in self._minute_time_windows_by_day:
+            self._minute_time_windows_by_day[day] = tuple(
+                normalize_time_range_to_minutes(window_start, window_end)
+                for window_start, window_end in self._get_cached_time_windows(day)
+            )
+
+        return self._minute_time_windows_by_day[day]
 
     def filter_user_slots(self, *, domain_slots: Iterable[SlotDTO]) -> List[SlotDTO]:
         """Фильтрует все возможные доменные слоты по индивидуальным правилам доступности специалиста.
@@ -65,7 +163,8 @@ class AvailabilitySlotFilter:
 
         for slot in domain_slots:
             day = slot.day  # получаем день из доменных слотов
-            time_windows = self.get_user_time_windows(day)  # получаем временные окна для конкретного дня
+            # получаем уже нормализованные временные окна для конкретного дня (вычисляются один раз на день)
+            time_windows = self.get_user_normalized_time_windows(day)
 
             if not time_windows:
                 continue  # день полностью закрыт и идем дальше
@@ -78,11 +177,7 @@ class AvailabilitySlotFilter:
             )
 
             # 2) Проверяем, попадает ли слот в любое разрешенное окно
-            for window_start, window_end in time_windows:
-                window_start_dt, window_end_dt = normalize_range(
-                    day, window_start, window_end
-                )
-
+            for window_start_dt, window_end_dt in time_windows:
                 if slot_start_dt >= window_start_dt and slot_end_dt <= window_end_dt:
                     allowed_slots.append(slot)
                     break  # слот уже принят, дальше окна проверять не нужно
@@ -0,0 +1,83 @@
+from datetime import date, datetime, time
+from typing import Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def time_to_minutes(value: time, *, round_up: bool = False) -> int:
+    """Переводит время суток в целое количество минут от полуночи.
+
+    :param value: Время суток.
+    :param round_up: Округлять ли секунды/микросекунды вверх (по умолчанию отбрасываются).
+        Нужно, чтобы целочисленные сравнения давали ровно тот же результат, что и сравнение исходных datetime:
+        "x >= начало" эквивалентно "x >= ceil(начало)", а "x > конец" эквивалентно "x > floor(конец)".
+    """
+    minutes = value.hour * 60 + value.minute
+
+    if round_up and (value.second or value.microsecond):
+        minutes += 1
+
+    return minutes
+
+
+def minutes_to_time(minutes: int) -> time:
+    """Обратное преобразование: смещение в минутах (в т.ч. больше суток) -> время суток."""
+    minutes %= MINUTES_PER_DAY
+    return time(minutes // 60, minutes % 60)
+
+
+def day_to_minutes(day: date) -> int:
+    """Абсолютное смещение полуночи календарного дня в минутах (общая ось для всего горизонта расписания)."""
+    return day.toordinal() * MINUTES_PER_DAY
+
+
+def datetime_to_minutes(value: datetime, *, round_up: bool = False) -> int:
+    """Переводит datetime в абсолютное смещение в минутах по "настенному" времени его timezone.
+
+    Все datetime внутри расчета расписания специалиста приводятся к одному и тому же tzinfo специалиста,
+    а сравнение aware datetime с общим tzinfo в Python - это сравнение настенного времени. Поэтому перевод
+    в минуты по настенному времени сохраняет результат всех прежних сравнений.
+    """
+    return day_to_minutes(value.date()) + time_to_minutes(value.time(), round_up=round_up)
+
+
+def normalize_minute_range(start_minutes: int, end_minutes: int) -> Tuple[int, int]:
+    """Целочисленный аналог normalize_range(): если "end <= start" внутри суток, интервал пересекает полночь
+    и к концу добавляются сутки."""
+    if end_minutes <= start_minutes:
+        end_minutes += MINUTES_PER_DAY
+
+    return start_minutes, end_minutes
+
+
+def normalize_time_range_to_minutes(start: time, end: time) -> Tuple[int, int]:
+    """Нормализует интервал времени суток (как normalize_range()) сразу в минуты от полуночи дня.
+
+    Сравнение "end <= start" выполняется по исходным time (как в normalize_range()), а округление
+    выполняется "внутрь" интервала, чтобы проверка вхождения целого слота давала тот же результат.
+    """
+    start_minutes = time_to_minutes(start, round_up=True)
+    end_minutes = time_to_minutes(end)
+
+    if end <= start:
+        end_minutes += MINUTES_PER_DAY
+
+    return start_minutes, end_minutes
+
+
+def shift_minute_end(start_minutes: int, duration_minutes: int) -> int:
+    """Возвращает конец интервала "start + duration" внутри дня с той же нормализацией, что и в use-case расписания.
+
+    Раньше конец строился как datetime и затем повторно нормализовался через normalize_range() по времени суток,
+    т.е. фактически: конец = (start + duration) по модулю суток, и если он "<= start" - плюс сутки.
+    Здесь ровно то же самое, но без создания datetime.
+
+    :param start_minutes: Старт в минутах от полуночи дня (0 <= start < 1440).
+    :param duration_minutes: Длительность интервала.
+    """
+    end_minutes = (start_minutes + duration_minutes) % MINUTES_PER_DAY
+
+    if end_minutes <= start_minutes:
+        end_minutes += MINUTES_PER_DAY
+
+    return end_minutes
@@ -1,9 +1,36 @@
-from datetime import date, time
-from typing import Iterable, Optional, Tuple
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
 
 from calendar_engine.domain.availability.base import AbsAvailabilityException
 
 
+def validate_exception_time_windows(time_windows: Iterable[Tuple[time, time]]) -> Tuple[Tuple[time, time], ...]:
+    """Проверяет переопределенные временные окна исключения и возвращает их в виде неизменяемого кортежа.
+
+    Правила:
+        - равные start/end допускаются только для 24/7 (00:00–00:00);
+        - start > end допускается только если окно заканчивается в 00:00 (конец текущих суток);
+        - набор окон не может быть пустым.
+    """
+    validated_windows = []
+
+    for start, end in time_windows:
+        if start == end and start != time(0, 0):
+            raise ValueError(
+                "Некорректное временное окно: равные start/end допускаются только для 24/7 (00:00–00:00)"
+            )
+
+        if start > end and end != time(0, 0):
+            raise ValueError(f"Некорректное временное окно: {start} > {end}")
+
+        validated_windows.append((start, end))
+
+    if not validated_windows:
+        raise ValueError("time_windows не может быть пустым")
+
+    return tuple(validated_windows)
+
+
 class DateAvailabilityException(AbsAvailabilityException):
     """Исключение для конкретной даты.
     Используется для:
@@ -31,6 +58,10 @@ class DateAvailabilityException(AbsAvailabilityException):
             return []
         return None
 
+    def covered_days(self) -> Optional[Iterable[date]]:
+        """Исключение действует ровно один календарный день."""
+        return (self._day,)
+
 
 class TimeAvailabilityException(AbsAvailabilityException):
     """Полностью переопределяет рабочие окна специалиста для конкретного дня (сокращенный или особый день).
@@ -46,24 +77,8 @@ class TimeAvailabilityException(AbsAvailabilityException):
         :param day: Конкретный рабочий день.
         :param time_windows: Итерируемый набор временных окон (start_time, end_time) внутри заданного календарного дня.
         """
-        validated_windows = []
-
-        for start, end in time_windows:
-            if start == end and start != time(0, 0):
-                raise ValueError(
-                    "Некорректное временное окно: равные start/end допускаются только для 24/7 (00:00–00:00)"
-                )
-
-            if start > end and end != time(0, 0):
-                raise ValueError(f"Некорректное временное окно: {start} > {end}")
-
-            validated_windows.append((start, end))
-
-        if not validated_windows:
-            raise ValueError("time_windows не может быть пустым")
-
         self._day = day
-        self._time_windows = tuple(validated_windows)
+        self._time_windows = validate_exception_time_windows(time_windows)
 
     def override_time_windows(self, day: date) -> Optional[Iterable[Tuple[time, time]]]:
         """Метод проверяет - применяется ли исключение к указанной дате и если да, то возвращает
@@ -73,3 +88,75 @@ class TimeAvailabilityException(AbsAvailabilityException):
         if day == self._day:
             return self._time_windows
         return None
+
+    def covered_days(self) -> Optional[Iterable[date]]:
+        """Исключение действует ровно один календарный день."""
+        return (self._day,)
+
+
+class DateIndexedAvailabilityExceptions(AbsAvailabilityException):
+    """Компактный набор всех исключений специалиста, проиндексированный по календарным дням.
+
+    Зачем нужен:
+        - раньше каждый диапазон AvailabilityException разворачивался в отдельный объект на каждый день
+          (двухмесячный отпуск = ~60 объектов), и фильтр перебирал их линейно;
+        - здесь все исключения хранятся в одном словаре {date: windows}, поэтому ответ для конкретного дня - O(1),
+          а окна override-исключения хранятся один раз и разделяются между всеми днями его диапазона.
+
+    Значения словаря:
+        - (): день полностью закрыт (unavailable);
+        - ((start, end), ...): переопределенные рабочие окна дня (override).
+    """
+
+    def __init__(self) -> None:
+        self._time_windows_by_day: Dict[date, Tuple[Tuple[time, time], ...]] = {}
+
+    def add_unavailable_range(self, *, date_from: date, date_to: date) -> None:
+        """Добавляет полностью закрытый диапазон дат (отпуск, больничный, выходной).
+
+        Если на день уже есть исключение, оно сохраняет приоритет (как при линейном переборе - побеждает первое).
+        """
+        self._add_range(date_from=date_from, date_to=date_to, time_windows=())
+
+    def add_override_range(
+        self,
+        *,
+        date_from: date,
+        date_to: date,
+        time_windows: Iterable[Tuple[time, time]],
+    ) -> None:
+        """Добавляет диапазон дат с переопределенными рабочими окнами (сокращенный или особый день).
+
+        Окна валидируются один раз на весь диапазон, а не для каждого дня.
+        """
+        self._add_range(
+            date_from=date_from,
+            date_to=date_to,
+            time_windows=validate_exception_time_windows(time_windows),
+        )
+
+    def _add_range(self, *, date_from: date, date_to: date, time_windows: Tuple[Tuple[time, time], ...]) -> None:
+        """Записывает окна по каждому дню диапазона (включительно), не перезаписывая уже добавленные дни."""
+        for day_offset in range((date_to - date_from).days + 1):
+            self._time_windows_by_day.setdefault(date_from + timedelta(days=day_offset), time_windows)
+
+    def __bool__(self) -> bool:
+        """Пустой набор исключений считается ложным, чтобы его можно было не передавать в фильтр."""
+        return bool(self._time_windows_by_day)
+
+    def override_time_windows(self, day: date) -> Optional[Iterable[Tuple[time, time]]]:
+        """Возвращает окна исключения для дня за O(1):
+            - None: на этот день исключений нет;
+            - []: день полностью закрыт (day-off);
+            - Iterable[(start, end)]: новые временные окна дня."""
+        time_windows = self._time_windows_by_day.get(day)
+
+        if time_windows is None:
+            return None
+        if not time_windows:
+            return []
+        return time_windows
+
+    def covered_days(self) -> Optional[Iterable[date]]:
+        """Возвращает все дни, к которым применяется хотя бы одно исключение."""
+        return self._time_windows_by_day.keys()
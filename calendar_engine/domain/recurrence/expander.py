@@ -0,0 +1,99 @@
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+
+
+def _iter_daily_candidates(*, rule_start: date, interval: int) -> Iterator[date]:
+    """Каждые interval дней начиная с rule_start."""
+    day = rule_start
+    while True:
+        yield day
+        day += timedelta(days=interval)
+
+
+def _iter_weekly_candidates(*, rule_start: date, interval: int, weekdays: Iterable[int]) -> Iterator[date]:
+    """Каждые interval недель в указанные дни недели (0 - понедельник).
+
+    Недели отсчитываются от понедельника недели rule_start, дни раньше rule_start в первой неделе пропускаются.
+    """
+    weekdays = sorted(set(weekdays))
+    week_start = rule_start - timedelta(days=rule_start.weekday())
+
+    while True:
+        for weekday in weekdays:
+            day = week_start + timedelta(days=weekday)
+            if day >= rule_start:
+                yield day
+
+        week_start += timedelta(weeks=interval)
+
+
+def _iter_monthly_candidates(*, rule_start: date, interval: int) -> Iterator[date]:
+    """Каждые interval месяцев в тот же день месяца, что и rule_start.
+
+    Месяцы, в которых такого дня нет (например, 31-е в апреле), пропускаются, а не сдвигаются на последний день
+    месяца: так встреча всегда остается в "своем" числе (так же трактует BYMONTHDAY календарный RFC 5545).
+    """
+    month_index = rule_start.year * 12 + rule_start.month - 1
+
+    while True:
+        year, month = divmod(month_index, 12)
+        if rule_start.day <= monthrange(year, month + 1)[1]:
+            yield date(year, month + 1, rule_start.day)
+
+        month_index += interval
+
+
+def iter_recurrence_days(
+    *,
+    rule_start: date,
+    frequency: str,
+    interval: int = 1,
+    count_recurrences: Optional[int] = None,
+    rule_end: Optional[date] = None,
+    weekdays_recurrences: Optional[Iterable[int]] = None,
+) -> Iterator[date]:
+    """Лениво разворачивает правило повторения (RecurrenceRule) в календарные дни повторений по возрастанию.
+
+    Бизнес-смысл:
+        - клиент в долгосрочной терапии бронирует одно и то же время на месяцы вперед;
+        - дни вычисляются по одному по мере чтения, поэтому вызывающий код может остановиться в любой момент
+          (например, на лимите длины серии), не разворачивая правило целиком.
+
+    ВАЖНО:
+        - функция ничего не знает про БД, время старта и timezone - только календарные дни;
+        - если не указаны ни count_recurrences, ни rule_end, последовательность бесконечна, и ограничивать ее
+          должен вызывающий код.
+
+    :param rule_start: Дата первого повторения (для weekly - неделя, с которой начинается отсчет).
+    :param frequency: Периодичность повторения: daily / weekly / monthly.
+    :param interval: Интервал повторения (1 - каждую неделю, 2 - через неделю и т.д.).
+    :param count_recurrences: Максимальное количество повторений.
+    :param rule_end: Последний день, в который еще может быть повторение (включительно).
+    :param weekdays_recurrences: Дни недели для weekly (0 - понедельник). Если не указаны - день недели rule_start.
+    :return: Итератор дат повторений.
+    """
+    if interval < 1:
+        raise ValueError("interval должен быть положительным числом")
+
+    if frequency == "daily":
+        candidates = _iter_daily_candidates(rule_start=rule_start, interval=interval)
+    elif frequency == "weekly":
+        candidates = _iter_weekly_candidates(
+            rule_start=rule_start,
+            interval=interval,
+            weekdays=weekdays_recurrences or [rule_start.weekday()],
+        )
+    elif frequency == "monthly":
+        candidates = _iter_monthly_candidates(rule_start=rule_start, interval=interval)
+    else:
+        raise ValueError("frequency должен быть одним из: 'daily', 'weekly', 'monthly'")
+
+    for occurrences_count, day in enumerate(candidates):
+        if count_recurrences is not None and occurrences_count >= count_recurrences:
+            return
+
+        if rule_end is not None and day > rule_end:
+            return
+
+        yield day
@@ -1,5 +1,5 @@
 from datetime import date, datetime, time, timedelta
-from typing import Iterable, Tuple
+from typing import Iterable, Optional, Tuple
 
 from calendar_engine.domain.time_policy.base import AbsDomainTimePolicy
 
@@ -32,6 +32,8 @@ class DomainTimePolicy(AbsDomainTimePolicy):
         self.day_time_start = day_time_start  # время начала доменного дня
         self.day_time_end = day_time_end  # время окончания доменного дня
         self.duration_slot = timedelta(minutes=slot_duration_minutes)  # Длительность одного базового слота (в минутах)
+        # Кэш сетки дня в минутах (см. get_domain_day_slot_offsets), вычисляется при первом обращении
+        self._day_slot_offsets: Optional[Tuple[Tuple[int, int], ...]] = None
 
     def iter_domain_day_slots(self, day: date) -> Iterable[Tuple[time, time]]:
         """Генерирует базовые временные слоты домена для одного дня (список всех возможных слотов):
@@ -62,3 +64,35 @@ class DomainTimePolicy(AbsDomainTimePolicy):
             yield start, end
 
             current_day_start += self.duration_slot
+
+    def get_domain_day_slot_offsets(self) -> Tuple[Tuple[int, int], ...]:
+        """Возвращает ту же базовую сетку дня, что и iter_domain_day_slots(), но в виде целочисленных смещений
+        в минутах от полуночи календарного дня: ((start_minutes, end_minutes), ...).
+
+        Зачем:
+            - сетка домена одинакова для любого календарного дня, поэтому ее достаточно вычислить один раз,
+              а не создавать datetime/time для каждого слота каждого дня;
+            - end_minutes уже нормализован (слот "23:00-00:00" -> (1380, 1440)), т.е. проверки вхождения
+              в рабочие окна и пересечения с занятостью сводятся к сравнению целых чисел.
+        """
+        if self._day_slot_offsets is None:
+            day_start_minutes = self.day_time_start.hour * 60 + self.day_time_start.minute
+            day_end_minutes = self.day_time_end.hour * 60 + self.day_time_end.minute
+
+            # Та же логика, что и в iter_domain_day_slots(): круглосуточная сетка (00:00-00:00) заканчивается
+            # в полночь следующего дня
+            if self.day_time_end <= self.day_time_start:
+                day_end_minutes += 24 * 60
+
+            slot_duration_minutes = int(self.duration_slot.total_seconds() // 60)
+
+            self._day_slot_offsets = tuple(
+                (start_minutes, start_minutes + slot_duration_minutes)
+                for start_minutes in range(
+                    day_start_minutes,
+                    day_end_minutes - slot_duration_minutes + 1,
+                    slot_duration_minutes,
+                )
+            )
+
+        return self._day_slot_offsets
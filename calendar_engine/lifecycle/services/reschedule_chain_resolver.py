@@ -1,4 +1,95 @@
-from calendar_engine.models import CalendarEvent
+from typing import Dict, Iterable
+
+from calendar_engine.models import CalendarEvent, EventParticipant
+
+
+def _build_reschedule_chain_sql(*, filter_by_viewer: bool) -> str:
+    """Собирает SQL рекурсивного CTE, который проходит цепочку previous_event сразу для нескольких событий.
+
+    Как работает:
+        - стартовая часть CTE - сами исходные события (depth = 0);
+        - рекурсивная часть на каждом шаге берет ровно ОДНО следующее звено: самого раннего direct-child
+          (ORDER BY created_at, id LIMIT 1 в LATERAL), как и прежний обход в Python;
+        - path хранит уже пройденные id, чтобы на "битых" данных с циклом previous_event обход остановился;
+        - в итоге для каждого исходного события выбирается звено с максимальной глубиной (DISTINCT ON).
+    Имена таблиц и колонок берутся из _meta моделей, а не пишутся вручную.
+    """
+    event_table = CalendarEvent._meta.db_table
+    previous_event_column = CalendarEvent._meta.get_field("previous_event").column
+    participant_table = EventParticipant._meta.db_table
+    participant_event_column = EventParticipant._meta.get_field("event").column
+    participant_user_column = EventParticipant._meta.get_field("user").column
+
+    viewer_condition = (
+        f"""
+                  AND EXISTS (
+                      SELECT 1
+                      FROM {participant_table} participant
+                      WHERE participant.{participant_event_column} = child.id
+                        AND participant.{participant_user_column} = %s
+                  )"""
+        if filter_by_viewer
+        else ""
+    )
+
+    return f"""
+        WITH RECURSIVE reschedule_chain (root_id, event_id, depth, path) AS (
+            SELECT root_event.id, root_event.id, 0, ARRAY[root_event.id]
+            FROM {event_table} root_event
+            WHERE root_event.id = ANY(%s)
+
+            UNION ALL
+
+            SELECT reschedule_chain.root_id, next_event.id, reschedule_chain.depth + 1,
+                   reschedule_chain.path || next_event.id
+            FROM reschedule_chain
+            CROSS JOIN LATERAL (
+                SELECT child.id
+                FROM {event_table} child
+                WHERE child.{previous_event_column} = reschedule_chain.event_id{viewer_condition}
+                ORDER BY child.created_at, child.id
+                LIMIT 1
+            ) next_event
+            WHERE NOT next_event.id = ANY(reschedule_chain.path)
+        )
+        SELECT DISTINCT ON (reschedule_chain.root_id) chain_event.*, reschedule_chain.root_id AS chain_root_id
+        FROM reschedule_chain
+        JOIN {event_table} chain_event ON chain_event.id = reschedule_chain.event_id
+        WHERE reschedule_chain.depth > 0
+        ORDER BY reschedule_chain.root_id, reschedule_chain.depth DESC
+    """
+
+
+def get_latest_rescheduled_descendants(
+    *,
+    event_ids: Iterable,
+    viewer_user=None,
+) -> Dict:
+    """Возвращает актуальных потомков сразу для множества событий по цепочке previous_event.
+
+    Бизнес-смысл:
+        - список встреч клиента показывает у перенесенных встреч ссылку "перенесено на ...";
+        - раньше для этого пришлось бы обходить цепочку отдельно для каждого события, по одному запросу
+          на каждое звено (N событий × глубина цепочки);
+        - теперь все цепочки разрешаются ОДНИМ SQL-запросом (рекурсивный CTE, см. _build_reschedule_chain_sql).
+
+    :param event_ids: id событий, для которых ищем актуального потомка.
+    :param viewer_user: Если указан, в цепочке учитываются только события, где этот пользователь - участник.
+    :return: Словарь {id исходного события: актуальный потомок}. События без потомков в словарь не попадают.
+    """
+    event_ids = list(dict.fromkeys(event_ids))
+    if not event_ids:
+        return {}
+
+    # Параметры подставляются по порядку %s в тексте SQL: сначала id исходных событий (стартовая часть CTE),
+    # затем участник (рекурсивная часть)
+    sql = _build_reschedule_chain_sql(filter_by_viewer=viewer_user is not None)
+    params = [event_ids, viewer_user.pk] if viewer_user is not None else [event_ids]
+
+    return {
+        descendant.chain_root_id: descendant
+        for descendant in CalendarEvent.objects.raw(sql, params)
+    }
 
 
 def get_latest_rescheduled_descendant(
@@ -13,22 +104,13 @@ def get_latest_rescheduled_descendant(
         - прямой child не всегда достаточен, потому что его могли потом перенести еще раз;
         - если из-за старых данных у события неожиданно несколько direct-children, берем самый ранний child,
           потому что именно он с наибольшей вероятностью является каноническим следующим звеном цепочки.
+
+    Вся цепочка разрешается одним запросом (см. get_latest_rescheduled_descendants), а не запросом на каждое звено.
     """
     if event is None:
         return None
 
-    current_event = event
-    visited_ids = {current_event.id}
-
-    while True:
-        next_events = CalendarEvent.objects.filter(previous_event_id=current_event.id)
-
-        if viewer_user is not None:
-            next_events = next_events.filter(participants__user=viewer_user)
-
-        next_event = next_events.order_by("created_at", "id").distinct().first()
-        if next_event is None or next_event.id in visited_ids:
-            return None if current_event == event else current_event
-
-        visited_ids.add(next_event.id)
-        current_event = next_event
+    return get_latest_rescheduled_descendants(
+        event_ids=[event.id],
+        viewer_user=viewer_user,
+    ).get(event.id)
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from calendar_engine.constants import STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS
+from core.services.cache_backend import is_process_local_cache
+
+STATUS_TRANSITIONS_WORKER_LAST_RUN_CACHE_KEY = "calendar:status_transitions:last_run"
+
+
+def mark_status_transitions_worker_run(*, processed_at) -> None:
+    """Запоминает момент времени, на который фоновая команда apply_status_transitions обновила статусы ВСЕХ событий.
+
+    TTL ключа равен STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS: дольше этого отметка guard-у все равно не нужна,
+    а если команда остановится, ключ сам исчезнет из cache (Redis), а не будет висеть в нем бессрочно.
+    """
+    cache.set(STATUS_TRANSITIONS_WORKER_LAST_RUN_CACHE_KEY, processed_at, STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS)
+
+
+def is_status_transitions_worker_current(*, current_datetime=None) -> bool:
+    """Проверяет, актуальны ли статусы событий/слотов благодаря фоновой команде ("stale since" guard).
+
+    Бизнес-смысл:
+        - если команда apply_status_transitions недавно прошла по всем событиям, то request-time пересчет
+          на страницах можно пропустить: статусы уже сдвинуты по времени с точностью до
+          STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS;
+        - если команда не запущена или отстала, то функция вернет False и страницы продолжат пересчитывать
+          статусы сами, как раньше.
+
+    Guard работает только с общим для всех процессов cache (Redis, см. REDIS_URL в settings.py): команда
+    и gunicorn workers - разные процессы. С LocMemCache отметка команды видна только ей самой, поэтому guard
+    сразу возвращает False, не читая cache.
+    """
+    if is_process_local_cache():
+        return False
+
+    last_run_at = cache.get(STATUS_TRANSITIONS_WORKER_LAST_RUN_CACHE_KEY)
+    if last_run_at is None:
+        return False
+
+    current_datetime = current_datetime or timezone.now()
+
+    return current_datetime - last_run_at <= timedelta(seconds=STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS)
@@ -4,8 +4,11 @@ from django.db import transaction
 from django.db.models import Count, Q
 from django.utils import timezone
 
+from calendar_engine.constants import STATUS_TRANSITIONS_WORKER_BATCH_SIZE
 from calendar_engine.lifecycle.services.event_status_resolver import (
     EventSlotStatusCounts, resolve_calendar_event_status)
+from calendar_engine.lifecycle.services.status_transitions_worker_state import (
+    is_status_transitions_worker_current, mark_status_transitions_worker_run)
 from calendar_engine.models import CalendarEvent, TimeSlot
 
 
@@ -187,13 +190,78 @@ def apply_time_based_status_transitions(
     return result
 
 
+def apply_time_based_status_transitions_in_batches(
+    *,
+    batch_size=STATUS_TRANSITIONS_WORKER_BATCH_SIZE,
+    current_datetime=None,
+) -> CalendarStatusTransitionResult:
+    """Глобально переводит статусы слотов/событий ВСЕХ пользователей по времени (фоновая команда).
+
+    Как работает:
+        1) фиксируем один момент времени на весь проход, чтобы набор "просроченных" слотов не рос во время работы;
+        2) берем пачку (batch_size) событий, у которых есть слоты, требующие перехода в started/completed;
+        3) каждую пачку обрабатываем общей функцией apply_time_based_status_transitions() в отдельной
+           короткой транзакции - так не держим долгие блокировки на горячих таблицах;
+        4) после полного прохода запоминаем момент времени для "stale since" guard на страницах.
+
+    :param batch_size: Сколько событий обрабатывать за одну транзакцию.
+    :return: Суммарный итог по всем пачкам.
+    """
+    current_datetime = current_datetime or timezone.now()
+    total_result = CalendarStatusTransitionResult()
+    last_event_id = None
+
+    # Слоты, которые по времени уже должны были начаться или закончиться.
+    # Берем только события в статусах, которые пересчитывает _get_target_events_queryset(), иначе такие слоты
+    # никогда не обновятся и будут попадать в каждую пачку снова
+    due_slots = TimeSlot.objects.filter(
+        event__status__in=["planned", "started", "completed"],
+    ).filter(
+        Q(status="started", end_datetime__lte=current_datetime)
+        | Q(status="planned", start_datetime__lte=current_datetime)
+    )
+
+    while True:
+        # Идем по событиям в порядке id (keyset): каждая следующая пачка начинается после последнего
+        # обработанного события, поэтому проход гарантированно конечен и не использует OFFSET
+        batch_slots = due_slots if last_event_id is None else due_slots.filter(event_id__gt=last_event_id)
+        event_ids = list(
+            batch_slots
+            .order_by("event_id")
+            .values_list("event_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not event_ids:
+            break
+
+        batch_result = apply_time_based_status_transitions(
+            event_ids=event_ids,
+            current_datetime=current_datetime,
+        )
+        total_result.started_slots_count += batch_result.started_slots_count
+        total_result.completed_slots_count += batch_result.completed_slots_count
+        total_result.updated_events_count += batch_result.updated_events_count
+        last_event_id = event_ids[-1]
+
+    mark_status_transitions_worker_run(processed_at=current_datetime)
+
+    return total_result
+
+
 # thin-wrapper: тонкая обертка над общей функцией
 def apply_time_based_status_transitions_for_user(
     *,
     participant_user,
     current_datetime=None,
 ) -> CalendarStatusTransitionResult:
-    """Пересчитывает по времени все события одного пользователя."""
+    """Пересчитывает по времени все события одного пользователя.
+
+    Если фоновая команда apply_status_transitions недавно обновила статусы всех событий, то пересчет пропускается
+    ("stale since" guard) и страница просто читает уже актуальные статусы без лишних запросов.
+    """
+    if current_datetime is None and is_status_transitions_worker_current():
+        return CalendarStatusTransitionResult()
+
     return apply_time_based_status_transitions(
         participant_user=participant_user,
         current_datetime=current_datetime,
@@ -207,7 +275,10 @@ def apply_time_based_status_transitions_for_event(
     event_id,
     current_datetime=None,
 ) -> CalendarStatusTransitionResult:
-    """Пересчитывает по времени только одно выбранное событие пользователя."""
+    """Пересчитывает по времени только одно выбранное событие пользователя (с тем же "stale since" guard)."""
+    if current_datetime is None and is_status_transitions_worker_current():
+        return CalendarStatusTransitionResult()
+
     return apply_time_based_status_transitions(
         participant_user=participant_user,
         event_ids=[event_id],
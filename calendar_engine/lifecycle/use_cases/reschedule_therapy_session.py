@@ -1,5 +1,6 @@
 from django.db import transaction
 
+from calendar_engine.booking.bulk_writer import full_clean_in_memory
 from calendar_engine.booking.use_cases.therapy_session_create import \
     CreateTherapySessionUseCase
 from calendar_engine.booking.validators import parse_requested_slot_start
@@ -54,7 +55,9 @@ def reschedule_therapy_session_slot(
     slot.status = "cancelled"
     slot.cancel_reason_type = "rescheduled"
     slot.cancel_reason = cancel_reason
-    slot.full_clean()
+    # Отмена не может нарушить ни FK, ни unique_together, ни ExclusionConstraint (cancelled-слоты в них не входят),
+    # поэтому проверяем только поля и бизнес-инварианты слота - без лишних SELECT-запросов
+    full_clean_in_memory(instance=slot)
     slot.save(update_fields=["status", "cancel_reason_type", "cancel_reason", "updated_at"])
 
     # 3) Пересчитывается статус всего CalendarEvent с учетом остальных слотов
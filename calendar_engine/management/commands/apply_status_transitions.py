@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from calendar_engine.constants import STATUS_TRANSITIONS_WORKER_BATCH_SIZE
+from calendar_engine.lifecycle.use_cases.apply_time_based_status_transitions import \
+    apply_time_based_status_transitions_in_batches
+from core.services.cache_backend import is_process_local_cache
+
+
+class Command(BaseCommand):
+    """Фоновое обновление статусов слотов и событий по времени (planned -> started -> completed) для всех.
+
+    Зачем нужна команда:
+        - раньше статусы сдвигались только синхронно на страницах пользователя (вход, список событий, личный
+          кабинет, детальная страница сессии), т.е. count + update + annotate-aggregate на каждый просмотр;
+        - теперь команда обновляет статусы глобально пачками, а страницы пропускают свой пересчет, пока команда
+          работает без отставания (см. is_status_transitions_worker_current()).
+
+    Сценарии запуска:
+        - cron раз в минуту: python manage.py apply_status_transitions
+        - постоянный процесс: python manage.py apply_status_transitions --interval 30
+
+    Требование: общий cache (Redis, REDIS_URL в settings.py). Отметка о проходе команды хранится в cache,
+    и только так ее видят gunicorn workers. С LocMemCache статусы команда обновляет, но страницы продолжают
+    пересчитывать их сами.
+    """
+
+    help = "Переводит статусы слотов и событий по времени для всех пользователей"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=STATUS_TRANSITIONS_WORKER_BATCH_SIZE,
+            help="Сколько событий обрабатывать за одну транзакцию (по умолчанию %(default)s)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Через сколько секунд повторять проход. 0 - выполнить один проход и завершиться (по умолчанию 0)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        interval = max(options["interval"], 0)
+
+        if is_process_local_cache():
+            self.stderr.write(
+                self.style.WARNING(
+                    "Cache не общий между процессами (LocMemCache): страницы не увидят отметку о проходе команды "
+                    "и продолжат пересчитывать статусы сами. Для пропуска пересчета нужен Redis (REDIS_URL)."
+                )
+            )
+
+        while True:
+            result = apply_time_based_status_transitions_in_batches(batch_size=batch_size)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Слотов started: {result.started_slots_count}, "
+                    f"слотов completed: {result.completed_slots_count}, "
+                    f"событий обновлено: {result.updated_events_count}"
+                )
+            )
+
+            if not interval:
+                break
+
+            time.sleep(interval)
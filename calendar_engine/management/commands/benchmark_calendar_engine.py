@@ -0,0 +1,148 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from calendar_engine.benchmarks.cases import (BENCHMARK_CASES,
+                                              BenchmarkParameters)
+from calendar_engine.benchmarks.runner import (
+    compare_with_baseline, find_baseline_parameter_differences, load_baseline,
+    save_baseline)
+from calendar_engine.constants import DAYS_AHEAD_FOR_SHOW_SCHEDULE
+
+DEFAULT_BASELINE_PATH = Path(settings.BASE_DIR) / "benchmarks" / "calendar_engine_baseline.json"
+
+
+class Command(BaseCommand):
+    """Запускает benchmark-сценарии calendar engine, фильтра каталога и подбора психологов.
+
+    Сценарии (calendar_engine/benchmarks/cases.py):
+        - без БД: доменная сетка, расписание специалиста, проверка выбранных стартов, matching выбранных слотов -
+          на синтетических специалистах (правило, плотные исключения, занятый календарь), сгенерированных по seed;
+        - с локальной БД: фильтр каталога (apply_catalog_basic_filters), расписания специалистов каталога без кэша,
+          подбор психологов для клиентов (PsychologistAggregatorService) - на данных, которые уже есть в БД.
+
+    Baseline:
+        - --save-baseline сохраняет результаты прогона (и его параметры) в JSON;
+        - обычный прогон сравнивает лучший результат каждого сценария с baseline и помечает регрессии,
+          а с --fail-on-regression завершается ошибкой (удобно для CI);
+        - если baseline сохранен с другими параметрами (--specialists, --days-ahead, --seed и т.п.), сравнение
+          не выполняется: время несопоставимо. С --fail-on-regression такой прогон тоже завершается ошибкой.
+
+    Пример:
+        python manage.py benchmark_calendar_engine --skip-db
+        python manage.py benchmark_calendar_engine --specialists 5000 --save-baseline
+        python manage.py benchmark_calendar_engine --case specialist_schedule --case catalog_filter_specific
+    """
+
+    help = "Замеряет производительность calendar engine, фильтра каталога и подбора психологов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--case",
+            action="append",
+            dest="cases",
+            choices=sorted(BENCHMARK_CASES),
+            help="Сценарий (можно указать несколько раз). Без параметра - все сценарии",
+        )
+        parser.add_argument("--skip-db", action="store_true", help="Не запускать сценарии, которым нужна БД")
+        parser.add_argument(
+            "--specialists",
+            type=int,
+            default=1000,
+            help="Количество синтетических специалистов / специалистов каталога из БД (по умолчанию 1000)",
+        )
+        parser.add_argument(
+            "--days-ahead",
+            type=int,
+            default=DAYS_AHEAD_FOR_SHOW_SCHEDULE,
+            help=f"Горизонт расписания в днях (по умолчанию {DAYS_AHEAD_FOR_SHOW_SCHEDULE})",
+        )
+        parser.add_argument("--exceptions", type=int, default=10, help="Исключений на специалиста (по умолчанию 10)")
+        parser.add_argument("--busy-slots", type=int, default=20, help="Встреч на специалиста (по умолчанию 20)")
+        parser.add_argument("--selected-slots", type=int, default=12, help="Выбранных стартов (по умолчанию 12)")
+        parser.add_argument("--clients", type=int, default=20, help="Клиентов для подбора (по умолчанию 20)")
+        parser.add_argument("--repeat", type=int, default=5, help="Замеров на сценарий (по умолчанию 5)")
+        parser.add_argument("--seed", type=int, default=42, help="Seed синтетических данных (по умолчанию 42)")
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=DEFAULT_BASELINE_PATH,
+            help=f"Путь к JSON с baseline (по умолчанию {DEFAULT_BASELINE_PATH})",
+        )
+        parser.add_argument("--save-baseline", action="store_true", help="Сохранить результаты как новый baseline")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=1.2,
+            help="Во сколько раз сценарий может быть медленнее baseline без пометки регрессии (по умолчанию 1.2)",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться ошибкой, если есть регрессии относительно baseline",
+        )
+
+    def handle(self, *args, **options):
+        parameters = BenchmarkParameters(
+            specialists=max(options["specialists"], 1),
+            days_ahead=max(options["days_ahead"], 1),
+            exceptions_per_specialist=max(options["exceptions"], 0),
+            busy_slots_per_specialist=max(options["busy_slots"], 0),
+            selected_slots=max(options["selected_slots"], 1),
+            clients=max(options["clients"], 1),
+            repeat=max(options["repeat"], 1),
+            seed=options["seed"],
+        )
+        cases = [BENCHMARK_CASES[name] for name in options["cases"] or BENCHMARK_CASES]
+        results = []
+
+        for case in cases:
+            if case.requires_db and options["skip_db"]:
+                continue
+
+            result = case.run(parameters)
+            if result is None:
+                self.stdout.write(self.style.WARNING(f"{case.name}: пропущен, в БД нет данных для сценария"))
+                continue
+
+            results.append(result)
+            details = ", ".join(f"{key}={value}" for key, value in result.details.items())
+            self.stdout.write(
+                f"{case.name}: best={result.best_seconds * 1000:.1f} ms, "
+                f"median={result.median_seconds * 1000:.1f} ms ({details})"
+            )
+
+        baseline_path = options["baseline"]
+        baseline = load_baseline(baseline_path)
+        regressions = []
+
+        parameter_differences = find_baseline_parameter_differences(baseline, parameters=parameters.to_dict())
+        if parameter_differences:
+            differences = ", ".join(
+                f"{name}: {baseline_value} -> {current_value}"
+                for name, (baseline_value, current_value) in parameter_differences.items()
+            )
+            self.stdout.write(
+                self.style.WARNING(f"Сравнение с baseline пропущено, параметры прогона отличаются ({differences})")
+            )
+            if options["fail_on_regression"] and not options["save_baseline"]:
+                raise CommandError("Baseline сохранен с другими параметрами прогона, сравнение невозможно")
+
+        for comparison in compare_with_baseline(results, baseline, parameters=parameters.to_dict()):
+            message = (
+                f"{comparison.name}: {comparison.ratio:.2f}x от baseline "
+                f"({comparison.baseline_seconds * 1000:.1f} ms -> {comparison.current_seconds * 1000:.1f} ms)"
+            )
+            if comparison.ratio > options["max_regression"]:
+                regressions.append(comparison)
+                self.stdout.write(self.style.ERROR(f"РЕГРЕССИЯ {message}"))
+            else:
+                self.stdout.write(message)
+
+        if options["save_baseline"]:
+            save_baseline(baseline_path, results=results, parameters=parameters.to_dict())
+            self.stdout.write(self.style.SUCCESS(f"Baseline сохранен: {baseline_path}"))
+
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Регрессий относительно baseline: {len(regressions)}")
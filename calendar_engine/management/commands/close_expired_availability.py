@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from calendar_engine.models import AvailabilityException, AvailabilityRule
+
+
+class Command(BaseCommand):
+    """Переводит в архив (is_active=False) просроченные рабочие правила и исключения ВСЕХ специалистов.
+
+    Зачем нужна команда:
+        - раньше AvailabilityRule/AvailabilityException.close_expired_for_user() вызывались на каждом read-запросе
+          (каталог, расписание, live-индикатор, API рабочего расписания), т.е. UPDATE-запросы на каждого
+          специалиста в цикле;
+        - теперь read-пути трактуют "rule_end / exception_end < сегодня" как неактивное прямо в запросе,
+          а фактическое закрытие записей выполняется этой командой пакетно по расписанию (cron).
+
+    Порядок важен: сначала закрываются правила (вместе с их исключениями), затем оставшиеся исключения.
+
+    Пример:
+        python manage.py close_expired_availability
+    """
+
+    help = "Архивирует рабочие правила и исключения специалистов, срок действия которых уже истек"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            closed_rules_count = AvailabilityRule.close_expired_for_all_users()
+            closed_exceptions_count = AvailabilityException.close_expired_for_all_users()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Закрыто правил: {closed_rules_count}, исключений: {closed_exceptions_count}"
+            )
+        )
@@ -0,0 +1,136 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from calendar_engine.availability_snapshot.services import \
+    rebuild_specialist_available_slots
+from calendar_engine.benchmarks.synthetic_dataset import (
+    SyntheticDatasetError, SyntheticDatasetGenerator,
+    SyntheticDatasetParameters)
+from calendar_engine.constants import DAYS_AHEAD_FOR_SHOW_SCHEDULE
+
+
+class Command(BaseCommand):
+    """Генерирует в локальной БД масштабный синтетический набор данных для нагрузочного тестирования
+    и профилирования каталога, подбора психологов и бронирования.
+
+    В fixtures всего несколько десятков психологов, поэтому проблемы, которые проявляются только на реальных
+    объемах (N+1, тяжелые фильтры каталога, расчет расписаний), на них не воспроизводятся.
+
+    Что создается (calendar_engine/benchmarks/synthetic_dataset.py):
+        - психологи с темами, методами, специализациями, образованием, AvailabilityRule + окна, исключения
+          и забронированные клиентами сессии (CalendarEvent + TimeSlot + участники);
+        - клиенты с предпочтениями (пол/возраст психолога, темы, методы, предпочитаемые слоты).
+
+    ВАЖНО:
+        - данные вставляются через bulk_create() без signals, поэтому для USE_MATERIALIZED_AVAILABILITY
+          нужен флаг --rebuild-availability (или отдельный запуск rebuild_available_slots);
+        - справочники (темы, методы, специализации) должны быть уже загружены из fixtures;
+        - email синтетических пользователей содержат seed, поэтому повторный запуск с тем же seed упадет
+          на уникальности email: для второго набора используйте другой --seed.
+
+    Пример:
+        python manage.py generate_synthetic_data --psychologists 1000 --clients 5000
+        python manage.py generate_synthetic_data --psychologists 10000 --sessions-per-psychologist 20 --seed 2
+        python manage.py generate_synthetic_data --psychologists 500 --rebuild-availability
+    """
+
+    help = "Генерирует синтетических психологов, клиентов и забронированные сессии для нагрузочного тестирования"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--psychologists",
+            type=int,
+            default=1000,
+            help="Количество психологов (по умолчанию 1000)",
+        )
+        parser.add_argument("--clients", type=int, default=2000, help="Количество клиентов (по умолчанию 2000)")
+        parser.add_argument(
+            "--sessions-per-psychologist",
+            type=int,
+            default=10,
+            help="Забронированных сессий на психолога (по умолчанию 10)",
+        )
+        parser.add_argument(
+            "--exceptions-per-psychologist",
+            type=int,
+            default=2,
+            help="Исключений из правила доступности на психолога (по умолчанию 2)",
+        )
+        parser.add_argument(
+            "--days-ahead",
+            type=int,
+            default=DAYS_AHEAD_FOR_SHOW_SCHEDULE,
+            help=f"Горизонт для исключений, сессий и предпочтений (по умолчанию {DAYS_AHEAD_FOR_SHOW_SCHEDULE} дней)",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Seed генератора (по умолчанию 1)")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Сколько психологов собирать в памяти за один проход (по умолчанию 1000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="batch_size для bulk_create (по умолчанию 2000)",
+        )
+        parser.add_argument(
+            "--password",
+            default="synthetic-password",
+            help="Пароль всех синтетических пользователей (для входа при нагрузочном тестировании)",
+        )
+        parser.add_argument(
+            "--rebuild-availability",
+            action="store_true",
+            help="После генерации пересобрать материализованную доступность созданных психологов",
+        )
+
+    def handle(self, *args, **options):
+        parameters = SyntheticDatasetParameters(
+            psychologists=max(options["psychologists"], 0),
+            clients=max(options["clients"], 0),
+            sessions_per_psychologist=max(options["sessions_per_psychologist"], 0),
+            exceptions_per_psychologist=max(options["exceptions_per_psychologist"], 0),
+            days_ahead=max(options["days_ahead"], 1),
+            seed=options["seed"],
+            chunk_size=max(options["chunk_size"], 1),
+            batch_size=max(options["batch_size"], 1),
+            password=options["password"],
+        )
+        generator = SyntheticDatasetGenerator(parameters)
+
+        started_at = perf_counter()
+        try:
+            created_rows = generator.generate()
+        except SyntheticDatasetError as exc:
+            raise CommandError(str(exc)) from exc
+        generation_seconds = perf_counter() - started_at
+
+        for table_name, rows_count in created_rows.items():
+            self.stdout.write(f"{table_name}: {rows_count}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано строк: {sum(created_rows.values())} за {generation_seconds:.1f} с "
+                f"(психологов: {parameters.psychologists}, клиентов: {parameters.clients})"
+            )
+        )
+
+        if not options["rebuild_availability"]:
+            return
+
+        started_at = perf_counter()
+        specialist_user_ids = generator.specialist_user_ids
+        available_slots_count = 0
+        for batch_start in range(0, len(specialist_user_ids), parameters.chunk_size):
+            available_slots_count += rebuild_specialist_available_slots(
+                specialist_user_ids=specialist_user_ids[batch_start:batch_start + parameters.chunk_size]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Пересобрано свободных стартов: {available_slots_count} за {perf_counter() - started_at:.1f} с"
+            )
+        )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from calendar_engine.availability_snapshot.services import \
+    rebuild_specialist_available_slots
+from users.models import PsychologistProfile
+
+
+class Command(BaseCommand):
+    """Пересобирает материализованную доступность специалистов (таблицы SpecialistAvailableSlot
+    и SpecialistNearestAvailableStart).
+
+    Сценарии запуска:
+        - первичное заполнение таблицы перед включением USE_MATERIALIZED_AVAILABILITY;
+        - ежедневный запуск (cron) для "прокрутки" горизонта DAYS_AHEAD_FOR_SHOW_SCHEDULE вперед и подхвата
+          изменений, которые не отправляют signals (QuerySet.update(), правки напрямую в БД).
+
+    Пример:
+        python manage.py rebuild_available_slots
+        python manage.py rebuild_available_slots --batch-size 500
+        python manage.py rebuild_available_slots --specialist-id 12 --specialist-id 15
+    """
+
+    help = "Пересобирает таблицу заранее рассчитанных свободных стартов специалистов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Сколько специалистов пересобирать за один пакет (по умолчанию 200)",
+        )
+        parser.add_argument(
+            "--specialist-id",
+            type=int,
+            action="append",
+            dest="specialist_ids",
+            help="id пользователя-специалиста (можно указать несколько раз). Без параметра - все специалисты",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        specialist_user_ids = options["specialist_ids"] or list(
+            PsychologistProfile.objects
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+        )
+
+        total_rows = 0
+        for batch_start in range(0, len(specialist_user_ids), batch_size):
+            batch_user_ids = specialist_user_ids[batch_start:batch_start + batch_size]
+            total_rows += rebuild_specialist_available_slots(specialist_user_ids=batch_user_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Пересобрано специалистов: {len(specialist_user_ids)}, свободных стартов: {total_rows}"
+            )
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from calendar_engine.availability_snapshot.services import \
+    roll_forward_nearest_available_starts
+
+
+class Command(BaseCommand):
+    """Сдвигает "сгоревшие" ближайшие свободные старты специалистов (таблица SpecialistNearestAvailableStart).
+
+    Зачем нужна команда:
+        - booking / отмена / изменения правил пересобирают ближайший старт сразу (signals + transaction.on_commit);
+        - но со временем ближайший старт перестает быть доступным сам по себе (наступает minimum notice),
+          и без сдвига карточки каталога показывали бы уже недоступное время;
+        - команда запускается часто (cron, например раз в 5-15 минут) и стоит один UPDATE + один DELETE.
+
+    Пример:
+        python manage.py roll_forward_nearest_available_starts
+    """
+
+    help = "Сдвигает ближайшие свободные старты специалистов, на которые уже нельзя записаться"
+
+    def handle(self, *args, **options):
+        rolled_count, deleted_count = roll_forward_nearest_available_starts()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Сдвинуто ближайших стартов: {rolled_count}, удалено (нет свободных стартов): {deleted_count}"
+            )
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_engine', '0014_recreate_timeslotmessage_for_current_db_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpecialistAvailableSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+                ('consultation_type', models.CharField(choices=[('individual', 'Индивидуальная'), ('couple', 'Парная')], help_text='Для какого типа консультации рассчитан свободный старт', max_length=32, verbose_name='Тип консультации')),
+                ('start_datetime', models.DateTimeField(verbose_name='Начало свободного слота')),
+                ('end_datetime', models.DateTimeField(help_text='Начало + продолжительность сессии выбранного типа консультации', verbose_name='Окончание сессии')),
+                ('bookable_until', models.DateTimeField(help_text='Начало слота минус minimum_booking_notice_hours специалиста на этот день', verbose_name='Можно записаться до')),
+                ('specialist', models.ForeignKey(help_text='Укажите специалиста', on_delete=django.db.models.deletion.CASCADE, related_name='available_slots', to=settings.AUTH_USER_MODEL, verbose_name='Специалист')),
+            ],
+            options={
+                'verbose_name': 'Свободный слот специалиста',
+                'verbose_name_plural': 'Свободные слоты специалистов',
+                'ordering': ['specialist', 'consultation_type', 'start_datetime'],
+                'indexes': [models.Index(fields=['consultation_type', 'start_datetime'], name='calendar_en_consult_764231_idx')],
+                'constraints': [models.UniqueConstraint(fields=('specialist', 'consultation_type', 'start_datetime'), name='unique_available_slot_per_specialist')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_engine', '0015_specialistavailableslot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpecialistNearestAvailableStart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+                ('consultation_type', models.CharField(choices=[('individual', 'Индивидуальная'), ('couple', 'Парная')], help_text='Для какого типа консультации рассчитан ближайший свободный старт', max_length=32, verbose_name='Тип консультации')),
+                ('nearest_available_start', models.DateTimeField(verbose_name='Ближайший свободный старт')),
+                ('bookable_until', models.DateTimeField(help_text='Начало ближайшего слота минус minimum_booking_notice_hours специалиста на этот день', verbose_name='Можно записаться до')),
+                ('specialist', models.ForeignKey(help_text='Укажите специалиста', on_delete=django.db.models.deletion.CASCADE, related_name='nearest_available_starts', to=settings.AUTH_USER_MODEL, verbose_name='Специалист')),
+            ],
+            options={
+                'verbose_name': 'Ближайший свободный старт специалиста',
+                'verbose_name_plural': 'Ближайшие свободные старты специалистов',
+                'ordering': ['consultation_type', 'nearest_available_start'],
+                'indexes': [models.Index(fields=['consultation_type', 'nearest_available_start'], name='calendar_en_consult_5b6e29_idx'), models.Index(fields=['bookable_until'], name='calendar_en_bookabl_0ef824_idx')],
+                'constraints': [models.UniqueConstraint(fields=('specialist', 'consultation_type'), name='unique_nearest_available_start_per_specialist')],
+            },
+        ),
+    ]
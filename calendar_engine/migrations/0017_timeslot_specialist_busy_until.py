@@ -0,0 +1,98 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_timeslot_specialist(apps, schema_editor):
+    """Заполняет specialist у уже существующих слотов: участник слота, у которого есть профиль психолога.
+
+    specialist_busy_until заполняется окончанием слота без перерыва: перерыв специалиста на день старых встреч
+    мог меняться, а constraint не должен упасть на исторических данных. Для новых бронирований перерыв
+    учитывается при создании слота.
+
+    Исторические данные могут содержать пересекающиеся активные встречи одного специалиста (их раньше не
+    запрещала БД). Молча исключать такие встречи из ExclusionConstraint нельзя (это реальные бронирования),
+    поэтому миграция останавливается с ошибкой и списком id конфликтующих слотов: их нужно разобрать вручную
+    (перенести или отменить) и повторить migrate, см. docs/app_calendar_info.md.
+    """
+    TimeSlot = apps.get_model("calendar_engine", "TimeSlot")
+    SlotParticipant = apps.get_model("calendar_engine", "SlotParticipant")
+
+    TimeSlot.objects.update(
+        specialist_id=models.Subquery(
+            SlotParticipant.objects
+            .filter(slot_id=models.OuterRef("pk"), user__psychologist_profile__isnull=False)
+            .values("user_id")[:1]
+        ),
+        specialist_busy_until=models.F("end_datetime"),
+    )
+
+    # Миграция выполняется в транзакции, поэтому при ошибке backfill откатывается целиком
+    overlapping_slot_ids = _find_overlapping_active_slot_ids(TimeSlot)
+    if overlapping_slot_ids:
+        raise RuntimeError(
+            "Нельзя добавить запрет пересечения встреч специалиста: у специалистов есть пересекающиеся активные "
+            f"встречи ({len(overlapping_slot_ids)} шт.). Перенесите или отмените более поздние из них и повторите "
+            f"migrate. id слотов: {', '.join(map(str, overlapping_slot_ids))}"
+        )
+
+
+def _find_overlapping_active_slot_ids(TimeSlot) -> list:
+    """Активные слоты, которые пересекаются с более ранней активной встречей того же специалиста.
+
+    Проверка та же, что и у ExclusionConstraint prevent_slot_overlap_per_specialist: интервалы
+    [start_datetime, specialist_busy_until), встречи "стык в стык" пересечением не считаются.
+    """
+    overlapping_slot_ids = []
+    current_specialist_id = None
+    current_busy_until = None
+
+    active_slots = (
+        TimeSlot.objects
+        .filter(
+            status__in=["planned", "started"],
+            specialist__isnull=False,
+            specialist_busy_until__isnull=False,
+        )
+        .order_by("specialist_id", "start_datetime", "pk")
+        .values_list("pk", "specialist_id", "start_datetime", "specialist_busy_until")
+    )
+
+    for slot_id, specialist_id, start_datetime, busy_until in active_slots.iterator():
+        if specialist_id != current_specialist_id:
+            current_specialist_id = specialist_id
+            current_busy_until = busy_until
+            continue
+
+        if start_datetime < current_busy_until:
+            overlapping_slot_ids.append(slot_id)
+            continue
+
+        current_busy_until = max(current_busy_until, busy_until)
+
+    return overlapping_slot_ids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_engine', '0016_specialistnearestavailablestart'),
+        ('users', '0017_alter_psychologistprofile_price_couples_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeslot',
+            name='specialist',
+            field=models.ForeignKey(blank=True, help_text='Специалист, у которого забронирован слот', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='specialist_slots', to=settings.AUTH_USER_MODEL, verbose_name='Специалист'),
+        ),
+        migrations.AddField(
+            model_name='timeslot',
+            name='specialist_busy_until',
+            field=models.DateTimeField(blank=True, help_text='Окончание слота плюс перерыв специалиста между сессиями на день слота', null=True, verbose_name='Специалист занят до'),
+        ),
+        migrations.RunPython(backfill_timeslot_specialist, migrations.RunPython.noop),
+    ]
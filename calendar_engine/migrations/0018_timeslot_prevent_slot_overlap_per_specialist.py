@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:00
+
+import django.contrib.postgres.constraints
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Constraint добавляется отдельной миграцией (отдельной транзакцией), т.к. в PostgreSQL ALTER TABLE нельзя
+    # выполнить в одной транзакции с UPDATE этой же таблицы, после которого остались отложенные проверки FK
+
+    dependencies = [
+        ('calendar_engine', '0017_timeslot_specialist_busy_until'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='timeslot',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('specialist__isnull', False), ('specialist_busy_until__isnull', False), ('status__in', ['planned', 'started'])), expressions=[(models.F('specialist'), '='), (models.Func(models.F('start_datetime'), models.F('specialist_busy_until'), function='tstzrange'), '&&')], name='prevent_slot_overlap_per_specialist'),
+        ),
+    ]
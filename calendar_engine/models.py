@@ -10,6 +10,7 @@ from django.db.models import Q
 from timezone_field import TimeZoneField
 
 from calendar_engine.constants import (AVAILABILITY_EXCEPTION_CHOICES,
+                                       AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES,
                                        EVENT_CANCEL_REASON_TYPE_CHOICES,
                                        EVENT_SOURCE_CHOICES,
                                        EVENT_STATUS_CHOICES,
@@ -22,7 +23,8 @@ from calendar_engine.constants import (AVAILABILITY_EXCEPTION_CHOICES,
                                        PARTICIPANT_SLOT_ROLE_CHOICES,
                                        PARTICIPANT_SLOT_STATUS_CHOICES,
                                        SLOT_STATUS_CHOICES, WEEKDAYS_CHOICES)
-from calendar_engine.services import get_local_date_for_user
+from calendar_engine.services import (get_latest_local_date,
+                                      get_local_date_for_user)
 
 # =====
 # СОБЫТИЕ / СЛОТЫ
@@ -351,6 +353,24 @@ class TimeSlot(TimeStampedModel):
         verbose_name="Порядок слота внутри события",
         help_text="Укажите порядок слота внутри события"
     )
+    # Денормализованные поля для защиты специалиста от пересекающихся бронирований на уровне БД
+    # (ExclusionConstraint prevent_slot_overlap_per_specialist ниже). Заполняются при создании бронирования,
+    # у слотов без специалиста (например, личные события) остаются пустыми и в constraint не участвуют
+    specialist = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="specialist_slots",
+        verbose_name="Специалист",
+        help_text="Специалист, у которого забронирован слот",
+    )
+    specialist_busy_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Специалист занят до",
+        help_text="Окончание слота плюс перерыв специалиста между сессиями на день слота",
+    )
 
     def __str__(self):
         """Метод определяет строковое представление объекта. Полезно для отображения объектов в админке/консоли."""
@@ -428,6 +448,28 @@ class TimeSlot(TimeStampedModel):
                 # Исторические слоты не должны блокировать доступность.
                 condition=models.Q(status__in=["planned", "started"]),
             ),
+            # Защита специалиста от пересекающихся бронирований (optimistic booking, см. USE_OPTIMISTIC_BOOKING).
+            # Сравниваются интервалы "старт - конец сессии + перерыв" (specialist_busy_until), т.е. ровно те
+            # busy intervals, по которым calendar engine скрывает занятые старты в расписании специалиста
+            ExclusionConstraint(
+                name="prevent_slot_overlap_per_specialist",
+                expressions=[
+                    (models.F("specialist"), "="),
+                    (
+                        models.Func(
+                            models.F("start_datetime"),
+                            models.F("specialist_busy_until"),
+                            function="tstzrange",
+                        ),
+                        "&&",
+                    ),
+                ],
+                condition=models.Q(
+                    status__in=["planned", "started"],
+                    specialist__isnull=False,
+                    specialist_busy_until__isnull=False,
+                ),
+            ),
         ]
         # ВАЖНО: для корректной работы constraint нужно включить расширение btree_gist.
         # ExclusionConstraint НЕ РАБОТАЕТ, если в PostgreSQL не включено расширение:
@@ -880,6 +922,57 @@ class AvailabilityRule(TimeStampedModel):
 
         return cls.objects.filter(pk__in=expired_rule_ids).update(is_active=False)
 
+    @classmethod
+    def close_expired_for_all_users(cls):
+        """Пакетно архивирует просроченные правила ВСЕХ пользователей (команда close_expired_availability).
+
+        Пояснение:
+        1) Раньше close_expired_for_user() вызывался на каждом read-запросе (каталог, расписание, live-индикатор),
+           т.е. по несколько UPDATE-запросов на каждого специалиста в цикле. Теперь read-пути трактуют
+           просроченное правило как неактивное прямо в запросе (см. active_for_user()), а реальное закрытие
+           выполняется здесь по расписанию (cron);
+        2) "Сегодня" у каждого пользователя свое (считается в его timezone), поэтому сначала одним запросом отбираем
+           кандидатов с запасом в сутки (get_latest_local_date()), а точную проверку делаем в Python;
+        3) Само закрытие правил и их исключений выполняется двумя UPDATE-запросами сразу на всех пользователей.
+        """
+        candidates = (
+            cls.objects
+            .filter(is_active=True, rule_end__lt=get_latest_local_date())
+            .select_related("creator")
+            .only("pk", "rule_end", "creator__timezone")
+        )
+        expired_rule_ids = [
+            rule.pk
+            for rule in candidates.iterator()
+            if rule.rule_end < get_local_date_for_user(rule.creator)
+        ]
+
+        if not expired_rule_ids:
+            return 0
+
+        AvailabilityException.objects.filter(
+            rule_id__in=expired_rule_ids,
+            is_active=True,
+        ).update(is_active=False)
+
+        return cls.objects.filter(pk__in=expired_rule_ids).update(is_active=False)
+
+    @classmethod
+    def active_for_user(cls, user):
+        """Возвращает QuerySet действующих правил пользователя без каких-либо UPDATE-запросов.
+
+        Правило с прошедшей датой окончания (rule_end < сегодня в TZ пользователя) считается неактивным уже на уровне
+        запроса, даже если команда close_expired_availability еще не успела перевести его в архив.
+        Правило без даты окончания (rule_end=None) остается действующим: exclude() в Django корректно учитывает NULL.
+        """
+        today = get_local_date_for_user(user)
+
+        return (
+            cls.objects
+            .filter(creator=user, is_active=True)
+            .exclude(rule_end__lt=today)
+        )
+
     class Meta:
         verbose_name = "Правило доступности"
         verbose_name_plural = "Правила доступности"
@@ -1121,6 +1214,58 @@ class AvailabilityException(TimeStampedModel):
             .update(is_active=False)
         )
 
+    @classmethod
+    def close_expired_for_all_users(cls):
+        """Пакетно архивирует исключения ВСЕХ пользователей, которые больше не могут действовать.
+
+        Пакетный аналог close_expired_for_user() для команды close_expired_availability:
+            - исключения с прошедшей датой окончания (дата "сегодня" проверяется в TZ каждого пользователя,
+              поэтому SQL отбирает кандидатов с запасом в сутки, а точная проверка выполняется в Python);
+            - исключения от уже закрытого рабочего правила и исключения без рабочего правила (одним UPDATE).
+        """
+        candidates = (
+            cls.objects
+            .filter(is_active=True, exception_end__lt=get_latest_local_date())
+            .select_related("creator")
+            .only("pk", "exception_end", "creator__timezone")
+        )
+        expired_exception_ids = [
+            exception.pk
+            for exception in candidates.iterator()
+            if exception.exception_end < get_local_date_for_user(exception.creator)
+        ]
+
+        closed_count = 0
+        if expired_exception_ids:
+            closed_count += cls.objects.filter(pk__in=expired_exception_ids).update(is_active=False)
+
+        closed_count += (
+            cls.objects
+            .filter(is_active=True)
+            .filter(Q(rule__is_active=False) | Q(rule__isnull=True))
+            .update(is_active=False)
+        )
+
+        return closed_count
+
+    @classmethod
+    def active_for_rule(cls, rule, *, today=None):
+        """Возвращает QuerySet действующих исключений правила без каких-либо UPDATE-запросов.
+
+        Исключение с прошедшей датой окончания (exception_end < сегодня в TZ автора) считается неактивным уже
+        на уровне запроса, даже если команда close_expired_availability еще не успела перевести его в архив.
+
+        :param today: Уже посчитанная дата "сегодня" пользователя (чтобы не считать ее повторно).
+        """
+        if today is None:
+            today = get_local_date_for_user(rule.creator)
+
+        return (
+            cls.objects
+            .filter(rule=rule, is_active=True)
+            .exclude(exception_end__lt=today)
+        )
+
     class Meta:
         verbose_name = "Исключение из правил доступности"
         verbose_name_plural = "Исключения из правил доступности"
@@ -1181,3 +1326,146 @@ class AvailabilityExceptionTimeWindow(TimeStampedModel):
         verbose_name = "Переопределенное временное окно доступности"
         verbose_name_plural = "Переопределенные временные окна доступности"
         ordering = ["exception", "override_start_time"]
+
+
+# =====
+# МАТЕРИАЛИЗОВАННАЯ ДОСТУПНОСТЬ
+# =====
+
+
+class SpecialistAvailableSlot(TimeStampedModel):
+    """Заранее рассчитанный свободный старт специалиста (материализованное расписание).
+
+    Бизнес-смысл:
+        - каталог, matching и виджеты расписания раньше каждый раз пересчитывали свободные старты специалиста
+          с нуля: доменная сетка → правило → исключения → minimum notice → уже существующие встречи;
+        - эта таблица хранит результат GenerateSpecialistScheduleUseCase на горизонт DAYS_AHEAD_FOR_SHOW_SCHEDULE,
+          поэтому фильтр по времени превращается в один индексированный SQL-запрос.
+
+    Актуальность данных:
+        - строки специалиста пересобираются после изменения его AvailabilityRule / AvailabilityException /
+          временных окон / TimeSlot (signals + transaction.on_commit);
+        - раз в сутки таблица "прокручивается" вперед management-командой rebuild_available_slots;
+        - bookable_until позволяет не показывать старты, которые уже стали слишком близкими к текущему моменту
+          (minimum_booking_notice_hours), даже если с момента пересборки прошло время.
+    """
+
+    specialist = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        related_name="available_slots",
+        verbose_name="Специалист",
+        help_text="Укажите специалиста",
+    )
+    consultation_type = models.CharField(
+        choices=AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES,
+        max_length=32,
+        null=False,
+        blank=False,
+        verbose_name="Тип консультации",
+        help_text="Для какого типа консультации рассчитан свободный старт",
+    )
+    start_datetime = models.DateTimeField(
+        null=False,
+        blank=False,
+        verbose_name="Начало свободного слота",
+    )
+    end_datetime = models.DateTimeField(
+        null=False,
+        blank=False,
+        verbose_name="Окончание сессии",
+        help_text="Начало + продолжительность сессии выбранного типа консультации",
+    )
+    bookable_until = models.DateTimeField(
+        null=False,
+        blank=False,
+        verbose_name="Можно записаться до",
+        help_text="Начало слота минус minimum_booking_notice_hours специалиста на этот день",
+    )
+
+    def __str__(self):
+        """Метод определяет строковое представление объекта. Полезно для отображения объектов в админке/консоли."""
+        return f"{self.specialist_id} / {self.consultation_type} / {self.start_datetime}"
+
+    class Meta:
+        verbose_name = "Свободный слот специалиста"
+        verbose_name_plural = "Свободные слоты специалистов"
+        ordering = ["specialist", "consultation_type", "start_datetime"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["specialist", "consultation_type", "start_datetime"],
+                name="unique_available_slot_per_specialist",
+            ),
+        ]
+        indexes = [
+            # Основной индекс для фильтра каталога: "кто свободен в эти старты для этого типа консультации"
+            models.Index(fields=["consultation_type", "start_datetime"]),
+        ]
+
+
+class SpecialistNearestAvailableStart(TimeStampedModel):
+    """Ближайший свободный старт специалиста для каждого типа консультации (агрегат над SpecialistAvailableSlot).
+
+    Бизнес-смысл:
+        - карточкам каталога/подбора нужен только "ближайший свободный слот", а не все расписание специалиста;
+        - раньше для этого приходилось выполнять весь pipeline GenerateSpecialistScheduleUseCase и брать schedule[0];
+        - одна строка на (специалист, consultation_type) позволяет сортировать и фильтровать каталог
+          ("доступен в ближайшие дни") одним индексированным SQL-запросом.
+
+    Актуальность данных:
+        - строки пересобираются вместе с SpecialistAvailableSlot (booking / отмена / изменения правил и исключений);
+        - старт со временем "сгорает" по minimum notice (bookable_until < now), поэтому management-команда
+          roll_forward_nearest_available_starts периодически сдвигает такие строки на следующий свободный старт.
+    """
+
+    specialist = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        related_name="nearest_available_starts",
+        verbose_name="Специалист",
+        help_text="Укажите специалиста",
+    )
+    consultation_type = models.CharField(
+        choices=AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES,
+        max_length=32,
+        null=False,
+        blank=False,
+        verbose_name="Тип консультации",
+        help_text="Для какого типа консультации рассчитан ближайший свободный старт",
+    )
+    nearest_available_start = models.DateTimeField(
+        null=False,
+        blank=False,
+        verbose_name="Ближайший свободный старт",
+    )
+    bookable_until = models.DateTimeField(
+        null=False,
+        blank=False,
+        verbose_name="Можно записаться до",
+        help_text="Начало ближайшего слота минус minimum_booking_notice_hours специалиста на этот день",
+    )
+
+    def __str__(self):
+        """Метод определяет строковое представление объекта. Полезно для отображения объектов в админке/консоли."""
+        return f"{self.specialist_id} / {self.consultation_type} / {self.nearest_available_start}"
+
+    class Meta:
+        verbose_name = "Ближайший свободный старт специалиста"
+        verbose_name_plural = "Ближайшие свободные старты специалистов"
+        ordering = ["consultation_type", "nearest_available_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["specialist", "consultation_type"],
+                name="unique_nearest_available_start_per_specialist",
+            ),
+        ]
+        indexes = [
+            # Сортировка/фильтр каталога: "кто раньше всех свободен для этого типа консультации"
+            models.Index(fields=["consultation_type", "nearest_available_start"]),
+            # Поиск "сгоревших" строк для roll forward
+            models.Index(fields=["bookable_until"]),
+        ]
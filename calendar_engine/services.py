@@ -51,6 +51,18 @@ def get_local_date_for_user(user=None) -> date:
     return django_timezone.localdate(timezone=ZoneInfo(str(timezone_value)))
 
 
+def get_latest_local_date() -> date:
+    """Возвращает самую "позднюю" текущую дату среди всех часовых поясов.
+
+        Нужна для пакетных операций сразу по всем пользователям (например, фоновое закрытие просроченных правил),
+        когда "сегодня" у каждого пользователя свое. Самый восточный часовой пояс (UTC+14) опережает UTC меньше
+        чем на сутки, поэтому "UTC-дата + 1 день" гарантированно не меньше локальной даты любого пользователя.
+        Фильтр "< get_latest_local_date()" в SQL дает надмножество кандидатов, а точная проверка по TZ
+        пользователя выполняется уже через get_local_date_for_user().
+    """
+    return django_timezone.now().astimezone(ZoneInfo("UTC")).date() + timedelta(days=1)
+
+
 def _time_to_minutes(value: time) -> int:
     """Переводит время в минуты от начала суток для простого сравнения нескольких временных окон."""
     return value.hour * 60 + value.minute
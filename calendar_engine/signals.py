@@ -0,0 +1,96 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from calendar_engine.availability_snapshot.schedule_cache import \
+    invalidate_specialist_schedule_cache
+from calendar_engine.availability_snapshot.services import \
+    schedule_specialist_available_slots_rebuild
+from calendar_engine.models import (AvailabilityException,
+                                    AvailabilityExceptionTimeWindow,
+                                    AvailabilityRule,
+                                    AvailabilityRuleTimeWindow,
+                                    SlotParticipant, TimeSlot)
+from users.models import AppUser
+
+# =====
+# ПЕРЕСБОРКА МАТЕРИАЛИЗОВАННОЙ ДОСТУПНОСТИ (SpecialistAvailableSlot) И СБРОС КЭША РАСПИСАНИЯ
+# =====
+# Любое изменение рабочего графика или встреч специалиста делает его заранее рассчитанные свободные старты
+# неактуальными. Сами сигналы ничего не считают, а только планируют пересборку и сброс кэша после commit транзакции.
+# ВАЖНО: QuerySet.update() сигналы не отправляет (например, close_expired_availability), такие изменения
+# подхватывает ежедневная команда rebuild_available_slots, а кэш расписания - по TTL.
+
+
+def _on_specialist_schedule_changed(specialist_user_ids) -> None:
+    """Расписание специалистов изменилось: пересобираем материализованную доступность и сбрасываем кэш."""
+    specialist_user_ids = list(specialist_user_ids)
+    invalidate_specialist_schedule_cache(specialist_user_ids=specialist_user_ids)
+    schedule_specialist_available_slots_rebuild(specialist_user_ids=specialist_user_ids)
+
+
+@receiver(post_save, sender=AvailabilityRule)
+@receiver(post_delete, sender=AvailabilityRule)
+@receiver(post_save, sender=AvailabilityException)
+@receiver(post_delete, sender=AvailabilityException)
+def rebuild_available_slots_on_availability_change(sender, instance, **kwargs):
+    """Правило или исключение специалиста изменилось - пересобираем его доступность."""
+    _on_specialist_schedule_changed([instance.creator_id])
+
+
+@receiver(post_save, sender=AvailabilityRuleTimeWindow)
+@receiver(post_delete, sender=AvailabilityRuleTimeWindow)
+def rebuild_available_slots_on_rule_window_change(sender, instance, **kwargs):
+    """Рабочее окно правила изменилось - пересобираем доступность владельца правила."""
+    creator_id = (
+        AvailabilityRule.objects
+        .filter(pk=instance.rule_id)
+        .values_list("creator_id", flat=True)
+        .first()
+    )
+    # Если правило уже удалено целиком, пересборку запланировал сигнал самого правила
+    _on_specialist_schedule_changed([creator_id])
+
+
+@receiver(post_save, sender=AvailabilityExceptionTimeWindow)
+@receiver(post_delete, sender=AvailabilityExceptionTimeWindow)
+def rebuild_available_slots_on_exception_window_change(sender, instance, **kwargs):
+    """Окно исключения изменилось - пересобираем доступность владельца исключения."""
+    creator_id = (
+        AvailabilityException.objects
+        .filter(pk=instance.exception_id)
+        .values_list("creator_id", flat=True)
+        .first()
+    )
+    _on_specialist_schedule_changed([creator_id])
+
+
+@receiver(post_save, sender=TimeSlot)
+def rebuild_available_slots_on_time_slot_change(sender, instance, **kwargs):
+    """Встреча создана/отменена/перенесена - пересобираем доступность всех ее участников.
+
+    Клиенты тоже попадают в список, но для них пересборка ничего не создает (у них нет PsychologistProfile).
+    Если специалист слота уже известен (TimeSlot.specialist), участников из БД не запрашиваем.
+    """
+    if instance.specialist_id:
+        _on_specialist_schedule_changed([instance.specialist_id])
+        return
+
+    participant_user_ids = SlotParticipant.objects.filter(slot_id=instance.pk).values_list("user_id", flat=True)
+    _on_specialist_schedule_changed(participant_user_ids)
+
+
+@receiver(post_save, sender=SlotParticipant)
+@receiver(post_delete, sender=SlotParticipant)
+def rebuild_available_slots_on_slot_participant_change(sender, instance, **kwargs):
+    """Участник добавлен во встречу или удален из нее (в том числе каскадно при удалении TimeSlot)."""
+    _on_specialist_schedule_changed([instance.user_id])
+
+
+@receiver(post_save, sender=AppUser)
+def invalidate_specialist_schedule_cache_on_timezone_change(sender, instance, update_fields=None, **kwargs):
+    """Timezone пользователя мог измениться - кэш его расписания построен в старом TZ.
+
+    Сохранения с update_fields без timezone (например, last_login при входе) кэш не трогают.
+    """
+    if update_fields is None or "timezone" in update_fields:
+        invalidate_specialist_schedule_cache(specialist_user_ids=[instance.pk])
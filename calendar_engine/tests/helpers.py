@@ -0,0 +1,191 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.utils.timezone import now
+
+from calendar_engine.booking.bulk_writer import (TherapySessionDraft,
+                                                 TherapySessionSlotDraft,
+                                                 write_therapy_sessions)
+from calendar_engine.models import (AvailabilityException,
+                                    AvailabilityExceptionTimeWindow,
+                                    AvailabilityRule,
+                                    AvailabilityRuleTimeWindow, CalendarEvent,
+                                    SlotParticipant, TimeSlot)
+from users.models import AppUser, ClientProfile, PsychologistProfile, UserRole
+
+# =====
+# ОБЩИЕ ХЕЛПЕРЫ ТЕСТОВ CALENDAR ENGINE
+# =====
+# Все тестовые специалисты работают в одном TZ, чтобы ожидаемые старты можно было считать "настенным" временем.
+
+TEST_TIMEZONE = "Europe/Moscow"
+TEST_PASSWORD = "Test-password-123"
+
+
+def get_specialist_today():
+    """Текущая дата в TZ тестовых специалистов."""
+    return now().astimezone(ZoneInfo(TEST_TIMEZONE)).date()
+
+
+def build_specialist_datetime(*, day, hour: int, minute: int = 0) -> datetime:
+    """Aware datetime в TZ тестовых специалистов."""
+    return datetime.combine(day, time(hour, minute), tzinfo=ZoneInfo(TEST_TIMEZONE))
+
+
+def to_specialist_local(value: datetime) -> datetime:
+    """Переводит datetime из БД (UTC) в TZ тестовых специалистов."""
+    return value.astimezone(ZoneInfo(TEST_TIMEZONE))
+
+
+def create_test_user(*, email: str, role: str, first_name: str = "Тест") -> AppUser:
+    """Активный пользователь с ролью (роль создается при первом обращении)."""
+    user_role, _ = UserRole.objects.get_or_create(role=role)
+
+    return AppUser.objects.create_user(
+        email=email,
+        password=TEST_PASSWORD,
+        first_name=first_name,
+        age=35,
+        role=user_role,
+        timezone=TEST_TIMEZONE,
+        is_active=True,
+    )
+
+
+def create_test_client(*, email: str) -> AppUser:
+    """Клиент с профилем."""
+    user = create_test_user(email=email, role="client")
+    ClientProfile.objects.create(user=user)
+
+    return user
+
+
+def create_test_specialist(*, email: str, gender: str = "female") -> PsychologistProfile:
+    """Верифицированный работающий психолог (PsychologistProfile)."""
+    user = create_test_user(email=email, role="psychologist")
+
+    return PsychologistProfile.objects.create(
+        user=user,
+        gender=gender,
+        is_verified=True,
+        is_all_education_verified=True,
+        work_status="working",
+    )
+
+
+def create_test_availability_rule(
+    *,
+    specialist_user,
+    time_windows=((time(9), time(18)),),
+    weekdays=tuple(range(7)),
+    **rule_fields,
+) -> AvailabilityRule:
+    """Активное правило доступности с рабочими окнами, действующее с сегодняшнего дня.
+
+    По умолчанию специалист работает каждый день с 09:00 до 18:00, сессия 50 минут, перерыв 10 минут.
+    """
+    rule = AvailabilityRule.objects.create(
+        creator=specialist_user,
+        timezone=TEST_TIMEZONE,
+        rule_start=get_specialist_today(),
+        rule_end=None,
+        weekdays=list(weekdays),
+        is_active=True,
+        **rule_fields,
+    )
+    for start_time, end_time in time_windows:
+        AvailabilityRuleTimeWindow.objects.create(rule=rule, start_time=start_time, end_time=end_time)
+
+    return rule
+
+
+def create_test_availability_exception(
+    *,
+    rule: AvailabilityRule,
+    day,
+    exception_type: str,
+    time_windows=(),
+    **override_fields,
+) -> AvailabilityException:
+    """Исключение из правила на один день (unavailable - выходной, override - другие окна и параметры)."""
+    exception = AvailabilityException.objects.create(
+        creator=rule.creator,
+        rule=rule,
+        exception_start=day,
+        exception_end=day,
+        reason="day_off" if exception_type == "unavailable" else "short_day",
+        exception_type=exception_type,
+        **override_fields,
+    )
+    for start_time, end_time in time_windows:
+        AvailabilityExceptionTimeWindow.objects.create(
+            exception=exception,
+            override_start_time=start_time,
+            override_end_time=end_time,
+        )
+
+    return exception
+
+
+def book_test_session(
+    *,
+    client_user,
+    specialist_user,
+    start_datetime: datetime,
+    session_duration_minutes: int = 50,
+    break_between_sessions_minutes: int = 10,
+):
+    """Записывает клиента к специалисту в обход проверки расписания (готовая встреча в БД).
+
+    :return: WrittenTherapySession (событие и его единственный слот).
+    """
+    end_datetime = start_datetime + timedelta(minutes=session_duration_minutes)
+    [written_session] = write_therapy_sessions(
+        drafts=[
+            TherapySessionDraft(
+                client_user=client_user,
+                specialist_user=specialist_user,
+                consultation_type="individual",
+                timezone=TEST_TIMEZONE,
+                slots=[
+                    TherapySessionSlotDraft(
+                        start_datetime=start_datetime,
+                        end_datetime=end_datetime,
+                        specialist_busy_until=end_datetime + timedelta(minutes=break_between_sessions_minutes),
+                    ),
+                ],
+            ),
+        ],
+    )
+
+    return written_session
+
+
+def create_test_time_slot(*, client_user, specialist_user, start_datetime: datetime) -> TimeSlot:
+    """Встреча через обычный save() (как из админки), т.е. с отправкой post_save, в отличие от bulk-записи.
+
+    Занятость специалиста в расписании читается через SlotParticipant, поэтому участники создаются тоже.
+    """
+    event = CalendarEvent.objects.create(
+        creator=client_user,
+        title="Терапевтическая сессия с психологом",
+        event_type="session_individual",
+        status="planned",
+        visibility="private",
+        source="internal",
+    )
+    time_slot = TimeSlot.objects.create(
+        creator=client_user,
+        specialist=specialist_user,
+        event=event,
+        start_datetime=start_datetime,
+        end_datetime=start_datetime + timedelta(minutes=50),
+        specialist_busy_until=start_datetime + timedelta(minutes=60),
+        status="planned",
+        timezone=TEST_TIMEZONE,
+        slot_index=1,
+    )
+    SlotParticipant.objects.create(slot=time_slot, user=client_user, role="organizer", status="planned")
+    SlotParticipant.objects.create(slot=time_slot, user=specialist_user, role="participant", status="planned")
+
+    return time_slot
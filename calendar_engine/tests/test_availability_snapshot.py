@@ -0,0 +1,173 @@
+from datetime import datetime, time, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from calendar_engine.application.factories.generate_specialist_schedule_factory import \
+    build_specialist_schedule_runtime_context
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.availability_snapshot.services import \
+    rebuild_specialist_available_slots
+from calendar_engine.constants import AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES
+from calendar_engine.models import SpecialistAvailableSlot, TimeSlot
+from calendar_engine.tests.helpers import (
+    book_test_session, build_specialist_datetime,
+    create_test_availability_exception, create_test_availability_rule,
+    create_test_client, create_test_specialist, get_specialist_today,
+    to_specialist_local)
+
+
+def _build_expected_rows(*, specialist_profile) -> set:
+    """Эталон: то, что GenerateSpecialistScheduleUseCase возвращает прямо сейчас для обоих типов консультаций."""
+    expected_rows = set()
+
+    for consultation_type, _label in AVAILABLE_SLOT_CONSULTATION_TYPE_CHOICES:
+        runtime_context = build_specialist_schedule_runtime_context(
+            specialist_profile=specialist_profile,
+            consultation_type=consultation_type,
+        )
+        specialist_tz = runtime_context["current_datetime"].tzinfo
+
+        for slot in GenerateSpecialistScheduleUseCase(**runtime_context).execute():
+            start_datetime = datetime.combine(slot.day, slot.start, tzinfo=specialist_tz)
+            session_duration_minutes = runtime_context["override_session_duration_minutes_by_day"].get(
+                slot.day,
+                runtime_context["session_duration_minutes"],
+            )
+            minimum_booking_notice_hours = runtime_context["override_minimum_booking_notice_hours_by_day"].get(
+                slot.day,
+                runtime_context["minimum_booking_notice_hours"],
+            )
+            expected_rows.add(
+                (
+                    consultation_type,
+                    start_datetime,
+                    start_datetime + timedelta(minutes=session_duration_minutes),
+                    start_datetime - timedelta(hours=minimum_booking_notice_hours),
+                )
+            )
+
+    return expected_rows
+
+
+def _get_snapshot_rows(*, specialist_profile, consultation_type=None) -> set:
+    """Строки SpecialistAvailableSlot специалиста в том же виде, что и эталон."""
+    queryset = SpecialistAvailableSlot.objects.filter(specialist_id=specialist_profile.user_id)
+    if consultation_type is not None:
+        queryset = queryset.filter(consultation_type=consultation_type)
+
+    return set(queryset.values_list("consultation_type", "start_datetime", "end_datetime", "bookable_until"))
+
+
+def _get_snapshot_starts(*, specialist_profile, day) -> set:
+    """Свободные индивидуальные старты специалиста в конкретный день (как локальное время специалиста)."""
+    local_starts = [
+        to_specialist_local(start_datetime)
+        for _type, start_datetime, _end, _bookable_until in _get_snapshot_rows(
+            specialist_profile=specialist_profile,
+            consultation_type="individual",
+        )
+    ]
+
+    return {start_datetime.time() for start_datetime in local_starts if start_datetime.date() == day}
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class SpecialistAvailableSlotSnapshotTests(TestCase):
+    """Материализованная доступность должна совпадать с расчетом GenerateSpecialistScheduleUseCase."""
+
+    def setUp(self):
+        self.today = get_specialist_today()
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        self.rule = create_test_availability_rule(
+            specialist_user=self.specialist_profile.user,
+            minimum_booking_notice_hours=1,
+        )
+
+        # День 1: встреча в 10:00 (50 минут + 10 минут перерыва)
+        self.booked_day = self.today + timedelta(days=1)
+        book_test_session(
+            client_user=self.client_user,
+            specialist_user=self.specialist_profile.user,
+            start_datetime=build_specialist_datetime(day=self.booked_day, hour=10),
+        )
+
+        # День 2: короткий день 12:00-15:00 с сессией 60 минут
+        self.override_day = self.today + timedelta(days=2)
+        create_test_availability_exception(
+            rule=self.rule,
+            day=self.override_day,
+            exception_type="override",
+            time_windows=((time(12), time(15)),),
+            override_session_duration_individual=60,
+        )
+
+        # День 3: выходной
+        self.unavailable_day = self.today + timedelta(days=3)
+        create_test_availability_exception(
+            rule=self.rule,
+            day=self.unavailable_day,
+            exception_type="unavailable",
+        )
+
+        # День 4: запись только за 6 суток - в горизонте расписания ни один старт этого дня уже недоступен
+        self.long_notice_day = self.today + timedelta(days=4)
+        create_test_availability_exception(
+            rule=self.rule,
+            day=self.long_notice_day,
+            exception_type="override",
+            time_windows=((time(9), time(18)),),
+            override_minimum_booking_notice_hours=24 * 6,
+        )
+
+    def test_snapshot_rows_match_use_case(self):
+        """Строки таблицы - ровно то, что вернул бы use-case расписания для обоих типов консультаций."""
+        rebuild_specialist_available_slots(specialist_user_ids=[self.specialist_profile.user_id])
+
+        snapshot_rows = _get_snapshot_rows(specialist_profile=self.specialist_profile)
+
+        self.assertTrue(snapshot_rows)
+        self.assertEqual(snapshot_rows, _build_expected_rows(specialist_profile=self.specialist_profile))
+
+    def test_snapshot_respects_bookings_exceptions_and_notice(self):
+        """Встречи, override/unavailable исключения и minimum notice отражаются в таблице."""
+        rebuild_started_at = now()
+        rebuild_specialist_available_slots(specialist_user_ids=[self.specialist_profile.user_id])
+
+        booked_day_starts = _get_snapshot_starts(specialist_profile=self.specialist_profile, day=self.booked_day)
+        self.assertNotIn(time(10), booked_day_starts)
+        self.assertIn(time(11), booked_day_starts)
+
+        self.assertEqual(
+            _get_snapshot_starts(specialist_profile=self.specialist_profile, day=self.override_day),
+            {time(12), time(13), time(14)},
+        )
+        for closed_day in (self.unavailable_day, self.long_notice_day):
+            self.assertEqual(_get_snapshot_starts(specialist_profile=self.specialist_profile, day=closed_day), set())
+
+        for _type, start_datetime, end_datetime, bookable_until in _get_snapshot_rows(
+            specialist_profile=self.specialist_profile,
+            consultation_type="individual",
+        ):
+            self.assertGreaterEqual(start_datetime, rebuild_started_at + timedelta(hours=1))
+            self.assertEqual(bookable_until, start_datetime - timedelta(hours=1))
+            expected_duration = 60 if to_specialist_local(start_datetime).date() == self.override_day else 50
+            self.assertEqual(end_datetime - start_datetime, timedelta(minutes=expected_duration))
+
+    def test_snapshot_ignores_cancelled_bookings(self):
+        """Отмененная встреча больше не занимает время специалиста."""
+        TimeSlot.objects.filter(specialist=self.specialist_profile.user).update(
+            status="cancelled",
+            cancel_reason_type="cancelled_by_user",
+            cancel_reason="Тест",
+        )
+
+        rebuild_specialist_available_slots(specialist_user_ids=[self.specialist_profile.user_id])
+
+        self.assertIn(time(10), _get_snapshot_starts(specialist_profile=self.specialist_profile, day=self.booked_day))
+        self.assertEqual(
+            _get_snapshot_rows(specialist_profile=self.specialist_profile),
+            _build_expected_rows(specialist_profile=self.specialist_profile),
+        )
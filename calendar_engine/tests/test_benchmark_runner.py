@@ -0,0 +1,67 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from calendar_engine.benchmarks.runner import (
+    BenchmarkResult, compare_with_baseline,
+    find_baseline_parameter_differences, load_baseline, save_baseline)
+
+PARAMETERS = {"specialists": 100, "days_ahead": 14, "repeat": 5, "seed": 42}
+
+
+class BenchmarkBaselineTests(SimpleTestCase):
+    """Сравнение с baseline выполняется только для прогонов с теми же параметрами."""
+
+    def setUp(self):
+        baseline_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, baseline_dir, ignore_errors=True)
+        self.baseline_path = Path(baseline_dir) / "baseline.json"
+
+        save_baseline(
+            self.baseline_path,
+            results=[BenchmarkResult(name="specialist_schedule", repeat=5, best_seconds=0.5, median_seconds=0.6)],
+            parameters=PARAMETERS,
+        )
+        self.current_results = [
+            BenchmarkResult(name="specialist_schedule", repeat=5, best_seconds=1.0, median_seconds=1.1),
+            BenchmarkResult(name="domain_grid", repeat=5, best_seconds=0.1, median_seconds=0.1),
+        ]
+
+    def test_same_parameters_are_compared(self):
+        baseline = load_baseline(self.baseline_path)
+
+        self.assertEqual(find_baseline_parameter_differences(baseline, parameters=PARAMETERS), {})
+        [comparison] = compare_with_baseline(self.current_results, baseline, parameters=PARAMETERS)
+        self.assertEqual(comparison.name, "specialist_schedule")
+        self.assertEqual(comparison.ratio, 2.0)
+
+    def test_different_parameters_are_not_compared(self):
+        baseline = load_baseline(self.baseline_path)
+        parameters = {**PARAMETERS, "specialists": 5000}
+
+        self.assertEqual(
+            find_baseline_parameter_differences(baseline, parameters=parameters),
+            {"specialists": (100, 5000)},
+        )
+        self.assertEqual(compare_with_baseline(self.current_results, baseline, parameters=parameters), [])
+
+    def test_baseline_without_parameters_is_not_compared(self):
+        """Старый baseline без сохраненных параметров тоже считается несопоставимым."""
+        self.baseline_path.write_text(
+            json.dumps({"results": {"specialist_schedule": {"best_seconds": 0.5}}}),
+            encoding="utf-8",
+        )
+
+        self.assertEqual(
+            compare_with_baseline(self.current_results, load_baseline(self.baseline_path), parameters=PARAMETERS),
+            [],
+        )
+
+    def test_missing_baseline(self):
+        baseline = load_baseline(self.baseline_path.with_name("missing.json"))
+
+        self.assertEqual(find_baseline_parameter_differences(baseline, parameters=PARAMETERS), {})
+        self.assertEqual(compare_with_baseline(self.current_results, baseline, parameters=PARAMETERS), [])
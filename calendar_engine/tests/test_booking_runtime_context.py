@@ -0,0 +1,114 @@
+from datetime import time, timedelta
+
+from django.test import TestCase, override_settings
+
+from calendar_engine.application.factories.generate_specialist_schedule_factory import (
+    build_specialist_booking_runtime_context,
+    build_specialist_schedule_runtime_context)
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.tests.helpers import (book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_availability_exception,
+                                           create_test_availability_rule,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today)
+
+# Окно "00:00-00:00" - круглые сутки: тогда старты сразу после полуночи тоже попадают в рабочее время
+FULL_DAY_WINDOWS = ((time(0), time(0)),)
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class SpecialistBookingRuntimeContextTests(TestCase):
+    """Узкий runtime-context бронирования + execute_for_slot_keys() дают тот же ответ по старту,
+    что и полное расписание execute() на полном runtime-context специалиста."""
+
+    def setUp(self):
+        self.previous_day = get_specialist_today() + timedelta(days=1)
+        self.day = self.previous_day + timedelta(days=1)
+        self.next_day = self.day + timedelta(days=1)
+
+        client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        specialist_user = self.specialist_profile.user
+        rule = create_test_availability_rule(specialist_user=specialist_user, time_windows=FULL_DAY_WINDOWS)
+
+        # Накануне перерыв после сессий 120 минут: вечерняя встреча в 22:00 занимает специалиста до 00:50
+        create_test_availability_exception(
+            rule=rule,
+            day=self.previous_day,
+            exception_type="override",
+            time_windows=FULL_DAY_WINDOWS,
+            override_break_between_sessions=120,
+        )
+        # На следующий день перерыв 70 минут: встреча в 12:00 занимает специалиста до 14:00
+        create_test_availability_exception(
+            rule=rule,
+            day=self.next_day,
+            exception_type="override",
+            time_windows=FULL_DAY_WINDOWS,
+            override_break_between_sessions=70,
+        )
+
+        for day, hour in ((self.previous_day, 22), (self.day, 12), (self.next_day, 12)):
+            book_test_session(
+                client_user=client_user,
+                specialist_user=specialist_user,
+                start_datetime=build_specialist_datetime(day=day, hour=hour),
+            )
+
+    def _get_full_schedule_keys(self, *, consultation_type: str) -> set:
+        """Эталон: все доступные старты полного расписания специалиста."""
+        runtime_context = build_specialist_schedule_runtime_context(
+            specialist_profile=self.specialist_profile,
+            consultation_type=consultation_type,
+        )
+
+        return {
+            (slot.day, slot.start)
+            for slot in GenerateSpecialistScheduleUseCase(**runtime_context).execute()
+        }
+
+    def _get_booking_check_keys(self, *, consultation_type: str, day, hour: int) -> set:
+        """Проверка одного старта так же, как в CreateTherapySessionUseCase."""
+        runtime_context = build_specialist_booking_runtime_context(
+            specialist_profile=self.specialist_profile,
+            consultation_type=consultation_type,
+            requested_start_datetime=build_specialist_datetime(day=day, hour=hour),
+        )
+
+        return {
+            (slot.day, slot.start)
+            for slot in GenerateSpecialistScheduleUseCase(**runtime_context).execute_for_slot_keys(
+                slot_keys={(day, time(hour))},
+            )
+        }
+
+    def test_single_start_check_matches_full_schedule(self):
+        """Каждый старт трех дней (накануне, день встречи, следующий день) для обоих типов консультаций."""
+        for consultation_type in ("individual", "couple"):
+            full_schedule_keys = self._get_full_schedule_keys(consultation_type=consultation_type)
+
+            for day in (self.previous_day, self.day, self.next_day):
+                for hour in range(24):
+                    with self.subTest(consultation_type=consultation_type, day=day, hour=hour):
+                        self.assertEqual(
+                            self._get_booking_check_keys(consultation_type=consultation_type, day=day, hour=hour),
+                            {(day, time(hour))} & full_schedule_keys,
+                        )
+
+    def test_expected_starts_around_bookings(self):
+        """Эталонное расписание действительно содержит проверяемые граничные случаи."""
+        full_schedule_keys = self._get_full_schedule_keys(consultation_type="individual")
+
+        # Перерыв накануне (override 120 минут) переходит через полночь
+        self.assertNotIn((self.day, time(0)), full_schedule_keys)
+        self.assertIn((self.day, time(1)), full_schedule_keys)
+        # Старты вплотную до и после встречи с перерывом по правилу (10 минут)
+        self.assertIn((self.day, time(11)), full_schedule_keys)
+        self.assertNotIn((self.day, time(12)), full_schedule_keys)
+        self.assertIn((self.day, time(13)), full_schedule_keys)
+        # Перерыв по override (70 минут) занимает еще один старт
+        self.assertNotIn((self.next_day, time(13)), full_schedule_keys)
+        self.assertIn((self.next_day, time(14)), full_schedule_keys)
@@ -0,0 +1,226 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from calendar_engine.booking.bulk_writer import (TherapySessionDraft,
+                                                 TherapySessionSlotDraft,
+                                                 write_therapy_sessions)
+from calendar_engine.booking.exceptions import CreateBookingValidationError
+from calendar_engine.booking.services import \
+    BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT
+from calendar_engine.models import (CalendarEvent, EventParticipant,
+                                    SlotParticipant, SpecialistAvailableSlot,
+                                    TimeSlot)
+from calendar_engine.tests.helpers import (TEST_TIMEZONE, book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_availability_rule,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today)
+
+
+def _build_draft(*, client_user, specialist_user, start_datetime, break_minutes: int = 10) -> TherapySessionDraft:
+    """Индивидуальная сессия 50 минут с перерывом специалиста break_minutes."""
+    end_datetime = start_datetime + timedelta(minutes=50)
+
+    return TherapySessionDraft(
+        client_user=client_user,
+        specialist_user=specialist_user,
+        consultation_type="individual",
+        timezone=TEST_TIMEZONE,
+        slots=[
+            TherapySessionSlotDraft(
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                specialist_busy_until=end_datetime + timedelta(minutes=break_minutes),
+            ),
+        ],
+    )
+
+
+def _count_inserts(captured_queries) -> int:
+    return sum(1 for query in captured_queries if query["sql"].lstrip().upper().startswith("INSERT"))
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class WriteTherapySessionsTests(TestCase):
+    """write_therapy_sessions(): 4 INSERT на пачку, проверки пересечений и ошибки ExclusionConstraint."""
+
+    def setUp(self):
+        self.day = get_specialist_today() + timedelta(days=1)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_user = create_test_specialist(email="specialist@example.com").user
+
+    def _assert_nothing_written(self):
+        self.assertFalse(CalendarEvent.objects.exists())
+        self.assertFalse(TimeSlot.objects.exists())
+        self.assertFalse(EventParticipant.objects.exists())
+        self.assertFalse(SlotParticipant.objects.exists())
+
+    def test_single_booking_is_four_inserts(self):
+        draft = _build_draft(
+            client_user=self.client_user,
+            specialist_user=self.specialist_user,
+            start_datetime=build_specialist_datetime(day=self.day, hour=10),
+        )
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            [written_session] = write_therapy_sessions(drafts=[draft])
+
+        self.assertEqual(_count_inserts(captured_queries), 4)
+        [slot] = written_session.slots
+        self.assertEqual(slot.slot_index, 1)
+        self.assertEqual(slot.specialist_id, self.specialist_user.pk)
+        self.assertEqual(EventParticipant.objects.filter(event=written_session.event).count(), 2)
+        self.assertEqual(SlotParticipant.objects.filter(slot=slot).count(), 2)
+
+    def test_batch_is_four_inserts(self):
+        """Количество INSERT не зависит от количества сессий в пачке."""
+        drafts = [
+            _build_draft(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=hour),
+            )
+            for hour in (10, 12, 14)
+        ]
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            written_sessions = write_therapy_sessions(drafts=drafts)
+
+        self.assertEqual(_count_inserts(captured_queries), 4)
+        self.assertEqual(len(written_sessions), 3)
+        self.assertEqual(TimeSlot.objects.filter(specialist=self.specialist_user).count(), 3)
+
+    def test_overlapping_drafts_of_specialist_are_rejected(self):
+        """Перерыв специалиста после первой сессии (до 11:30) пересекается со второй сессией другого клиента."""
+        drafts = [
+            _build_draft(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10),
+                break_minutes=40,
+            ),
+            _build_draft(
+                client_user=create_test_client(email="other-client@example.com"),
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=11),
+            ),
+        ]
+
+        with self.assertRaisesMessage(CreateBookingValidationError, "по времени специалиста"):
+            write_therapy_sessions(drafts=drafts)
+
+        self._assert_nothing_written()
+
+    def test_overlapping_drafts_of_client_are_rejected(self):
+        drafts = [
+            _build_draft(
+                client_user=self.client_user,
+                specialist_user=specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10, minute=minute),
+            )
+            for specialist_user, minute in (
+                (self.specialist_user, 0),
+                (create_test_specialist(email="other-specialist@example.com").user, 30),
+            )
+        ]
+
+        with self.assertRaisesMessage(CreateBookingValidationError, "по времени клиента"):
+            write_therapy_sessions(drafts=drafts)
+
+        self._assert_nothing_written()
+
+    def test_exclusion_conflict_with_existing_booking(self):
+        """Пересечение с уже записанной встречей клиента отклоняет PostgreSQL (prevent_slot_overlap_per_creator),
+        а клиент получает предметную ошибку, и ничего из пачки не записывается."""
+        existing_session = book_test_session(
+            client_user=self.client_user,
+            specialist_user=create_test_specialist(email="other-specialist@example.com").user,
+            start_datetime=build_specialist_datetime(day=self.day, hour=10),
+        )
+
+        with self.assertRaisesMessage(
+            CreateBookingValidationError,
+            BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT["prevent_slot_overlap_per_creator"],
+        ):
+            write_therapy_sessions(
+                drafts=[
+                    _build_draft(
+                        client_user=self.client_user,
+                        specialist_user=self.specialist_user,
+                        start_datetime=build_specialist_datetime(day=self.day, hour=10, minute=30),
+                    ),
+                ],
+            )
+
+        self.assertEqual(list(CalendarEvent.objects.all()), [existing_session.event])
+        self.assertEqual(TimeSlot.objects.count(), 1)
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=True)
+class WriteTherapySessionsRefreshTests(TestCase):
+    """bulk_create() не отправляет signals, поэтому пересборку доступности и сброс кэша планирует сам writer."""
+
+    def setUp(self):
+        self.day = get_specialist_today() + timedelta(days=1)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_user = create_test_specialist(email="specialist@example.com").user
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_test_availability_rule(specialist_user=self.specialist_user)
+
+    def _write_booking(self):
+        return write_therapy_sessions(
+            drafts=[
+                _build_draft(
+                    client_user=self.client_user,
+                    specialist_user=self.specialist_user,
+                    start_datetime=build_specialist_datetime(day=self.day, hour=10),
+                ),
+            ],
+        )
+
+    def _has_available_start(self, *, hour: int) -> bool:
+        return SpecialistAvailableSlot.objects.filter(
+            specialist=self.specialist_user,
+            consultation_type="individual",
+            start_datetime=build_specialist_datetime(day=self.day, hour=hour),
+        ).exists()
+
+    def test_rebuild_after_commit(self):
+        self.assertTrue(self._has_available_start(hour=10))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self._write_booking()
+
+        self.assertTrue(callbacks)
+        self.assertFalse(self._has_available_start(hour=10))
+        self.assertTrue(self._has_available_start(hour=11))
+
+    def test_schedule_cache_invalidated(self):
+        with patch("calendar_engine.booking.bulk_writer.invalidate_specialist_schedule_cache") as mocked_invalidate:
+            self._write_booking()
+
+        mocked_invalidate.assert_called_once_with(specialist_user_ids=[self.specialist_user.pk])
+
+    def test_nothing_scheduled_when_batch_rejected(self):
+        """Отклоненная пачка не планирует ни пересборку, ни сброс кэша."""
+        drafts = [
+            _build_draft(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10, minute=minute),
+            )
+            for minute in (0, 30)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(CreateBookingValidationError):
+                write_therapy_sessions(drafts=drafts)
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(self._has_available_start(hour=10))
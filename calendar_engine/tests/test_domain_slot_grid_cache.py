@@ -0,0 +1,122 @@
+from collections import Counter
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+
+from calendar_engine.application.use_cases.get_domain_slots_use_case import (
+    SERIALIZED_DOMAIN_SLOTS_CACHE, GetDomainSlotsUseCase)
+from calendar_engine.constants import DAYS_AHEAD_FOR_CLIENT
+from calendar_engine.domain.availability.domain_slot_generator import (
+    DOMAIN_SLOTS_CACHE, DomainSlotGenerator)
+from calendar_engine.domain.availability.domain_slot_grid_cache import (
+    DOMAIN_SLOT_GRID_CACHE_KEEP_DAYS, DomainSlotGridCache)
+from calendar_engine.tests.helpers import TEST_TIMEZONE
+
+DAY = date(2027, 3, 1)
+
+
+class DomainSlotGridCacheTests(SimpleTestCase):
+    """Кэш сетки в памяти процесса: одна сборка на (день, ключ) и вытеснение старых дней при смене дня."""
+
+    def setUp(self):
+        self.grid_cache = DomainSlotGridCache()
+        self.builds = Counter()
+
+    def _get(self, day, key="grid"):
+        """Значение из кэша; self.builds считает, сколько раз build() вызывался для (day, key)."""
+
+        def build():
+            self.builds[day, key] += 1
+            return f"{day}:{key}"
+
+        return self.grid_cache.get_or_build(day=day, key=key, build=build)
+
+    def test_value_is_built_once_per_key(self):
+        self.assertEqual(self._get(DAY), f"{DAY}:grid")
+        self.assertEqual(self._get(DAY), f"{DAY}:grid")
+        self._get(DAY, key="other")
+        self._get(DAY + timedelta(days=1))
+
+        self.assertEqual(
+            self.builds,
+            Counter({(DAY, "grid"): 1, (DAY, "other"): 1, (DAY + timedelta(days=1), "grid"): 1}),
+        )
+
+    def test_day_rollover_evicts_days_outside_window(self):
+        """Новый день вытесняет все дни старше DOMAIN_SLOT_GRID_CACHE_KEEP_DAYS от него, а окно остается в кэше."""
+        requested_days = [
+            DAY + timedelta(days=day_offset)
+            for day_offset in range(DOMAIN_SLOT_GRID_CACHE_KEEP_DAYS + 2)
+        ]
+        for day in requested_days:
+            self._get(day)
+        # Последний запрошенный день - новый "сегодня", от него в кэше остается окно из KEEP_DAYS + 1 дней
+        oldest_kept_day = requested_days[1]
+
+        self.assertEqual({cached_day for cached_day, _key in self.grid_cache._values}, set(requested_days[1:]))
+
+        # Вытесненный день строится заново, а день из окна - нет
+        self._get(DAY)
+        self._get(oldest_kept_day)
+        self.assertEqual(self.builds[DAY, "grid"], 2)
+        self.assertEqual(self.builds[oldest_kept_day, "grid"], 1)
+
+    def test_earlier_day_does_not_evict(self):
+        """Запрос от пользователя, у которого "сегодня" еще вчера (другой timezone), ничего не вытесняет."""
+        self._get(DAY + timedelta(days=1))
+        self._get(DAY)
+        self._get(DAY + timedelta(days=1))
+
+        self.assertEqual(self.builds[DAY + timedelta(days=1), "grid"], 1)
+        self.assertEqual(len(self.grid_cache._values), 2)
+
+    def test_clear(self):
+        self._get(DAY)
+        self.grid_cache.clear()
+        self._get(DAY)
+
+        self.assertEqual(self.builds[DAY, "grid"], 2)
+
+
+class DomainSlotsCacheCallersTests(SimpleTestCase):
+    """Общие на процесс кэши сетки не портятся, если вызывающий код модифицирует полученный результат."""
+
+    def setUp(self):
+        for grid_cache in (DOMAIN_SLOTS_CACHE, SERIALIZED_DOMAIN_SLOTS_CACHE):
+            grid_cache.clear()
+            self.addCleanup(grid_cache.clear)
+
+    def test_generate_domain_slots_returns_new_list(self):
+        slot_generator = DomainSlotGenerator()
+        expected_slots = DomainSlotGenerator._build_domain_slots(date_from=DAY, days_ahead=3)
+
+        domain_slots = slot_generator.generate_domain_slots(date_from=DAY, days_ahead=3)
+        self.assertEqual(domain_slots, expected_slots)
+        domain_slots.pop()
+        domain_slots.reverse()
+
+        self.assertEqual(slot_generator.generate_domain_slots(date_from=DAY, days_ahead=3), expected_slots)
+
+    def test_generate_domain_slots_after_rollover(self):
+        """После смены дня сетка строится от новой даты, а не берется от старой."""
+        slot_generator = DomainSlotGenerator()
+        slot_generator.generate_domain_slots(date_from=DAY, days_ahead=2)
+        next_day = DAY + timedelta(days=1)
+
+        self.assertEqual(
+            slot_generator.generate_domain_slots(date_from=next_day, days_ahead=2),
+            DomainSlotGenerator._build_domain_slots(date_from=next_day, days_ahead=2),
+        )
+
+    def test_get_domain_slots_returns_new_lists(self):
+        use_case = GetDomainSlotsUseCase(timezone=ZoneInfo(TEST_TIMEZONE))
+
+        slots_by_day = use_case.execute()["slots"]
+        self.assertEqual(len(slots_by_day), DAYS_AHEAD_FOR_CLIENT)
+        expected_slots_by_day = {day: list(day_slots) for day, day_slots in slots_by_day.items()}
+        first_day = next(iter(slots_by_day))
+        slots_by_day[first_day].clear()
+        slots_by_day.pop(first_day)
+
+        self.assertEqual(use_case.execute()["slots"], expected_slots_by_day)
@@ -0,0 +1,217 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import IntegrityError, OperationalError, transaction
+from django.test import (SimpleTestCase, TestCase, TransactionTestCase,
+                         override_settings)
+
+from calendar_engine.booking.exceptions import CreateBookingValidationError
+from calendar_engine.booking.services import (
+    BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT, is_transient_booking_error,
+    map_booking_integrity_error)
+from calendar_engine.booking.use_cases.therapy_session_create import \
+    CreateTherapySessionUseCase
+from calendar_engine.constants import OPTIMISTIC_BOOKING_MAX_ATTEMPTS
+from calendar_engine.models import CalendarEvent, TimeSlot
+from calendar_engine.tests.helpers import (TEST_TIMEZONE, book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today)
+
+SPECIALIST_CONFLICT_MESSAGE = BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT["prevent_slot_overlap_per_specialist"]
+
+
+class _DriverError(Exception):
+    """Ошибка драйвера БД с SQLSTATE (как у psycopg), которую Django оборачивает в свои исключения."""
+
+    def __init__(self, message: str, *, sqlstate: str):
+        super().__init__(message)
+        self.sqlstate = sqlstate
+
+
+def _build_operational_error(*, sqlstate: str) -> OperationalError:
+    """OperationalError Django с исходной ошибкой драйвера в __cause__ (как при `raise ... from exc`)."""
+    error = OperationalError(f"database error {sqlstate}")
+    error.__cause__ = _DriverError(f"database error {sqlstate}", sqlstate=sqlstate)
+    return error
+
+
+class MapBookingIntegrityErrorTests(TestCase):
+    """Нарушение ExclusionConstraint у TimeSlot превращается в CreateBookingValidationError."""
+
+    def setUp(self):
+        self.start_datetime = build_specialist_datetime(day=get_specialist_today() + timedelta(days=1), hour=10)
+        self.specialist_user = create_test_specialist(email="specialist@example.com").user
+        book_test_session(
+            client_user=create_test_client(email="first-client@example.com"),
+            specialist_user=self.specialist_user,
+            start_datetime=self.start_datetime,
+        )
+
+    def _insert_overlapping_slot(self) -> IntegrityError:
+        """Вставляет в обход проверок слот, пересекающийся с уже забронированным, и возвращает ошибку БД."""
+        client_user = create_test_client(email="second-client@example.com")
+        event = CalendarEvent.objects.create(
+            creator=client_user,
+            title="Терапевтическая сессия с психологом",
+            event_type="session_individual",
+            status="planned",
+            visibility="private",
+            source="internal",
+        )
+
+        with self.assertRaises(IntegrityError) as raised:
+            with transaction.atomic():
+                TimeSlot.objects.bulk_create([
+                    TimeSlot(
+                        creator=client_user,
+                        specialist=self.specialist_user,
+                        event=event,
+                        start_datetime=self.start_datetime + timedelta(minutes=30),
+                        end_datetime=self.start_datetime + timedelta(minutes=80),
+                        specialist_busy_until=self.start_datetime + timedelta(minutes=90),
+                        status="planned",
+                        timezone=TEST_TIMEZONE,
+                        slot_index=1,
+                    ),
+                ])
+
+        return raised.exception
+
+    def test_specialist_overlap_is_mapped(self):
+        booking_error = map_booking_integrity_error(self._insert_overlapping_slot())
+
+        self.assertIsInstance(booking_error, CreateBookingValidationError)
+        self.assertEqual(str(booking_error), SPECIALIST_CONFLICT_MESSAGE)
+
+    def test_overlap_through_bulk_writer(self):
+        """write_therapy_sessions() отдает клиенту ту же предметную ошибку, а не IntegrityError."""
+        with self.assertRaisesMessage(CreateBookingValidationError, SPECIALIST_CONFLICT_MESSAGE):
+            book_test_session(
+                client_user=create_test_client(email="second-client@example.com"),
+                specialist_user=self.specialist_user,
+                start_datetime=self.start_datetime,
+            )
+
+
+class MapBookingIntegrityErrorUnitTests(SimpleTestCase):
+    """Распознавание constraint по diag.constraint_name драйвера и по тексту ошибки."""
+
+    def test_unknown_constraint_is_not_mapped(self):
+        error = IntegrityError('duplicate key value violates unique constraint "calendar_engine_timeslot_pkey"')
+
+        self.assertIsNone(map_booking_integrity_error(error))
+
+    def test_constraint_name_from_message(self):
+        error = IntegrityError(
+            'conflicting key value violates exclusion constraint "prevent_slot_overlap_per_creator"'
+        )
+
+        self.assertEqual(
+            str(map_booking_integrity_error(error)),
+            BOOKING_CONFLICT_MESSAGES_BY_CONSTRAINT["prevent_slot_overlap_per_creator"],
+        )
+
+    def test_transient_errors(self):
+        self.assertTrue(is_transient_booking_error(_build_operational_error(sqlstate="40P01")))
+        self.assertTrue(is_transient_booking_error(_build_operational_error(sqlstate="40001")))
+        self.assertFalse(is_transient_booking_error(_build_operational_error(sqlstate="57014")))
+
+
+@override_settings(USE_OPTIMISTIC_BOOKING=True)
+@patch("calendar_engine.booking.use_cases.therapy_session_create.sleep")
+class OptimisticBookingRetryTests(TransactionTestCase):
+    """_create_booking_optimistically() повторяет попытку после deadlock (SQLSTATE 40P01).
+
+    TransactionTestCase: повтор возможен только вне внешней транзакции, а TestCase оборачивает каждый тест в atomic.
+    """
+
+    def setUp(self):
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        self.booking_result = {"event_id": "created"}
+
+    def _execute(self):
+        slot_start_datetime = build_specialist_datetime(day=get_specialist_today() + timedelta(days=1), hour=10)
+
+        return CreateTherapySessionUseCase().execute(
+            client_user=self.client_user,
+            specialist_profile_id=self.specialist_profile.pk,
+            slot_start_iso=slot_start_datetime.isoformat(),
+            consultation_type="individual",
+        )
+
+    def test_deadlock_is_retried(self, mocked_sleep):
+        with patch.object(
+            CreateTherapySessionUseCase,
+            "_create_booking",
+            side_effect=[_build_operational_error(sqlstate="40P01"), self.booking_result],
+        ) as mocked_create_booking:
+            self.assertEqual(self._execute(), self.booking_result)
+
+        self.assertEqual(mocked_create_booking.call_count, 2)
+        mocked_sleep.assert_called_once()
+
+    def test_backoff_runs_outside_transaction(self, mocked_sleep):
+        """Пауза перед повтором выполняется после отката попытки: прерванная транзакция не держит блокировки."""
+        mocked_sleep.side_effect = lambda seconds: self.assertFalse(transaction.get_connection().in_atomic_block)
+
+        with patch.object(
+            CreateTherapySessionUseCase,
+            "_create_booking",
+            side_effect=[_build_operational_error(sqlstate="40001"), self.booking_result],
+        ):
+            self.assertEqual(self._execute(), self.booking_result)
+
+        mocked_sleep.assert_called_once()
+
+    def test_no_retry_inside_outer_transaction(self, mocked_sleep):
+        """Deadlock прерывает всю внешнюю транзакцию вызывающего кода, поэтому повторять внутри нее бесполезно."""
+        with patch.object(
+            CreateTherapySessionUseCase,
+            "_create_booking",
+            side_effect=[_build_operational_error(sqlstate="40P01"), self.booking_result],
+        ) as mocked_create_booking:
+            with self.assertRaises(OperationalError):
+                with transaction.atomic():
+                    self._execute()
+
+        self.assertEqual(mocked_create_booking.call_count, 1)
+        mocked_sleep.assert_not_called()
+
+    def test_retries_are_limited(self, mocked_sleep):
+        with patch.object(
+            CreateTherapySessionUseCase,
+            "_create_booking",
+            side_effect=[_build_operational_error(sqlstate="40P01") for _ in range(OPTIMISTIC_BOOKING_MAX_ATTEMPTS)],
+        ) as mocked_create_booking:
+            with self.assertRaises(OperationalError):
+                self._execute()
+
+        self.assertEqual(mocked_create_booking.call_count, OPTIMISTIC_BOOKING_MAX_ATTEMPTS)
+        self.assertEqual(mocked_sleep.call_count, OPTIMISTIC_BOOKING_MAX_ATTEMPTS - 1)
+
+    def test_other_database_errors_are_not_retried(self, mocked_sleep):
+        with patch.object(
+            CreateTherapySessionUseCase,
+            "_create_booking",
+            side_effect=_build_operational_error(sqlstate="57014"),
+        ) as mocked_create_booking:
+            with self.assertRaises(OperationalError):
+                self._execute()
+
+        self.assertEqual(mocked_create_booking.call_count, 1)
+        mocked_sleep.assert_not_called()
+
+    def test_booking_conflict_is_not_retried(self, mocked_sleep):
+        with patch.object(
+            CreateTherapySessionUseCase,
+            "_create_booking",
+            side_effect=CreateBookingValidationError(SPECIALIST_CONFLICT_MESSAGE),
+        ) as mocked_create_booking:
+            with self.assertRaisesMessage(CreateBookingValidationError, SPECIALIST_CONFLICT_MESSAGE):
+                self._execute()
+
+        self.assertEqual(mocked_create_booking.call_count, 1)
+        mocked_sleep.assert_not_called()
@@ -0,0 +1,92 @@
+from datetime import date
+from itertools import islice
+
+from django.test import SimpleTestCase
+
+from calendar_engine.domain.recurrence.expander import iter_recurrence_days
+
+
+class IterRecurrenceDaysTests(SimpleTestCase):
+    """Разворачивание правила повторения серии в календарные дни."""
+
+    def test_monthly_skips_months_without_day(self):
+        """Серия 31-го числа пропускает месяцы, где 31-го нет, а не сдвигается на последний день месяца."""
+        self.assertEqual(
+            list(iter_recurrence_days(rule_start=date(2027, 1, 31), frequency="monthly", count_recurrences=4)),
+            [date(2027, 1, 31), date(2027, 3, 31), date(2027, 5, 31), date(2027, 7, 31)],
+        )
+
+    def test_monthly_with_interval(self):
+        self.assertEqual(
+            list(
+                iter_recurrence_days(
+                    rule_start=date(2027, 11, 15),
+                    frequency="monthly",
+                    interval=2,
+                    rule_end=date(2028, 5, 15),
+                )
+            ),
+            [date(2027, 11, 15), date(2028, 1, 15), date(2028, 3, 15), date(2028, 5, 15)],
+        )
+
+    def test_weekly_with_interval_and_weekdays(self):
+        """Каждые 2 недели по понедельникам и средам: серия начинается в среду, понедельник первой недели пропущен."""
+        self.assertEqual(
+            list(
+                iter_recurrence_days(
+                    rule_start=date(2027, 1, 6),
+                    frequency="weekly",
+                    interval=2,
+                    count_recurrences=5,
+                    weekdays_recurrences=[2, 0],
+                )
+            ),
+            [date(2027, 1, 6), date(2027, 1, 18), date(2027, 1, 20), date(2027, 2, 1), date(2027, 2, 3)],
+        )
+
+    def test_weekly_defaults_to_rule_start_weekday(self):
+        self.assertEqual(
+            list(iter_recurrence_days(rule_start=date(2027, 1, 6), frequency="weekly", count_recurrences=3)),
+            [date(2027, 1, 6), date(2027, 1, 13), date(2027, 1, 20)],
+        )
+
+    def test_rule_end_is_inclusive(self):
+        self.assertEqual(
+            list(
+                iter_recurrence_days(
+                    rule_start=date(2027, 3, 1),
+                    frequency="daily",
+                    interval=3,
+                    rule_end=date(2027, 3, 10),
+                )
+            ),
+            [date(2027, 3, 1), date(2027, 3, 4), date(2027, 3, 7), date(2027, 3, 10)],
+        )
+
+    def test_count_stops_before_rule_end(self):
+        """Срабатывает то ограничение, которое наступает раньше."""
+        self.assertEqual(
+            list(
+                iter_recurrence_days(
+                    rule_start=date(2027, 3, 1),
+                    frequency="daily",
+                    count_recurrences=2,
+                    rule_end=date(2027, 3, 10),
+                )
+            ),
+            [date(2027, 3, 1), date(2027, 3, 2)],
+        )
+
+    def test_unbounded_series_is_lazy(self):
+        """Без count_recurrences и rule_end последовательность бесконечна и читается по мере необходимости."""
+        days = list(islice(iter_recurrence_days(rule_start=date(2027, 3, 1), frequency="daily"), 400))
+
+        self.assertEqual(len(days), 400)
+        self.assertEqual(days[-1], date(2028, 4, 3))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            next(iter_recurrence_days(rule_start=date(2027, 3, 1), frequency="daily", interval=0))
+
+        with self.assertRaises(ValueError):
+            next(iter_recurrence_days(rule_start=date(2027, 3, 1), frequency="yearly"))
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from calendar_engine.lifecycle.services.reschedule_chain_resolver import (
+    get_latest_rescheduled_descendant, get_latest_rescheduled_descendants)
+from calendar_engine.models import CalendarEvent
+from calendar_engine.tests.helpers import (book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today)
+
+
+class RescheduleChainResolverTests(TestCase):
+    """Рекурсивный CTE по цепочке previous_event: самое глубокое звено, самый ранний direct-child, участник, цикл."""
+
+    def setUp(self):
+        self.first_day = get_specialist_today() + timedelta(days=1)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_user = create_test_specialist(email="specialist@example.com").user
+        self.events_count = 0
+
+    def _create_event(self, *, previous_event=None, client_user=None, specialist_user=None, created_at=None):
+        """Встреча в отдельный день (чтобы встречи не пересекались) с переносом из previous_event.
+
+        previous_event и created_at проставляются через update(): так можно собрать и "битые" данные, которые
+        не прошли бы clean() (несколько direct-children, цикл).
+        """
+        self.events_count += 1
+        event = book_test_session(
+            client_user=client_user or self.client_user,
+            specialist_user=specialist_user or self.specialist_user,
+            start_datetime=build_specialist_datetime(day=self.first_day + timedelta(days=self.events_count), hour=10),
+        ).event
+
+        CalendarEvent.objects.filter(pk=event.pk).update(
+            previous_event=previous_event,
+            created_at=created_at or now() + timedelta(minutes=self.events_count),
+        )
+        event.refresh_from_db()
+
+        return event
+
+    def _create_chain(self, *, length: int) -> list:
+        """Цепочка переносов root -> 1 -> ... -> length."""
+        chain = [self._create_event()]
+        for _ in range(length):
+            chain.append(self._create_event(previous_event=chain[-1]))
+
+        return chain
+
+    def test_deep_chain_returns_last_event(self):
+        chain = self._create_chain(length=4)
+
+        self.assertEqual(get_latest_rescheduled_descendant(event=chain[0]), chain[-1])
+        # Из середины цепочки - тоже последнее звено, а для последнего звена потомка нет
+        self.assertEqual(get_latest_rescheduled_descendant(event=chain[2]), chain[-1])
+        self.assertIsNone(get_latest_rescheduled_descendant(event=chain[-1]))
+
+    def test_earliest_direct_child_wins(self):
+        """При нескольких direct-children цепочка идет через самого раннего по (created_at, id)."""
+        root_event = self._create_event()
+        created_at = now()
+        later_child = self._create_event(previous_event=root_event, created_at=created_at + timedelta(hours=1))
+        earliest_child = self._create_event(previous_event=root_event, created_at=created_at)
+        earliest_child_descendant = self._create_event(previous_event=earliest_child)
+        self._create_event(previous_event=later_child)
+
+        self.assertEqual(get_latest_rescheduled_descendant(event=root_event), earliest_child_descendant)
+
+    def test_same_created_at_is_resolved_by_id(self):
+        root_event = self._create_event()
+        created_at = now()
+        children = [self._create_event(previous_event=root_event, created_at=created_at) for _ in range(3)]
+
+        self.assertEqual(
+            get_latest_rescheduled_descendant(event=root_event),
+            min(children, key=lambda child: child.id),
+        )
+
+    def test_viewer_user_filter(self):
+        """Звенья, где viewer_user не участник, пропускаются: берется самый ранний child С участием viewer_user."""
+        root_event = self._create_event()
+        created_at = now()
+        foreign_child = self._create_event(
+            previous_event=root_event,
+            client_user=create_test_client(email="other-client@example.com"),
+            specialist_user=create_test_specialist(email="other-specialist@example.com").user,
+            created_at=created_at,
+        )
+        own_child = self._create_event(previous_event=root_event, created_at=created_at + timedelta(hours=1))
+        own_descendant = self._create_event(previous_event=own_child)
+
+        self.assertEqual(get_latest_rescheduled_descendant(event=root_event), foreign_child)
+        self.assertEqual(
+            get_latest_rescheduled_descendant(event=root_event, viewer_user=self.client_user),
+            own_descendant,
+        )
+
+    def test_cycle_stops_traversal(self):
+        """На "битых" данных с циклом previous_event обход останавливается на последнем непройденном звене."""
+        chain = self._create_chain(length=2)
+        CalendarEvent.objects.filter(pk=chain[0].pk).update(previous_event=chain[-1])
+
+        self.assertEqual(get_latest_rescheduled_descendant(event=chain[0]), chain[-1])
+        self.assertEqual(get_latest_rescheduled_descendant(event=chain[1]), chain[0])
+
+    def test_batch_is_one_query(self):
+        """Цепочки для всех событий страницы разрешаются одним запросом, независимо от их количества и глубины."""
+        chains = [self._create_chain(length=length) for length in (1, 3, 5)]
+        event_without_descendants = self._create_event()
+
+        with self.assertNumQueries(1):
+            descendants_by_event_id = get_latest_rescheduled_descendants(
+                event_ids=[chain[0].id for chain in chains] + [event_without_descendants.id],
+                viewer_user=self.client_user,
+            )
+
+        self.assertEqual(descendants_by_event_id, {chain[0].id: chain[-1] for chain in chains})
+
+    def test_empty_event_ids(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(get_latest_rescheduled_descendants(event_ids=[]), {})
@@ -0,0 +1,146 @@
+import shutil
+import tempfile
+from datetime import time, timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from calendar_engine.availability_snapshot.schedule_cache import (
+    get_specialist_schedule_slots, get_specialists_schedule_slots)
+from calendar_engine.tests.helpers import (book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_availability_rule,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           create_test_time_slot,
+                                           get_specialist_today)
+
+
+def _get_free_starts(schedule_slots, *, day) -> set:
+    """Свободные старты специалиста в конкретный день (локальное время специалиста)."""
+    return {slot.start for slot, _bookable_until in schedule_slots if slot.day == day}
+
+
+class SpecialistScheduleCacheTestsMixin:
+    """Общие данные тестов кэша расписания: специалист, работающий каждый день с 09:00 до 18:00."""
+
+    def setUp(self):
+        self.day = get_specialist_today() + timedelta(days=1)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        self.specialist_user = self.specialist_profile.user
+        create_test_availability_rule(specialist_user=self.specialist_user)
+
+    def _get_free_starts(self) -> set:
+        """Свободные индивидуальные старты специалиста на self.day через кэш расписания."""
+        return _get_free_starts(
+            get_specialist_schedule_slots(
+                specialist_profile=self.specialist_profile,
+                consultation_type="individual",
+            ),
+            day=self.day,
+        )
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class SharedSpecialistScheduleCacheTests(SpecialistScheduleCacheTestsMixin, TestCase):
+    """Кэш расписания с общим для всех процессов backend (в тесте - FileBasedCache вместо Redis)."""
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
+        shared_cache_settings = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir,
+                },
+            },
+        )
+        shared_cache_settings.enable()
+        self.addCleanup(shared_cache_settings.disable)
+
+        super().setUp()
+
+    def test_schedule_is_cached(self):
+        """Повторное чтение расписания не обращается к БД."""
+        self.assertIn(time(10), self._get_free_starts())
+
+        with self.assertNumQueries(0):
+            self.assertIn(time(10), self._get_free_starts())
+
+    def test_time_slot_insert_invalidates_cached_schedule(self):
+        """Новая встреча (TimeSlot.save() -> post_save) после commit сбрасывает закэшированное расписание."""
+        self.assertIn(time(10), self._get_free_starts())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_test_time_slot(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10),
+            )
+
+        free_starts = self._get_free_starts()
+        self.assertNotIn(time(10), free_starts)
+        self.assertIn(time(11), free_starts)
+
+    def test_bulk_booking_invalidates_cached_schedule(self):
+        """bulk-запись встречи не отправляет signals, но сбрасывает кэш сама (в том числе пакетного чтения)."""
+        schedules = get_specialists_schedule_slots(
+            specialist_profiles=[self.specialist_profile],
+            consultation_type="individual",
+        )
+        self.assertIn(time(10), _get_free_starts(schedules[self.specialist_profile.pk], day=self.day))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book_test_session(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10),
+            )
+
+        schedules = get_specialists_schedule_slots(
+            specialist_profiles=[self.specialist_profile],
+            consultation_type="individual",
+        )
+        self.assertNotIn(time(10), _get_free_starts(schedules[self.specialist_profile.pk], day=self.day))
+        self.assertNotIn(time(10), self._get_free_starts())
+
+    def test_invalidation_waits_for_commit(self):
+        """До commit версия кэша не меняется: иначе параллельный запрос закэшировал бы незакоммиченное состояние."""
+        self.assertIn(time(10), self._get_free_starts())
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            create_test_time_slot(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10),
+            )
+
+        self.assertTrue(callbacks)
+        # Пока commit не выполнен, читается прежняя версия кэша
+        self.assertIn(time(10), self._get_free_starts())
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class LocalSpecialistScheduleCacheTests(SpecialistScheduleCacheTestsMixin, TestCase):
+    """С LocMemCache (кэш отдельного процесса) кэш расписания не используется."""
+
+    def test_schedule_is_not_cached(self):
+        """Расписание не пишется в LocMemCache, и встреча видна сразу, даже если сброс версии не выполнялся
+        (как в другом процессе, до которого инвалидация не доходит)."""
+        self.assertIn(time(10), self._get_free_starts())
+
+        with self.captureOnCommitCallbacks(execute=False):
+            create_test_time_slot(
+                client_user=self.client_user,
+                specialist_user=self.specialist_user,
+                start_datetime=build_specialist_datetime(day=self.day, hour=10),
+            )
+
+        with CaptureQueriesContext(connection) as schedule_queries:
+            self.assertNotIn(time(10), self._get_free_starts())
+
+        self.assertTrue(schedule_queries.captured_queries)
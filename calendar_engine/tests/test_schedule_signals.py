@@ -0,0 +1,130 @@
+from datetime import time, timedelta
+
+from django.test import TestCase, override_settings
+
+from calendar_engine.availability_snapshot.services import \
+    rebuild_specialist_available_slots
+from calendar_engine.models import (AvailabilityRuleTimeWindow,
+                                    SpecialistAvailableSlot)
+from calendar_engine.tests.helpers import (
+    build_specialist_datetime, create_test_availability_exception,
+    create_test_availability_rule, create_test_client, create_test_specialist,
+    create_test_time_slot, get_specialist_today)
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=True)
+class SpecialistScheduleSignalsTests(TestCase):
+    """Изменения встреч и графика специалиста пересобирают SpecialistAvailableSlot после commit транзакции."""
+
+    def setUp(self):
+        self.day = get_specialist_today() + timedelta(days=1)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        self.specialist_user = self.specialist_profile.user
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule = create_test_availability_rule(specialist_user=self.specialist_user)
+
+    def _has_available_start(self, *, hour: int, day=None) -> bool:
+        """Есть ли в таблице свободный индивидуальный старт специалиста в указанный час."""
+        return SpecialistAvailableSlot.objects.filter(
+            specialist=self.specialist_user,
+            consultation_type="individual",
+            start_datetime=build_specialist_datetime(day=day or self.day, hour=hour),
+        ).exists()
+
+    def _create_time_slot(self, *, hour: int):
+        """Встреча клиента у специалиста в указанный час через обычный save()."""
+        return create_test_time_slot(
+            client_user=self.client_user,
+            specialist_user=self.specialist_user,
+            start_datetime=build_specialist_datetime(day=self.day, hour=hour),
+        )
+
+    def test_initial_rule_builds_snapshot(self):
+        """Создание правила с окнами заполняет таблицу."""
+        self.assertTrue(self._has_available_start(hour=10))
+
+    def test_rebuild_waits_for_commit(self):
+        """Пересборка только планируется через on_commit: до commit таблица не меняется."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self._create_time_slot(hour=10)
+
+            self.assertTrue(self._has_available_start(hour=10))
+
+        self.assertTrue(callbacks)
+        self.assertTrue(self._has_available_start(hour=10))
+
+    def test_time_slot_create_and_cancel(self):
+        """Новая встреча занимает старт, а ее отмена снова его освобождает."""
+        with self.captureOnCommitCallbacks(execute=True):
+            time_slot = self._create_time_slot(hour=10)
+
+        self.assertFalse(self._has_available_start(hour=10))
+        self.assertTrue(self._has_available_start(hour=11))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            time_slot.status = "cancelled"
+            time_slot.cancel_reason_type = "cancelled_by_user"
+            time_slot.cancel_reason = "Клиент отменил встречу"
+            time_slot.save()
+
+        self.assertTrue(self._has_available_start(hour=10))
+
+    def test_rule_window_change(self):
+        """Сокращение рабочего окна правила убирает старты за его пределами."""
+        with self.captureOnCommitCallbacks(execute=True):
+            AvailabilityRuleTimeWindow.objects.filter(rule=self.rule).update(end_time=time(12))
+            # QuerySet.update() сигналы не отправляет - сохраняем окно через save()
+            AvailabilityRuleTimeWindow.objects.get(rule=self.rule).save()
+
+        self.assertTrue(self._has_available_start(hour=11))
+        self.assertFalse(self._has_available_start(hour=12))
+
+    def test_rule_deactivation(self):
+        """Закрытое правило убирает всю доступность специалиста."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule.deactivate()
+
+        self.assertFalse(SpecialistAvailableSlot.objects.filter(specialist=self.specialist_user).exists())
+
+    def test_exception_create_and_delete(self):
+        """Выходной убирает старты своего дня, а его удаление возвращает их."""
+        with self.captureOnCommitCallbacks(execute=True):
+            exception = create_test_availability_exception(
+                rule=self.rule,
+                day=self.day,
+                exception_type="unavailable",
+            )
+
+        self.assertFalse(self._has_available_start(hour=10))
+        self.assertTrue(self._has_available_start(hour=10, day=self.day + timedelta(days=1)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            exception.delete()
+
+        self.assertTrue(self._has_available_start(hour=10))
+
+    def test_exception_window_change(self):
+        """Окно override-исключения задает старты своего дня."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_test_availability_exception(
+                rule=self.rule,
+                day=self.day,
+                exception_type="override",
+                time_windows=((time(14), time(16)),),
+            )
+
+        self.assertFalse(self._has_available_start(hour=10))
+        self.assertTrue(self._has_available_start(hour=14))
+
+    @override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+    def test_rebuild_skipped_when_materialized_availability_disabled(self):
+        """Без материализованной доступности signals таблицу не трогают."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_time_slot(hour=10)
+
+        self.assertTrue(self._has_available_start(hour=10))
+
+        rebuild_specialist_available_slots(specialist_user_ids=[self.specialist_user.pk])
+        self.assertFalse(self._has_available_start(hour=10))
@@ -0,0 +1,307 @@
+import random
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+
+from calendar_engine.application.use_cases.specialist_schedule import \
+    GenerateSpecialistScheduleUseCase
+from calendar_engine.constants import DOMAIN_TIME_POLICY
+from calendar_engine.domain.availability.base import AbsAvailabilityRule
+from calendar_engine.domain.availability.busy_interval_index import \
+    BusyIntervalIndex
+from calendar_engine.domain.availability.domain_slot_generator import \
+    DomainSlotGenerator
+from calendar_engine.domain.availability.get_user_slots import \
+    AvailabilitySlotFilter
+from calendar_engine.domain.availability.minute_grid import (
+    datetime_to_minutes, normalize_time_range_to_minutes, shift_minute_end,
+    time_to_minutes)
+from calendar_engine.services import normalize_range
+
+SPECIALIST_TZ = ZoneInfo("Europe/Moscow")
+DAY = date(2027, 3, 1)
+
+
+class _TimeWindowsRule(AbsAvailabilityRule):
+    """Правило доступности с одними и теми же рабочими окнами на каждый день."""
+
+    def __init__(self, *, time_windows):
+        self._time_windows = tuple(time_windows)
+
+    def iter_time_windows(self, day):
+        return self._time_windows
+
+
+def _at(day: date, hour: int, minute: int = 0, second: int = 0, microsecond: int = 0) -> datetime:
+    """Aware datetime в TZ специалиста."""
+    return datetime.combine(day, time(hour, minute, second, microsecond), tzinfo=SPECIALIST_TZ)
+
+
+def _build_schedule_kwargs(
+    *,
+    time_windows=((time(9), time(18)),),
+    busy_intervals=(),
+    current_datetime=None,
+    days_ahead: int = 3,
+    session_duration_minutes: int = 50,
+    break_between_sessions_minutes: int = 10,
+    minimum_booking_notice_hours: int = 1,
+) -> dict:
+    """Runtime-context use-case расписания без БД (как его собирает фабрика, но с явными значениями)."""
+    return {
+        "slot_generator": DomainSlotGenerator(),
+        "slot_filter": AvailabilitySlotFilter(rule=_TimeWindowsRule(time_windows=time_windows)),
+        "date_from": DAY,
+        "days_ahead": days_ahead,
+        "current_datetime": current_datetime or _at(DAY - timedelta(days=1), 12),
+        "session_duration_minutes": session_duration_minutes,
+        "break_between_sessions_minutes": break_between_sessions_minutes,
+        "override_session_duration_minutes_by_day": {},
+        "override_break_between_sessions_minutes_by_day": {},
+        "minimum_booking_notice_hours": minimum_booking_notice_hours,
+        "override_minimum_booking_notice_hours_by_day": {},
+        "busy_intervals": list(busy_intervals),
+    }
+
+
+def _get_schedule_keys(**schedule_kwargs) -> set:
+    use_case = GenerateSpecialistScheduleUseCase(**_build_schedule_kwargs(**schedule_kwargs))
+    return {(slot.day, slot.start) for slot in use_case.execute()}
+
+
+def _get_reference_schedule_keys(**schedule_kwargs) -> set:
+    """Эталон: прежняя проверка доменных слотов через datetime и normalize_range() (до минутной сетки)."""
+    kwargs = _build_schedule_kwargs(**schedule_kwargs)
+    session_duration = timedelta(minutes=kwargs["session_duration_minutes"])
+    break_between_sessions = timedelta(minutes=kwargs["break_between_sessions_minutes"])
+    earliest_allowed_start = kwargs["current_datetime"] + timedelta(hours=kwargs["minimum_booking_notice_hours"])
+
+    busy_ranges = [
+        normalize_range(busy_start.date(), busy_start.time(), busy_end.time())
+        for busy_start, busy_end in kwargs["busy_intervals"]
+    ]
+    available_keys = set()
+
+    for day_offset in range(kwargs["days_ahead"]):
+        day = DAY + timedelta(days=day_offset)
+        windows = [
+            normalize_range(day, window_start, window_end)
+            for window_start, window_end in kwargs["slot_filter"].get_user_time_windows(day)
+        ]
+
+        for slot_start, slot_end in DOMAIN_TIME_POLICY.iter_domain_day_slots(day):
+            slot_start_dt, slot_end_dt = normalize_range(day, slot_start, slot_end)
+            if not any(start <= slot_start_dt and slot_end_dt <= end for start, end in windows):
+                continue
+
+            if slot_start_dt.replace(tzinfo=SPECIALIST_TZ) < earliest_allowed_start:
+                continue
+
+            session_start_dt, session_end_dt = normalize_range(
+                day, slot_start, (slot_start_dt + session_duration).time(),
+            )
+            if not any(start <= session_start_dt and session_end_dt <= end for start, end in windows):
+                continue
+
+            candidate_start_dt, candidate_end_dt = normalize_range(
+                day, slot_start, (session_end_dt + break_between_sessions).time(),
+            )
+            if any(
+                busy_start < candidate_end_dt and busy_end > candidate_start_dt
+                for busy_start, busy_end in busy_ranges
+            ):
+                continue
+
+            available_keys.add((day, slot_start))
+
+    return available_keys
+
+
+class MinuteGridTests(SimpleTestCase):
+    """Округление и нормализация минутной сетки."""
+
+    def test_time_to_minutes_rounding(self):
+        self.assertEqual(time_to_minutes(time(10, 5, 30)), 605)
+        self.assertEqual(time_to_minutes(time(10, 5, 30), round_up=True), 606)
+        self.assertEqual(time_to_minutes(time(10, 5, 0, 1), round_up=True), 606)
+        self.assertEqual(time_to_minutes(time(10, 5), round_up=True), 605)
+
+    def test_datetime_to_minutes_uses_wall_clock(self):
+        self.assertEqual(
+            datetime_to_minutes(_at(DAY, 23, 59, 1), round_up=True) - datetime_to_minutes(_at(DAY, 0)),
+            24 * 60,
+        )
+
+    def test_windows_are_rounded_inwards_and_normalized(self):
+        self.assertEqual(normalize_time_range_to_minutes(time(9, 0, 30), time(18, 0, 30)), (541, 1080))
+        self.assertEqual(normalize_time_range_to_minutes(time(22), time(0)), (1320, 1440))
+        self.assertEqual(normalize_time_range_to_minutes(time(0), time(0)), (0, 1440))
+        self.assertEqual(normalize_time_range_to_minutes(time(22), time(2)), (1320, 1560))
+
+    def test_shift_minute_end_crosses_midnight(self):
+        self.assertEqual(shift_minute_end(23 * 60, 60), 24 * 60)
+        self.assertEqual(shift_minute_end(23 * 60, 120), 25 * 60)
+        self.assertEqual(shift_minute_end(10 * 60, 50), 10 * 60 + 50)
+
+
+class BusyIntervalIndexTests(SimpleTestCase):
+    """Занятые интервалы округляются наружу: для целых минут ответ тот же, что и по исходным datetime."""
+
+    def _overlaps(self, index: BusyIntervalIndex, *, start: datetime, end: datetime) -> bool:
+        return index.overlaps(start=datetime_to_minutes(start), end=datetime_to_minutes(end))
+
+    def test_busy_end_with_seconds(self):
+        index = BusyIntervalIndex(busy_intervals=[(_at(DAY, 10), _at(DAY, 10, 59, 30))])
+
+        self.assertTrue(self._overlaps(index, start=_at(DAY, 10, 59), end=_at(DAY, 12)))
+        self.assertFalse(self._overlaps(index, start=_at(DAY, 11), end=_at(DAY, 12)))
+
+    def test_busy_start_with_seconds(self):
+        index = BusyIntervalIndex(busy_intervals=[(_at(DAY, 11, 0, 30), _at(DAY, 12))])
+
+        self.assertFalse(self._overlaps(index, start=_at(DAY, 10), end=_at(DAY, 11)))
+        self.assertTrue(self._overlaps(index, start=_at(DAY, 10), end=_at(DAY, 11, 1)))
+
+    def test_busy_interval_crossing_midnight(self):
+        next_day = DAY + timedelta(days=1)
+        index = BusyIntervalIndex(busy_intervals=[(_at(DAY, 23, 30), _at(next_day, 0, 40))])
+
+        self.assertTrue(self._overlaps(index, start=_at(next_day, 0), end=_at(next_day, 1)))
+        self.assertFalse(self._overlaps(index, start=_at(next_day, 0, 40), end=_at(next_day, 1)))
+
+    def test_busy_interval_ending_at_midnight(self):
+        next_day = DAY + timedelta(days=1)
+        index = BusyIntervalIndex(busy_intervals=[(_at(DAY, 23), _at(next_day, 0))])
+
+        self.assertTrue(self._overlaps(index, start=_at(DAY, 23, 30), end=_at(next_day, 0, 30)))
+        self.assertFalse(self._overlaps(index, start=_at(next_day, 0), end=_at(next_day, 1)))
+
+    def test_long_earlier_interval_covers_later_starts(self):
+        """prefix max: короткая встреча внутри длинной не "затирает" окончание длинной."""
+        index = BusyIntervalIndex(
+            busy_intervals=[(_at(DAY, 9), _at(DAY, 15)), (_at(DAY, 10), _at(DAY, 10, 30))],
+        )
+
+        self.assertTrue(self._overlaps(index, start=_at(DAY, 14), end=_at(DAY, 15)))
+
+
+class GenerateSpecialistScheduleMinuteGridTests(SimpleTestCase):
+    """Граничные случаи расписания специалиста на минутной сетке."""
+
+    def test_minimum_notice_with_sub_minute_now(self):
+        """Сейчас 10:00:30, notice 1 час: старт 11:00 уже раньше порога 11:00:30."""
+        keys = _get_schedule_keys(current_datetime=_at(DAY, 10, 0, 30))
+
+        self.assertNotIn((DAY, time(11)), keys)
+        self.assertIn((DAY, time(12)), keys)
+        self.assertIn((DAY, time(11)), _get_schedule_keys(current_datetime=_at(DAY, 10)))
+
+    def test_window_ending_at_midnight(self):
+        """Окно 20:00-00:00: сессия может закончиться ровно в полночь, но не позже."""
+        time_windows = ((time(20), time(0)),)
+
+        individual_keys = _get_schedule_keys(time_windows=time_windows)
+        self.assertIn((DAY, time(23)), individual_keys)
+        self.assertNotIn((DAY, time(19)), individual_keys)
+
+        couple_keys = _get_schedule_keys(time_windows=time_windows, session_duration_minutes=120)
+        self.assertIn((DAY, time(22)), couple_keys)
+        self.assertNotIn((DAY, time(23)), couple_keys)
+
+    def test_full_day_window_does_not_extend_into_next_day(self):
+        """Окно 00:00-00:00 - ровно сутки: парная сессия в 23:00 закончилась бы в 01:00 следующего дня."""
+        keys = _get_schedule_keys(time_windows=((time(0), time(0)),), session_duration_minutes=120)
+
+        self.assertIn((DAY, time(22)), keys)
+        self.assertNotIn((DAY, time(23)), keys)
+
+    def test_busy_interval_from_previous_day_blocks_after_midnight(self):
+        next_day = DAY + timedelta(days=1)
+        keys = _get_schedule_keys(
+            time_windows=((time(0), time(0)),),
+            busy_intervals=[(_at(DAY, 23), _at(next_day, 1, 10))],
+        )
+
+        self.assertNotIn((next_day, time(0)), keys)
+        self.assertNotIn((next_day, time(1)), keys)
+        self.assertIn((next_day, time(2)), keys)
+        # Кандидат в 22:00 с перерывом занимает специалиста до 23:00 - встык с встречей
+        self.assertIn((DAY, time(22)), keys)
+
+    def test_busy_interval_with_seconds(self):
+        keys = _get_schedule_keys(busy_intervals=[(_at(DAY, 10), _at(DAY, 11, 0, 1))])
+
+        self.assertNotIn((DAY, time(11)), keys)
+        self.assertIn((DAY, time(12)), keys)
+
+    def test_execute_for_slot_keys_matches_execute(self):
+        schedule_kwargs = {
+            "time_windows": ((time(8), time(13)), (time(22), time(2))),
+            "busy_intervals": [(_at(DAY, 9, 15, 20), _at(DAY, 10, 5)), (_at(DAY, 23, 30), _at(DAY, 0, 20))],
+            "current_datetime": _at(DAY, 7, 30, 15),
+        }
+        full_keys = _get_schedule_keys(**schedule_kwargs)
+        slot_keys = {
+            (DAY + timedelta(days=day_offset), time(hour))
+            for day_offset in range(-1, 4)
+            for hour in range(24)
+        }
+        # Старты вне доменной сетки execute_for_slot_keys() тоже не должен вернуть
+        slot_keys |= {(DAY, time(9, 30)), (DAY, time(11, 0, 30))}
+
+        use_case = GenerateSpecialistScheduleUseCase(**_build_schedule_kwargs(**schedule_kwargs))
+        self.assertEqual(
+            {(slot.day, slot.start) for slot in use_case.execute_for_slot_keys(slot_keys=slot_keys)},
+            full_keys & slot_keys,
+        )
+        self.assertTrue(full_keys)
+
+    def test_matches_datetime_reference_on_random_inputs(self):
+        """Сравнение с прежней проверкой через datetime на случайных окнах, встречах (с секундами) и "сейчас"."""
+        randomizer = random.Random(20261017)
+
+        def random_time(*, with_seconds: bool) -> time:
+            return time(
+                randomizer.randrange(24),
+                randomizer.choice((0, 0, 30, randomizer.randrange(60))),
+                randomizer.randrange(60) if with_seconds else 0,
+            )
+
+        for iteration in range(200):
+            busy_intervals = []
+            for _ in range(randomizer.randrange(6)):
+                busy_start = datetime.combine(
+                    DAY + timedelta(days=randomizer.randrange(-1, 3)),
+                    random_time(with_seconds=randomizer.random() < 0.3),
+                    tzinfo=SPECIALIST_TZ,
+                )
+                busy_end = busy_start + timedelta(seconds=randomizer.randrange(30 * 60, 5 * 60 * 60))
+                busy_intervals.append((busy_start, busy_end))
+
+            schedule_kwargs = {
+                "time_windows": tuple(
+                    (
+                        random_time(with_seconds=randomizer.random() < 0.1),
+                        random_time(with_seconds=randomizer.random() < 0.1),
+                    )
+                    for _ in range(randomizer.randrange(1, 3))
+                ),
+                "busy_intervals": busy_intervals,
+                "current_datetime": _at(
+                    DAY,
+                    randomizer.randrange(24),
+                    randomizer.randrange(60),
+                    randomizer.randrange(60),
+                    randomizer.randrange(1_000_000),
+                ),
+                "session_duration_minutes": randomizer.choice((50, 90, 120)),
+                "break_between_sessions_minutes": randomizer.choice((0, 10, 15, 70)),
+                "minimum_booking_notice_hours": randomizer.choice((0, 1, 2, 24)),
+            }
+
+            with self.subTest(iteration=iteration):
+                self.assertEqual(
+                    _get_schedule_keys(**schedule_kwargs),
+                    _get_reference_schedule_keys(**schedule_kwargs),
+                )
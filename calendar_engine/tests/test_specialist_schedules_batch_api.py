@@ -0,0 +1,115 @@
+from datetime import datetime
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+
+from calendar_engine.constants import SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES
+from calendar_engine.tests.helpers import (create_test_availability_rule,
+                                           create_test_client,
+                                           create_test_specialist)
+
+SCHEDULE_SLOT_KEYS = {"day", "start_time", "end_time", "start_iso", "end_iso"}
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class GetSpecialistsSchedulesBatchAjaxViewTests(TestCase):
+    """GET /calendar/api/psychologists/schedules/ - расписания нескольких специалистов одним запросом."""
+
+    def setUp(self):
+        self.url = reverse("calendar:api:get-psychologists-schedules")
+        self.client.force_login(create_test_client(email="client@example.com"))
+        self.specialists_count = 0
+
+    def _create_specialist(self, *, with_rule: bool = True):
+        """Специалист, работающий каждый день с 09:00 до 18:00 (или без рабочего графика)."""
+        self.specialists_count += 1
+        profile = create_test_specialist(email=f"specialist-{self.specialists_count}@example.com")
+        if with_rule:
+            create_test_availability_rule(specialist_user=profile.user)
+
+        return profile
+
+    def _get(self, **params):
+        return self.client.get(self.url, data=params)
+
+    def _assert_invalid_value(self, response):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"status": "error", "error": "invalid_value"})
+
+    def test_profile_ids_validation(self):
+        too_many_profile_ids = ",".join(str(index) for index in range(1, SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES + 2))
+
+        for params in ({}, {"profile_ids": ""}, {"profile_ids": " , "}, {"profile_ids": "1,abc"},
+                       {"profile_ids": too_many_profile_ids}):
+            with self.subTest(params=params):
+                self._assert_invalid_value(self._get(**params))
+
+    def test_max_profiles_is_accepted(self):
+        """Ровно SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES id (дубли не считаются) - валидный запрос."""
+        profile = self._create_specialist()
+        profile_ids = [profile.pk, *range(10**6, 10**6 + SPECIALIST_SCHEDULES_BATCH_MAX_PROFILES - 1), profile.pk]
+
+        response = self._get(profile_ids=",".join(str(profile_id) for profile_id in profile_ids))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["schedules"]), [str(profile.pk)])
+
+    def test_response_shape(self):
+        """Несуществующие профили в ответ не попадают, у специалиста без графика пустое расписание."""
+        working_profile = self._create_specialist()
+        day_off_profile = self._create_specialist(with_rule=False)
+
+        response = self._get(profile_ids=f"{working_profile.pk},{day_off_profile.pk},{10**6}")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(set(payload), {"status", "schedules", "now_iso_client"})
+        self.assertEqual(payload["status"], "ok")
+        self.assertEqual(set(payload["schedules"]), {str(working_profile.pk), str(day_off_profile.pk)})
+        self.assertEqual(payload["schedules"][str(day_off_profile.pk)], {"nearest_slot": None, "schedule": []})
+
+        schedule = payload["schedules"][str(working_profile.pk)]["schedule"]
+        self.assertTrue(schedule)
+        self.assertEqual(payload["schedules"][str(working_profile.pk)]["nearest_slot"], schedule[0])
+        for slot in schedule:
+            self.assertEqual(set(slot), SCHEDULE_SLOT_KEYS)
+
+        # Все слоты - в будущем, по порядку и в TZ viewer'а (Europe/Moscow)
+        slot_starts = [datetime.fromisoformat(slot["start_iso"]) for slot in schedule]
+        self.assertEqual(slot_starts, sorted(slot_starts))
+        self.assertGreater(slot_starts[0], now())
+        self.assertTrue(all(slot["start_iso"].endswith("+03:00") for slot in schedule))
+
+    def test_nearest_only(self):
+        profile = self._create_specialist()
+        full_schedule = self._get(profile_ids=str(profile.pk)).json()["schedules"][str(profile.pk)]
+
+        response = self._get(profile_ids=str(profile.pk), nearest_only="1")
+
+        self.assertEqual(
+            response.json()["schedules"][str(profile.pk)],
+            {"nearest_slot": full_schedule["nearest_slot"], "schedule": []},
+        )
+
+    def test_query_count_does_not_depend_on_profiles_count(self):
+        """Правила, исключения и занятые слоты всех специалистов читаются пакетно, а не запросами на специалиста."""
+        profile_ids = [self._create_specialist().pk]
+        # Прогрев: первый запрос может заполнить служебные кэши процесса (например, ContentType)
+        self._get(profile_ids=str(profile_ids[0]))
+
+        with CaptureQueriesContext(connection) as single_profile_queries:
+            response = self._get(profile_ids=str(profile_ids[0]))
+
+        self.assertEqual(response.status_code, 200)
+
+        profile_ids += [self._create_specialist().pk for _ in range(4)]
+
+        with self.assertNumQueries(len(single_profile_queries)):
+            response = self._get(profile_ids=",".join(str(profile_id) for profile_id in profile_ids))
+
+        schedules = response.json()["schedules"]
+        self.assertEqual(len(schedules), len(profile_ids))
+        self.assertTrue(all(schedule["nearest_slot"] for schedule in schedules.values()))
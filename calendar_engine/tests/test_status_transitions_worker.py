@@ -0,0 +1,175 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.timezone import now
+
+from calendar_engine.constants import STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS
+from calendar_engine.lifecycle.services import status_transitions_worker_state
+from calendar_engine.lifecycle.services.status_transitions_worker_state import (
+    STATUS_TRANSITIONS_WORKER_LAST_RUN_CACHE_KEY,
+    is_status_transitions_worker_current, mark_status_transitions_worker_run)
+from calendar_engine.lifecycle.use_cases import \
+    apply_time_based_status_transitions as transitions_module
+from calendar_engine.lifecycle.use_cases.apply_time_based_status_transitions import (
+    apply_time_based_status_transitions_for_event,
+    apply_time_based_status_transitions_for_user,
+    apply_time_based_status_transitions_in_batches)
+from calendar_engine.models import CalendarEvent, TimeSlot
+from calendar_engine.tests.helpers import (book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today)
+
+
+class SharedCacheTestsMixin:
+    """Общий для всех процессов cache (в тесте - FileBasedCache вместо Redis), без которого guard выключен."""
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
+        shared_cache_settings = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir,
+                },
+            },
+        )
+        shared_cache_settings.enable()
+        self.addCleanup(shared_cache_settings.disable)
+
+        super().setUp()
+
+
+class StatusTransitionsWorkerGuardTests(SharedCacheTestsMixin, SimpleTestCase):
+    """"Stale since" guard: отметка фоновой команды в cache и пропуск пересчета статусов на страницах."""
+
+    def setUp(self):
+        super().setUp()
+        self.processed_at = now()
+
+    def test_without_mark(self):
+        self.assertFalse(is_status_transitions_worker_current())
+
+    def test_mark_is_current_within_max_lag(self):
+        mark_status_transitions_worker_run(processed_at=self.processed_at)
+        max_lag = timedelta(seconds=STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS)
+
+        self.assertTrue(is_status_transitions_worker_current(current_datetime=self.processed_at + max_lag))
+        self.assertFalse(
+            is_status_transitions_worker_current(current_datetime=self.processed_at + max_lag + timedelta(seconds=1))
+        )
+
+    def test_mark_has_explicit_ttl(self):
+        """Отметка живет в cache не дольше STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS, а не бессрочно."""
+        with mock.patch.object(status_transitions_worker_state, "cache") as cache_mock:
+            mark_status_transitions_worker_run(processed_at=self.processed_at)
+
+        cache_mock.set.assert_called_once_with(
+            STATUS_TRANSITIONS_WORKER_LAST_RUN_CACHE_KEY,
+            self.processed_at,
+            STATUS_TRANSITIONS_WORKER_MAX_LAG_SECONDS,
+        )
+
+    def test_process_local_cache_disables_guard(self):
+        """С LocMemCache отметку команды видит только ее процесс, поэтому guard не доверяет даже свежей отметке."""
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            mark_status_transitions_worker_run(processed_at=self.processed_at)
+
+            self.assertFalse(is_status_transitions_worker_current(current_datetime=self.processed_at))
+
+    def test_wrappers_skip_recalculation_while_worker_is_current(self):
+        """Пока команда работает без отставания, страницы не делают ни одного запроса на пересчет статусов
+        (SimpleTestCase упадет на любом обращении к БД)."""
+        mark_status_transitions_worker_run(processed_at=now())
+        participant_user = mock.sentinel.participant_user
+
+        user_result = apply_time_based_status_transitions_for_user(participant_user=participant_user)
+        event_result = apply_time_based_status_transitions_for_event(participant_user=participant_user, event_id=1)
+
+        self.assertEqual(user_result.updated_events_count, 0)
+        self.assertEqual(event_result.updated_events_count, 0)
+
+
+class ApplyTimeBasedStatusTransitionsInBatchesTests(SharedCacheTestsMixin, TestCase):
+    """Фоновая команда: все события пачками по batch_size, один момент времени на проход и отметка для guard-а."""
+
+    def setUp(self):
+        super().setUp()
+        first_day = get_specialist_today() + timedelta(days=1)
+        client_user = create_test_client(email="client@example.com")
+        specialist_user = create_test_specialist(email="specialist@example.com").user
+
+        # По одной встрече 10:00-10:50 в 5 дней подряд. "Сейчас" - 10:20 третьего дня: две встречи уже прошли,
+        # третья идет, две впереди
+        self.events = [
+            book_test_session(
+                client_user=client_user,
+                specialist_user=specialist_user,
+                start_datetime=build_specialist_datetime(day=first_day + timedelta(days=day_offset), hour=10),
+            ).event
+            for day_offset in range(5)
+        ]
+        self.current_datetime = build_specialist_datetime(day=first_day + timedelta(days=2), hour=10, minute=20)
+
+    def _run_worker(self):
+        return apply_time_based_status_transitions_in_batches(batch_size=2, current_datetime=self.current_datetime)
+
+    def test_statuses_are_moved_forward(self):
+        result = self._run_worker()
+
+        self.assertEqual(result.completed_slots_count, 2)
+        self.assertEqual(result.started_slots_count, 1)
+        self.assertEqual(result.updated_events_count, 3)
+        self.assertEqual(
+            list(
+                CalendarEvent.objects.filter(pk__in=[event.pk for event in self.events])
+                .order_by("pk")
+                .values_list("status", flat=True)
+            ),
+            ["completed", "completed", "started", "planned", "planned"],
+        )
+        self.assertEqual(
+            list(TimeSlot.objects.filter(event__in=self.events).order_by("event_id").values_list("status", flat=True)),
+            ["completed", "completed", "started", "planned", "planned"],
+        )
+
+    def test_only_due_events_are_processed_in_batches(self):
+        """В пачки попадают только события с просроченными слотами, по batch_size штук в порядке id."""
+        with mock.patch.object(
+            transitions_module,
+            "apply_time_based_status_transitions",
+            wraps=transitions_module.apply_time_based_status_transitions,
+        ) as apply_mock:
+            self._run_worker()
+
+        self.assertEqual(
+            [call.kwargs["event_ids"] for call in apply_mock.call_args_list],
+            [[self.events[0].pk, self.events[1].pk], [self.events[2].pk]],
+        )
+        self.assertTrue(
+            all(call.kwargs["current_datetime"] == self.current_datetime for call in apply_mock.call_args_list)
+        )
+
+    def test_second_pass_has_nothing_to_do(self):
+        self._run_worker()
+
+        with self.assertNumQueries(1):
+            result = self._run_worker()
+
+        self.assertEqual(
+            (result.started_slots_count, result.completed_slots_count, result.updated_events_count),
+            (0, 0, 0),
+        )
+
+    def test_pass_marks_worker_run(self):
+        self.assertFalse(is_status_transitions_worker_current(current_datetime=self.current_datetime))
+
+        self._run_worker()
+
+        self.assertTrue(is_status_transitions_worker_current(current_datetime=self.current_datetime))
@@ -0,0 +1,216 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from calendar_engine.booking.exceptions import CreateBookingValidationError
+from calendar_engine.booking.use_cases.therapy_session_series_create import \
+    CreateTherapySessionSeriesUseCase
+from calendar_engine.booking.validators import \
+    validate_client_has_no_overlapping_series_bookings
+from calendar_engine.models import CalendarEvent, RecurrenceRule, TimeSlot
+from calendar_engine.tests.helpers import (book_test_session,
+                                           build_specialist_datetime,
+                                           create_test_availability_exception,
+                                           create_test_availability_rule,
+                                           create_test_client,
+                                           create_test_specialist,
+                                           get_specialist_today,
+                                           to_specialist_local)
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class CreateTherapySessionSeriesUseCaseTests(TestCase):
+    """Серия встреч проверяется одним проходом и бронируется целиком или не бронируется вовсе."""
+
+    def setUp(self):
+        self.first_day = get_specialist_today() + timedelta(days=2)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        self.specialist_user = self.specialist_profile.user
+        self.rule = create_test_availability_rule(specialist_user=self.specialist_user)
+
+    def _execute_weekly_series(self, *, count_recurrences: int = 3) -> dict:
+        """Еженедельная серия в 10:00, начиная с self.first_day."""
+        return CreateTherapySessionSeriesUseCase().execute(
+            client_user=self.client_user,
+            specialist_profile_id=self.specialist_profile.pk,
+            slot_start_iso=build_specialist_datetime(day=self.first_day, hour=10).isoformat(),
+            consultation_type="individual",
+            frequency="weekly",
+            count_recurrences=count_recurrences,
+        )
+
+    def test_weekly_series_is_created(self):
+        booking_result = self._execute_weekly_series()
+
+        event = booking_result["event"]
+        self.assertTrue(event.is_recurring)
+        self.assertEqual(
+            [
+                (slot.slot_index, to_specialist_local(slot.start_datetime))
+                for slot in TimeSlot.objects.filter(event=event).order_by("slot_index")
+            ],
+            [
+                (index + 1, build_specialist_datetime(day=self.first_day + timedelta(weeks=index), hour=10))
+                for index in range(3)
+            ],
+        )
+
+        recurrence_rule = RecurrenceRule.objects.get(event=event)
+        self.assertEqual(recurrence_rule, booking_result["recurrence_rule"])
+        self.assertEqual(recurrence_rule.frequency, "weekly")
+        self.assertEqual(recurrence_rule.count_recurrences, 3)
+        self.assertEqual(recurrence_rule.rule_start, self.first_day)
+
+    def test_series_is_rejected_with_unavailable_dates(self):
+        """Выходной специалиста во второе повторение и чужая встреча в третье: серия не создается целиком,
+        а в ошибке перечислены обе даты."""
+        day_off = self.first_day + timedelta(weeks=1)
+        booked_day = self.first_day + timedelta(weeks=2)
+        create_test_availability_exception(rule=self.rule, day=day_off, exception_type="unavailable")
+        book_test_session(
+            client_user=create_test_client(email="other-client@example.com"),
+            specialist_user=self.specialist_user,
+            start_datetime=build_specialist_datetime(day=booked_day, hour=10),
+        )
+
+        with self.assertRaisesMessage(
+            CreateBookingValidationError,
+            f"недоступно в даты {day_off:%d.%m.%Y}, {booked_day:%d.%m.%Y}.",
+        ):
+            self._execute_weekly_series()
+
+        self.assertFalse(CalendarEvent.objects.filter(creator=self.client_user).exists())
+        self.assertFalse(RecurrenceRule.objects.exists())
+        self.assertEqual(TimeSlot.objects.count(), 1)
+
+    def test_series_overlapping_client_booking_is_rejected(self):
+        """У клиента уже есть встреча с другим специалистом во время второго повторения."""
+        overlapping_day = self.first_day + timedelta(weeks=1)
+        book_test_session(
+            client_user=self.client_user,
+            specialist_user=create_test_specialist(email="other-specialist@example.com").user,
+            start_datetime=build_specialist_datetime(day=overlapping_day, hour=10, minute=30),
+        )
+
+        with self.assertRaisesMessage(
+            CreateBookingValidationError,
+            f"у клиента уже есть другая сессия в это время ({overlapping_day:%d.%m.%Y} 10:00)",
+        ):
+            self._execute_weekly_series()
+
+        self.assertEqual(TimeSlot.objects.count(), 1)
+        self.assertFalse(RecurrenceRule.objects.exists())
+
+    def test_series_without_end_is_rejected(self):
+        with self.assertRaisesMessage(CreateBookingValidationError, "количество повторений или дату окончания"):
+            self._execute_weekly_series(count_recurrences=None)
+
+
+class ValidateClientHasNoOverlappingSeriesBookingsTests(TestCase):
+    """Одна выборка встреч клиента на период серии и бинарный поиск по ней для каждого повторения."""
+
+    def setUp(self):
+        self.day = get_specialist_today() + timedelta(days=2)
+        self.client_user = create_test_client(email="client@example.com")
+        specialist_user = create_test_specialist(email="specialist@example.com").user
+
+        # Длинная встреча 09:00-12:00 и обычная 14:00-14:50
+        book_test_session(
+            client_user=self.client_user,
+            specialist_user=specialist_user,
+            start_datetime=build_specialist_datetime(day=self.day, hour=9),
+            session_duration_minutes=180,
+        )
+        book_test_session(
+            client_user=self.client_user,
+            specialist_user=specialist_user,
+            start_datetime=build_specialist_datetime(day=self.day, hour=14),
+        )
+
+    def _validate(self, *ranges):
+        """ranges: (hour, minute, duration_minutes) встреч серии в self.day."""
+        slot_ranges = []
+        for hour, minute, duration_minutes in ranges:
+            slot_start = build_specialist_datetime(day=self.day, hour=hour, minute=minute)
+            slot_ranges.append((slot_start, slot_start + timedelta(minutes=duration_minutes)))
+
+        validate_client_has_no_overlapping_series_bookings(client_user=self.client_user, slot_ranges=slot_ranges)
+
+    def test_free_ranges_pass(self):
+        """Встречи вплотную до, между и после существующих встреч не пересекаются с ними."""
+        self._validate((8, 10, 50), (12, 0, 50), (13, 10, 50), (14, 50, 50))
+
+    def test_overlap_with_long_earlier_booking(self):
+        """Встреча начинается внутри длинной встречи клиента, а первая встреча серии свободна."""
+        with self.assertRaisesMessage(CreateBookingValidationError, f"({self.day:%d.%m.%Y} 11:00)"):
+            self._validate((8, 0, 50), (11, 0, 50))
+
+    def test_overlap_with_later_booking(self):
+        with self.assertRaisesMessage(CreateBookingValidationError, f"({self.day:%d.%m.%Y} 13:30)"):
+            self._validate((13, 30, 50))
+
+    def test_cancelled_booking_is_ignored(self):
+        TimeSlot.objects.filter(start_datetime=build_specialist_datetime(day=self.day, hour=14)).update(
+            status="cancelled",
+        )
+
+        self._validate((13, 30, 50))
+
+    def test_empty_series(self):
+        with self.assertNumQueries(0):
+            self._validate()
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class CalendarEventSeriesCreateViewTests(TestCase):
+    """POST /calendar/api/events/series/ - HTTP-обертка над CreateTherapySessionSeriesUseCase."""
+
+    def setUp(self):
+        self.first_day = get_specialist_today() + timedelta(days=2)
+        self.client_user = create_test_client(email="client@example.com")
+        self.specialist_profile = create_test_specialist(email="specialist@example.com")
+        self.rule = create_test_availability_rule(specialist_user=self.specialist_profile.user)
+        # API авторизуется по JWT (DEFAULT_AUTHENTICATION_CLASSES), а не по сессии Django
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(user=self.client_user)
+
+    def _post_series(self):
+        return self.api_client.post(
+            reverse("calendar:api:events-series-create"),
+            data={
+                "specialist_profile_id": self.specialist_profile.pk,
+                "slot_start_iso": build_specialist_datetime(day=self.first_day, hour=10).isoformat(),
+                "consultation_type": "individual",
+                "frequency": "weekly",
+                "count_recurrences": 2,
+            },
+            format="json",
+        )
+
+    def test_series_is_created(self):
+        response = self._post_series()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["slot_ids"]), 2)
+        self.assertTrue(RecurrenceRule.objects.filter(pk=response.json()["recurrence_rule_id"]).exists())
+
+    def test_session_login_is_not_accepted(self):
+        """Сессия Django (force_login) для API не авторизует: endpoint рассчитан на JWT."""
+        self.api_client.force_authenticate(user=None)
+        self.api_client.force_login(self.client_user)
+
+        self.assertEqual(self._post_series().status_code, 401)
+        self.assertFalse(TimeSlot.objects.exists())
+
+    def test_unavailable_date_is_bad_request(self):
+        unavailable_day = self.first_day + timedelta(weeks=1)
+        create_test_availability_exception(rule=self.rule, day=unavailable_day, exception_type="unavailable")
+
+        response = self._post_series()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f"{unavailable_day:%d.%m.%Y}", response.json()["detail"])
+        self.assertFalse(TimeSlot.objects.exists())
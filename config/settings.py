@@ -72,6 +72,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Профилирование запросов (SQL + время). Стоит первой, чтобы в замеры попали и SQL-запросы других middleware
+    # (сессия, пользователь). Активна только при REQUEST_PROFILING_ENABLED=True, иначе отключается при старте
+    'core.profiling.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # должно быть выше CommonMiddleware, в идеале сразу за SecurityMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -121,8 +124,12 @@ DATABASES = {
 }
 
 # База данных для тестов при разворачивании приложения (чтоб не разворачивать сразу postgresql достаточно в начале
-# для тестов развернуть sqlite
-if 'test' in sys.argv:
+# для тестов развернуть sqlite.
+# ВАЖНО: миграции calendar_engine используют ExclusionConstraint (PostgreSQL), поэтому тесты calendar_engine
+# и aggregator запускаются только на PostgreSQL: USE_POSTGRES_FOR_TESTS=True python manage.py test
+# (Django сам создаст и удалит отдельную тестовую БД test_<DATABASE_NAME>)
+USE_POSTGRES_FOR_TESTS = True if os.getenv('USE_POSTGRES_FOR_TESTS') == 'True' else False
+if 'test' in sys.argv and not USE_POSTGRES_FOR_TESTS:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
@@ -260,14 +267,43 @@ PASSWORD_RESET_TIMEOUT = 60 * 60 * 24  # 24 часа
 
 LOGOUT_REDIRECT_URL = 'core:start-page'
 
+# Материализованная доступность специалистов (таблица SpecialistAvailableSlot):
+# 1) если True - фильтр каталога "Время сессии" читает заранее рассчитанные свободные старты одним SQL-запросом,
+# а изменения графика/встреч специалиста пересобирают его строки через signals;
+# 2) перед включением нужно один раз заполнить таблицу: python manage.py rebuild_available_slots
+# и настроить ежедневный запуск этой же команды (cron), чтобы горизонт расписания "прокручивался" вперед.
+USE_MATERIALIZED_AVAILABILITY = True if os.getenv('USE_MATERIALIZED_AVAILABILITY') == 'True' else False
+
+# Optimistic booking (calendar_engine/booking/use_cases/therapy_session_create.py):
+# 1) если False - бронирование сериализуется через select_for_update() строк клиента и специалиста;
+# 2) если True - блокировки не берутся, слот сразу вставляется, а пересечения отклоняет сам PostgreSQL
+# (ExclusionConstraint prevent_slot_overlap_per_specialist / prevent_slot_overlap_per_creator у TimeSlot),
+# поэтому бронирования разных слотов одного специалиста выполняются параллельно.
+USE_OPTIMISTIC_BOOKING = True if os.getenv('USE_OPTIMISTIC_BOOKING') == 'True' else False
+
+# Профилирование запросов (core/profiling/middleware.py):
+# 1) если True - для каждого запроса считаются количество SQL-запросов, время в БД, общее время и время фаз
+# calendar engine; метрики доступны staff/admin по адресу internal/profiling-metrics/ (JSON или ?format=prometheus),
+# а в ответ добавляется заголовок Server-Timing;
+# 2) запросы медленнее REQUEST_PROFILING_SLOW_REQUEST_MS или с количеством SQL больше REQUEST_PROFILING_MAX_QUERIES
+# пишутся в лог core.profiling.middleware с уровнем WARNING.
+REQUEST_PROFILING_ENABLED = True if os.getenv('REQUEST_PROFILING_ENABLED') == 'True' else False
+REQUEST_PROFILING_SLOW_REQUEST_MS = int(os.getenv('REQUEST_PROFILING_SLOW_REQUEST_MS', default='500'))
+REQUEST_PROFILING_MAX_QUERIES = int(os.getenv('REQUEST_PROFILING_MAX_QUERIES', default='30'))
+
 # LOGIN_URL = 'core:home-page'
 
-# REDIS_URL = os.getenv('REDIS_URL')
-# CACHE_ENABLED = True
-# if CACHE_ENABLED:
-#     CACHES = {
-#         'default': {
-#             'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-#             'LOCATION': REDIS_URL,
-#         }
-#     }
+# Кэш (расписания специалистов, границы фильтров каталога):
+# 1) если REDIS_URL задан - все процессы (gunicorn workers, cron-команды) работают с одним общим Redis, и сброс кэша
+# из signals в одном процессе сразу виден остальным (нужен пакет redis: poetry add redis);
+# 2) если REDIS_URL не задан - Django использует LocMemCache, т.е. отдельный кэш в памяти КАЖДОГО процесса. Сброс
+# из signals до других процессов не доходит, поэтому кэш расписания специалистов тогда не используется, а границы
+# фильтров каталога кэшируются с коротким TTL (core/services/cache_backend.py).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        """Подключает signals приложения (инвалидация кэша границ фильтров каталога)."""
+        import core.signals  # noqa: F401
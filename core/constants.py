@@ -9,3 +9,13 @@ MESSAGE_LENGTH_IN_THERAPY_SESSION_PAGE = 100
 
 # === Время, в течение которого автор может редактировать свое сообщение в детальной карточке *Терапевтическая сессия*
 MESSAGE_EDIT_WINDOW_SECONDS_IN_THERAPY_SESSION_PAGE = 3600
+
+# === Время жизни (в секундах) кэша границ фильтров *Каталога психологов* (возраст, стаж, цены).
+# Кэш сбрасывается сигналами при сохранении PsychologistProfile/AppUser, а TTL - страховка для изменений
+# через QuerySet.update(). Час используется только с общим кэшем (Redis, REDIS_URL в settings.py)
+CATALOG_FACET_BOUNDS_CACHE_TIMEOUT = 60 * 60
+
+# === Время жизни (в секундах) того же кэша, если кэш локальный для процесса (LocMemCache без Redis).
+# Сигнал сбрасывает кэш только в процессе, который сохранил психолога, а остальные workers видят новые границы
+# фильтров только после истечения TTL - поэтому он короткий (это и есть максимальное "отставание" границ)
+CATALOG_FACET_BOUNDS_LOCAL_CACHE_TIMEOUT = 60
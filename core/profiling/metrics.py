@@ -0,0 +1,174 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Накопитель времени фаз текущего запроса: {имя фазы: секунды}.
+# None - запрос не профилируется, и phase_timer() ничего не измеряет
+_current_phase_seconds: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "current_phase_seconds",
+    default=None,
+)
+
+
+def start_phase_timings() -> Token:
+    """Включает сбор времени фаз для текущего запроса (вызывается middleware перед view).
+
+    :return: Token для finish_phase_timings().
+    """
+    return _current_phase_seconds.set({})
+
+
+def finish_phase_timings(token: Token) -> Dict[str, float]:
+    """Выключает сбор времени фаз и возвращает накопленное за запрос время по каждой фазе."""
+    phase_seconds = _current_phase_seconds.get() or {}
+    _current_phase_seconds.reset(token)
+    return phase_seconds
+
+
+@contextmanager
+def phase_timer(name: str) -> Iterator[None]:
+    """Замеряет время фазы внутри профилируемого запроса (например, генерация доменной сетки в use-case).
+
+    Если запрос не профилируется (middleware выключена или код выполняется в management-команде),
+    то таймер ничего не делает. Повторные вызовы одной фазы за запрос суммируются.
+
+    Пример:
+        with phase_timer("calendar.domain_grid"):
+            ...
+
+        @phase_timer("calendar.runtime_context")  # как декоратор - замеряется каждый вызов функции
+        def build_runtime_context(...):
+            ...
+    """
+    phase_seconds = _current_phase_seconds.get()
+    if phase_seconds is None:
+        yield
+        return
+
+    started_at = perf_counter()
+    try:
+        yield
+    finally:
+        phase_seconds[name] = phase_seconds.get(name, 0.0) + perf_counter() - started_at
+
+
+class EndpointMetrics:
+    """Накопленные метрики одного endpoint (view_name) с момента старта процесса."""
+
+    def __init__(self) -> None:
+        self.requests_count = 0
+        self.duration_seconds_sum = 0.0
+        self.duration_seconds_max = 0.0
+        self.db_duration_seconds_sum = 0.0
+        self.db_queries_sum = 0
+        self.db_queries_max = 0
+        self.phase_seconds_sum: Dict[str, float] = {}
+
+    def to_dict(self) -> dict:
+        """Представление метрик endpoint для JSON-ответа."""
+        return {
+            "requests_count": self.requests_count,
+            "duration_seconds_sum": self.duration_seconds_sum,
+            "duration_seconds_max": self.duration_seconds_max,
+            "db_duration_seconds_sum": self.db_duration_seconds_sum,
+            "db_queries_sum": self.db_queries_sum,
+            "db_queries_max": self.db_queries_max,
+            "phase_seconds_sum": dict(self.phase_seconds_sum),
+        }
+
+
+class ProfilingMetricsRegistry:
+    """Хранилище метрик профилирования запросов в памяти процесса.
+
+    ВАЖНО:
+        - метрики живут в памяти одного процесса (каждый worker gunicorn/uwsgi считает свои),
+          поэтому endpoint метрик показывает данные того worker'а, который обработал запрос;
+        - запись выполняется под Lock, т.к. один процесс может обслуживать запросы в нескольких потоках.
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = Lock()
+
+    def record_request(
+        self,
+        *,
+        endpoint: str,
+        duration_seconds: float,
+        db_duration_seconds: float,
+        db_queries: int,
+        phase_seconds: Dict[str, float],
+    ) -> None:
+        """Добавляет результаты одного запроса к метрикам endpoint."""
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self._endpoints[endpoint] = EndpointMetrics()
+
+            metrics.requests_count += 1
+            metrics.duration_seconds_sum += duration_seconds
+            metrics.duration_seconds_max = max(metrics.duration_seconds_max, duration_seconds)
+            metrics.db_duration_seconds_sum += db_duration_seconds
+            metrics.db_queries_sum += db_queries
+            metrics.db_queries_max = max(metrics.db_queries_max, db_queries)
+
+            for phase_name, seconds in phase_seconds.items():
+                metrics.phase_seconds_sum[phase_name] = metrics.phase_seconds_sum.get(phase_name, 0.0) + seconds
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Возвращает копию метрик всех endpoint в виде {view_name: {...}}."""
+        with self._lock:
+            return {endpoint: metrics.to_dict() for endpoint, metrics in sorted(self._endpoints.items())}
+
+    def render_prometheus_text(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus (exposition format 0.0.4)."""
+        snapshot = self.snapshot()
+        series: List[Tuple[str, str, str, List[Tuple[str, float]]]] = [
+            ("app_requests_total", "counter", "Количество обработанных запросов", []),
+            ("app_request_duration_seconds_sum", "counter", "Суммарное время обработки запросов", []),
+            ("app_request_duration_seconds_max", "gauge", "Максимальное время обработки запроса", []),
+            ("app_request_db_duration_seconds_sum", "counter", "Суммарное время SQL-запросов", []),
+            ("app_request_db_queries_total", "counter", "Суммарное количество SQL-запросов", []),
+            ("app_request_db_queries_max", "gauge", "Максимальное количество SQL-запросов за один запрос", []),
+            ("app_request_phase_duration_seconds_sum", "counter", "Суммарное время фаз внутри запросов", []),
+        ]
+        samples_by_name = {name: samples for name, _type, _help, samples in series}
+
+        for endpoint, metrics in snapshot.items():
+            labels = f'endpoint="{_escape_label_value(endpoint)}"'
+            samples_by_name["app_requests_total"].append((labels, metrics["requests_count"]))
+            samples_by_name["app_request_duration_seconds_sum"].append((labels, metrics["duration_seconds_sum"]))
+            samples_by_name["app_request_duration_seconds_max"].append((labels, metrics["duration_seconds_max"]))
+            samples_by_name["app_request_db_duration_seconds_sum"].append(
+                (labels, metrics["db_duration_seconds_sum"])
+            )
+            samples_by_name["app_request_db_queries_total"].append((labels, metrics["db_queries_sum"]))
+            samples_by_name["app_request_db_queries_max"].append((labels, metrics["db_queries_max"]))
+
+            for phase_name, seconds in sorted(metrics["phase_seconds_sum"].items()):
+                samples_by_name["app_request_phase_duration_seconds_sum"].append(
+                    (f'{labels},phase="{_escape_label_value(phase_name)}"', seconds)
+                )
+
+        lines = []
+        for name, metric_type, help_text, samples in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in samples)
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Очищает все накопленные метрики."""
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _escape_label_value(value: str) -> str:
+    """Экранирует значение label по правилам текстового формата Prometheus."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+PROFILING_METRICS = ProfilingMetricsRegistry()
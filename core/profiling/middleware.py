@@ -0,0 +1,109 @@
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from core.profiling.metrics import (PROFILING_METRICS, finish_phase_timings,
+                                    start_phase_timings)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCollector:
+    """execute_wrapper для django.db.connection: считает количество SQL-запросов и их суммарное время."""
+
+    def __init__(self) -> None:
+        self.queries_count = 0
+        self.duration_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries_count += 1
+            self.duration_seconds += perf_counter() - started_at
+
+
+class RequestProfilingMiddleware:
+    """Профилирует каждый запрос: количество SQL-запросов, время в БД, общее время и время фаз calendar engine.
+
+    Зачем нужна:
+        - самые тяжелые endpoint'ы (фильтр каталога, подбор психологов, расписание специалиста, календарь
+          клиента) склонны к N+1 и регрессиям по количеству запросов, а без замеров это видно только по жалобам;
+        - middleware накапливает метрики по view_name в PROFILING_METRICS (endpoint internal/profiling-metrics/),
+          добавляет заголовок Server-Timing и пишет WARNING для медленных запросов / запросов с большим числом SQL.
+
+    Включение:
+        - settings.REQUEST_PROFILING_ENABLED = True (переменная окружения REQUEST_PROFILING_ENABLED);
+        - если профилирование выключено, Django исключает middleware из цепочки при старте (MiddlewareNotUsed),
+          т.е. накладных расходов нет совсем.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.slow_request_ms = getattr(settings, "REQUEST_PROFILING_SLOW_REQUEST_MS", 500)
+        self.max_queries = getattr(settings, "REQUEST_PROFILING_MAX_QUERIES", 30)
+
+    def __call__(self, request):
+        query_collector = QueryCollector()
+        phase_timings_token = start_phase_timings()
+        started_at = perf_counter()
+
+        try:
+            with connection.execute_wrapper(query_collector):
+                response = self.get_response(request)
+        finally:
+            phase_seconds = finish_phase_timings(phase_timings_token)
+
+        duration_seconds = perf_counter() - started_at
+
+        # Запросы, которые не дошли до view (404 по URL, статика), в метрики не попадают
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return response
+
+        endpoint = resolver_match.view_name
+        PROFILING_METRICS.record_request(
+            endpoint=endpoint,
+            duration_seconds=duration_seconds,
+            db_duration_seconds=query_collector.duration_seconds,
+            db_queries=query_collector.queries_count,
+            phase_seconds=phase_seconds,
+        )
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f"total;dur={duration_seconds * 1000:.1f}",
+                f'db;dur={query_collector.duration_seconds * 1000:.1f};desc="{query_collector.queries_count} queries"',
+                *(
+                    f"{phase_name.replace('.', '-')};dur={seconds * 1000:.1f}"
+                    for phase_name, seconds in phase_seconds.items()
+                ),
+            ]
+        )
+
+        duration_ms = duration_seconds * 1000
+        log_level = (
+            logging.WARNING
+            if duration_ms >= self.slow_request_ms or query_collector.queries_count > self.max_queries
+            else logging.DEBUG
+        )
+        logger.log(
+            log_level,
+            "request_profile endpoint=%s method=%s status=%s total_ms=%.1f db_ms=%.1f queries=%s phases=%s",
+            endpoint,
+            request.method,
+            response.status_code,
+            duration_ms,
+            query_collector.duration_seconds * 1000,
+            query_collector.queries_count,
+            {phase_name: round(seconds * 1000, 1) for phase_name, seconds in phase_seconds.items()},
+        )
+
+        return response
@@ -0,0 +1,14 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_process_local_cache(*, alias: str = DEFAULT_CACHE_ALIAS) -> bool:
+    """Проверяет, живет ли кэш в памяти текущего процесса (LocMemCache - backend Django по умолчанию).
+
+    Почему это важно:
+        - у каждого процесса (gunicorn worker, cron-команда) свой LocMemCache;
+        - сброс кэша из signals (delete / смена версии ключа) выполняется только в процессе, который сохранил данные,
+          а остальные процессы продолжают читать свое старое значение до истечения TTL;
+        - с общим кэшем (Redis, см. REDIS_URL в settings.py) сброс сразу виден всем процессам.
+    """
+    return isinstance(caches[alias], LocMemCache)
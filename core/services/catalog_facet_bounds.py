@@ -0,0 +1,57 @@
+from datetime import date
+
+from django.core.cache import cache
+
+from core.constants import (CATALOG_FACET_BOUNDS_CACHE_TIMEOUT,
+                            CATALOG_FACET_BOUNDS_LOCAL_CACHE_TIMEOUT)
+from core.services.cache_backend import is_process_local_cache
+
+# Ключ зависит от года, потому что границы стажа считаются относительно текущего года:
+# с наступлением нового года старое значение просто перестает читаться
+CATALOG_FACET_BOUNDS_CACHE_KEY_PREFIX = "catalog:facet_bounds"
+
+
+def _build_catalog_facet_bounds_cache_key() -> str:
+    """Возвращает ключ кэша границ фильтров каталога для текущего года."""
+    return f"{CATALOG_FACET_BOUNDS_CACHE_KEY_PREFIX}:{date.today().year}"
+
+
+def _get_catalog_facet_bounds_cache_timeout() -> int:
+    """Возвращает TTL кэша: с локальным для процесса кэшем (LocMemCache) сигнал не сбросит кэш других workers,
+    поэтому TTL короткий, а с общим кэшем (Redis) - длинный."""
+    if is_process_local_cache():
+        return CATALOG_FACET_BOUNDS_LOCAL_CACHE_TIMEOUT
+
+    return CATALOG_FACET_BOUNDS_CACHE_TIMEOUT
+
+
+def get_catalog_facet_bounds(*, build):
+    """Возвращает границы фильтров каталога (возраст, стаж, фиксированные цены) из Django cache.
+
+    Зачем нужно:
+        - границы фильтров считаются aggregate-запросами по всем верифицированным психологам, а меняются они
+          только при изменении профиля/аккаунта специалиста;
+        - поэтому в устойчивом состоянии "обвязка" фильтров каталога не должна стоить ни одного запроса в БД.
+
+    Ограничение: без общего кэша (Redis) сброс из signals доходит только до кэша процесса, который сохранил
+    психолога, поэтому остальные процессы могут показывать старые границы до CATALOG_FACET_BOUNDS_LOCAL_CACHE_TIMEOUT.
+
+    :param build: Функция без аргументов, которая считает границы по данным из БД (вызывается только при промахе).
+    :return: Словарь вида {"age": {...}, "experience": {...}, "price_choices": {...}}.
+    """
+    cache_key = _build_catalog_facet_bounds_cache_key()
+    facet_bounds = cache.get(cache_key)
+
+    if facet_bounds is None:
+        facet_bounds = build()
+        cache.set(cache_key, facet_bounds, _get_catalog_facet_bounds_cache_timeout())
+
+    return facet_bounds
+
+
+def invalidate_catalog_facet_bounds():
+    """Сбрасывает кэш границ фильтров каталога (вызывается из signals при изменении психологов).
+
+    С LocMemCache сбрасывается только кэш текущего процесса (см. get_catalog_facet_bounds).
+    """
+    cache.delete(_build_catalog_facet_bounds_cache_key())
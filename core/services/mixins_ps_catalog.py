@@ -1,22 +1,23 @@
+import math
 import random
 from datetime import date
 from urllib.parse import urlencode
 
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import (Case, IntegerField, Max, Min, Prefetch, Value,
-                              When)
+from django.db.models import CharField, Max, Min, Prefetch, Q, Value
+from django.db.models.functions import MD5, Cast, Concat
 from django.template.loader import render_to_string
 from django.urls import reverse
 
 from aggregator._web.services.basic_filter_catalog import (
     DEFAULT_CATALOG_AGE_MAX, DEFAULT_CATALOG_AGE_MIN,
     DEFAULT_CATALOG_EXPERIENCE_MAX, DEFAULT_CATALOG_EXPERIENCE_MIN,
-    apply_catalog_basic_filters, extract_age_range, extract_consultation_type,
-    extract_experience_range, extract_gender, extract_method_ids,
-    extract_price_values, extract_selected_session_slots,
+    apply_catalog_basic_filters, build_catalog_facet_counts, extract_age_range,
+    extract_consultation_type, extract_experience_range, extract_gender,
+    extract_method_ids, extract_price_values, extract_selected_session_slots,
     extract_session_time_mode, extract_topic_ids)
 from calendar_engine.models import AvailabilityRule
 from core.constants import CARDS_PER_PAGE
+from core.services.catalog_facet_bounds import get_catalog_facet_bounds
 from core.services.experience_label import build_experience_label
 from core.services.session_duration_label import attach_session_duration_labels
 from users.models import PsychologistProfile
@@ -80,8 +81,9 @@ class CatalogPsychologistQuerysetMixin:
         Основная бизнес-логика:
             1) берем только активных и верифицированных специалистов;
             2) сразу подтягиваем связанные данные через select_related/prefetch_related, чтобы избежать N+1;
-            3) базовую сортировку оставляем стабильной по id, а реальную случайность применяем безопасно
-               на уровне списка id (random.shuffle() + ключ случайного порядка).
+            3) базовую сортировку оставляем стабильной по id, а случайный порядок карточек считается уже в SQL:
+               ORDER BY MD5("<id>:<random_order_key>"), id с keyset-пагинацией по этой паре
+               (см. _build_catalog_order_expression() и _build_catalog_page_data()).
 
         "Случайность" - это рандомный вывод ВСЕХ карточек БЕЗ фильтрации при первом открытии страницы, чтоб
         была динамика. Далее мы добавим коэффициент совпадения при наличии фильтрации и ранжированный вывод.
@@ -122,6 +124,28 @@ class CatalogPsychologistQuerysetMixin:
         profile.slug = generate_unique_slug(profile, source_value)
         profile.save(update_fields=["slug"])
 
+    def _get_catalog_facet_bounds(self):
+        """Возвращает границы фильтров каталога (возраст, стаж, фиксированные цены) без повторных запросов в БД.
+
+        Простая бизнес-логика:
+            - между запросами значения живут в Django cache и сбрасываются signals при сохранении
+              PsychologistProfile/AppUser (см. core/signals.py);
+            - внутри одного запроса значения дополнительно запоминаются на самом view, т.к. payload-методы
+              обращаются к ним несколько раз.
+        """
+        if not hasattr(self, "_catalog_facet_bounds"):
+            self._catalog_facet_bounds = get_catalog_facet_bounds(build=self._build_catalog_facet_bounds)
+
+        return self._catalog_facet_bounds
+
+    def _build_catalog_facet_bounds(self):
+        """Считает все границы фильтров каталога по данным из БД (вызывается только при промахе кэша)."""
+        return {
+            "age": self._build_catalog_age_bounds(),
+            "experience": self._build_catalog_experience_bounds(),
+            "price_choices": self._build_catalog_price_choices(),
+        }
+
     def _build_catalog_age_bounds(self):
         """Возвращает реальные возрастные границы каталога по данным из БД.
 
@@ -322,13 +346,13 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
                 "age_max": 40 | None,
                 "experience_min": 3 | None,
                 "experience_max": 15 | None,
-                "session_time_mode": "any" | "specific",
+                "session_time_mode": "any" | "specific" | "this_week",
                 "selected_session_slots": ["2026-01-22T19:00:00+03:00"] | [],
             }
         """
         raw_filters_state = raw_filters_state or {}
-        age_bounds = age_bounds or self._build_catalog_age_bounds()
-        experience_bounds = experience_bounds or self._build_catalog_experience_bounds()
+        age_bounds = age_bounds or self._get_catalog_facet_bounds()["age"]
+        experience_bounds = experience_bounds or self._get_catalog_facet_bounds()["experience"]
         age_min, age_max = extract_age_range(
             raw_filters_state.get("age_min"),
             raw_filters_state.get("age_max"),
@@ -371,7 +395,57 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
             ),
         }
 
-    def _build_catalog_page_data(self, *, filters_state, requested_page=1, random_order_key=None, restore_mode=False):
+    @staticmethod
+    def _build_catalog_order_expression(random_order_key):
+        """Возвращает SQL-выражение стабильного случайного порядка карточек для "ключа случайного порядка".
+
+        Пояснение:
+            - порядок считается прямо в БД как MD5 от строки "<id>:<random_order_key>";
+            - пока ключ один и тот же, у каждого психолога один и тот же "вес" и порядок не меняется между запросами;
+            - новый ключ дает новый порядок, т.е. это тот же детерминированный shuffle, но без загрузки всех id
+              в Python.
+        """
+        return MD5(
+            Concat(
+                Cast("pk", output_field=CharField()),
+                Value(f":{random_order_key}"),
+                output_field=CharField(),
+            )
+        )
+
+    @staticmethod
+    def _parse_catalog_cursor(raw_cursor):
+        """Разбирает keyset-курсор вида "<md5 последней карточки>:<id последней карточки>".
+
+        Если курсор пустой или битый, возвращаем None - тогда страница берется по номеру (LIMIT/OFFSET).
+        """
+        if not isinstance(raw_cursor, str):
+            return None
+
+        order_value, separator, raw_pk = raw_cursor.partition(":")
+        if not separator or len(order_value) != 32:
+            return None
+
+        try:
+            int(order_value, 16)
+            pk = int(raw_pk)
+        except ValueError:
+            return None
+
+        if pk <= 0:
+            return None
+
+        return order_value, pk
+
+    def _build_catalog_page_data(
+        self,
+        *,
+        filters_state,
+        requested_page=1,
+        random_order_key=None,
+        restore_mode=False,
+        cursor=None,
+    ):
         """Собирает данные каталога для полной страницы (page=1 / page=2 / ...) или AJAX-ответа (фильтрация).
 
         Аргументы:
@@ -380,16 +454,19 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
             - random_order_key: ключ стабильного случайного порядка;
             - restore_mode: если True и страница > 1, возвращаем карточки с 1-й страницы и до requested_page
               включительно. Это нужно для возврата из детальной карточки (detail) обратно в каталог,
-              чтобы клиент увидел тот же набор карточек в каталоге, что и до перехода.
+              чтобы клиент увидел тот же набор карточек в каталоге, что и до перехода;
+            - cursor: keyset-курсор последней показанной карточки (next_cursor из предыдущего ответа).
 
         Техническая логика (простыми словами):
-            1) берем id всех подходящих психологов из БД;
-            2) перемешиваем эти id по "ключу случайного порядка";
-            3) берем только нужный кусок страницы (например, 1-18 или 19-36);
-            4) вторым запросом в БД забираем данные только по этим id.
+            1) считаем количество подходящих психологов (для индикатора страниц);
+            2) сортируем их прямо в БД по MD5("<id>:<random_order_key>") - это стабильный "случайный" порядок;
+            3) если фронтенд прислал курсор, то берем карточки строго после последней показанной (keyset pagination),
+               иначе - нужный кусок по номеру страницы;
+            4) в любом случае это один ограниченный запрос (LIMIT страницы + 1), без загрузки в память id всего
+               каталога; has_next определяется по лишней (+1) карточке.
         """
-        age_bounds = self._build_catalog_age_bounds()
-        experience_bounds = self._build_catalog_experience_bounds()
+        age_bounds = self._get_catalog_facet_bounds()["age"]
+        experience_bounds = self._get_catalog_facet_bounds()["experience"]
         queryset = apply_catalog_basic_filters(
             self.get_queryset(),
             self._extract_filters_state(
@@ -406,85 +483,65 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
             fallback=self._generate_random_order_key(),
         )
 
-        # 1) Берем только id, чтобы дешево перемешать порядок в памяти
-        profile_ids = list(queryset.values_list("id", flat=True))
-        # Отдельно обрабатываем полностью пустой каталог, чтобы не создавать некорректную страницу paginator.page(0)
-        if not profile_ids:
+        # 1) Количество карточек нужно только для индикатора "страница N из M"
+        total_count = queryset.count()
+        # Отдельно обрабатываем полностью пустой каталог, чтобы не создавать некорректную страницу
+        if not total_count:
             return {
                 "profiles": [],
                 "has_next": False,
                 "next_page_number": None,
+                "next_cursor": None,
                 "current_page_number": 1,
                 "total_pages": 0,
                 "total_count": 0,
                 "random_order_key": safe_random_order_key,
             }
 
-        # 2) Перемешиваем детерминированно через "ключ случайного порядка"
-        rng = random.Random(safe_random_order_key)
-        rng.shuffle(profile_ids)
-
-        # 3) Пагинируем уже перемешанный список id
-        paginator = Paginator(profile_ids, self.page_size)
-        safe_requested_page = self._parse_positive_int(requested_page, fallback=1)
+        total_pages = math.ceil(total_count / self.page_size)
+        # Как и раньше с paginator: слишком большой номер страницы прижимаем к последней странице
+        page_number = min(self._parse_positive_int(requested_page, fallback=1), total_pages)
 
-        try:
-            page_obj = paginator.page(safe_requested_page)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # 2) Стабильный случайный порядок считается в БД (id - второй ключ на случай совпадения MD5)
+        ordered_queryset = (
+            queryset
+            .annotate(_catalog_order=self._build_catalog_order_expression(safe_random_order_key))
+            .order_by("_catalog_order", "pk")
+        )
 
+        # 3) Определяем границы выборки
         # Для сценария "возврат из детальной карточки в каталог":
         # если указан restore=1 и page>1, то нужно вернуть НЕ только page=2,
         # а всю ленту от начала и до конца этой страницы (1..2, 1..3 и т.д.),
         # чтобы пользователь визуально оказался в том же месте списка
-        if restore_mode and page_obj.number > 1:
-            current_page_ids = profile_ids[:page_obj.end_index()]
-        else:
-            current_page_ids = list(page_obj.object_list)
-
-        # 4) Возвращаем профили в том же порядке, что и в current_page_ids
-        # current_page_ids - это список id текущей страницы (например, page=2) в нужном порядке после перемешивания.
-        # Например: current_page_ids = [42, 7, 19]. Если сделать просто: queryset.filter(pk__in=current_page_ids), то
-        # БД вернет записи в своем порядке (часто по id: 7, 19, 42), а нам нужен порядок 42, 7, 19. Вот эту задачу
-        # решает код ниже.
-
-        # УПРОЩЕННЫЙ ВАРИАНТ КОДА: конструкцию можно описать в развернутом виде вот так:
-        # # Шаг 1. Создаем пустой список условий для SQL-конструкции CASE ... WHEN ...
-        # order_conditions = []
-        # # Шаг 2. Проходим по id текущей страницы и запоминаем их позицию
-        # # Пример current_page_ids = [42, 7, 19]
-        # # Тогда пары будут: (0,42), (1,7), (2,19)
-        # for position, profile_id in enumerate(current_page_ids):
-        #     order_conditions.append(
-        #         When(pk=profile_id, then=Value(position))
-        #     )
-        # # Шаг 3. Собираем итоговое выражение:
-        # # CASE
-        # #   WHEN pk=42 THEN 0
-        # #   WHEN pk=7  THEN 1
-        # #   WHEN pk=19 THEN 2
-        # # END
-        # ordering = Case(
-        #     *order_conditions,
-        #     output_field=IntegerField(),
-        # )
-        if current_page_ids:
-            # enumerate - дает пары: (0, 42), (1, 7), (2, 19), то есть “какая позиция у каждого id”
-            # Case - создает SQL-правило: если pk=42 то _catalog_order=0, если pk=7 то _catalog_order=1 и т.д.
-            ordering = Case(
-                *[When(pk=pk, then=Value(pos)) for pos, pk in enumerate(current_page_ids)],
-                output_field=IntegerField(),
-            )
-            profiles = list(
-                queryset
-                .filter(pk__in=current_page_ids)
-                .annotate(_catalog_order=ordering)  # annotate - добавляет это вычисленное поле к каждой записи
-                .order_by("_catalog_order")  # order_by - сортирует именно по этой позиции и получаем [42, 7, 19]
-            )
+        parsed_cursor = None if restore_mode else self._parse_catalog_cursor(cursor)
+        page_end = page_number * self.page_size
+        # Сколько карточек показываем. Из БД берем на одну больше: есть ли следующая страница, решает эта
+        # лишняя карточка, а не номер страницы от клиента (с курсором номер страницы может не совпадать
+        # с реальным положением в ленте)
+        page_limit = self.page_size
+
+        if parsed_cursor is not None:
+            # keyset pagination: карточки строго после последней показанной, без OFFSET
+            last_order_value, last_pk = parsed_cursor
+            page_queryset = ordered_queryset.filter(
+                Q(_catalog_order__gt=last_order_value)
+                | Q(_catalog_order=last_order_value, pk__gt=last_pk)
+            )[:page_limit + 1]
+        elif restore_mode and page_number > 1:
+            page_limit = page_end
+            page_queryset = ordered_queryset[:page_limit + 1]
         else:
-            profiles = []
+            page_queryset = ordered_queryset[page_end - self.page_size:page_end + 1]
+
+        # 4) Один ограниченный запрос за карточками текущей страницы уже в нужном порядке
+        profiles = list(page_queryset)
+        has_next = len(profiles) > page_limit
+        profiles = profiles[:page_limit]
+
+        next_cursor = None
+        if has_next and profiles:
+            next_cursor = f"{profiles[-1]._catalog_order}:{profiles[-1].pk}"
 
         # Динамически обогащаем объект значениями, которые нужны только для текущего UI
         for profile in profiles:
@@ -494,11 +551,12 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
 
         return {
             "profiles": profiles,
-            "has_next": page_obj.has_next(),
-            "next_page_number": page_obj.next_page_number() if page_obj.has_next() else None,
-            "current_page_number": page_obj.number,
-            "total_pages": paginator.num_pages,
-            "total_count": paginator.count,
+            "has_next": has_next,
+            "next_page_number": page_number + 1 if has_next else None,
+            "next_cursor": next_cursor,
+            "current_page_number": page_number,
+            "total_pages": total_pages,
+            "total_count": total_count,
             "random_order_key": safe_random_order_key,
         }
 
@@ -530,8 +588,8 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
             - пустое состояние каталога;
             - активность фильтр-чипов.
         """
-        age_bounds = self._build_catalog_age_bounds()
-        experience_bounds = self._build_catalog_experience_bounds()
+        age_bounds = self._get_catalog_facet_bounds()["age"]
+        experience_bounds = self._get_catalog_facet_bounds()["experience"]
 
         return {
             "status": "ok",
@@ -542,6 +600,7 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
             ),
             "has_next": page_data["has_next"],
             "next_page_number": page_data["next_page_number"],
+            "next_cursor": page_data["next_cursor"],
             "current_page_number": page_data["current_page_number"],
             "total_pages": page_data["total_pages"],
             "total_count": page_data["total_count"],
@@ -559,8 +618,8 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
         Этот режим нужен для модалок фильтров, когда пользователь еще не применил изменения,
         но уже хочет увидеть, сколько специалистов будет найдено.
         """
-        age_bounds = self._build_catalog_age_bounds()
-        experience_bounds = self._build_catalog_experience_bounds()
+        age_bounds = self._get_catalog_facet_bounds()["age"]
+        experience_bounds = self._get_catalog_facet_bounds()["experience"]
         filtered_queryset = apply_catalog_basic_filters(
             self.get_queryset(),
             self._extract_filters_state(
@@ -581,3 +640,31 @@ class CatalogPageDataMixin(CatalogPsychologistQuerysetMixin, CatalogDetailLinkMi
                 experience_bounds=experience_bounds,
             ),
         }
+
+    def _build_facet_counts_response_payload(self, *, filters_state):
+        """Собирает JSON-ответ с количеством специалистов по каждому значению фильтров (faceted counts).
+
+        Этот режим нужен для модалок фильтров: за один запрос фронтенд получает, сколько специалистов
+        найдется по каждой теме, методу, полу, цене и диапазону стажа при текущем состоянии фильтров,
+        вместо отдельного preview-запроса на каждое значение.
+        """
+        age_bounds = self._get_catalog_facet_bounds()["age"]
+        experience_bounds = self._get_catalog_facet_bounds()["experience"]
+        active_filters = self._extract_filters_state(
+            filters_state,
+            age_bounds=age_bounds,
+            experience_bounds=experience_bounds,
+        )
+        facet_counts = build_catalog_facet_counts(
+            self.get_queryset(),
+            active_filters,
+            age_bounds=age_bounds,
+            experience_bounds=experience_bounds,
+        )
+
+        return {
+            "status": "ok",
+            "total_count": facet_counts.pop("total_count"),
+            "facet_counts": facet_counts,
+            "active_filters": active_filters,
+        }
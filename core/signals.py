@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.catalog_facet_bounds import invalidate_catalog_facet_bounds
+from users.models import AppUser, PsychologistProfile
+
+# =====
+# ИНВАЛИДАЦИЯ КЭША ГРАНИЦ ФИЛЬТРОВ КАТАЛОГА
+# =====
+# Границы фильтров каталога (возраст, стаж, цены) зависят только от этих полей.
+# Если save() вызван с update_fields без них (например, AppUser.last_login при входе в систему),
+# то сбрасывать кэш не нужно.
+CATALOG_FACET_APP_USER_FIELDS = {"age", "is_active"}
+CATALOG_FACET_PROFILE_FIELDS = {"is_verified", "practice_start_year", "price_individual", "price_couples"}
+
+
+def _affects_catalog_facet_bounds(update_fields, relevant_fields) -> bool:
+    """Проверяет, могло ли сохранение изменить границы фильтров каталога."""
+    return update_fields is None or bool(set(update_fields) & relevant_fields)
+
+
+@receiver(post_save, sender=AppUser)
+def invalidate_catalog_facet_bounds_on_user_save(sender, instance, update_fields=None, **kwargs):
+    """Аккаунт изменился - возраст или активность специалиста могли поменять границы фильтров каталога."""
+    if _affects_catalog_facet_bounds(update_fields, CATALOG_FACET_APP_USER_FIELDS):
+        invalidate_catalog_facet_bounds()
+
+
+@receiver(post_save, sender=PsychologistProfile)
+def invalidate_catalog_facet_bounds_on_profile_save(sender, instance, update_fields=None, **kwargs):
+    """Профиль психолога изменился - верификация, стаж или цены могли поменять границы фильтров каталога."""
+    if _affects_catalog_facet_bounds(update_fields, CATALOG_FACET_PROFILE_FIELDS):
+        invalidate_catalog_facet_bounds()
+
+
+@receiver(post_delete, sender=AppUser)
+@receiver(post_delete, sender=PsychologistProfile)
+def invalidate_catalog_facet_bounds_on_delete(sender, instance, **kwargs):
+    """Специалист удален - набор участников каталога изменился."""
+    invalidate_catalog_facet_bounds()
@@ -0,0 +1,122 @@
+from hashlib import md5
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from calendar_engine.tests.helpers import create_test_specialist
+from core.services.mixins_ps_catalog import CatalogPageDataMixin
+
+RANDOM_ORDER_KEY = 42
+
+
+class _CatalogPageData(CatalogPageDataMixin):
+    """CatalogPageDataMixin без view: маленькая страница, чтобы ленту можно было пройти за несколько запросов."""
+
+    page_size = 3
+
+
+class ParseCatalogCursorTests(SimpleTestCase):
+    """Курсор "<md5>:<id>": битый курсор не ломает запрос, а откатывает пагинацию на номер страницы."""
+
+    def test_valid_cursor(self):
+        order_value = md5(b"7:42").hexdigest()
+
+        self.assertEqual(CatalogPageDataMixin._parse_catalog_cursor(f"{order_value}:7"), (order_value, 7))
+
+    def test_broken_cursor(self):
+        order_value = md5(b"7:42").hexdigest()
+
+        for raw_cursor in (None, "", "7", f"{order_value}", f"{order_value}:", f"{order_value}:0",
+                           f"{order_value}:abc", f"{order_value[:-1]}:7", f"{'z' * 32}:7"):
+            with self.subTest(raw_cursor=raw_cursor):
+                self.assertIsNone(CatalogPageDataMixin._parse_catalog_cursor(raw_cursor))
+
+
+@override_settings(USE_MATERIALIZED_AVAILABILITY=False)
+class CatalogKeysetPaginationTests(TestCase):
+    """Лента каталога по курсору: стабильный порядок MD5("<id>:<key>"), id без дублей и пропусков между страницами."""
+
+    def setUp(self):
+        self.page_data_builder = _CatalogPageData()
+        self.profile_ids = [
+            create_test_specialist(email=f"specialist-{index}@example.com").pk
+            for index in range(7)
+        ]
+
+    def _build_page_data(self, *, requested_page=1, cursor=None, restore_mode=False):
+        return self.page_data_builder._build_catalog_page_data(
+            filters_state={},
+            requested_page=requested_page,
+            random_order_key=RANDOM_ORDER_KEY,
+            restore_mode=restore_mode,
+            cursor=cursor,
+        )
+
+    def _walk_pages_by_cursor(self) -> list:
+        """Проходит ленту так же, как фронтенд: page + next_cursor из предыдущего ответа. Возвращает страницы id."""
+        pages = []
+        page_data = self._build_page_data()
+        while True:
+            pages.append([profile.pk for profile in page_data["profiles"]])
+            if not page_data["has_next"]:
+                self.assertIsNone(page_data["next_cursor"])
+                return pages
+
+            page_data = self._build_page_data(
+                requested_page=page_data["next_page_number"],
+                cursor=page_data["next_cursor"],
+            )
+
+    def test_cursor_round_trip(self):
+        """next_cursor - это MD5 и id последней карточки страницы, и он разбирается обратно в ту же пару."""
+        page_data = self._build_page_data()
+        last_profile = page_data["profiles"][-1]
+
+        self.assertEqual(
+            self.page_data_builder._parse_catalog_cursor(page_data["next_cursor"]),
+            (md5(f"{last_profile.pk}:{RANDOM_ORDER_KEY}".encode()).hexdigest(), last_profile.pk),
+        )
+
+    def test_pages_have_no_duplicates_or_gaps(self):
+        pages = self._walk_pages_by_cursor()
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sorted(sum(pages, [])), sorted(self.profile_ids))
+
+    def test_order_is_stable_for_fixed_key(self):
+        """Порядок совпадает с MD5("<id>:<key>"), id, одинаков между проходами и с постраничной выдачей по номеру."""
+        expected_ids = sorted(
+            self.profile_ids,
+            key=lambda pk: (md5(f"{pk}:{RANDOM_ORDER_KEY}".encode()).hexdigest(), pk),
+        )
+
+        self.assertEqual(sum(self._walk_pages_by_cursor(), []), expected_ids)
+        self.assertEqual(sum(self._walk_pages_by_cursor(), []), expected_ids)
+        self.assertEqual(
+            [profile.pk for profile in self._build_page_data(requested_page=2)["profiles"]],
+            expected_ids[3:6],
+        )
+        self.assertEqual(
+            [profile.pk for profile in self._build_page_data(requested_page=3, restore_mode=True)["profiles"]],
+            expected_ids,
+        )
+
+    def test_has_next_does_not_depend_on_client_page_number(self):
+        """Курсор на 6-ю карточку из 7, а клиент прислал page=1: отдается одна карточка и следующей страницы нет."""
+        first_page = self._build_page_data()
+        second_page = self._build_page_data(requested_page=2, cursor=first_page["next_cursor"])
+
+        last_page = self._build_page_data(requested_page=1, cursor=second_page["next_cursor"])
+
+        self.assertEqual(len(last_page["profiles"]), 1)
+        self.assertFalse(last_page["has_next"])
+        self.assertIsNone(last_page["next_page_number"])
+
+    def test_last_full_page_has_no_next(self):
+        """Если карточек ровно на целое число страниц, последняя полная страница не обещает следующую."""
+        self.page_data_builder.page_size = 7
+
+        page_data = self._build_page_data()
+
+        self.assertEqual(len(page_data["profiles"]), 7)
+        self.assertFalse(page_data["has_next"])
+        self.assertIsNone(page_data["next_cursor"])
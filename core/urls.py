@@ -18,6 +18,7 @@ from core.views.client.specialist_matching.view_payment_card import \
     ClientAddPaymentCardPageView
 from core.views.client.specialist_matching.view_personal_questions import \
     ClientPersonalQuestionsPageView
+from core.views.profiling_metrics_view import ProfilingMetricsView
 from core.views.psychologist.my_account.main_account_page import \
     PsychologistAccountView
 from core.views.start_view import StartPageView
@@ -57,6 +58,10 @@ urlpatterns = [
         name="psychologist-catalog-filter",
     ),
 
+    # === СЛУЖЕБНЫЕ СТРАНИЦЫ ===
+    # 1) Метрики профилирования запросов (RequestProfilingMiddleware), только для staff/admin
+    path("internal/profiling-metrics/", ProfilingMetricsView.as_view(), name="profiling-metrics"),
+
     # Детальная карточка психолога в КАТАЛОГЕ должна быть последней, потому что это catch-all slug route.
     # Если поставить ее выше конкретных URL, например "client-account/", Django начнет ошибочно
     # воспринимать такие адреса как profile_slug.
@@ -10,8 +10,8 @@ from django.views import View
 from django.views.generic import TemplateView
 from django_ratelimit.decorators import ratelimit
 
-from aggregator._web.services.basic_filter_catalog import \
-    CONSULTATION_TYPE_CHOICES
+from aggregator._web.services.basic_filter_catalog import (
+    CONSULTATION_TYPE_CHOICES, is_nearest_days_session_time_mode_enabled)
 from calendar_engine.models import AvailabilityRule
 from core.services.experience_label import build_experience_label
 from core.services.mixins_ps_catalog import (CatalogBackLinkMixin,
@@ -59,8 +59,10 @@ class PsychologistCatalogFilterAjaxView(LoginRequiredMixin, CatalogLayoutModeMix
             - page: какую страницу нужно получить;
             - order_key: существующий random order key или null;
             - restore_mode: нужно ли вернуть все карточки до текущей страницы;
+            - cursor: keyset-курсор последней показанной карточки (next_cursor из предыдущего ответа);
             - layout_mode: sidebar/menu для корректных ссылок внутри карточек;
-            - preview_only: если true, возвращаем только количество найденных специалистов.
+            - preview_only: если true, возвращаем только количество найденных специалистов;
+            - facets_only: если true, возвращаем количество специалистов по каждому значению фильтров.
 
         На текущем шаге filters может содержать:
             - consultation_type;
@@ -82,12 +84,20 @@ class PsychologistCatalogFilterAjaxView(LoginRequiredMixin, CatalogLayoutModeMix
         requested_page = self._parse_positive_int(payload.get("page"), fallback=1)
         random_order_key = self._parse_non_negative_int(payload.get("order_key"), fallback=None)
         restore_mode = bool(payload.get("restore_mode"))
+        cursor = payload.get("cursor")
         preview_only = bool(payload.get("preview_only"))
+        facets_only = bool(payload.get("facets_only"))
         layout_mode = payload.get("layout_mode")
 
         if layout_mode not in {"sidebar", "menu"}:
             layout_mode = self._resolve_layout_mode()
 
+        if facets_only:
+            return JsonResponse(
+                self._build_facet_counts_response_payload(filters_state=filters_state),
+                status=200,
+            )
+
         if preview_only:
             return JsonResponse(
                 self._build_preview_response_payload(filters_state=filters_state),
@@ -99,6 +109,7 @@ class PsychologistCatalogFilterAjaxView(LoginRequiredMixin, CatalogLayoutModeMix
             requested_page=requested_page,
             random_order_key=random_order_key,
             restore_mode=restore_mode,
+            cursor=cursor,
         )
 
         return JsonResponse(
@@ -152,6 +163,7 @@ class PsychologistCatalogPageView(LoginRequiredMixin, CatalogLayoutModeMixin, Ca
             - catalog_age_bounds: реальные возрастные границы каталога для фильтра "Возраст";
             - catalog_experience_bounds: реальные границы стажа каталога для фильтра "Опыт";
             - catalog_domain_slots_endpoint: URL read-only эндпоинта доменных слотов для фильтра "Время сессии";
+            - catalog_nearest_days_session_time_enabled: показывать ли режим "Ближайшие 7 дней" фильтра "Время сессии";
             - catalog_filter_endpoint: URL AJAX-endpoint для временной фильтрации каталога;
             - current_sidebar_key: ключ для серверной подсветки активного пункта боковой навигации;
             - profiles: карточки психологов для текущей страницы каталога;
@@ -185,10 +197,12 @@ class PsychologistCatalogPageView(LoginRequiredMixin, CatalogLayoutModeMixin, Ca
             value: "Мужчина" if value == "male" else "Женщина" if value == "female" else label.title()
             for value, label in GENDER_CHOICES
         }
-        context["catalog_price_choices"] = self._build_catalog_price_choices()
-        context["catalog_age_bounds"] = self._build_catalog_age_bounds()
-        context["catalog_experience_bounds"] = self._build_catalog_experience_bounds()
+        catalog_facet_bounds = self._get_catalog_facet_bounds()
+        context["catalog_price_choices"] = catalog_facet_bounds["price_choices"]
+        context["catalog_age_bounds"] = catalog_facet_bounds["age"]
+        context["catalog_experience_bounds"] = catalog_facet_bounds["experience"]
         context["catalog_domain_slots_endpoint"] = reverse("calendar:api:get-domain-slots")
+        context["catalog_nearest_days_session_time_enabled"] = is_nearest_days_session_time_mode_enabled()
         context["catalog_filter_endpoint"] = reverse("core:psychologist-catalog-filter")
 
         # Источник истины для серверной подсветки (route-based) текущего выбранного пункта в БОКОВОЙ НАВИГАЦИИ
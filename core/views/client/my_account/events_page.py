@@ -5,6 +5,8 @@ from django.utils.formats import date_format
 from django.views.generic import TemplateView
 
 from calendar_engine.booking.services import build_specialist_live_indicator
+from calendar_engine.lifecycle.services.reschedule_chain_resolver import \
+    get_latest_rescheduled_descendants
 from calendar_engine.lifecycle.services.slot_status_display import \
     build_calendar_slot_status_display
 from calendar_engine.lifecycle.use_cases.apply_time_based_status_transitions import \
@@ -456,6 +458,20 @@ class ClientEventsView(ClientRequiredMixin, SpecialistMatchingLayoutMixin, Templ
                 }
             )
 
+        # ШАГ 5: Для перенесенных встреч находим актуальную встречу той же цепочки переносов.
+        # get_latest_rescheduled_descendants() разрешает цепочки previous_event сразу для всех карточек
+        # одним SQL-запросом (рекурсивный CTE), а не отдельным обходом для каждой перенесенной встречи
+        rescheduled_events_by_id = get_latest_rescheduled_descendants(
+            event_ids=[
+                item["event"].id
+                for item in client_events
+                if item["slot"].status == "cancelled" and item["slot"].cancel_reason_type == "rescheduled"
+            ],
+            viewer_user=self.request.user,
+        )
+        for item in client_events:
+            item["rescheduled_event"] = rescheduled_events_by_id.get(item["event"].id)
+
         # Для режима "события выбранного дня" порядок карточек должен быть смешанным:
         #   - сначала все еще активные встречи по возрастанию времени;
         #   - затем уже завершенные встречи по убыванию времени.
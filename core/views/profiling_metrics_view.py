@@ -0,0 +1,31 @@
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+
+from core.profiling.metrics import PROFILING_METRICS
+from users.mixins.role_required_mixin import RoleRequiredMixin
+
+
+class ProfilingMetricsView(RoleRequiredMixin, View):
+    """Служебный endpoint с метриками профилирования запросов (RequestProfilingMiddleware).
+
+    Доступ: только staff/admin.
+
+    Формат ответа:
+        - по умолчанию JSON: {"status": "ok", "endpoints": {view_name: {...}}};
+        - ?format=prometheus - текстовый формат Prometheus, чтобы метрики можно было забирать scrape-ом.
+
+    ВАЖНО: метрики хранятся в памяти процесса, поэтому ответ содержит данные только того worker'а,
+    который обработал этот запрос.
+    """
+
+    http_method_names = ["get"]
+    allowed_roles = ("admin",)
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") == "prometheus":
+            return HttpResponse(
+                PROFILING_METRICS.render_prometheus_text(),
+                content_type="text/plain; version=0.0.4; charset=utf-8",
+            )
+
+        return JsonResponse({"status": "ok", "endpoints": PROFILING_METRICS.snapshot()})
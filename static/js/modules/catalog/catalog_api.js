@@ -26,6 +26,7 @@ export function buildCatalogRequestHeaders() {
 export async function requestCatalogData({
     page = 1,
     orderKey = null,
+    cursor = null,
     restoreMode = false,
     previewOnly = false,
     filtersOverride = null,
@@ -43,6 +44,7 @@ export async function requestCatalogData({
             filters: normalizeCatalogFilters(filtersOverride || catalogRuntimeState.filters),
             page,
             order_key: orderKey,
+            cursor,
             restore_mode: restoreMode,
             preview_only: previewOnly,
             layout_mode: catalogRuntimeState.layout_mode,
@@ -1,11 +1,11 @@
-import { initToggleGroup } from "../toggle_group_single_choice.js";
 import { initTimeSlotsPicker } from "../time_slots_picker.js";
 
 /**
  * Фильтр каталога "Время сессии".
  *
  * Бизнес-задача этого файла:
- * - показать пользователю выбор между режимами "Любое" и "Конкретное";
+ * - показать пользователю выбор между режимами "Любое", "Ближайшие 7 дней" и "Конкретное"
+ *   (режим "Ближайшие 7 дней" - только если backend его предлагает, см. is_nearest_days_session_time_enabled);
  * - при режиме "Конкретное" показать доменные временные слоты на ближайшие 7 дней;
  * - передать странице каталога готовые функции для preview-count, применения фильтра и подсветки кнопки фильтра.
  */
@@ -13,18 +13,34 @@ import { initTimeSlotsPicker } from "../time_slots_picker.js";
 export const CATALOG_SESSION_TIME_FILTER_KEY = "session_time";
 export const CATALOG_SESSION_TIME_FILTER_NAME = "Время сессии";
 
+const CATALOG_SESSION_TIME_MODES = ["any", "this_week", "specific"];
+
+// Кнопки режимов внутри модалки: режим -> id кнопки
+const CATALOG_SESSION_TIME_MODE_BUTTON_IDS = {
+    any: "catalog-session-time-any-btn",
+    this_week: "catalog-session-time-this-week-btn",
+    specific: "catalog-session-time-specific-btn",
+};
+
+const CATALOG_SESSION_TIME_ACTIVE_CLASSES = ["bg-indigo-500", "text-white", "border-indigo-100", "hover:bg-indigo-900"];
+const CATALOG_SESSION_TIME_INACTIVE_CLASSES = ["bg-white", "text-gray-700", "border-gray-300", "hover:bg-gray-50"];
+
 // Приводит режим фильтра "Время сессии" к допустимому состоянию каталога.
 // Если пришло некорректное значение, возвращаем "any", чтобы каталог работал без дополнительного ограничения.
 export function normalizeCatalogSessionTimeMode(rawValue) {
-    return rawValue === "specific" ? "specific" : "any";
+    return CATALOG_SESSION_TIME_MODES.includes(rawValue) ? rawValue : "any";
 }
 
 // Возвращает поясняющий текст для текущего режима фильтра "Время сессии".
 // Это нужно, чтобы одна и та же бизнес-формулировка использовалась и при первой отрисовке модалки, и при переключении режима внутри нее.
 function resolveCatalogSessionTimeHelperText(sessionTimeMode) {
-    return sessionTimeMode === "specific"
-        ? "Будут показаны специалисты, к которым можно записаться в указанное вами день и время"
-        : "Если оставить режим \"Любое\", каталог не будет дополнительно фильтроваться по времени";
+    if (sessionTimeMode === "specific") {
+        return "Будут показаны специалисты, к которым можно записаться в указанное вами день и время";
+    }
+    if (sessionTimeMode === "this_week") {
+        return "Будут показаны специалисты, у которых есть свободное время для записи в ближайшие 7 дней";
+    }
+    return "Если оставить режим \"Любое\", каталог не будет дополнительно фильтроваться по времени";
 }
 
 // Приводит выбранные доменные слоты к чистому и безопасному виду.
@@ -52,12 +68,16 @@ export function normalizeCatalogSelectedSessionSlots(rawValues) {
 // Проверяет, применен ли сейчас фильтр "Время сессии" в каталоге.
 // Если функция возвращает true, страница понимает, что кнопка фильтра "Время сессии" должна подсветиться как активная.
 export function isCatalogSessionTimeFilterActive(filters) {
-    return normalizeCatalogSessionTimeMode(filters?.session_time_mode) === "specific"
+    const sessionTimeMode = normalizeCatalogSessionTimeMode(filters?.session_time_mode);
+
+    if (sessionTimeMode === "this_week") return true;
+
+    return sessionTimeMode === "specific"
         && normalizeCatalogSelectedSessionSlots(filters?.selected_session_slots).length > 0;
 }
 
 // Читает текущий режим фильтра прямо из открытой модалки.
-// Это нужно, чтобы страница понимала, должен ли каталог работать в режиме "Любое" или "Конкретное".
+// Это нужно, чтобы страница понимала, в каком режиме должен работать каталог: "Любое", "Ближайшие 7 дней" или "Конкретное".
 export function getCatalogSessionTimeModalMode() {
     const hiddenInput = document.getElementById("catalog-session-time-mode-input");
     return normalizeCatalogSessionTimeMode(hiddenInput ? hiddenInput.value : "any");
@@ -73,13 +93,21 @@ export function getCatalogSessionTimeModalSelectedSlots() {
 }
 
 // Собирает HTML содержимого модалки фильтра "Время сессии".
-// Простыми словами: рисует две кнопки выбора режима и контейнер для уже существующего UI доменных слотов.
+// Простыми словами: рисует кнопки выбора режима и контейнер для уже существующего UI доменных слотов.
 export function buildCatalogSessionTimeModalHtml({
     catalogRuntimeState,
 }) {
     const sessionTimeMode = normalizeCatalogSessionTimeMode(catalogRuntimeState.filters.session_time_mode);
     const slotsWrapperClass = sessionTimeMode === "specific" ? "mt-4 rounded-2xl bg-gray-50" : "hidden mt-4 rounded-2xl bg-gray-50";
     const helperText = resolveCatalogSessionTimeHelperText(sessionTimeMode);
+    const isNearestDaysModeEnabled = catalogRuntimeState.is_nearest_days_session_time_enabled;
+    const modeButtonsGridClass = isNearestDaysModeEnabled ? "grid grid-cols-3 gap-3 max-w-xl" : "grid grid-cols-2 gap-3 max-w-md";
+    const nearestDaysButtonHtml = isNearestDaysModeEnabled
+        ? `
+                <button id="catalog-session-time-this-week-btn" type="button" class="px-4 py-2 rounded-lg border text-lg font-medium">
+                    Ближайшие 7 дней
+                </button>`
+        : "";
 
     return `
         <div class="space-y-4">
@@ -87,10 +115,10 @@ export function buildCatalogSessionTimeModalHtml({
                 Выберите, нужно ли учитывать конкретное время сессии при фильтрации каталога
             </p>
 
-            <div class="grid grid-cols-2 gap-3 max-w-md">
+            <div class="${modeButtonsGridClass}">
                 <button id="catalog-session-time-any-btn" type="button" class="px-4 py-2 rounded-lg border text-lg font-medium">
                     Любое
-                </button>
+                </button>${nearestDaysButtonHtml}
                 <button id="catalog-session-time-specific-btn" type="button" class="px-4 py-2 rounded-lg border text-lg font-medium">
                     Конкретное
                 </button>
@@ -145,7 +173,7 @@ export function buildCatalogSessionTimeTentativeFilters({
 }
 
 // Рисует модалку фильтра "Время сессии" и подключает ее поведение.
-// Бизнес-смысл: дать пользователю выбрать режим "Любое/Конкретное", а при необходимости переиспользовать уже готовый UI доменных временных слотов.
+// Бизнес-смысл: дать пользователю выбрать режим "Любое/Ближайшие 7 дней/Конкретное", а при необходимости переиспользовать уже готовый UI доменных временных слотов.
 export function renderCatalogSessionTimeModal({
     modalContent,
     catalogRuntimeState,
@@ -160,28 +188,27 @@ export function renderCatalogSessionTimeModal({
         catalogRuntimeState,
     });
 
-    initToggleGroup({
-        firstBtn: "#catalog-session-time-any-btn",
-        secondBtn: "#catalog-session-time-specific-btn",
-        valFirst: "any",
-        valSecond: "specific",
-        blockToToggleSelector: "#catalog-time-slots-wrapper",
-        initialValue: normalizeCatalogSessionTimeMode(catalogRuntimeState.filters.session_time_mode),
-        hiddenInputSelector: "#catalog-session-time-mode-input",
-        showBlockWhen: "second",
-    });
-
-    const anyButton = document.getElementById("catalog-session-time-any-btn");
-    const specificButton = document.getElementById("catalog-session-time-specific-btn");
+    const modeInput = document.getElementById("catalog-session-time-mode-input");
     const slotsWrapper = document.getElementById("catalog-time-slots-wrapper");
     const helperText = document.getElementById("catalog-session-time-helper-text");
 
-    // Синхронизирует UI открытой модалки с текущим режимом "Любое/Конкретное".
-    // Простыми словами: сразу переключает видимость блока слотов и поясняющий текст, не дожидаясь повторного открытия модалки.
+    // Синхронизирует UI открытой модалки с текущим режимом "Любое/Ближайшие 7 дней/Конкретное".
+    // Простыми словами: подсвечивает выбранную кнопку, сразу переключает видимость блока слотов и поясняющий текст,
+    // не дожидаясь повторного открытия модалки.
+    // Кнопок может быть три (с режимом "Ближайшие 7 дней"), поэтому здесь не используется двухкнопочный initToggleGroup.
     function syncSessionTimeModeUi() {
         const currentMode = getCatalogSessionTimeModalMode();
         const isSpecificMode = currentMode === "specific";
 
+        Object.entries(CATALOG_SESSION_TIME_MODE_BUTTON_IDS).forEach(([mode, buttonId]) => {
+            const button = document.getElementById(buttonId);
+            if (!button) return;
+
+            const isActive = mode === currentMode;
+            CATALOG_SESSION_TIME_ACTIVE_CLASSES.forEach((className) => button.classList.toggle(className, isActive));
+            CATALOG_SESSION_TIME_INACTIVE_CLASSES.forEach((className) => button.classList.toggle(className, !isActive));
+        });
+
         if (slotsWrapper) {
             slotsWrapper.classList.toggle("hidden", !isSpecificMode);
         }
@@ -214,22 +241,21 @@ export function renderCatalogSessionTimeModal({
 
     syncSessionTimeModeUi();
 
-    if (anyButton) {
-        anyButton.addEventListener("click", () => {
-            window.requestAnimationFrame(() => {
-                syncSessionTimeModeUi();
-                schedulePreviewRefresh();
-            });
-        });
-    }
-
-    if (specificButton) {
-        specificButton.addEventListener("click", () => {
-            initSlotsPickerIfNeeded();
+    Object.entries(CATALOG_SESSION_TIME_MODE_BUTTON_IDS).forEach(([mode, buttonId]) => {
+        const button = document.getElementById(buttonId);
+        if (!button) return;
+
+        button.addEventListener("click", () => {
+            if (modeInput) {
+                modeInput.value = mode;
+            }
+            if (mode === "specific") {
+                initSlotsPickerIfNeeded();
+            }
             window.requestAnimationFrame(() => {
                 syncSessionTimeModeUi();
                 schedulePreviewRefresh();
             });
         });
-    }
+    });
 }
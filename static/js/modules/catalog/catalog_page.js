@@ -260,9 +260,11 @@ function initLoadMore() {
         if (errorLabel) errorLabel.classList.add("hidden");
 
         try {
+            // Курсор последней показанной карточки: backend отдаст следующую страницу без OFFSET (keyset pagination)
             const data = await requestCatalogData({
                 page: requestedPage,
                 orderKey,
+                cursor: loadMoreButton.dataset.nextCursor || null,
                 restoreMode: false,
             });
             applyCatalogResponse(data, { appendMode: true });
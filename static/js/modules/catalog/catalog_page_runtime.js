@@ -48,6 +48,8 @@ export const catalogRuntimeState = {
     order_key: null,
     anchor: null,
     scroll_y: 0,
+    // Режим "Ближайшие 7 дней" фильтра "Время сессии" backend предлагает только при материализованной доступности
+    is_nearest_days_session_time_enabled: false,
     filters: {},
 };
 
@@ -121,7 +123,10 @@ export function normalizeCatalogFilters(rawFilters = {}) {
         rawFilters?.experience_max,
         { readJsonScript },
     );
-    const sessionTimeMode = normalizeCatalogSessionTimeMode(rawFilters?.session_time_mode);
+    const rawSessionTimeMode = normalizeCatalogSessionTimeMode(rawFilters?.session_time_mode);
+    const sessionTimeMode = rawSessionTimeMode === "this_week" && !catalogRuntimeState.is_nearest_days_session_time_enabled
+        ? "any"
+        : rawSessionTimeMode;
     const selectedSessionSlots = normalizeCatalogSelectedSessionSlots(rawFilters?.selected_session_slots);
 
     return {
@@ -167,5 +172,6 @@ export function hydrateRuntimeStateFromDom() {
     catalogRuntimeState.current_page = toPositiveInt(loadMoreButton.dataset.currentPage, 1);
     catalogRuntimeState.total_pages = toNonNegativeInt(loadMoreButton.dataset.totalPages, 0);
     catalogRuntimeState.order_key = toNonNegativeInt(loadMoreButton.dataset.randomOrderKey, null);
+    catalogRuntimeState.is_nearest_days_session_time_enabled = loadMoreButton.dataset.nearestDaysSessionTimeEnabled === "true";
     catalogRuntimeState.filters = normalizeCatalogFilters(buildDefaultCatalogFilters());
 }
@@ -99,9 +99,11 @@ export function syncLoadMoreButton(data) {
     const nextPageNumber = toPositiveInt(data.next_page_number, null);
     if (data.has_next && nextPageNumber) {
         loadMoreButton.dataset.nextPage = String(nextPageNumber);
+        loadMoreButton.dataset.nextCursor = data.next_cursor || "";
         loadMoreButton.hidden = false;
     } else {
         loadMoreButton.dataset.nextPage = "";
+        loadMoreButton.dataset.nextCursor = "";
         loadMoreButton.hidden = true;
     }
 
@@ -9,6 +9,7 @@ import {
     updateScheduleToggleButton,
     updateScheduleUI,
 } from "./detail_card_schedule.js";
+import { fetchPsychologistSchedule } from "./detail_card_schedule_prefetch.js";
 import {
     buildPaymentStepUrl,
     setSelectedAppointmentSlot,
@@ -277,8 +278,8 @@ export function renderPsychologistCard(ps, options = {}) {
     updatePaymentStepTarget(null);
 
     // Получаем актуальное расписание психолога.
-    fetch(`/calendar/api/psychologists/${currentPsId}/schedule/?consultation_type=${encodeURIComponent(ps.session_type || "individual")}`)
-        .then(response => response.json())
+    // Если страница заранее получила расписания набора специалистов пакетным запросом - берем готовый ответ.
+    fetchPsychologistSchedule(currentPsId, ps.session_type || "individual")
         .then(data => {
             // Защита от гонок: если карточка уже переключена на другого психолога - игнорируем
             if (container.dataset.psId !== String(currentPsId)) return;
@@ -0,0 +1,83 @@
+/**
+ * Бизнес-смысл модуля:
+ * На странице "Выбор психолога" клиент быстро переключает карточки специалистов,
+ * и раньше каждое переключение означало отдельный запрос расписания.
+ * Модуль заранее одним запросом получает расписания всех специалистов текущего набора аватаров
+ * (пакетный эндпоинт), а карточка при открытии берет уже готовый ответ.
+ */
+
+// Сколько живет заранее полученное расписание. Дольше не храним, чтобы не показывать уже занятые слоты.
+const SCHEDULE_PREFETCH_TTL_MS = 60 * 1000;
+
+// Заранее полученные расписания: ключ "<id психолога>:<consultation_type>" -> { createdAt, promise }
+const prefetchedSchedules = new Map();
+
+function buildScheduleKey(psId, consultationType) {
+    return `${psId}:${consultationType}`;
+}
+
+function isFresh(entry) {
+    return Boolean(entry) && Date.now() - entry.createdAt < SCHEDULE_PREFETCH_TTL_MS;
+}
+
+// Одиночный запрос расписания (прежний сценарий карточки)
+function fetchSingleSchedule(psId, consultationType) {
+    return fetch(`/calendar/api/psychologists/${psId}/schedule/?consultation_type=${encodeURIComponent(consultationType)}`)
+        .then(response => response.json());
+}
+
+// Заранее получаем расписания набора специалистов (по одному запросу на каждый consultation_type)
+export function prefetchPsychologistSchedules(psList = []) {
+    const idsByConsultationType = new Map();
+
+    psList.forEach(ps => {
+        if (!ps) return;
+
+        const consultationType = ps.session_type || "individual";
+        const key = buildScheduleKey(ps.id, consultationType);
+        if (isFresh(prefetchedSchedules.get(key))) return;
+
+        if (!idsByConsultationType.has(consultationType)) {
+            idsByConsultationType.set(consultationType, []);
+        }
+        idsByConsultationType.get(consultationType).push(ps.id);
+    });
+
+    idsByConsultationType.forEach((ids, consultationType) => {
+        const params = new URLSearchParams({
+            profile_ids: ids.join(","),
+            consultation_type: consultationType,
+        });
+        // Ошибку пакетного запроса не показываем: карточка просто сделает обычный одиночный запрос
+        const request = fetch(`/calendar/api/psychologists/schedules/?${params.toString()}`)
+            .then(response => response.json())
+            .catch(() => null);
+        const createdAt = Date.now();
+
+        ids.forEach(psId => {
+            prefetchedSchedules.set(buildScheduleKey(psId, consultationType), {
+                createdAt,
+                // Приводим ответ к формату одиночного эндпоинта, чтобы карточке было все равно, откуда он пришел
+                promise: request.then(data => {
+                    const item = data && data.status === "ok" ? data.schedules?.[String(psId)] : null;
+                    return item ? { status: "ok", ...item, now_iso_client: data.now_iso_client } : null;
+                }),
+            });
+        });
+    });
+}
+
+// Расписание для карточки: заранее полученное (если еще свежее) или одиночный запрос
+export function fetchPsychologistSchedule(psId, consultationType) {
+    const key = buildScheduleKey(psId, consultationType);
+    const entry = prefetchedSchedules.get(key);
+
+    // Заранее полученный ответ используем один раз: повторное открытие карточки запросит свежие данные
+    prefetchedSchedules.delete(key);
+
+    if (!isFresh(entry)) {
+        return fetchSingleSchedule(psId, consultationType);
+    }
+
+    return entry.promise.then(data => data || fetchSingleSchedule(psId, consultationType));
+}
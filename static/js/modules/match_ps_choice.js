@@ -2,6 +2,7 @@ import { initStickyHeaderBehavior } from "./detail_card/detail_card_sticky_compa
 import { initDetailCardModals } from "./detail_card/detail_card_modals.js";
 import { initGlobalTextToggleHandlers } from "./detail_card/detail_card_content_toggle.js";
 import { renderPsychologistCard } from "./detail_card/detail_card_render.js";
+import { prefetchPsychologistSchedules } from "./detail_card/detail_card_schedule_prefetch.js";
 import { initSessionChoiceState } from "./detail_card/detail_card_session_choice.js";
 
 /**
@@ -148,6 +149,10 @@ function renderAvatars() {
 
     const pageItems = psychologists.slice(currentOffset, currentOffset + PAGE_SIZE);
 
+    // Расписания всех специалистов текущего набора аватаров получаем одним пакетным запросом,
+    // чтобы переключение карточек не делало отдельный запрос на каждого специалиста
+    prefetchPsychologistSchedules(pageItems);
+
     pageItems.forEach(ps => {
         const img = document.createElement("img");
 